@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+
+from benchmarks.llm_falso import ClienteLLMFalso
+from src.agent.pipeline_turno import SessaoChat, processar_turno_async
+from src.database.repositorio_filmes import RepositorioFilmes, definir_repositorio
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+from src.llm.cache_respostas import CacheRespostas
+from src.llm.cliente_llm import redefinir_cliente_llm
+from src.llm.llm_utils import (
+    chamar_llm_para_resumo_stream_async,
+    redefinir_cache_respostas,
+)
+from src.llm.metricas_stream import MetricasStream
+from src.nlp.nlp_utils import (
+    extrair_titulo_da_pergunta_async,
+    recarregar_automato_titulos,
+)
+
+# (tipo de pergunta, pergunta, título que a LLM falsa extrai)
+PERGUNTAS = [
+    ("título do catálogo", "Quem dirigiu Matrix?", None),
+    ("saudação", "Olá, tudo bem?", None),
+    ("fora do catálogo", "Me fale sobre Nosferatu", "Nosferatu"),
+    ("menção incerta", "me fale de up", "Up"),
+]
+
+
+async def turno_sequencial(pergunta, repositorio):
+    """Fluxo antigo: extração do título -> banco -> resposta, uma etapa por vez."""
+    metricas = MetricasStream()
+    titulo = await extrair_titulo_da_pergunta_async(pergunta)
+    info_filme = None
+    if titulo:
+        info_filme = await asyncio.to_thread(repositorio.buscar_por_titulo, titulo)
+    pedacos = chamar_llm_para_resumo_stream_async(pergunta, info_filme=info_filme)
+    async for _ in metricas.acompanhar_async(pedacos):
+        pass
+    return metricas.tempo_primeiro_pedaco, metricas.tempo_total
+
+
+async def turno_agendado(pergunta, repositorio, especular):
+    """Fluxo novo: 'processar_turno_async' com as etapas em paralelo."""
+    resultado = await processar_turno_async(
+        pergunta, SessaoChat(), repositorio, especular=especular
+    )
+    return resultado["tempo_primeiro_pedaco"], resultado["tempo_total"]
+
+
+async def medir(executar_turno, pergunta, cliente, repeticoes):
+    """Executa o turno várias vezes e retorna (TTFT médio, total médio, chamadas/turno)."""
+    chamadas_antes = cliente.chamadas
+    ttfts, totais = [], []
+    for _ in range(repeticoes):
+        ttft, total = await executar_turno(pergunta)
+        ttfts.append(ttft)
+        totais.append(total)
+    await asyncio.sleep(0)  # Deixa as tarefas canceladas terminarem.
+    chamadas = (cliente.chamadas - chamadas_antes) / repeticoes
+    return statistics.mean(ttfts), statistics.mean(totais), chamadas
+
+
+async def executar(args, repositorio):
+    """Compara os fluxos para cada tipo de pergunta e imprime a tabela."""
+    cliente = ClienteLLMFalso(
+        args.latencia,
+        titulos_extraidos={p: t for _, p, t in PERGUNTAS if t},
+    )
+    redefinir_cliente_llm(cliente)
+    redefinir_cache_respostas(CacheRespostas(capacidade=0))
+
+    fluxos = [
+        ("sequencial", lambda p: turno_sequencial(p, repositorio)),
+        ("agendado", lambda p: turno_agendado(p, repositorio, False)),
+        ("agendado+especulação", lambda p: turno_agendado(p, repositorio, True)),
+    ]
+    print(f"LLM falsa com {args.latencia * 1000:.0f}ms por chamada\n")
+    print(f"{'pergunta':<20} {'fluxo':<22} {'1º pedaço':>10} {'total':>10} chamadas")
+    for tipo, pergunta, _ in PERGUNTAS:
+        for nome, executar_turno in fluxos:
+            ttft, total, chamadas = await medir(
+                executar_turno, pergunta, cliente, args.repeticoes
+            )
+            print(
+                f"{tipo:<20} {nome:<22} {ttft * 1000:8.1f}ms {total * 1000:8.1f}ms "
+                f"{chamadas:8.1f}"
+            )
+
+
+def main():
+    """Mede o caminho crítico de um turno: fluxo sequencial x agendador paralelo."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--latencia", type=float, default=0.2)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_bd = os.path.join(diretorio, "filmes.db")
+        criar_tabela_filmes(caminho_bd)
+        popular_filmes_exemplo(caminho_bd)
+        repositorio = RepositorioFilmes(caminho_bd)
+        definir_repositorio(repositorio)  # Catálogo do autômato de títulos.
+        recarregar_automato_titulos()
+        try:
+            asyncio.run(executar(args, repositorio))
+        finally:
+            repositorio.fechar()
+            definir_repositorio(None)
+            recarregar_automato_titulos()
+            redefinir_cliente_llm()
+            redefinir_cache_respostas()
+
+
+if __name__ == "__main__":
+    main()
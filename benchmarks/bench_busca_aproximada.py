@@ -0,0 +1,122 @@
+import argparse
+import itertools
+import random
+import statistics
+import time
+
+from src.nlp.busca_aproximada import BuscaAproximadaTitulos
+
+# Frequência aproximada das letras em títulos (português e inglês misturados).
+FREQUENCIA_LETRAS = {
+    "a": 12, "e": 12, "o": 10, "i": 7, "s": 7, "r": 6, "n": 6, "t": 6, "d": 5,
+    "m": 4, "u": 4, "c": 4, "l": 4, "p": 3, "h": 3, "v": 2, "g": 2, "b": 2, "f": 2,
+    "y": 1, "w": 1, "k": 1, "q": 1, "z": 1, "j": 1, "x": 1,
+}  # fmt: skip
+
+LETRAS = "".join(FREQUENCIA_LETRAS)
+
+
+def gerar_vocabulario(tamanho, aleatorio):
+    """Palavras sintéticas de 2 a 10 letras, sorteadas pela frequência das letras."""
+    pesos = list(FREQUENCIA_LETRAS.values())
+    return [
+        "".join(aleatorio.choices(LETRAS, weights=pesos, k=aleatorio.randint(2, 10)))
+        for _ in range(tamanho)
+    ]
+
+
+def gerar_titulos(quantidade, semente=42, tamanho_vocabulario=50_000):
+    """
+    Gera títulos sintéticos únicos de 1 a 5 palavras. As palavras seguem a lei de
+    Zipf, como nos títulos reais: poucas muito comuns e uma cauda longa de raras.
+    """
+    aleatorio = random.Random(semente)
+    vocabulario = gerar_vocabulario(tamanho_vocabulario, aleatorio)
+    postos = range(1, len(vocabulario) + 1)
+    pesos = list(itertools.accumulate(1 / posto for posto in postos))
+    vistos = set()
+    while len(vistos) < quantidade:
+        k = aleatorio.randint(1, 5)
+        palavras = aleatorio.choices(vocabulario, cum_weights=pesos, k=k)
+        titulo = " ".join(palavras).title()
+        if titulo not in vistos:
+            vistos.add(titulo)
+            yield titulo
+
+
+def inserir_erro(texto, aleatorio):
+    """Aplica um erro de digitação: troca, remoção, inserção ou transposição."""
+    i = aleatorio.randrange(len(texto) - 1)
+    tipo = aleatorio.choice(("troca", "remocao", "insercao", "transposicao"))
+    if tipo == "troca":
+        return texto[:i] + aleatorio.choice(LETRAS) + texto[i + 1 :]
+    if tipo == "remocao":
+        return texto[:i] + texto[i + 1 :]
+    if tipo == "insercao":
+        return texto[:i] + aleatorio.choice(LETRAS) + texto[i:]
+    return texto[:i] + texto[i + 1] + texto[i] + texto[i + 2 :]
+
+
+def consultas_com_erros(titulos, total, semente=7):
+    """Pares (consulta com 1 ou 2 erros, título certo), em minúsculas e sem acentos."""
+    aleatorio = random.Random(semente)
+    consultas = []
+    for _ in range(total):
+        titulo = aleatorio.choice(titulos)
+        consulta = titulo.lower()
+        for _ in range(1 if len(consulta) < 10 else aleatorio.randint(1, 2)):
+            consulta = inserir_erro(consulta, aleatorio)
+        consultas.append((consulta, titulo))
+    return consultas
+
+
+def resumir(nome, latencias):
+    latencias = sorted(latencias)
+    p95 = latencias[int(len(latencias) * 0.95) - 1]
+    print(
+        f"{nome:<22} mediana {statistics.median(latencias) * 1e6:9.1f} µs   "
+        f"p95 {p95 * 1e6:9.1f} µs"
+    )
+
+
+def main():
+    """Mede a busca aproximada de títulos (latência e acerto) com erros de digitação."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--titulos", type=int, default=1_000_000)
+    parser.add_argument("--consultas", type=int, default=1_000)
+    args = parser.parse_args()
+
+    titulos = list(gerar_titulos(args.titulos))
+    inicio = time.perf_counter()
+    busca = BuscaAproximadaTitulos(titulos)
+    print(f"{len(titulos)} títulos indexados em {time.perf_counter() - inicio:.1f}s")
+
+    latencias, acertos, acima_limiar = [], 0, 0
+    for consulta, esperado in consultas_com_erros(titulos, args.consultas):
+        inicio = time.perf_counter()
+        melhor = busca.melhor_titulo(consulta, limiar=0.0)
+        latencias.append(time.perf_counter() - inicio)
+        acertos += melhor is not None and melhor[0] == esperado
+        acima_limiar += busca.melhor_titulo(consulta) is not None
+    resumir("com erros", latencias)
+    print(
+        f"acerto top-1: {acertos / args.consultas:.1%}   "
+        f"acima do limiar: {acima_limiar / args.consultas:.1%}"
+    )
+
+    aleatorio = random.Random(11)
+    ausentes = [
+        "".join(aleatorio.choices(LETRAS + " ", k=aleatorio.randint(5, 25)))
+        for _ in range(args.consultas)
+    ]
+    latencias, falsos_positivos = [], 0
+    for consulta in ausentes:
+        inicio = time.perf_counter()
+        falsos_positivos += busca.melhor_titulo(consulta) is not None
+        latencias.append(time.perf_counter() - inicio)
+    resumir("ausentes", latencias)
+    print(f"aceitos por engano: {falsos_positivos / args.consultas:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from src.database.repositorio_filmes import SQL_BUSCA_POR_TITULO, RepositorioFilmes
+from src.database.setup_db import criar_tabela_filmes
+from src.nlp.normalizacao import normalizar_texto
+
+PALAVRAS = (
+    "amor noite cidade sonho guerra último rei coração estrela viagem sombra "
+    "espelho silêncio fúria caminho lobo água tempo mistério retorno ilha "
+    "fantasma ponte jardim inverno verão dragão céu mar fogo segredo"
+).split()
+
+
+def gerar_titulos(quantidade, semente=42):
+    """Gera títulos sintéticos únicos (2 a 5 palavras + número de sequência)."""
+    aleatorio = random.Random(semente)
+    for i in range(quantidade):
+        palavras = aleatorio.choices(PALAVRAS, k=aleatorio.randint(2, 5))
+        yield f"{' '.join(palavras).title()} {i}"
+
+
+def criar_banco_sintetico(caminho_bd, quantidade):
+    """Cria um 'filmes.db' com o esquema do projeto e 'quantidade' títulos sintéticos."""
+    criar_tabela_filmes(caminho_bd)
+    conn = sqlite3.connect(caminho_bd)
+    conn.executemany(
+        "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista, titulo_normalizado) "
+        "VALUES (?, 'Drama', 2000, 'Diretor', 'Protagonista', ?)",
+        ((titulo, normalizar_texto(titulo)) for titulo in gerar_titulos(quantidade)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def consultas_de_teste(quantidade, total=200, semente=7):
+    """Monta consultas: trechos de títulos existentes (sem acentos) e termos ausentes."""
+    aleatorio = random.Random(semente)
+    titulos = list(gerar_titulos(quantidade))
+    consultas = []
+    for _ in range(total // 2):
+        titulo = aleatorio.choice(titulos)
+        consultas.append(normalizar_texto(titulo))  # O usuário digita sem acentos.
+        consultas.append(f"titulo inexistente {aleatorio.randint(0, 10**9)}")
+    return consultas
+
+
+def medir(funcao_consulta, consultas):
+    """Retorna as latências (em segundos) de cada consulta."""
+    latencias = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        funcao_consulta(consulta)
+        latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+
+def main():
+    """Compara LIKE '%...%' e o índice FTS5 trigram em catálogos sintéticos crescentes."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--consultas", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for quantidade in args.tamanhos:
+            caminho_bd = os.path.join(diretorio, f"filmes_{quantidade}.db")
+            inicio = time.perf_counter()
+            criar_banco_sintetico(caminho_bd, quantidade)
+            print(
+                f"\n--- {quantidade} títulos (carga em {time.perf_counter() - inicio:.1f}s) ---"
+            )
+            consultas = consultas_de_teste(quantidade, args.consultas)
+
+            conn = sqlite3.connect(caminho_bd)
+            latencias_like = medir(
+                lambda c: conn.execute(SQL_BUSCA_POR_TITULO, (f"%{c}%",)).fetchone(),
+                consultas,
+            )
+            conn.close()
+
+            repositorio = RepositorioFilmes(caminho_bd, tamanho_pool=1)
+            latencias_fts = medir(repositorio.buscar_por_titulo, consultas)
+            repositorio.fechar()
+
+            for nome, latencias in (
+                ("LIKE '%...%'", latencias_like),
+                ("FTS5 trigram", latencias_fts),
+            ):
+                print(
+                    f"{nome:<14} p50={statistics.median(latencias) * 1e3:9.3f}ms "
+                    f"média={statistics.mean(latencias) * 1e3:9.3f}ms "
+                    f"máx={max(latencias) * 1e3:9.3f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_busca_titulos import consultas_de_teste, criar_banco_sintetico
+from src.database.catalogo_memoria import CatalogoMemoria, construir_catalogo
+from src.database.repositorio_filmes import RepositorioFilmes
+
+
+def medir(funcao_consulta, consultas):
+    """Retorna as latências (em segundos) de cada consulta."""
+    latencias = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        funcao_consulta(consulta)
+        latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+
+def resumir(nome, latencias):
+    latencias = sorted(latencias)
+    p95 = latencias[int(len(latencias) * 0.95) - 1]
+    print(
+        f"{nome:<22} mediana {statistics.median(latencias) * 1e6:9.1f} µs   "
+        f"p95 {p95 * 1e6:9.1f} µs"
+    )
+
+
+def _worker(caminho_arquivo, consultas):
+    """Um processo worker: abre o instantâneo (sem copiar) e responde às consultas."""
+    inicio = time.perf_counter()
+    catalogo = CatalogoMemoria.carregar(caminho_arquivo)
+    abertura = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        catalogo.buscar_por_titulo(consulta)
+    return abertura, len(consultas) / (time.perf_counter() - inicio)
+
+
+def main():
+    """Compara buscas por título no SQLite (FTS5) e no catálogo em memória mapeada."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--filmes", type=int, default=200_000)
+    parser.add_argument("--consultas", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_bd = os.path.join(diretorio, "filmes.db")
+        caminho_arquivo = os.path.join(diretorio, "catalogo.bin")
+        criar_banco_sintetico(caminho_bd, args.filmes)
+        consultas = consultas_de_teste(args.filmes, args.consultas)
+
+        inicio = time.perf_counter()
+        construir_catalogo(caminho_bd, caminho_arquivo)
+        tamanho_mib = os.path.getsize(caminho_arquivo) / 2**20
+        print(
+            f"{args.filmes} filmes; instantâneo de {tamanho_mib:.1f} MiB gerado em "
+            f"{time.perf_counter() - inicio:.2f}s"
+        )
+
+        # Títulos existentes (achados pela tabela hash) e ausentes (pelos trigramas).
+        grupos = {"existentes": consultas[0::2], "ausentes": consultas[1::2]}
+        repositorio = RepositorioFilmes(caminho_bd, tamanho_pool=1)
+        catalogo = CatalogoMemoria.carregar(caminho_arquivo)
+        for grupo, consultas_grupo in grupos.items():
+            print(f"--- títulos {grupo} ---")
+            for nome, buscar in (
+                ("SQLite (FTS5)", repositorio.buscar_por_titulo),
+                ("catálogo em memória", catalogo.buscar_por_titulo),
+            ):
+                resumir(nome, medir(buscar, consultas_grupo))
+        repositorio.fechar()
+
+        # Os workers mapeiam o mesmo arquivo: as páginas ficam uma vez só na memória.
+        with multiprocessing.Pool(args.workers) as pool:
+            resultados = pool.starmap(
+                _worker, [(caminho_arquivo, grupos["existentes"])] * args.workers
+            )
+        for i, (abertura, vazao) in enumerate(resultados):
+            print(
+                f"worker {i}: aberto em {abertura * 1e3:.2f} ms, "
+                f"{vazao:,.0f} consultas/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from src.database.repositorio_filmes import RepositorioFilmes
+from src.database.setup_db import SQL_INDICES_FILTROS, criar_tabela_filmes
+
+GENEROS = ["Drama", "Comédia", "Ação", "Crime", "Ficção Científica", "Terror"]
+
+
+def popular_catalogo_sintetico(caminho_bd, num_filmes, num_pessoas, semente=42):
+    """Insere 'num_filmes' filmes com diretores, protagonistas, anos e gêneros aleatórios."""
+    aleatorio = random.Random(semente)
+    filmes = []
+    for i in range(num_filmes):
+        generos = aleatorio.sample(GENEROS, aleatorio.randint(1, 2))
+        filmes.append(
+            (
+                f"Filme {i}",
+                "/".join(generos),
+                aleatorio.randint(1920, 2024),
+                f"Diretor {aleatorio.randrange(num_pessoas)}",
+                f"Ator {aleatorio.randrange(num_pessoas)}",
+                f"filme {i}",
+            )
+        )
+    conn = sqlite3.connect(caminho_bd)
+    conn.executemany(
+        "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista, "
+        "titulo_normalizado) VALUES (?, ?, ?, ?, ?, ?)",
+        filmes,
+    )
+    conn.commit()
+    conn.close()
+
+
+def gerar_consultas(num_consultas, num_pessoas, semente=7):
+    """Mistura de filtros parecida com as perguntas 'filmes do X' e 'dramas de 1994'."""
+    aleatorio = random.Random(semente)
+    consultas = []
+    for i in range(num_consultas):
+        tipo = i % 4
+        pessoa = aleatorio.randrange(num_pessoas)
+        if tipo == 0:
+            consultas.append({"diretor": f"diretor {pessoa}"})  # Sem diferenciar caixa.
+        elif tipo == 1:
+            consultas.append({"protagonista": f"Ator {pessoa}"})
+        elif tipo == 2:
+            ano = aleatorio.randint(1920, 2024)
+            consultas.append({"genero": aleatorio.choice(GENEROS), "ano": ano})
+        else:
+            inicio = aleatorio.randrange(1920, 2020, 10)
+            consultas.append({"ano": (inicio, inicio + 9), "genero": "Drama"})
+    return consultas
+
+
+def medir(repositorio, consultas):
+    """Executa as consultas em sequência; retorna (consultas/s, linhas retornadas)."""
+    linhas = 0
+    inicio = time.perf_counter()
+    for filtros in consultas:
+        linhas += len(repositorio.buscar_filmes(**filtros))
+    return len(consultas) / (time.perf_counter() - inicio), linhas
+
+
+def main():
+    """Compara as consultas estruturadas com e sem os índices secundários."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--filmes", type=int, default=100_000)
+    parser.add_argument("--pessoas", type=int, default=5_000)
+    parser.add_argument("--consultas", type=int, default=400)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_bd = os.path.join(diretorio, "filmes.db")
+        criar_tabela_filmes(caminho_bd)
+        popular_catalogo_sintetico(caminho_bd, args.filmes, args.pessoas)
+        consultas = gerar_consultas(args.consultas, args.pessoas)
+
+        conn = sqlite3.connect(caminho_bd)
+        conn.execute("ANALYZE")
+        indices = [
+            linha[0]
+            for linha in conn.execute(
+                "SELECT name FROM sqlite_master WHERE name LIKE 'idx_filmes_%'"
+            )
+        ]
+        for indice in indices:
+            conn.execute(f"DROP INDEX {indice}")
+        conn.commit()
+        repositorio = RepositorioFilmes(caminho_bd, tamanho_pool=1)
+        vazao, linhas = medir(repositorio, consultas)
+        repositorio.fechar()
+        print(f"{args.filmes} filmes, {len(consultas)} consultas")
+        print(f"sem índices : {vazao:10.0f} consultas/s ({linhas} linhas)")
+
+        for sql in SQL_INDICES_FILTROS:
+            conn.execute(sql)
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+        repositorio = RepositorioFilmes(caminho_bd, tamanho_pool=1)
+        vazao, linhas = medir(repositorio, consultas)
+        repositorio.fechar()
+        print(f"com índices : {vazao:10.0f} consultas/s ({linhas} linhas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_busca_aproximada import gerar_vocabulario
+from models_prototype.corpus_codificado import CorpusCodificado
+
+
+def gerar_linhas(num_linhas, semente=42, tamanho_vocabulario=100_000):
+    """Linhas tokenizadas sintéticas, de 1 a 15 palavras que seguem a lei de Zipf."""
+    aleatorio = random.Random(semente)
+    vocabulario = gerar_vocabulario(tamanho_vocabulario, aleatorio)
+    postos = range(1, len(vocabulario) + 1)
+    pesos = list(itertools.accumulate(1 / posto for posto in postos))
+    for _ in range(num_linhas):
+        k = aleatorio.randint(1, 15)
+        palavras = aleatorio.choices(vocabulario, cum_weights=pesos, k=k)
+        # Cada token é uma string nova, como as do 'lower()' do tokenizador.
+        yield [palavra.lower() for palavra in palavras]
+
+
+def medir(nome, funcao):
+    """Roda 'funcao' e mostra o pico de memória alocada pelo Python e pelo numpy."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nome:<34} pico {pico / 2**20:8.1f} MB   {segundos:6.1f}s")
+    return resultado
+
+
+def lista_de_strings(num_linhas):
+    """A abordagem do protótipo: todos os tokens numa lista e 'sorted(set(...))'."""
+    tokens = []
+    for linha in gerar_linhas(num_linhas):
+        tokens.extend(linha)
+    palavras = sorted(set(tokens))
+    word_to_idx = {palavra: i for i, palavra in enumerate(palavras)}
+    return len(tokens), [word_to_idx[palavra] for palavra in tokens]
+
+
+def ler_corpus(caminho_base):
+    """Percorre todas as linhas do corpus (memória mapeada), como um treino faria."""
+    corpus = CorpusCodificado.carregar(caminho_base)
+    return sum(int(corpus.linha(i).sum()) for i in range(len(corpus)))
+
+
+def main():
+    """Compara a memória de uma lista de tokens com a do corpus codificado (uint32)."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--linhas", type=int, default=500_000)
+    args = parser.parse_args()
+
+    num_tokens, _ = medir(
+        "lista de strings + word_to_idx", lambda: lista_de_strings(args.linhas)
+    )
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_base = os.path.join(diretorio, "corpus")
+        medir(
+            "corpus codificado (construção)",
+            lambda: CorpusCodificado.construir(
+                gerar_linhas(args.linhas), caminho_base, min_contagem=1
+            ),
+        )
+        medir("corpus codificado (leitura)", lambda: ler_corpus(caminho_base))
+        tamanho = sum(
+            os.path.getsize(os.path.join(diretorio, nome))
+            for nome in os.listdir(diretorio)
+        )
+    print(f"{num_tokens} tokens; arquivos do corpus: {tamanho / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
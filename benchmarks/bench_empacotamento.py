@@ -0,0 +1,96 @@
+import argparse
+import random
+import time
+
+import torch
+import torch.nn as nn
+
+from models_prototype.nlp_model_arch import SimpleNLGModel, empacotar
+
+
+def gerar_sequencias(num_sequencias, tamanho_vocabulario, semente=42):
+    """Frases sintéticas de índices, quase todas curtas e algumas longas (até 60)."""
+    aleatorio = random.Random(semente)
+    sequencias = []
+    for _ in range(num_sequencias):
+        tamanho = min(1 + int(aleatorio.expovariate(1 / 8)), 60)
+        sequencias.append(
+            [aleatorio.randrange(2, tamanho_vocabulario) for _ in range(tamanho)]
+        )
+    return sequencias
+
+
+def preencher(sequencias):
+    """Lote retangular: completa cada frase com '<pad>' (0) até a maior do lote."""
+    maior = max(len(s) for s in sequencias)
+    return (torch.tensor([s + [0] * (maior - len(s)) for s in sequencias]),)
+
+
+def medir(modelo, sequencias, tamanho_lote, montar, treinar):
+    """Frases por segundo percorrendo 'sequencias' em lotes montados por 'montar'."""
+    lotes = [
+        sequencias[i : i + tamanho_lote]
+        for i in range(0, len(sequencias), tamanho_lote)
+    ]
+    otimizador = torch.optim.SGD(modelo.parameters(), lr=0.01)
+    funcao_perda = nn.CrossEntropyLoss()
+    inicio = time.perf_counter()
+    for lote in lotes:
+        entrada = montar(lote)
+        if treinar:
+            otimizador.zero_grad()
+            alvos = torch.zeros(len(lote), dtype=torch.long)
+            funcao_perda(modelo(*entrada), alvos).backward()
+            otimizador.step()
+        else:
+            with torch.inference_mode():
+                modelo(*entrada)
+    return len(sequencias) / (time.perf_counter() - inicio)
+
+
+def main():
+    """Compara lotes preenchidos com '<pad>' e lotes empacotados (offsets) no modelo."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--frases", type=int, default=20_000)
+    parser.add_argument("--vocabulario", type=int, default=50_000)
+    parser.add_argument("--saidas", type=int, default=4, help="4 = intenções.")
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1, 8, 32, 128, 512])
+    parser.add_argument("--threads", type=int, help="Padrão: o do PyTorch.")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    torch.manual_seed(0)
+    modelo = SimpleNLGModel(args.vocabulario, 64, 128, args.saidas)
+    sequencias = gerar_sequencias(args.frases, args.vocabulario)
+    tokens = sum(len(s) for s in sequencias)
+    print(f"{len(sequencias)} frases, {tokens / len(sequencias):.1f} tokens em média\n")
+    print("Frases por segundo (inferência e treino), por tamanho de lote:")
+    colunas = (
+        "inf. preenchido",
+        "inf. empacotado",
+        "treino preench.",
+        "treino empacot.",
+    )
+    print(f"{'lote':>5} {'<pad>':>6} " + " ".join(f"{c:>15}" for c in colunas))
+    for tamanho_lote in args.lotes:
+        preenchidos = sum(
+            len(lote) * max(len(s) for s in lote)
+            for lote in (
+                sequencias[i : i + tamanho_lote]
+                for i in range(0, len(sequencias), tamanho_lote)
+            )
+        )
+        vazoes = [
+            medir(modelo, sequencias, tamanho_lote, montar, treinar)
+            for treinar in (False, True)
+            for montar in (preencher, empacotar)
+        ]
+        print(
+            f"{tamanho_lote:>5} {1 - tokens / preenchidos:>6.0%} "
+            + " ".join(f"{vazao:>15,.0f}" for vazao in vazoes)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from src.database.esquema_normalizado import sincronizar_esquema_normalizado
+from src.database.repositorio_filmes import montar_consulta_filmes
+from src.database.setup_db import criar_tabela_filmes
+
+GENEROS = [
+    "Drama",
+    "Comédia",
+    "Ação",
+    "Crime",
+    "Ficção Científica",
+    "Terror",
+    "Animação",
+    "Romance",
+]
+PRENOMES = ["Ana", "Bruno", "Carla", "Davi", "Elisa", "Fábio", "Gabi", "Heitor"]
+
+
+def nome_pessoa(aleatorio, num_sobrenomes):
+    """Nome sintético; às vezes uma dupla com o mesmo sobrenome ('Ana e Davi Souza3')."""
+    sobrenome = f"Souza{aleatorio.randrange(num_sobrenomes)}"
+    if aleatorio.random() < 0.1:
+        primeiro, segundo = aleatorio.sample(PRENOMES, 2)
+        return f"{primeiro} e {segundo} {sobrenome}"
+    return f"{aleatorio.choice(PRENOMES)} {sobrenome}"
+
+
+def popular_catalogo_sintetico(conn, num_filmes, num_sobrenomes, semente=42):
+    """Insere filmes com gêneros compostos ('Drama/Crime') e pessoas em texto livre."""
+    aleatorio = random.Random(semente)
+    filmes = []
+    for i in range(num_filmes):
+        generos = aleatorio.sample(GENEROS, aleatorio.randint(1, 3))
+        filmes.append(
+            (
+                f"Filme {i}",
+                "/".join(generos),
+                aleatorio.randint(1920, 2024),
+                nome_pessoa(aleatorio, num_sobrenomes),
+                nome_pessoa(aleatorio, num_sobrenomes),
+                f"filme {i}",
+            )
+        )
+    conn.executemany(
+        "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista, "
+        "titulo_normalizado) VALUES (?, ?, ?, ?, ?, ?)",
+        filmes,
+    )
+    conn.commit()
+
+
+def gerar_consultas(num_consultas, num_sobrenomes, semente=7):
+    """Filtros por gênero, por pessoa e combinados, como nas perguntas do chatbot."""
+    aleatorio = random.Random(semente)
+    consultas = []
+    for i in range(num_consultas):
+        sobrenome = f"Souza{aleatorio.randrange(num_sobrenomes)}"
+        pessoa = f"{aleatorio.choice(PRENOMES)} {sobrenome}"
+        genero = aleatorio.choice(GENEROS)
+        tipo = i % 3
+        if tipo == 0:
+            consultas.append({"diretor": pessoa})
+        elif tipo == 1:
+            consultas.append({"genero": genero, "protagonista": pessoa})
+        else:
+            ano = aleatorio.randint(1920, 2024)
+            consultas.append({"genero": genero, "ano": ano})
+    return consultas
+
+
+def consulta_por_texto(filtros):
+    """A abordagem por strings: LIKE '%...%' sobre as colunas de texto de 'filmes'."""
+    condicoes, parametros = [], []
+    for coluna in ("diretor", "protagonista", "genero"):
+        if filtros.get(coluna):
+            condicoes.append(f"{coluna} LIKE ?")
+            parametros.append(f"%{filtros[coluna]}%")
+    if "ano" in filtros:
+        condicoes.append("ano = ?")
+        parametros.append(filtros["ano"])
+    sql = (
+        "SELECT titulo, diretor, ano, genero, protagonista FROM filmes "
+        f"WHERE {' AND '.join(condicoes)} ORDER BY ano, id LIMIT 10"
+    )
+    return sql, parametros
+
+
+def consulta_normalizada(filtros):
+    """A abordagem normalizada: junções indexadas (RepositorioFilmes.buscar_filmes)."""
+    return montar_consulta_filmes(limite=10, normalizado=True, **filtros)
+
+
+def medir(conn, consultas, montar):
+    """Executa as consultas; retorna (consultas/s, linhas retornadas)."""
+    linhas = 0
+    inicio = time.perf_counter()
+    for filtros in consultas:
+        sql, parametros = montar(filtros)
+        linhas += len(conn.execute(sql, parametros).fetchall())
+    return len(consultas) / (time.perf_counter() - inicio), linhas
+
+
+def main():
+    """Compara filtros por gênero/pessoa com LIKE nas strings e com o esquema normalizado."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--filmes", type=int, default=300_000)
+    parser.add_argument("--sobrenomes", type=int, default=20_000)
+    parser.add_argument("--consultas", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_bd = os.path.join(diretorio, "filmes.db")
+        criar_tabela_filmes(caminho_bd)
+        conn = sqlite3.connect(caminho_bd)
+        popular_catalogo_sintetico(conn, args.filmes, args.sobrenomes)
+
+        inicio = time.perf_counter()
+        with conn:
+            sincronizar_esquema_normalizado(conn)
+        print(f"migração de {args.filmes} filmes: {time.perf_counter() - inicio:.2f}s")
+        conn.execute("ANALYZE")
+
+        consultas = gerar_consultas(args.consultas, args.sobrenomes)
+        for nome, montar in (
+            ("strings (LIKE)", consulta_por_texto),
+            ("normalizado (junções)", consulta_normalizada),
+        ):
+            vazao, linhas = medir(conn, consultas, montar)
+            print(f"{nome:<22} {vazao:10.0f} consultas/s ({linhas} linhas)")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
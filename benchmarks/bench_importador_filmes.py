@@ -0,0 +1,88 @@
+import argparse
+import csv
+import gzip
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from src.database.importador_filmes import importar_filmes
+from src.database.setup_db import criar_tabela_filmes
+from src.nlp.normalizacao import normalizar_texto
+
+GENEROS = ["Drama", "Comédia", "Ação", "Crime", "Ficção Científica", "Terror"]
+
+
+def gerar_csv(caminho, num_filmes, semente=42):
+    """Escreve um catálogo sintético em CSV compactado com gzip."""
+    aleatorio = random.Random(semente)
+    with gzip.open(caminho, "wt", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["titulo", "genero", "ano", "diretor", "protagonista"])
+        for i in range(num_filmes):
+            escritor.writerow(
+                [
+                    f"Filme {i}",
+                    "/".join(aleatorio.sample(GENEROS, aleatorio.randint(1, 2))),
+                    aleatorio.randint(1920, 2024),
+                    f"Diretor {aleatorio.randrange(5_000)}",
+                    f"Ator {aleatorio.randrange(5_000)}",
+                ]
+            )
+
+
+def importar_linha_a_linha(caminho_csv, caminho_bd):
+    """A abordagem ingênua: um INSERT e um commit por linha, com os índices ativos."""
+    criar_tabela_filmes(caminho_bd)
+    conn = sqlite3.connect(caminho_bd)
+    inicio = time.perf_counter()
+    with gzip.open(caminho_csv, "rt", encoding="utf-8", newline="") as arquivo:
+        for linha in csv.DictReader(arquivo):
+            conn.execute(
+                "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista, "
+                "titulo_normalizado) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    linha["titulo"],
+                    linha["genero"],
+                    int(linha["ano"]),
+                    linha["diretor"],
+                    linha["protagonista"],
+                    normalizar_texto(linha["titulo"]),
+                ),
+            )
+            conn.commit()
+    conn.close()
+    return time.perf_counter() - inicio
+
+
+def main():
+    """Compara o importador em lote com inserções linha a linha."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--filmes", type=int, default=200_000)
+    parser.add_argument("--filmes-linha-a-linha", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_pequeno = os.path.join(diretorio, "pequeno.csv.gz")
+        gerar_csv(caminho_pequeno, args.filmes_linha_a_linha)
+        segundos = importar_linha_a_linha(
+            caminho_pequeno, os.path.join(diretorio, "linha.db")
+        )
+        print(
+            f"linha a linha : {args.filmes_linha_a_linha / segundos:10.0f} linhas/s "
+            f"({args.filmes_linha_a_linha} linhas)"
+        )
+
+        caminho_csv = os.path.join(diretorio, "catalogo.csv.gz")
+        gerar_csv(caminho_csv, args.filmes)
+        resultado = importar_filmes(caminho_csv, os.path.join(diretorio, "lote.db"))
+        print(
+            f"em lote       : {resultado['linhas_por_segundo']:10.0f} linhas/s "
+            f"({resultado['linhas']} linhas; índices em "
+            f"{resultado['segundos_indices']:.1f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_busca_titulos import gerar_titulos
+from src.nlp.indice_semantico import DIMENSAO_PADRAO, IndiceSemantico
+
+NOMES = (
+    "Ana Bruno Carla Diego Elisa Fabio Gabriela Heitor Irene Joao Karina Lucas Marta "
+    "Nuno Olga Paulo Rita Sergio Tania Vitor"
+).split()
+SOBRENOMES = (
+    "Almeida Barros Cardoso Duarte Esteves Ferraz Guimaraes Hoffmann Ivanov Jardim "
+    "Kowalski Lacerda Monteiro Nakamura Oliveira Pimentel Quintana Rezende Salgado "
+    "Teixeira Uchoa Valente Wagner Xavier Yamada Zanetti"
+).split()
+GENEROS = (
+    "Drama Comédia Ação Terror Suspense Romance Animação Documentário Fantasia "
+    "Ficção Científica Musical Faroeste"
+).split()
+
+
+def gerar_filmes(quantidade, semente=42):
+    """Gera linhas sintéticas (titulo, diretor, ano, genero, protagonista)."""
+    aleatorio = random.Random(semente)
+    pessoas = [f"{n} {s}" for n in NOMES for s in SOBRENOMES]
+    return [
+        (
+            titulo,
+            aleatorio.choice(pessoas),
+            aleatorio.randint(1920, 2024),
+            aleatorio.choice(GENEROS),
+            aleatorio.choice(pessoas),
+        )
+        for titulo in gerar_titulos(quantidade, semente)
+    ]
+
+
+def gerar_consultas(filmes, total, semente=7):
+    """
+    Monta consultas que descrevem um filme sem o título completo.
+
+    Returns:
+        list: Pares (consulta, posição do filme procurado).
+    """
+    aleatorio = random.Random(semente)
+    consultas = []
+    for _ in range(total):
+        posicao = aleatorio.randrange(len(filmes))
+        titulo, diretor, ano, genero, protagonista = filmes[posicao]
+        palavras = titulo.split()[:-1]  # Sem o número de sequência.
+        trecho = " ".join(aleatorio.sample(palavras, min(2, len(palavras))))
+        consultas.append(
+            (
+                f"aquele {genero} do {diretor.split()[1]} com {protagonista} "
+                f"sobre {trecho}",
+                posicao,
+            )
+        )
+    return consultas
+
+
+def medir(indice, consultas, k, n_sondas):
+    """Retorna (recall@k, consultas por segundo) da busca, uma consulta por vez."""
+    acertos = 0
+    inicio = time.perf_counter()
+    for consulta, posicao in consultas:
+        linhas = [linha for _, linha in indice.buscar(consulta, k, n_sondas)]
+        acertos += indice.linhas[posicao] in linhas
+    decorrido = time.perf_counter() - inicio
+    return acertos / len(consultas), len(consultas) / decorrido
+
+
+def main():
+    """Mede recall@k e consultas/s do índice semântico (busca exata e IVF)."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--filmes", type=int, default=50_000)
+    parser.add_argument("--consultas", type=int, default=300)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dimensao", type=int, default=DIMENSAO_PADRAO)
+    parser.add_argument("--listas-ivf", type=int, default=256)
+    args = parser.parse_args()
+
+    filmes = gerar_filmes(args.filmes)
+    consultas = gerar_consultas(filmes, args.consultas)
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_base = os.path.join(diretorio, "indice")
+        inicio = time.perf_counter()
+        indice = IndiceSemantico.construir(
+            filmes, caminho_base, dimensao=args.dimensao, n_listas=args.listas_ivf
+        )
+        tamanho = os.path.getsize(f"{caminho_base}.vetores.npy") / 2**20
+        print(
+            f"{len(indice)} filmes, vetores de {args.dimensao} dimensões "
+            f"({tamanho:.0f} MiB em memmap), construído em "
+            f"{time.perf_counter() - inicio:.1f}s\n"
+        )
+
+        print(f"{'busca':<22} {f'recall@{args.k}':>10} {'consultas/s':>12}")
+        recall, qps = medir(indice, consultas, args.k, None)
+        print(f"{'exata':<22} {recall:10.1%} {qps:12,.0f}")
+        for n_sondas in (1, 4, 16, 64):
+            if n_sondas > args.listas_ivf:
+                break
+            recall, qps = medir(indice, consultas, args.k, n_sondas)
+            nome = f"IVF {n_sondas}/{args.listas_ivf} listas"
+            print(f"{nome:<22} {recall:10.1%} {qps:12,.0f}")
+
+        textos = [consulta for consulta, _ in consultas]
+        inicio = time.perf_counter()
+        indice.buscar_lote(textos, args.k)
+        qps_lote = len(textos) / (time.perf_counter() - inicio)
+        print(f"{'exata em lote':<22} {'':>10} {qps_lote:12,.0f}")
+        del indice  # Libera o memmap antes de apagar o diretório.
+
+
+if __name__ == "__main__":
+    main()
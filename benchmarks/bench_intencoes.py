@@ -0,0 +1,100 @@
+import argparse
+import csv
+import os
+import time
+from collections import Counter
+
+from src.agent.classificador_intencoes import ClassificadorIntencoes
+
+CAMINHO_CORPUS = os.path.join(
+    os.path.dirname(__file__), "dados", "intencoes_rotuladas.tsv"
+)
+
+
+def identificar_intencao_por_substring(pergunta):
+    """Classificador anterior: buscas de substring em listas, uma por intenção."""
+    pergunta_lower = pergunta.lower()
+    if any(p in pergunta_lower for p in ("sair", "adeus", "tchau", "até logo")):
+        return "sair"
+    fatuais = ["quem", "qual", "quando", "onde", "diretor", "ano", "gênero", "genero"]
+    if any(keyword in pergunta_lower for keyword in fatuais):
+        return "factual"
+    resumo_geral = [
+        "resuma",
+        "fale sobre",
+        "me conte",
+        "o que é",
+        "história",
+        "sobre",
+        "personagem",
+        "atores",
+        "atrizes",
+        "qual a moral",
+        "elenco",
+    ]
+    if any(keyword in pergunta_lower for keyword in resumo_geral):
+        return "resumo_geral"
+    return "desconhecida"
+
+
+def carregar_corpus(caminho):
+    """Lê o corpus rotulado (TSV com as colunas 'intencao' e 'frase')."""
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        linhas = list(csv.DictReader(arquivo, delimiter="\t"))
+    return [linha["frase"] for linha in linhas], [linha["intencao"] for linha in linhas]
+
+
+def avaliar(nome, classificar_lote, frases, rotulos, repeticoes):
+    """Imprime a acurácia (geral e por intenção) e a vazão do classificador."""
+    previstos = classificar_lote(frases)
+    acertos = Counter(r for r, p in zip(rotulos, previstos) if r == p)
+    totais = Counter(rotulos)
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        classificar_lote(frases)
+    decorrido = time.perf_counter() - inicio
+
+    por_intencao = ", ".join(
+        f"{intencao} {acertos[intencao]}/{total}" for intencao, total in totais.items()
+    )
+    print(
+        f"{nome:<24} acurácia {sum(acertos.values()) / len(rotulos):6.1%}  "
+        f"{len(frases) * repeticoes / decorrido:12,.0f} frases/s  ({por_intencao})"
+    )
+    return previstos
+
+
+def main():
+    """Mede acurácia e vazão dos classificadores de intenção sobre o corpus rotulado."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--corpus", default=CAMINHO_CORPUS)
+    parser.add_argument("--repeticoes", type=int, default=200)
+    parser.add_argument(
+        "--mostrar-erros",
+        action="store_true",
+        help="Lista as frases classificadas errado.",
+    )
+    args = parser.parse_args()
+
+    frases, rotulos = carregar_corpus(args.corpus)
+    print(f"{len(frases)} frases rotuladas em {args.corpus}\n")
+
+    classificadores = [
+        (
+            "substring (anterior)",
+            lambda lote: [identificar_intencao_por_substring(f) for f in lote],
+        ),
+        ("regex sem pesos", ClassificadorIntencoes(ponderado=False).classificar_lote),
+        ("regex com pesos", ClassificadorIntencoes().classificar_lote),
+    ]
+    for nome, classificar_lote in classificadores:
+        previstos = avaliar(nome, classificar_lote, frases, rotulos, args.repeticoes)
+        if args.mostrar_erros:
+            for frase, rotulo, previsto in zip(frases, rotulos, previstos):
+                if rotulo != previsto:
+                    print(f"    {frase!r}: esperado {rotulo}, previsto {previsto}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import warnings
+
+from benchmarks.bench_intencoes import CAMINHO_CORPUS, carregar_corpus
+from models_prototype.modelo_intencoes import (
+    ClassificadorIntencoesNeural,
+    gerar_dataset_treino,
+    treinar_modelo_intencoes,
+)
+from src.agent.classificador_intencoes import ClassificadorIntencoes
+
+
+def medir_latencias(classificar, frases, repeticoes):
+    """Retorna a latência (em segundos) de cada classificação, uma frase por vez."""
+    latencias = []
+    for _ in range(repeticoes):
+        for frase in frases:
+            inicio = time.perf_counter()
+            classificar(frase)
+            latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+
+def medir_vazao_em_lote(classificar_lote, frases, repeticoes):
+    """Retorna quantas frases por segundo o classificador processa em lote."""
+    lote = frases * repeticoes
+    inicio = time.perf_counter()
+    classificar_lote(lote)
+    return len(lote) / (time.perf_counter() - inicio)
+
+
+def main():
+    """Compara o modelo de intenções treinado (fp32, int8, TorchScript) às palavras-chave."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--corpus", default=CAMINHO_CORPUS)
+    parser.add_argument(
+        "--modelo", help="Modelo salvo com 'salvar' (padrão: treina um agora)."
+    )
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")  # Avisos de depreciação do TorchScript/int8.
+
+    if args.modelo:
+        neural = ClassificadorIntencoesNeural.carregar(args.modelo)
+    else:
+        neural = treinar_modelo_intencoes(*gerar_dataset_treino())
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_script = os.path.join(diretorio, "modelo_intencoes.ts")
+        neural.exportar_torchscript(caminho_script)
+        script = ClassificadorIntencoesNeural.carregar_torchscript(caminho_script)
+
+    frases, rotulos = carregar_corpus(args.corpus)
+    classificadores = [
+        ("palavras-chave (regex)", ClassificadorIntencoes()),
+        ("modelo fp32", neural),
+        ("modelo int8", neural.quantizar()),
+        ("modelo TorchScript", script),
+    ]
+    print(f"\n{len(frases)} frases rotuladas em {args.corpus}\n")
+    print(
+        f"{'classificador':<24} {'acurácia':>9} {'p50/frase':>11} {'p99/frase':>11} "
+        f"{'lote (frases/s)':>16}"
+    )
+    for nome, classificador in classificadores:
+        previstos = classificador.classificar_lote(frases)
+        acuracia = sum(p == r for p, r in zip(previstos, rotulos)) / len(rotulos)
+        latencias = medir_latencias(classificador.classificar, frases, args.repeticoes)
+        percentis = statistics.quantiles(latencias, n=100)
+        vazao = medir_vazao_em_lote(
+            classificador.classificar_lote, frases, args.repeticoes
+        )
+        print(
+            f"{nome:<24} {acuracia:9.1%} {percentis[49] * 1e6:9.1f}µs "
+            f"{percentis[98] * 1e6:9.1f}µs {vazao:16,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
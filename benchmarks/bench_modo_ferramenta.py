@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+
+from benchmarks.llm_falso import ClienteLLMFalso
+from src.agent.pipeline_turno import SessaoChat, processar_turno_async
+from src.database.repositorio_filmes import RepositorioFilmes, definir_repositorio
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+from src.llm.cache_respostas import CacheRespostas
+from src.llm.cliente_llm import redefinir_cliente_llm
+from src.llm.llm_utils import redefinir_cache_respostas
+from src.nlp.nlp_utils import recarregar_automato_titulos
+
+# (tipo de pergunta, pergunta, título que a LLM falsa extrai / pede à ferramenta)
+PERGUNTAS = [
+    ("título do catálogo", "Quem dirigiu Matrix?", None),
+    ("saudação", "Olá, tudo bem?", None),
+    ("fora do catálogo", "Me fale sobre Nosferatu", "Nosferatu"),
+    ("menção incerta", "me fale de up", "Up"),
+]
+
+# (nome exibido, modo do pipeline, especular)
+FLUXOS = [
+    ("duas chamadas", "duas_chamadas", False),
+    ("duas chamadas+especulação", "duas_chamadas", True),
+    ("ferramenta", "ferramenta", False),
+]
+
+
+async def medir(pergunta, modo, especular, repositorio, cliente, repeticoes):
+    """Executa o turno várias vezes e retorna (TTFT médio, total médio, chamadas/turno)."""
+    chamadas_antes = cliente.chamadas
+    ttfts, totais = [], []
+    for _ in range(repeticoes):
+        resultado = await processar_turno_async(
+            pergunta, SessaoChat(), repositorio, especular=especular, modo=modo
+        )
+        ttfts.append(resultado["tempo_primeiro_pedaco"])
+        totais.append(resultado["tempo_total"])
+    await asyncio.sleep(0)  # Deixa as tarefas canceladas terminarem.
+    chamadas = (cliente.chamadas - chamadas_antes) / repeticoes
+    return statistics.mean(ttfts), statistics.mean(totais), chamadas
+
+
+async def executar(args, repositorio):
+    """Compara os modos do pipeline para cada tipo de pergunta e imprime a tabela."""
+    cliente = ClienteLLMFalso(
+        args.latencia,
+        titulos_extraidos={p: t for _, p, t in PERGUNTAS if t},
+    )
+    redefinir_cliente_llm(cliente)
+    redefinir_cache_respostas(CacheRespostas(capacidade=0))
+
+    print(f"LLM falsa com {args.latencia * 1000:.0f}ms por chamada\n")
+    print(f"{'pergunta':<20} {'modo':<27} {'1º pedaço':>10} {'total':>10} chamadas")
+    for tipo, pergunta, _ in PERGUNTAS:
+        for nome, modo, especular in FLUXOS:
+            ttft, total, chamadas = await medir(
+                pergunta, modo, especular, repositorio, cliente, args.repeticoes
+            )
+            print(
+                f"{tipo:<20} {nome:<27} {ttft * 1000:8.1f}ms {total * 1000:8.1f}ms "
+                f"{chamadas:8.1f}"
+            )
+
+
+def main():
+    """Compara o fluxo de duas chamadas à LLM com o modo de chamada única com ferramenta."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--latencia", type=float, default=0.2)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_bd = os.path.join(diretorio, "filmes.db")
+        criar_tabela_filmes(caminho_bd)
+        popular_filmes_exemplo(caminho_bd)
+        repositorio = RepositorioFilmes(caminho_bd)
+        definir_repositorio(repositorio)  # Catálogo do autômato de títulos.
+        recarregar_automato_titulos()
+        try:
+            asyncio.run(executar(args, repositorio))
+        finally:
+            repositorio.fechar()
+            definir_repositorio(None)
+            recarregar_automato_titulos()
+            redefinir_cliente_llm()
+            redefinir_cache_respostas()
+
+
+if __name__ == "__main__":
+    main()
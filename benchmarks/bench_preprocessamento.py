@@ -0,0 +1,73 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from models_prototype.data_preprocessing import TextProcessor
+
+# Falas curtas no estilo das legendas do OpenSubtitles ('data/pt.txt').
+FALAS = [
+    "Olá, tudo bem?",
+    "Não sei... talvez amanhã.",
+    'Ele disse: "Corra!"',
+    "Onde você estava ontem à noite?",
+    "São 10 horas, precisamos ir.",
+    "- Vamos embora. - Espere!",
+    "Eu não acredito que você fez isso.",
+    "Obrigado, Sr. Silva.",
+]
+
+
+def gerar_legendas(caminho, num_linhas, semente=42):
+    """Escreve um arquivo sintético de legendas, uma fala por linha."""
+    aleatorio = random.Random(semente)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        for _ in range(num_linhas):
+            arquivo.write(" ".join(aleatorio.choices(FALAS, k=aleatorio.randint(1, 2))))
+            arquivo.write("\n")
+
+
+def medir(nome, funcao, num_linhas):
+    inicio = time.perf_counter()
+    tokens = funcao()
+    segundos = time.perf_counter() - inicio
+    print(
+        f"{nome:<22} {num_linhas / segundos:10.0f} linhas/s "
+        f"({len(tokens)} tokens em {segundos:.1f}s)"
+    )
+    return tokens
+
+
+def main():
+    """Compara o pré-processamento serial com o paralelo (em blocos de bytes)."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--arquivo", help="dataset real (ex: data/pt.txt)")
+    parser.add_argument("--linhas", type=int, default=200_000)
+    parser.add_argument("--processos", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    processador = TextProcessor(lang="portuguese")
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = args.arquivo
+        if caminho is None:
+            caminho = os.path.join(diretorio, "pt.txt")
+            gerar_legendas(caminho, args.linhas)
+
+        serial = medir(
+            "serial",
+            lambda: processador.load_and_preprocess_dataset(caminho, args.linhas),
+            args.linhas,
+        )
+        paralelo = medir(
+            f"paralelo ({args.processos} proc.)",
+            lambda: processador.load_and_preprocess_dataset(
+                caminho, args.linhas, num_workers=args.processos
+            ),
+            args.linhas,
+        )
+        print(f"mesmos tokens: {paralelo == serial}")
+
+
+if __name__ == "__main__":
+    main()
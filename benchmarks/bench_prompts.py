@@ -0,0 +1,66 @@
+import argparse
+
+from src.llm.prompts import (
+    INSTRUCAO_SISTEMA_EXTRACAO,
+    INSTRUCAO_SISTEMA_RESUMO,
+    montar_prompt_extracao,
+    montar_prompt_resumo,
+)
+
+INFO_MATRIX = (
+    "Matrix",
+    "Lana e Lilly Wachowski",
+    1999,
+    "Ficção Científica/Ação",
+    "Keanu Reeves",
+)
+
+CENARIOS = [
+    ("resposta com fatos do BD", INSTRUCAO_SISTEMA_RESUMO, "Quem dirigiu Matrix?"),
+    ("extração de título", INSTRUCAO_SISTEMA_EXTRACAO, "Quem dirigiu Matrix?"),
+]
+
+
+def estimar_tokens(texto):
+    """Estimativa grosseira (≈4 caracteres por token), usada sem acesso à API."""
+    return max(1, len(texto) // 4)
+
+
+def contar_tokens_na_api(texto):
+    """Conta os tokens com o tokenizador do próprio modelo (requer GOOGLE_API_KEY)."""
+    from src.llm.cliente_llm import obter_cliente_llm
+
+    return obter_cliente_llm().obter_modelo().count_tokens(texto).total_tokens
+
+
+def main():
+    """Tokens de entrada por requisição: prefixo fixo x parte variável do prompt."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--contar-na-api",
+        action="store_true",
+        help="Usa o count_tokens do Gemini em vez da estimativa local.",
+    )
+    args = parser.parse_args()
+    contar = contar_tokens_na_api if args.contar_na_api else estimar_tokens
+
+    print(f"{'cenário':<26} {'prefixo fixo':>13} {'variável':>9} {'sem cache':>10}")
+    for nome, instrucao, pergunta in CENARIOS:
+        if instrucao is INSTRUCAO_SISTEMA_RESUMO:
+            variavel = montar_prompt_resumo(pergunta, INFO_MATRIX)
+        else:
+            variavel = montar_prompt_extracao(pergunta)
+        fixo = contar(instrucao)
+        parte_variavel = contar(variavel)
+        print(f"{nome:<26} {fixo:>13} {parte_variavel:>9} {fixo + parte_variavel:>10}")
+    print(
+        "\nSem cache de contexto, cada requisição paga prefixo fixo + parte variável."
+        "\nCom GEMINI_CACHE_CONTEXTO=1 (e um prefixo acima do mínimo do modelo), o"
+        "\nprefixo é enviado uma vez e as requisições seguintes pagam a parte variável"
+        "\ncheia e o prefixo à tarifa de cache. Os tokens reais de cada chamada aparecem"
+        "\nno log INFO de 'src.llm.cliente_llm'."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from src.database.repositorio_filmes import SQL_BUSCA_POR_TITULO, RepositorioFilmes
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+
+TITULOS_CONSULTADOS = ["Matrix", "Origem", "Chefão", "Gladiador", "Inexistente"]
+
+
+def consulta_com_conexao_por_chamada(caminho_bd, titulo_filme):
+    """Reproduz o comportamento antigo: abre e fecha uma conexão a cada consulta."""
+    conn = sqlite3.connect(caminho_bd)
+    try:
+        return conn.execute(SQL_BUSCA_POR_TITULO, (f"%{titulo_filme}%",)).fetchone()
+    finally:
+        conn.close()
+
+
+def medir(funcao_consulta, num_threads, consultas_por_thread):
+    """
+    Executa 'funcao_consulta' em várias threads e coleta a latência de cada chamada.
+
+    Returns:
+        tuple: (lista de latências em segundos, tempo total em segundos)
+    """
+    latencias = []
+    trava = threading.Lock()
+
+    def trabalhador():
+        locais = []
+        for i in range(consultas_por_thread):
+            titulo = TITULOS_CONSULTADOS[i % len(TITULOS_CONSULTADOS)]
+            inicio = time.perf_counter()
+            funcao_consulta(titulo)
+            locais.append(time.perf_counter() - inicio)
+        with trava:
+            latencias.extend(locais)
+
+    threads = [threading.Thread(target=trabalhador) for _ in range(num_threads)]
+    inicio_total = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencias, time.perf_counter() - inicio_total
+
+
+def imprimir_resultado(nome, latencias, tempo_total):
+    """Imprime média, p50, p99 (em microssegundos) e vazão de um cenário."""
+    latencias = sorted(latencias)
+    p99 = latencias[int(len(latencias) * 0.99) - 1]
+    print(
+        f"{nome:<28} média={statistics.mean(latencias) * 1e6:8.1f}µs "
+        f"p50={statistics.median(latencias) * 1e6:8.1f}µs p99={p99 * 1e6:8.1f}µs "
+        f"vazão={len(latencias) / tempo_total:10.0f} consultas/s"
+    )
+
+
+def main():
+    """Compara a latência por consulta antes (conexão por chamada) e depois (pool)."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--consultas", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_bd = os.path.join(diretorio, "filmes.db")
+        criar_tabela_filmes(caminho_bd)
+        popular_filmes_exemplo(caminho_bd)
+
+        for num_threads in args.threads:
+            print(f"\n--- {num_threads} leitor(es) concorrente(s) ---")
+            latencias, total = medir(
+                lambda titulo: consulta_com_conexao_por_chamada(caminho_bd, titulo),
+                num_threads,
+                args.consultas,
+            )
+            imprimir_resultado("antes (connect por chamada)", latencias, total)
+
+            repositorio = RepositorioFilmes(caminho_bd, tamanho_pool=num_threads)
+            latencias, total = medir(
+                repositorio.buscar_por_titulo, num_threads, args.consultas
+            )
+            imprimir_resultado("depois (RepositorioFilmes)", latencias, total)
+            repositorio.fechar()
+
+
+if __name__ == "__main__":
+    main()
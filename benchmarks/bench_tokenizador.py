@@ -0,0 +1,49 @@
+import argparse
+import itertools
+import os
+import tempfile
+import time
+
+from benchmarks.bench_preprocessamento import gerar_legendas
+from models_prototype.data_preprocessing import TextProcessor
+
+
+def ler_linhas(caminho, num_linhas):
+    """As primeiras 'num_linhas' linhas do arquivo, sem as pontas em branco."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        return [linha.strip() for linha in itertools.islice(arquivo, num_linhas)]
+
+
+def medir(nome, funcao, linhas):
+    inicio = time.perf_counter()
+    resultado = funcao(linhas)
+    segundos = time.perf_counter() - inicio
+    print(f"{nome:<16} {len(linhas) / segundos:10.0f} linhas/s")
+    return resultado
+
+
+def main():
+    """Compara o 'word_tokenize' do NLTK com o tokenizador rápido por regex."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--arquivo", help="dataset real (ex: data/pt.txt)")
+    parser.add_argument("--linhas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = args.arquivo
+        if caminho is None:
+            caminho = os.path.join(diretorio, "pt.txt")
+            gerar_legendas(caminho, args.linhas)
+        linhas = ler_linhas(caminho, args.linhas)
+
+    nltk_completo = TextProcessor(tokenizer="nltk")
+    rapido = TextProcessor(tokenizer="regex")
+    esperado = medir("nltk", nltk_completo.preprocess_batch, linhas)
+    obtido = medir("regex", rapido.preprocess_batch, linhas)
+
+    iguais = sum(a == b for a, b in zip(obtido, esperado))
+    print(f"linhas iguais ao NLTK: {iguais}/{len(linhas)}")
+
+
+if __name__ == "__main__":
+    main()
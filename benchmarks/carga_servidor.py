@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.llm_falso import ClienteLLMFalso
+from src.database.repositorio_filmes import RepositorioFilmes, definir_repositorio
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+from src.llm.cache_respostas import CacheRespostas
+from src.llm.cliente_llm import redefinir_cliente_llm
+from src.llm.llm_utils import redefinir_cache_respostas
+from src.nlp.nlp_utils import recarregar_automato_titulos
+from src.servidor.servidor_chat import ServidorChat
+
+PERGUNTAS = [
+    "Quem dirigiu Matrix?",
+    "Me fale sobre O Poderoso Chefão",
+    "Qual o gênero de Gladiador?",
+    "Olá, tudo bem?",
+    "Quem é o protagonista de Cidade de Deus?",
+    "Me indique um filme triste",
+]
+
+
+async def enviar_pergunta(reader, writer, pergunta, id_sessao, stream=False):
+    """
+    Envia um POST /chat por uma conexão keep-alive.
+
+    Returns:
+        tuple: (JSON final da resposta, segundos até o primeiro pedaço do texto).
+    """
+    inicio = time.perf_counter()
+    corpo = json.dumps(
+        {"pergunta": pergunta, "sessao": id_sessao, "stream": stream}
+    ).encode("utf-8")
+    writer.write(
+        (
+            "POST /chat HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        + corpo
+    )
+    await writer.drain()
+
+    await reader.readline()  # Linha de status.
+    cabecalhos = {}
+    while True:
+        linha = await reader.readline()
+        if linha in (b"\r\n", b""):
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        cabecalhos[nome.strip().lower()] = valor.strip()
+
+    if cabecalhos.get("transfer-encoding") != "chunked":
+        dados = json.loads(await reader.readexactly(int(cabecalhos["content-length"])))
+        return dados, time.perf_counter() - inicio
+
+    # Resposta em pedaços (NDJSON): cada pedaço traz uma linha JSON.
+    tempo_primeiro_pedaco = None
+    dados = None
+    while True:
+        tamanho = int(await reader.readline(), 16)
+        if tamanho == 0:
+            await reader.readline()  # Linha em branco que fecha a resposta.
+            break
+        linha = json.loads(await reader.readexactly(tamanho))
+        await reader.readline()  # '\r\n' após o pedaço.
+        if "pedaco" in linha:
+            if tempo_primeiro_pedaco is None:
+                tempo_primeiro_pedaco = time.perf_counter() - inicio
+        else:
+            dados = linha
+    return dados, tempo_primeiro_pedaco
+
+
+async def usuario_virtual(porta, turnos, latencias, ttfts, indice, stream):
+    """Simula um usuário: uma conexão, uma sessão e 'turnos' perguntas seguidas."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    id_sessao = None
+    try:
+        for turno in range(turnos):
+            pergunta = PERGUNTAS[(indice + turno) % len(PERGUNTAS)]
+            inicio = time.perf_counter()
+            resposta, ttft = await enviar_pergunta(
+                reader, writer, pergunta, id_sessao, stream
+            )
+            latencias.append(time.perf_counter() - inicio)
+            ttfts.append(ttft)
+            id_sessao = resposta.get("sessao", id_sessao)
+    finally:
+        writer.close()
+
+
+async def executar_carga(args):
+    """Sobe o servidor no próprio processo, dispara os usuários e imprime as métricas."""
+    servidor_chat = ServidorChat("127.0.0.1", 0, max_turnos_simultaneos=args.max_turnos)
+    await servidor_chat.iniciar()
+
+    latencias = []
+    ttfts = []
+    inicio = time.perf_counter()
+    await asyncio.gather(
+        *(
+            usuario_virtual(
+                servidor_chat.porta, args.turnos, latencias, ttfts, i, args.stream
+            )
+            for i in range(args.usuarios)
+        )
+    )
+    tempo_total = time.perf_counter() - inicio
+    await servidor_chat.encerrar()
+
+    print(
+        f"{args.usuarios} usuários x {args.turnos} turnos "
+        f"(LLM falsa com {args.latencia * 1000:.0f}ms, "
+        f"máx. {args.max_turnos} turnos simultâneos, "
+        f"{'com' if args.stream else 'sem'} streaming)"
+    )
+    vazao = len(latencias) / tempo_total
+    print(f"vazão={vazao:8.1f} turnos/s total={tempo_total:6.2f}s")
+    imprimir_percentis("latência total", latencias)
+    imprimir_percentis("1º pedaço (TTFT)", ttfts)
+
+
+def imprimir_percentis(nome, tempos):
+    """Imprime p50 e p99 (em milissegundos) de uma lista de tempos em segundos."""
+    tempos = sorted(tempos)
+    p50 = tempos[len(tempos) // 2]
+    p99 = tempos[max(0, int(len(tempos) * 0.99) - 1)]
+    print(f"{nome:<18} p50={p50 * 1000:8.1f}ms p99={p99 * 1000:8.1f}ms")
+
+
+def main():
+    """Teste de carga do servidor de chat contra uma LLM falsa local."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--usuarios", type=int, default=100)
+    parser.add_argument("--turnos", type=int, default=5)
+    parser.add_argument("--max-turnos", type=int, default=64)
+    parser.add_argument(
+        "--latencia", type=float, default=0.2, help="Latência da LLM falsa (s)."
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Pede as respostas em streaming e mede o tempo até o primeiro pedaço.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Mantém o cache de respostas ligado (por padrão, toda pergunta vai à LLM).",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_bd = os.path.join(diretorio, "filmes.db")
+        criar_tabela_filmes(caminho_bd)
+        popular_filmes_exemplo(caminho_bd)
+
+        repositorio = RepositorioFilmes(caminho_bd)
+        definir_repositorio(repositorio)
+        recarregar_automato_titulos()
+        redefinir_cliente_llm(ClienteLLMFalso(args.latencia))
+        if not args.cache:
+            redefinir_cache_respostas(CacheRespostas(capacidade=0))
+        try:
+            asyncio.run(executar_carga(args))
+        finally:
+            repositorio.fechar()
+
+
+if __name__ == "__main__":
+    main()
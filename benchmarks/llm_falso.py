@@ -0,0 +1,123 @@
+import asyncio
+import contextlib
+import re
+import time
+
+# Última frase de um prompt de extração de título ("Frase: '...'").
+_PADRAO_FRASE_EXTRACAO = re.compile(r"Frase: '(.*)'\nTítulo:\s*$")
+
+# Pergunta dentro de um prompt de resposta ("Pergunta do usuário: '...'").
+_PADRAO_PERGUNTA = re.compile(r"Pergunta do usuário: '(.*)'\n")
+
+RESPOSTA_PADRAO = (
+    "Ah, uma pergunta digna de uma estreia em tela grande! "
+    "Deixe-me contar essa história com a devida pompa."
+)
+
+
+class ClienteLLMFalso:
+    """
+    Substituto local do ClienteLLM para benchmarks: não acessa a rede e simula a
+    latência da API com um 'sleep', para medir só o custo do próprio chatbot.
+
+    Prompts de extração de título recebem o título de 'titulos_extraidos' para a
+    pergunta (ou 'NENHUM'); os demais recebem uma resposta fixa no estilo do chatbot.
+    No modo com ferramentas, a "LLM" chama a primeira ferramenta quando a pergunta
+    está em 'titulos_extraidos', o que custa uma rodada (chamada) a mais.
+    No modo streaming, o primeiro pedaço chega após 'fracao_primeiro_pedaco' da
+    latência e o restante é distribuído entre os demais.
+    """
+
+    def __init__(
+        self,
+        latencia=0.2,
+        modelo="llm-falso",
+        pedacos=8,
+        fracao_primeiro_pedaco=0.25,
+        titulos_extraidos=None,
+    ):
+        """
+        Args:
+            latencia (float): Segundos que cada chamada "demora" (até o fim do texto).
+            modelo (str): Nome do modelo (entra na chave do cache de respostas).
+            pedacos (int): Em quantos pedaços o texto é entregue no modo streaming.
+            fracao_primeiro_pedaco (float): Fração da latência até o primeiro pedaço.
+            titulos_extraidos (dict, optional): Pergunta -> título que a "LLM" extrai.
+        """
+        self.latencia = latencia
+        self.modelo = modelo
+        self.pedacos = pedacos
+        self.fracao_primeiro_pedaco = fracao_primeiro_pedaco
+        self.titulos_extraidos = titulos_extraidos or {}
+        self.chamadas = 0
+        self.simultaneas = 0
+        self.max_simultaneas = (
+            0  # Maior número de chamadas em andamento ao mesmo tempo.
+        )
+
+    @property
+    def configurado(self):
+        return True
+
+    @contextlib.contextmanager
+    def _em_andamento(self):
+        """Conta as chamadas em andamento (mostra se as etapas se sobrepuseram)."""
+        self.simultaneas += 1
+        self.max_simultaneas = max(self.max_simultaneas, self.simultaneas)
+        try:
+            yield
+        finally:
+            self.simultaneas -= 1
+
+    def _responder(self, prompt):
+        self.chamadas += 1
+        extracao = _PADRAO_FRASE_EXTRACAO.search(prompt)
+        if extracao:
+            return self.titulos_extraidos.get(extracao.group(1), "NENHUM")
+        return RESPOSTA_PADRAO
+
+    def gerar(self, prompt, system_instruction=None):
+        time.sleep(self.latencia)
+        return self._responder(prompt)
+
+    async def gerar_async(self, prompt, system_instruction=None):
+        with self._em_andamento():
+            await asyncio.sleep(self.latencia)
+            return self._responder(prompt)
+
+    def _dividir(self, prompt):
+        """Divide a resposta em pedaços e calcula a espera antes de cada um."""
+        texto = self._responder(prompt)
+        tamanho = -(-len(texto) // self.pedacos)  # Divisão arredondada para cima.
+        partes = [texto[i : i + tamanho] for i in range(0, len(texto), tamanho)]
+        primeira_espera = self.latencia * self.fracao_primeiro_pedaco
+        demais = (self.latencia - primeira_espera) / max(1, len(partes) - 1)
+        return [
+            (primeira_espera if i == 0 else demais, parte)
+            for i, parte in enumerate(partes)
+        ]
+
+    def gerar_stream(self, prompt, system_instruction=None):
+        for espera, parte in self._dividir(prompt):
+            time.sleep(espera)
+            yield parte
+
+    async def gerar_stream_async(self, prompt, system_instruction=None):
+        with self._em_andamento():
+            for espera, parte in self._dividir(prompt):
+                await asyncio.sleep(espera)
+                yield parte
+
+    async def gerar_stream_com_ferramentas_async(
+        self, prompt, ferramentas, funcoes, system_instruction=None, max_rodadas=3
+    ):
+        pergunta = _PADRAO_PERGUNTA.search(prompt)
+        titulo = pergunta and self.titulos_extraidos.get(pergunta.group(1))
+        if titulo:
+            # 1ª rodada: o modelo só pede a ferramenta; a resposta vem na 2ª.
+            await asyncio.sleep(self.latencia * self.fracao_primeiro_pedaco)
+            self.chamadas += 1
+            nome = ferramentas[0]["name"]
+            await asyncio.to_thread(funcoes[nome], title=titulo)
+        async for parte in self.gerar_stream_async(prompt, system_instruction):
+            yield parte
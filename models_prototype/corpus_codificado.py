@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import time
+from array import array
+
+import numpy as np
+
+from models_prototype.data_preprocessing import TOKENIZADORES, TextProcessor
+from models_prototype.modelo_intencoes import TOKEN_DESCONHECIDO, TOKEN_PAD
+
+# Índices fixos dos tokens especiais (os mesmos do classificador de intenções).
+ID_PAD = 0
+ID_DESCONHECIDO = 1
+
+# Itens acumulados na memória antes de cada escrita nos arquivos temporários.
+ITENS_POR_ESCRITA = 1 << 20
+
+# Itens lidos por vez dos arquivos temporários (contagem e conversão final).
+ITENS_POR_BLOCO = 1 << 22
+
+
+def _abrir_bruto(caminho, dtype):
+    """Abre um arquivo binário sem cabeçalho como memmap (vazio se o arquivo for)."""
+    if os.path.getsize(caminho) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(caminho, dtype=dtype, mode="r")
+
+
+def _blocos(vetor):
+    """Percorre um vetor (normalmente um memmap) em blocos de ITENS_POR_BLOCO."""
+    for inicio in range(0, len(vetor), ITENS_POR_BLOCO):
+        yield inicio, vetor[inicio : inicio + ITENS_POR_BLOCO]
+
+
+def _gravar_temporarios(linhas, caminho_tokens, caminho_fins):
+    """
+    Primeira (e única) passada pelas linhas tokenizadas.
+
+    Cada palavra nova recebe um índice provisório, na ordem em que aparece; os
+    índices vão para um arquivo uint32 e o fim de cada linha para um uint64. Na
+    memória ficam só o dicionário de palavras e os buffers da próxima escrita.
+
+    Returns:
+        list: As palavras, na ordem dos índices provisórios.
+    """
+    provisorios = {}
+    tokens = array("I")
+    fins = array("Q")
+    total = 0
+    with open(caminho_tokens, "wb") as arquivo_tokens, open(
+        caminho_fins, "wb"
+    ) as arquivo_fins:
+        for tokens_linha in linhas:
+            tokens.extend(
+                [provisorios.setdefault(t, len(provisorios)) for t in tokens_linha]
+            )
+            total += len(tokens_linha)
+            fins.append(total)
+            if len(tokens) >= ITENS_POR_ESCRITA:
+                tokens.tofile(arquivo_tokens)
+                tokens = array("I")
+            if len(fins) >= ITENS_POR_ESCRITA:
+                fins.tofile(arquivo_fins)
+                fins = array("Q")
+        tokens.tofile(arquivo_tokens)
+        fins.tofile(arquivo_fins)
+    return list(provisorios)
+
+
+class CorpusCodificado:
+    """
+    Corpus de treino codificado em índices inteiros e lido por memória mapeada.
+
+    Em vez de uma lista Python de strings (dezenas de bytes por token), cada token
+    ocupa 4 bytes num arquivo uint32 e as linhas são só deslocamentos nesse arquivo.
+    Carregar o corpus é instantâneo e só as páginas lidas vão para a memória.
+
+    Arquivos gravados a partir de 'caminho_base':
+        <base>.tokens.npy: uint32 [tokens], os índices de todas as linhas em sequência.
+        <base>.linhas.npy: uint64 [linhas + 1], onde cada linha começa em 'tokens'.
+        <base>.vocab.json: As palavras (na ordem dos índices) e suas contagens.
+    """
+
+    def __init__(self, tokens, inicios, vocabulario, contagens):
+        """
+        Args:
+            tokens (numpy.ndarray): Índices de todos os tokens (normalmente um memmap).
+            inicios (numpy.ndarray): Início de cada linha em 'tokens' (e o fim da
+                                     última).
+            vocabulario (list): As palavras; a posição é o índice ('<pad>' é 0 e
+                                '<unk>' é 1).
+            contagens (list): Ocorrências de cada palavra no corpus.
+        """
+        self.tokens = tokens
+        self.inicios = inicios
+        self.vocabulario = vocabulario
+        self.contagens = contagens
+        self.indices = {palavra: i for i, palavra in enumerate(vocabulario)}
+
+    def __len__(self):
+        return len(self.inicios) - 1
+
+    def linha(self, posicao):
+        """Os índices dos tokens de uma linha (uma fatia do memmap, sem cópia)."""
+        return self.tokens[self.inicios[posicao] : self.inicios[posicao + 1]]
+
+    def codificar(self, palavras):
+        """Converte palavras em índices do vocabulário ('<unk>' para as de fora)."""
+        return [self.indices.get(palavra, ID_DESCONHECIDO) for palavra in palavras]
+
+    def decodificar(self, indices):
+        """Converte índices de volta em palavras."""
+        return [self.vocabulario[int(i)] for i in indices]
+
+    @classmethod
+    def construir(cls, linhas, caminho_base, min_contagem=2, max_vocabulario=None):
+        """
+        Codifica um fluxo de linhas tokenizadas e grava o corpus em disco.
+
+        As linhas são lidas uma única vez: os tokens vão para um arquivo temporário
+        com índices provisórios, as contagens saem dele em blocos, e o arquivo final
+        é regravado com os índices do vocabulário. A memória usada depende do
+        vocabulário, não do tamanho do corpus.
+
+        Args:
+            linhas (iterable): Listas de tokens, uma por linha (ex: o gerador
+                               'TextProcessor.iter_preprocessed_lines').
+            caminho_base (str): Prefixo dos arquivos (ex: 'data/corpus').
+            min_contagem (int): Palavras mais raras que isso viram '<unk>'.
+            max_vocabulario (int, optional): Tamanho máximo do vocabulário, com
+                                             '<pad>' e '<unk>'; ficam as palavras
+                                             mais frequentes.
+
+        Returns:
+            CorpusCodificado: O corpus recém-gravado, aberto por memória mapeada.
+        """
+        caminho_provisorio = f"{caminho_base}.tokens.tmp"
+        caminho_fins = f"{caminho_base}.linhas.tmp"
+        palavras = _gravar_temporarios(linhas, caminho_provisorio, caminho_fins)
+        provisorios = _abrir_bruto(caminho_provisorio, np.uint32)
+        fins = _abrir_bruto(caminho_fins, np.uint64)
+
+        contagens = np.zeros(len(palavras), dtype=np.int64)
+        for _, bloco in _blocos(provisorios):
+            contagens += np.bincount(bloco, minlength=len(palavras))
+
+        # Mais frequentes primeiro (empates em ordem alfabética, para ser reproduzível).
+        ordem = sorted(range(len(palavras)), key=lambda i: (-contagens[i], palavras[i]))
+        mantidas = [i for i in ordem if contagens[i] >= min_contagem]
+        if max_vocabulario is not None:
+            mantidas = mantidas[: max(max_vocabulario - 2, 0)]
+        novos_indices = np.full(len(palavras), ID_DESCONHECIDO, dtype=np.uint32)
+        novos_indices[mantidas] = np.arange(2, len(mantidas) + 2, dtype=np.uint32)
+
+        tokens = np.lib.format.open_memmap(
+            f"{caminho_base}.tokens.npy",
+            mode="w+",
+            dtype=np.uint32,
+            shape=(len(provisorios),),
+        )
+        for inicio, bloco in _blocos(provisorios):
+            tokens[inicio : inicio + len(bloco)] = novos_indices[bloco]
+        tokens.flush()
+        inicios = np.lib.format.open_memmap(
+            f"{caminho_base}.linhas.npy",
+            mode="w+",
+            dtype=np.uint64,
+            shape=(len(fins) + 1,),
+        )
+        inicios[0] = 0
+        for inicio, bloco in _blocos(fins):
+            inicios[inicio + 1 : inicio + len(bloco) + 1] = bloco
+        inicios.flush()
+
+        desconhecidas = int(contagens.sum() - contagens[mantidas].sum())
+        dados = {
+            "vocabulario": [TOKEN_PAD, TOKEN_DESCONHECIDO]
+            + [palavras[i] for i in mantidas],
+            "contagens": [0, desconhecidas] + [int(contagens[i]) for i in mantidas],
+            "min_contagem": min_contagem,
+        }
+        with open(f"{caminho_base}.vocab.json", "w", encoding="utf-8") as arquivo:
+            json.dump(dados, arquivo, ensure_ascii=False)
+
+        # Fecha os memmaps antes de apagar os temporários e reabrir para leitura.
+        del tokens, inicios, provisorios, fins
+        os.remove(caminho_provisorio)
+        os.remove(caminho_fins)
+        return cls.carregar(caminho_base)
+
+    @classmethod
+    def carregar(cls, caminho_base):
+        """
+        Abre um corpus gravado por 'construir' (tokens e linhas por memória mapeada).
+
+        Args:
+            caminho_base (str): Prefixo dos arquivos.
+
+        Returns:
+            CorpusCodificado: O corpus pronto para leitura.
+
+        Raises:
+            OSError: Se os arquivos do corpus não existirem.
+        """
+        tokens = np.load(f"{caminho_base}.tokens.npy", mmap_mode="r")
+        inicios = np.load(f"{caminho_base}.linhas.npy", mmap_mode="r")
+        with open(f"{caminho_base}.vocab.json", encoding="utf-8") as arquivo:
+            dados = json.load(arquivo)
+        return cls(tokens, inicios, dados["vocabulario"], dados["contagens"])
+
+
+def main():
+    """Tokeniza o dataset e grava o corpus codificado (uint32 + deslocamentos)."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--arquivo", default="data/pt.txt")
+    parser.add_argument("--saida", default="data/corpus")
+    parser.add_argument("--min-contagem", type=int, default=2)
+    parser.add_argument("--max-vocabulario", type=int, default=50_000)
+    parser.add_argument("--max-linhas", type=int, help="Padrão: o arquivo inteiro.")
+    parser.add_argument("--processos", type=int, default=os.cpu_count())
+    parser.add_argument("--tokenizador", choices=TOKENIZADORES, default="regex")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.arquivo):
+        print(f"ERRO: O arquivo do dataset '{args.arquivo}' não foi encontrado.")
+        return
+    processador = TextProcessor(tokenizer=args.tokenizador)
+    linhas = processador.iter_preprocessed_lines(
+        args.arquivo, args.max_linhas, args.processos, show_progress=True
+    )
+    os.makedirs(os.path.dirname(args.saida) or ".", exist_ok=True)
+    inicio = time.perf_counter()
+    corpus = CorpusCodificado.construir(
+        linhas, args.saida, args.min_contagem, args.max_vocabulario
+    )
+    segundos = time.perf_counter() - inicio
+
+    num_tokens = len(corpus.tokens)
+    taxa_desconhecidas = corpus.contagens[ID_DESCONHECIDO] / max(num_tokens, 1)
+    tamanho_bytes = sum(
+        os.path.getsize(f"{args.saida}{sufixo}")
+        for sufixo in (".tokens.npy", ".linhas.npy", ".vocab.json")
+    )
+    tamanho_mb = tamanho_bytes / 2**20
+    print(
+        f"{len(corpus)} linhas, {num_tokens} tokens e {len(corpus.vocabulario)} "
+        f"palavras no vocabulário ({taxa_desconhecidas:.2%} viraram '<unk>')."
+    )
+    print(f"Corpus gravado em {args.saida}.* ({tamanho_mb:.1f} MB) em {segundos:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
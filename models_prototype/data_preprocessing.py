@@ -1,166 +1,402 @@
-import os  # Importa o módulo 'os' para interagir com o sistema operacional, como verificar a existência de arquivos.
-import sys  # Importa o módulo 'sys' para funções relacionadas ao sistema, como sair do script em caso de erro.
-
-import nltk  # Importa a biblioteca Natural Language Toolkit, essencial para processamento de linguagem natural.
-from nltk.tokenize import (
-    word_tokenize,
-)  # Importa a função específica para dividir texto em palavras (tokenização).
-
-
-class TextProcessor:
-    """
-    Classe para encapsular e gerenciar o processo de pré-processamento de dados textuais.
-
-    Esta classe organiza as etapas de limpeza e preparação de texto, que são
-    fundamentais antes de alimentar os dados para modelos de Machine Learning ou IA.
-    """
-
-    def __init__(self, lang="portuguese"):
-        """
-        Inicializa o processador de texto, garantindo que os recursos NLTK necessários estejam disponíveis.
-
-        Args:
-            lang (str): Idioma para o processamento, 'portuguese' por padrão.
-        """
-        self.lang = lang
-        # Verifica se os modelos de tokenização do NLTK ('punkt') para o idioma especificado já estão baixados.
-        try:
-            nltk.data.find(f"tokenizers/punkt/{lang}.pickle")
-        except LookupError:
-            # Se não encontrar, informa e tenta baixar os recursos automaticamente.
-            print(f"Recursos NLTK para '{lang}' não encontrados. Baixando 'punkt'...")
-            # 'quiet=True' evita que uma janela pop-up de download apareça se o recurso já estiver lá.
-            nltk.download("punkt", quiet=True)
-
-    def preprocess(self, text):
-        """
-        Aplica as etapas de pré-processamento básicas a uma única string de texto.
-
-        As etapas incluem:
-        1. Tokenização: Divide a string em palavras (tokens).
-        2. Lowercasing: Converte todas as palavras para minúsculas.
-        3. Filtragem: Remove tokens que não são puramente alfabéticos (ex: pontuações, números soltos).
-
-        Args:
-            text (str): A string de texto a ser pré-processada.
-
-        Returns:
-            list: Uma lista de tokens (palavras) limpos e em minúsculas.
-        """
-        # Utiliza o tokenizador específico para o idioma para lidar com nuances (ex: contrações).
-        tokens = word_tokenize(text, language=self.lang)
-
-        # List comprehension para aplicar lowercasing e filtrar.
-        # 'word.isalpha()' verifica se todos os caracteres na palavra são letras.
-        processed_tokens = [word.lower() for word in tokens if word.isalpha()]
-        return processed_tokens
-
-    def load_and_preprocess_dataset(self, file_path, max_lines=None):
-        """
-        Carrega linhas de um arquivo de dataset e aplica o pré-processamento.
-
-        Projetado para lidar com datasets grandes, processando-os linha por linha
-        e permitindo um limite de linhas para demonstrações.
-
-        Args:
-            file_path (str): Caminho completo para o arquivo do dataset (ex: 'pt.txt').
-            max_lines (int, optional): Número máximo de linhas a processar.
-                                        Se None, processa todas as linhas.
-                                        Útil para demonstrações com datasets muito grandes.
-
-        Returns:
-            list: Uma lista consolidada de todos os tokens processados do dataset.
-        """
-        # Verifica se o arquivo existe antes de tentar lê-lo.
-        if not os.path.exists(file_path):
-            # Imprime um erro para a saída padrão de erro (sys.stderr) e encerra o script.
-            print(
-                f"ERRO: O arquivo do dataset '{file_path}' não foi encontrado.",
-                file=sys.stderr,
-            )
-            print(
-                "Por favor, certifique-se de que o caminho de 'data/pt.txt' está correto.",
-                file=sys.stderr,
-            )
-            sys.exit(1)  # Sai do script com um código de erro (indicando falha)
-
-        all_tokens = []  # Lista para armazenar todos os tokens de todas as linhas.
-        try:
-            # Abre o arquivo em modo de leitura ('r') com codificação UTF-8, essencial para textos com caracteres variados.
-            with open(file_path, "r", encoding="utf-8") as f:
-                # Itera sobre cada linha do arquivo, com um contador 'i'.
-                for i, line in enumerate(f):
-                    if (
-                        max_lines and i >= max_lines
-                    ):  # Verifica se o limite de linhas foi atingido.
-                        break  # Para a leitura se o limite for definido e alcançado.
-
-                    # Pré-processa a linha atual (removendo espaços extras nas pontas) e estende a lista geral.
-                    all_tokens.extend(self.preprocess(line.strip()))
-        except Exception as e:
-            # Captura qualquer exceção inesperada durante a leitura ou pré-processamento.
-            print(
-                f"ERRO: Falha grave ao ler ou pré-processar o arquivo '{file_path}': {e}",
-                file=sys.stderr,
-            )
-            sys.exit(1)  # Encerra o script com erro.
-
-        return all_tokens  # Retorna a lista final de todos os tokens pré-processados.
-
-
-def main():
-    """
-    Função principal que orquestra a execução do script de pré-processamento de dados.
-    Esta função simula a fase inicial de um pipeline de treinamento para um modelo de NLP.
-    """
-    print("--- Iniciando o Pré-processamento do Dataset (Fase de Treino) ---")
-
-    processor = TextProcessor(
-        lang="portuguese"
-    )  # Instancia o processador de texto, definindo o idioma.
-
-    dataset_file = (
-        "data/pt.txt"  # Define o nome do arquivo do dataset a ser processado.
-    )
-
-    # Chama a função para carregar e pré-processar o dataset.
-    # 'max_lines=1000' é usado para processar apenas uma amostra, ideal para demonstrações rápidas.
-    # Em um cenário de treinamento real, este valor seria muito maior ou nulo.
-    processed_data = processor.load_and_preprocess_dataset(dataset_file, max_lines=1000)
-
-    # Verifica se algum dado foi realmente processado.
-    if not processed_data:
-        print(
-            "\nNenhum dado foi processado. Verifique o arquivo do dataset ou o processo de leitura."
-        )
-        return  # Sai da função main se não houver dados.
-
-    # Exibe informações sobre os dados processados para validação.
-    print(f"\nTotal de tokens processados (amostra): {len(processed_data)}")
-    print("Primeiros 20 tokens processados:")
-    print(processed_data[:20])
-
-    print("\n--- Próximos Passos no Pipeline de Treinamento (Conceitualização) ---")
-    print(
-        "Com estes dados pré-processados, as próximas etapas cruciais para construir um modelo de IA seriam:"
-    )
-    print(
-        "1.  **Criação de Embeddings:** Converter palavras em vetores numéricos densos. Isso permite que modelos de ML/DL 'entendam' as palavras. Pode ser feito com técnicas como Word2Vec, GloVe, ou utilizando embeddings contextuais de modelos pré-treinados maiores (como BERT ou GPT) através da biblioteca HuggingFace Transformers."
-    )
-    print(
-        "2.  **Definição da Arquitetura do Modelo:** Projetar a estrutura da rede neural (utilizando frameworks como PyTorch ou TensorFlow). Para geração de diálogo ou chatbots, arquiteturas como Seq2Seq (Encoder-Decoder) com LSTMs ou mecanismos de atenção (Transformers) são comuns. Redes Neurais Convolucionais (CNNs) podem ser usadas nessas arquiteturas para extração de características de texto (ex: identificar padrões locais em frases)."
-    )
-    print(
-        "3.  **Treinamento do Modelo:** Alimentar a rede neural com os dados pré-processados para que ela aprenda a realizar a tarefa (ex: mapear perguntas a respostas, ou gerar respostas no estilo OpenSubtitles). Este processo é computacionalmente intensivo, requer grandes volumes de dados e poder computacional (GPUs)."
-    )
-    print(
-        "4.  **Avaliação e Ajuste Fino:** Testar o desempenho do modelo com métricas de NLP (ex: BLEU, ROUGE) e fazer ajustes finos para otimizar sua performance em cenários reais."
-    )
-    print(
-        "\nEste script serve como a base fundamental para a fase de preparação de dados de um modelo de Processamento de Linguagem Natural (NLP) mais completo, simulando o início de um pipeline de treinamento."
-    )
-    print("--- Pré-processamento Concluído ---")
-
-
-if __name__ == "__main__":
-    main()  # Inicia a execução do script chamando a função principal.
+import argparse  # Lê as opções de linha de comando (arquivo, limite, processos).
+import os  # Importa o módulo 'os' para interagir com o sistema operacional, como verificar a existência de arquivos.
+import re  # Expressões regulares do tokenizador rápido ('tokenizer="regex"').
+import sys  # Importa o módulo 'sys' para funções relacionadas ao sistema, como sair do script em caso de erro.
+import time  # Mede a vazão (linhas/s) do pré-processamento paralelo.
+from collections import deque  # Fila dos blocos em andamento, na ordem do arquivo.
+from concurrent.futures import (
+    ProcessPoolExecutor,
+)  # Pool de processos que tokeniza os blocos do arquivo em paralelo.
+
+import nltk  # Importa a biblioteca Natural Language Toolkit, essencial para processamento de linguagem natural.
+from nltk.tokenize import (
+    sent_tokenize,
+    word_tokenize,
+)  # Importa as funções que dividem o texto em frases e em palavras (tokenização).
+
+# Tokenizadores disponíveis: o 'word_tokenize' do NLTK ou o caminho rápido por regex.
+TOKENIZADORES = ("nltk", "regex")
+
+# O que o tokenizador Treebank do 'word_tokenize' sempre separa das palavras: espaços,
+# aspas, '?!;@#$%&*', parênteses e colchetes, travessões, '--', reticências, ':' e ','
+# (exceto antes de um dígito) e o ponto final da frase. Todo o resto (hífen, ponto
+# interno, dígitos, '/') fica grudado, e o token deixa de ser alfabético.
+_SEPARADORES = re.compile(
+    r"\s+"
+    r"|[«“‘„`»”’\"?!;@#$%&*\[\](){}<>\u2012-\u2015]"
+    r"|\.{2,}"
+    r"|--"
+    r"|[:,](?!\d)"
+    r"|(?<=[^.])\.(?=[\]\)}>\"»”’ ]*\s*$)"
+)
+
+# Casos raros em que o Treebank faz mais do que separar: apóstrofos (contrações como
+# "don't" -> "do", "n't"), ':' ou ',' seguidos de ':' ou ',' e palavras que ele parte
+# ao meio ("gonna" -> "gon", "na"). Nessas linhas, o caminho rápido usa o NLTK.
+_PRECISA_TREEBANK = re.compile(
+    r"'|[:,][:,]|(?i:\b(?:cannot|gimme|gonna|gotta|lemme|wanna)\b)"
+)
+
+# Um ponto isolado que não é o último da linha pode ser fim de frase (ou abreviação,
+# como 'Sr.'): quem decide é o 'punkt', como no 'word_tokenize'.
+_PONTO_INTERNO = re.compile(r"(?<!\.)\.(?!\.)(?![\]\)}>\"»”’ ]*\s*$)")
+
+# Tamanho (em bytes) de cada bloco do arquivo entregue a um processo do pool.
+TAMANHO_BLOCO_PADRAO = 4 * 1024 * 1024
+
+# Blocos em andamento por processo: limita a memória e mantém o pool ocupado.
+BLOCOS_POR_PROCESSO = 2
+
+# Processador usado por cada processo do pool (definido em '_iniciar_processo').
+_processador_do_processo = None
+
+
+def _tokens_alfabeticos(frase):
+    """Os tokens alfabéticos (em minúsculas) que o Treebank daria para uma frase."""
+    return [pedaco.lower() for pedaco in _SEPARADORES.split(frase) if pedaco.isalpha()]
+
+
+def tokenizar_regex(text, lang="portuguese"):
+    """
+    Caminho rápido equivalente a 'preprocess' com o 'word_tokenize' do NLTK.
+
+    Uma única regex separa os tokens como o Treebank do NLTK faria; como depois só
+    ficam os tokens alfabéticos, basta dividir nos separadores e filtrar. O 'punkt'
+    só é chamado quando há um ponto no meio da linha, e o NLTK inteiro só nos casos
+    raros de '_PRECISA_TREEBANK'.
+
+    Args:
+        text (str): A string de texto (uma linha).
+        lang (str): Idioma do 'punkt', usado só nas linhas com ponto interno.
+
+    Returns:
+        list: Os tokens alfabéticos, em minúsculas.
+    """
+    if _PRECISA_TREEBANK.search(text):
+        tokens = word_tokenize(text, language=lang)
+        return [token.lower() for token in tokens if token.isalpha()]
+    if _PONTO_INTERNO.search(text):
+        return [
+            token
+            for frase in sent_tokenize(text, language=lang)
+            for token in _tokens_alfabeticos(frase)
+        ]
+    return _tokens_alfabeticos(text)
+
+
+def dividir_em_blocos(file_path, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Divide um arquivo em intervalos de bytes [início, fim) que terminam em fim de linha.
+
+    Cada intervalo tem por volta de 'tamanho_bloco' bytes e é estendido até a próxima
+    quebra de linha, para nenhuma linha ficar dividida entre dois blocos.
+
+    Args:
+        file_path (str): Caminho do arquivo de texto.
+        tamanho_bloco (int): Tamanho aproximado de cada bloco, em bytes.
+
+    Yields:
+        tuple: (início, fim) de cada bloco, na ordem do arquivo.
+    """
+    tamanho_arquivo = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        inicio = 0
+        while inicio < tamanho_arquivo:
+            f.seek(inicio + tamanho_bloco)
+            f.readline()  # Avança até o início da próxima linha.
+            fim = min(f.tell(), tamanho_arquivo)
+            yield inicio, fim
+            inicio = fim
+
+
+def _ler_linhas_do_bloco(file_path, inicio, fim):
+    """Lê as linhas (sem a quebra de linha) de um intervalo de bytes do arquivo."""
+    with open(file_path, "rb") as f:
+        f.seek(inicio)
+        linhas = f.read(fim - inicio).decode("utf-8").split("\n")
+    if linhas[-1] == "":
+        linhas.pop()  # O bloco termina em '\n': não há uma linha vazia depois dele.
+    return linhas
+
+
+def _iniciar_processo(processador):
+    """Guarda, em cada processo do pool, o processador que vai tokenizar os blocos."""
+    global _processador_do_processo
+    _processador_do_processo = processador
+
+
+def _preprocessar_bloco(file_path, inicio, fim):
+    """Tokeniza um bloco do arquivo (executado num processo do pool)."""
+    linhas = [linha.strip() for linha in _ler_linhas_do_bloco(file_path, inicio, fim)]
+    return _processador_do_processo.preprocess_batch(linhas)
+
+
+class TextProcessor:
+    """
+    Classe para encapsular e gerenciar o processo de pré-processamento de dados textuais.
+
+    Esta classe organiza as etapas de limpeza e preparação de texto, que são
+    fundamentais antes de alimentar os dados para modelos de Machine Learning ou IA.
+    """
+
+    def __init__(self, lang="portuguese", tokenizer="nltk"):
+        """
+        Inicializa o processador de texto, garantindo que os recursos NLTK necessários estejam disponíveis.
+
+        Args:
+            lang (str): Idioma para o processamento, 'portuguese' por padrão.
+            tokenizer (str): 'nltk' (o 'word_tokenize' completo) ou 'regex' (caminho
+                             rápido com os mesmos tokens, ver 'tokenizar_regex').
+        """
+        if tokenizer not in TOKENIZADORES:
+            raise ValueError(
+                f"Tokenizador desconhecido: '{tokenizer}'. Use um de {TOKENIZADORES}."
+            )
+        self.lang = lang
+        self.tokenizer = tokenizer
+        # Verifica se os modelos de tokenização do NLTK ('punkt') para o idioma especificado já estão baixados.
+        try:
+            nltk.data.find(f"tokenizers/punkt/{lang}.pickle")
+        except LookupError:
+            # Se não encontrar, informa e tenta baixar os recursos automaticamente.
+            print(f"Recursos NLTK para '{lang}' não encontrados. Baixando 'punkt'...")
+            # 'quiet=True' evita que uma janela pop-up de download apareça se o recurso já estiver lá.
+            nltk.download("punkt", quiet=True)
+
+    def preprocess(self, text):
+        """
+        Aplica as etapas de pré-processamento básicas a uma única string de texto.
+
+        As etapas incluem:
+        1. Tokenização: Divide a string em palavras (tokens).
+        2. Lowercasing: Converte todas as palavras para minúsculas.
+        3. Filtragem: Remove tokens que não são puramente alfabéticos (ex: pontuações, números soltos).
+
+        Args:
+            text (str): A string de texto a ser pré-processada.
+
+        Returns:
+            list: Uma lista de tokens (palavras) limpos e em minúsculas.
+        """
+        if self.tokenizer == "regex":
+            return tokenizar_regex(text, self.lang)  # Mesmo resultado, bem mais rápido.
+
+        # Utiliza o tokenizador específico para o idioma para lidar com nuances (ex: contrações).
+        tokens = word_tokenize(text, language=self.lang)
+
+        # List comprehension para aplicar lowercasing e filtrar.
+        # 'word.isalpha()' verifica se todos os caracteres na palavra são letras.
+        processed_tokens = [word.lower() for word in tokens if word.isalpha()]
+        return processed_tokens
+
+    def preprocess_batch(self, texts):
+        """
+        Pré-processa uma lista de linhas (a unidade de trabalho do modo paralelo).
+
+        Args:
+            texts (list): As strings de texto a pré-processar.
+
+        Returns:
+            list: Uma lista de tokens por linha, na mesma ordem de 'texts'.
+        """
+        return [self.preprocess(text) for text in texts]
+
+    def iter_preprocessed_lines(
+        self,
+        file_path,
+        max_lines=None,
+        num_workers=None,
+        chunk_bytes=TAMANHO_BLOCO_PADRAO,
+        show_progress=False,
+    ):
+        """
+        Pré-processa um arquivo em paralelo, devolvendo os tokens linha a linha.
+
+        O arquivo é dividido em blocos de bytes (terminados em fim de linha) que são
+        tokenizados num pool de processos. Os resultados saem na ordem do arquivo, e
+        só 'BLOCOS_POR_PROCESSO' blocos por processo ficam em andamento: a memória
+        usada não depende do tamanho do arquivo.
+
+        Args:
+            file_path (str): Caminho do arquivo do dataset (ex: 'data/pt.txt').
+            max_lines (int, optional): Número máximo de linhas a processar.
+            num_workers (int, optional): Processos do pool (padrão: número de CPUs).
+            chunk_bytes (int): Tamanho aproximado de cada bloco, em bytes.
+            show_progress (bool): Se True, mostra o progresso e a vazão em linhas/s.
+
+        Yields:
+            list: Os tokens processados de cada linha, na ordem do arquivo.
+        """
+        num_workers = num_workers or os.cpu_count() or 1
+        tamanho_arquivo = os.path.getsize(file_path)
+        blocos = dividir_em_blocos(file_path, chunk_bytes)
+        em_andamento = deque()
+        linhas_processadas = 0
+        inicio_medicao = time.perf_counter()
+        with ProcessPoolExecutor(
+            num_workers, initializer=_iniciar_processo, initargs=(self,)
+        ) as pool:
+            try:
+                while True:
+                    # Mantém o pool cheio sem ler o arquivo inteiro adiantado.
+                    while len(em_andamento) < num_workers * BLOCOS_POR_PROCESSO:
+                        bloco = next(blocos, None)
+                        if bloco is None:
+                            break
+                        futuro = pool.submit(_preprocessar_bloco, file_path, *bloco)
+                        em_andamento.append((bloco[1], futuro))
+                    if not em_andamento:
+                        break
+                    fim_bloco, futuro = em_andamento.popleft()
+                    for tokens in futuro.result():
+                        if max_lines and linhas_processadas >= max_lines:
+                            return
+                        linhas_processadas += 1
+                        yield tokens
+                    if show_progress:
+                        segundos = max(time.perf_counter() - inicio_medicao, 1e-9)
+                        print(
+                            f"\r{fim_bloco / max(tamanho_arquivo, 1):6.1%} do arquivo, "
+                            f"{linhas_processadas} linhas "
+                            f"({linhas_processadas / segundos:.0f} linhas/s)",
+                            end="",
+                            file=sys.stderr,
+                        )
+            finally:
+                # Sai cedo (limite de linhas ou erro): descarta os blocos pendentes.
+                for _, futuro in em_andamento:
+                    futuro.cancel()
+                if show_progress:
+                    print(file=sys.stderr)
+
+    def load_and_preprocess_dataset(
+        self, file_path, max_lines=None, num_workers=1, chunk_bytes=TAMANHO_BLOCO_PADRAO
+    ):
+        """
+        Carrega linhas de um arquivo de dataset e aplica o pré-processamento.
+
+        Projetado para lidar com datasets grandes, processando-os linha por linha
+        e permitindo um limite de linhas para demonstrações.
+
+        Args:
+            file_path (str): Caminho completo para o arquivo do dataset (ex: 'pt.txt').
+            max_lines (int, optional): Número máximo de linhas a processar.
+                                        Se None, processa todas as linhas.
+                                        Útil para demonstrações com datasets muito grandes.
+            num_workers (int): Processos usados na tokenização. Com mais de um, o
+                                arquivo é processado em blocos por
+                                'iter_preprocessed_lines' (mesmo resultado).
+            chunk_bytes (int): Tamanho aproximado dos blocos do modo paralelo.
+
+        Returns:
+            list: Uma lista consolidada de todos os tokens processados do dataset.
+        """
+        # Verifica se o arquivo existe antes de tentar lê-lo.
+        if not os.path.exists(file_path):
+            # Imprime um erro para a saída padrão de erro (sys.stderr) e encerra o script.
+            print(
+                f"ERRO: O arquivo do dataset '{file_path}' não foi encontrado.",
+                file=sys.stderr,
+            )
+            print(
+                "Por favor, certifique-se de que o caminho de 'data/pt.txt' está correto.",
+                file=sys.stderr,
+            )
+            sys.exit(1)  # Sai do script com um código de erro (indicando falha)
+
+        all_tokens = []  # Lista para armazenar todos os tokens de todas as linhas.
+        try:
+            if num_workers > 1:
+                # Modo paralelo: blocos do arquivo tokenizados num pool de processos.
+                for tokens in self.iter_preprocessed_lines(
+                    file_path, max_lines, num_workers, chunk_bytes
+                ):
+                    all_tokens.extend(tokens)
+                return all_tokens
+
+            # Abre o arquivo em modo de leitura ('r') com codificação UTF-8, essencial para textos com caracteres variados.
+            with open(file_path, "r", encoding="utf-8") as f:
+                # Itera sobre cada linha do arquivo, com um contador 'i'.
+                for i, line in enumerate(f):
+                    if (
+                        max_lines and i >= max_lines
+                    ):  # Verifica se o limite de linhas foi atingido.
+                        break  # Para a leitura se o limite for definido e alcançado.
+
+                    # Pré-processa a linha atual (removendo espaços extras nas pontas) e estende a lista geral.
+                    all_tokens.extend(self.preprocess(line.strip()))
+        except Exception as e:
+            # Captura qualquer exceção inesperada durante a leitura ou pré-processamento.
+            print(
+                f"ERRO: Falha grave ao ler ou pré-processar o arquivo '{file_path}': {e}",
+                file=sys.stderr,
+            )
+            sys.exit(1)  # Encerra o script com erro.
+
+        return all_tokens  # Retorna a lista final de todos os tokens pré-processados.
+
+
+def main():
+    """
+    Função principal que orquestra a execução do script de pré-processamento de dados.
+    Esta função simula a fase inicial de um pipeline de treinamento para um modelo de NLP.
+    """
+    parser = argparse.ArgumentParser(description="Pré-processa o dataset de treino.")
+    parser.add_argument("--arquivo", default="data/pt.txt")
+    parser.add_argument("--max-linhas", type=int, default=1000)
+    parser.add_argument("--processos", type=int, default=1)
+    parser.add_argument("--tokenizador", choices=TOKENIZADORES, default="nltk")
+    args = parser.parse_args()
+
+    print("--- Iniciando o Pré-processamento do Dataset (Fase de Treino) ---")
+
+    processor = TextProcessor(
+        lang="portuguese", tokenizer=args.tokenizador
+    )  # Instancia o processador de texto, definindo o idioma e o tokenizador.
+
+    dataset_file = args.arquivo  # Define o nome do arquivo do dataset a ser processado.
+
+    # Chama a função para carregar e pré-processar o dataset.
+    # '--max-linhas 1000' (padrão) processa só uma amostra, ideal para demonstrações.
+    # Em um cenário de treinamento real, este valor seria muito maior ou nulo (0),
+    # com '--processos' dividindo o arquivo entre vários processos.
+    processed_data = processor.load_and_preprocess_dataset(
+        dataset_file, max_lines=args.max_linhas or None, num_workers=args.processos
+    )
+
+    # Verifica se algum dado foi realmente processado.
+    if not processed_data:
+        print(
+            "\nNenhum dado foi processado. Verifique o arquivo do dataset ou o processo de leitura."
+        )
+        return  # Sai da função main se não houver dados.
+
+    # Exibe informações sobre os dados processados para validação.
+    print(f"\nTotal de tokens processados (amostra): {len(processed_data)}")
+    print("Primeiros 20 tokens processados:")
+    print(processed_data[:20])
+
+    print("\n--- Próximos Passos no Pipeline de Treinamento (Conceitualização) ---")
+    print(
+        "Com estes dados pré-processados, as próximas etapas cruciais para construir um modelo de IA seriam:"
+    )
+    print(
+        "1.  **Criação de Embeddings:** Converter palavras em vetores numéricos densos. Isso permite que modelos de ML/DL 'entendam' as palavras. Pode ser feito com técnicas como Word2Vec, GloVe, ou utilizando embeddings contextuais de modelos pré-treinados maiores (como BERT ou GPT) através da biblioteca HuggingFace Transformers."
+    )
+    print(
+        "2.  **Definição da Arquitetura do Modelo:** Projetar a estrutura da rede neural (utilizando frameworks como PyTorch ou TensorFlow). Para geração de diálogo ou chatbots, arquiteturas como Seq2Seq (Encoder-Decoder) com LSTMs ou mecanismos de atenção (Transformers) são comuns. Redes Neurais Convolucionais (CNNs) podem ser usadas nessas arquiteturas para extração de características de texto (ex: identificar padrões locais em frases)."
+    )
+    print(
+        "3.  **Treinamento do Modelo:** Alimentar a rede neural com os dados pré-processados para que ela aprenda a realizar a tarefa (ex: mapear perguntas a respostas, ou gerar respostas no estilo OpenSubtitles). Este processo é computacionalmente intensivo, requer grandes volumes de dados e poder computacional (GPUs)."
+    )
+    print(
+        "4.  **Avaliação e Ajuste Fino:** Testar o desempenho do modelo com métricas de NLP (ex: BLEU, ROUGE) e fazer ajustes finos para otimizar sua performance em cenários reais."
+    )
+    print(
+        "\nEste script serve como a base fundamental para a fase de preparação de dados de um modelo de Processamento de Linguagem Natural (NLP) mais completo, simulando o início de um pipeline de treinamento."
+    )
+    print("--- Pré-processamento Concluído ---")
+
+
+if __name__ == "__main__":
+    main()  # Inicia a execução do script chamando a função principal.
@@ -0,0 +1,437 @@
+import argparse
+import csv
+import json
+import os
+import random
+from collections import defaultdict
+
+import torch
+import torch.nn as nn
+
+from models_prototype.nlp_model_arch import SimpleNLGModel, empacotar
+from src.nlp.normalizacao import normalizar_texto
+
+# Intenções reconhecidas pelo chatbot (a ordem é a das saídas do modelo).
+INTENCOES = ("factual", "resumo_geral", "sair", "desconhecida")
+
+# Tokens especiais do vocabulário: preenchimento e palavra desconhecida.
+TOKEN_PAD = "<pad>"
+TOKEN_DESCONHECIDO = "<unk>"
+
+# Frases-modelo para gerar o dataset de treino ('{t}' é trocado por um título).
+MODELOS_FRASES = {
+    "factual": [
+        "quem dirigiu {t}",
+        "quem é o diretor de {t}",
+        "qual o diretor de {t}",
+        "qual o ano de {t}",
+        "em que ano saiu {t}",
+        "quando foi lançado {t}",
+        "qual o gênero de {t}",
+        "gênero de {t}",
+        "quem é o protagonista de {t}",
+        "quem estrela {t}",
+        "diretor de {t}",
+        "ano de lançamento de {t}",
+        "{t} é de que ano",
+        "quais filmes esse diretor fez além de {t}",
+        "onde se passa {t}",
+    ],
+    "resumo_geral": [
+        "me resuma {t}",
+        "resuma {t}",
+        "fale sobre {t}",
+        "me fale de {t}",
+        "me conte a história de {t}",
+        "o que é {t}",
+        "qual a moral de {t}",
+        "qual a história de {t}",
+        "quem são os personagens de {t}",
+        "fale do elenco de {t}",
+        "quais atores estão em {t}",
+        "sinopse de {t}",
+        "qual o enredo de {t}",
+        "do que se trata {t}",
+        "o que acontece em {t}",
+        "explique o final de {t}",
+    ],
+    "sair": [
+        "tchau",
+        "adeus",
+        "até logo",
+        "até mais",
+        "quero sair",
+        "preciso sair",
+        "encerrar a conversa",
+        "obrigado tchau",
+        "já vou indo tchau",
+        "pode encerrar",
+        "fui até a próxima",
+        "sair do chat",
+    ],
+    "desconhecida": [
+        "olá",
+        "oi tudo bem",
+        "bom dia",
+        "boa noite",
+        "obrigado",
+        "valeu",
+        "você gosta de cinema",
+        "me recomenda um filme",
+        "estou entediado",
+        "você é um robô",
+        "adoro pipoca",
+        "legal demais",
+        "que dia bonito",
+        "kkkk",
+        "{t}",
+        "gostei de {t}",
+    ],
+}
+
+# Títulos usados para preencher as frases-modelo.
+TITULOS_TREINO = (
+    "Matrix",
+    "O Poderoso Chefão",
+    "Titanic",
+    "Duna",
+    "Interestelar",
+    "Pulp Fiction",
+    "Cidade de Deus",
+    "Forrest Gump",
+    "Parasita",
+    "A Origem",
+    "Toy Story",
+    "O Rei Leão",
+    "Coringa",
+    "Gladiador",
+    "Central do Brasil",
+    "Up",
+)
+
+
+def tokenizar(frase):
+    """
+    Divide uma frase em palavras normalizadas (a mesma forma dos índices de títulos).
+
+    Args:
+        frase (str): A frase do usuário.
+
+    Returns:
+        list: Palavras sem acentos e minúsculas (ex: ['quem', 'dirigiu', 'matrix']).
+    """
+    return normalizar_texto(frase).split()
+
+
+def gerar_dataset_treino(titulos=TITULOS_TREINO, semente=42):
+    """
+    Gera frases rotuladas combinando as frases-modelo com títulos de filmes.
+
+    Args:
+        titulos (iterable): Títulos para o lugar de '{t}'.
+        semente (int): Semente do embaralhamento (dataset reproduzível).
+
+    Returns:
+        tuple: (frases, rótulos), duas listas do mesmo tamanho.
+    """
+    exemplos = set()
+    for intencao, modelos in MODELOS_FRASES.items():
+        for modelo in modelos:
+            for titulo in titulos if "{t}" in modelo else ("",):
+                exemplos.add((modelo.format(t=titulo), intencao))
+    exemplos = sorted(exemplos)
+    random.Random(semente).shuffle(exemplos)
+    return [frase for frase, _ in exemplos], [intencao for _, intencao in exemplos]
+
+
+def carregar_dataset_tsv(caminho):
+    """
+    Lê um dataset rotulado em TSV, com as colunas 'intencao' e 'frase'.
+
+    Args:
+        caminho (str): O arquivo TSV (ex: 'benchmarks/dados/intencoes_rotuladas.tsv').
+
+    Returns:
+        tuple: (frases, rótulos), duas listas do mesmo tamanho.
+    """
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        linhas = list(csv.DictReader(arquivo, delimiter="\t"))
+    return [linha["frase"] for linha in linhas], [linha["intencao"] for linha in linhas]
+
+
+def construir_vocabulario(frases, min_ocorrencias=1):
+    """
+    Monta o vocabulário (palavra -> índice) a partir das frases de treino.
+
+    Args:
+        frases (iterable): As frases de treino.
+        min_ocorrencias (int): Palavras mais raras que isso viram '<unk>'.
+
+    Returns:
+        dict: Palavra -> índice; '<pad>' é 0 e '<unk>' é 1.
+    """
+    contagem = defaultdict(int)
+    for frase in frases:
+        for palavra in tokenizar(frase):
+            contagem[palavra] += 1
+    vocabulario = {TOKEN_PAD: 0, TOKEN_DESCONHECIDO: 1}
+    for palavra in sorted(contagem):
+        if contagem[palavra] >= min_ocorrencias:
+            vocabulario[palavra] = len(vocabulario)
+    return vocabulario
+
+
+def codificar(frase, vocabulario):
+    """Converte uma frase em índices do vocabulário (nunca vazia: '<unk>' se preciso)."""
+    desconhecido = vocabulario[TOKEN_DESCONHECIDO]
+    indices = [vocabulario.get(palavra, desconhecido) for palavra in tokenizar(frase)]
+    return indices or [desconhecido]
+
+
+def treinar_modelo_intencoes(
+    frases,
+    rotulos,
+    embedding_dim=32,
+    hidden_dim=64,
+    epocas=30,
+    tamanho_lote=32,
+    taxa_aprendizado=0.01,
+    semente=42,
+):
+    """
+    Treina o SimpleNLGModel como classificador de intenções (bag of embeddings).
+
+    Args:
+        frases (list): Frases de treino.
+        rotulos (list): A intenção de cada frase (uma de INTENCOES).
+        embedding_dim (int): Dimensão dos embeddings.
+        hidden_dim (int): Neurônios da camada oculta.
+        epocas (int): Passadas completas pelo dataset.
+        tamanho_lote (int): Frases por passo de otimização.
+        taxa_aprendizado (float): Taxa do otimizador Adam.
+        semente (int): Semente do PyTorch e do embaralhamento.
+
+    Returns:
+        ClassificadorIntencoesNeural: O classificador treinado, pronto para inferência.
+    """
+    torch.manual_seed(semente)
+    aleatorio = random.Random(semente)
+    vocabulario = construir_vocabulario(frases)
+    sequencias = [codificar(frase, vocabulario) for frase in frases]
+    alvos = torch.tensor([INTENCOES.index(r) for r in rotulos], dtype=torch.long)
+
+    modelo = SimpleNLGModel(len(vocabulario), embedding_dim, hidden_dim, len(INTENCOES))
+    otimizador = torch.optim.Adam(modelo.parameters(), lr=taxa_aprendizado)
+    funcao_perda = nn.CrossEntropyLoss()
+
+    modelo.train()
+    ordem = list(range(len(sequencias)))
+    for epoca in range(epocas):
+        # Frases de tamanhos diferentes vão no mesmo lote, empacotadas (sem '<pad>').
+        aleatorio.shuffle(ordem)
+        perda_total = 0.0
+        for inicio in range(0, len(ordem), tamanho_lote):
+            posicoes = ordem[inicio : inicio + tamanho_lote]
+            indices, offsets = empacotar([sequencias[p] for p in posicoes])
+            otimizador.zero_grad()
+            perda = funcao_perda(modelo(indices, offsets), alvos[posicoes])
+            perda.backward()
+            otimizador.step()
+            perda_total += perda.item() * len(posicoes)
+        if (epoca + 1) % 10 == 0:
+            perda_media = perda_total / len(frases)
+            print(f"Época {epoca + 1}/{epocas}: perda média {perda_media:.4f}")
+
+    dimensoes = {"embedding_dim": embedding_dim, "hidden_dim": hidden_dim}
+    return ClassificadorIntencoesNeural(modelo, vocabulario, dimensoes)
+
+
+class ClassificadorIntencoesNeural:
+    """
+    Inferência em CPU do classificador de intenções treinado.
+
+    Tem a mesma interface do ClassificadorIntencoes por palavras-chave
+    ('classificar' e 'classificar_lote'), então o 'agent_core' pode usar qualquer um.
+    """
+
+    def __init__(self, modelo, vocabulario, dimensoes=None):
+        """
+        Args:
+            modelo (nn.Module): SimpleNLGModel treinado (ou sua versão quantizada/TorchScript).
+            vocabulario (dict): Palavra -> índice, o mesmo usado no treino.
+            dimensoes (dict, optional): 'embedding_dim' e 'hidden_dim' (para salvar).
+        """
+        self.modelo = modelo.eval()
+        self.vocabulario = vocabulario
+        self.dimensoes = dimensoes or {}
+
+    def classificar(self, pergunta):
+        """
+        Identifica a intenção de uma pergunta.
+
+        Args:
+            pergunta (str): A pergunta do usuário.
+
+        Returns:
+            str: Uma das INTENCOES.
+        """
+        indices = codificar(pergunta, self.vocabulario)
+        entrada = torch.tensor([indices], dtype=torch.long)
+        with torch.inference_mode():
+            return INTENCOES[int(self.modelo(entrada).argmax(dim=1))]
+
+    def classificar_lote(self, perguntas, tamanho_lote=256):
+        """
+        Classifica várias perguntas em lotes empacotados (sem preenchimento).
+
+        Args:
+            perguntas (iterable): As perguntas.
+            tamanho_lote (int): Máximo de perguntas por passada do modelo.
+
+        Returns:
+            list: A intenção de cada pergunta, na mesma ordem.
+        """
+        sequencias = [codificar(p, self.vocabulario) for p in perguntas]
+        intencoes = []
+        with torch.inference_mode():
+            for inicio in range(0, len(sequencias), tamanho_lote):
+                indices, offsets = empacotar(sequencias[inicio : inicio + tamanho_lote])
+                previstas = self.modelo(indices, offsets).argmax(dim=1).tolist()
+                intencoes.extend(INTENCOES[indice] for indice in previstas)
+        return intencoes
+
+    def quantizar(self):
+        """
+        Retorna uma cópia com as camadas lineares quantizadas dinamicamente em int8.
+
+        Os embeddings continuam em float32; só 'fc1' e 'fc2' passam a usar pesos int8.
+
+        Returns:
+            ClassificadorIntencoesNeural: O classificador quantizado.
+        """
+        modelo = torch.ao.quantization.quantize_dynamic(
+            self.modelo, {nn.Linear}, dtype=torch.qint8
+        )
+        return ClassificadorIntencoesNeural(modelo, self.vocabulario, self.dimensoes)
+
+    def salvar(self, caminho):
+        """
+        Salva os pesos junto com o vocabulário e as dimensões do modelo.
+
+        Args:
+            caminho (str): Arquivo de destino (ex: 'data/modelo_intencoes.pt').
+        """
+        torch.save(
+            {
+                "estado": self.modelo.state_dict(),
+                "vocabulario": self.vocabulario,
+                "intencoes": list(INTENCOES),
+                "dimensoes": self.dimensoes,
+            },
+            caminho,
+        )
+
+    @classmethod
+    def carregar(cls, caminho, quantizar=False):
+        """
+        Carrega um classificador salvo com 'salvar'.
+
+        Args:
+            caminho (str): O arquivo salvo.
+            quantizar (bool): Se True, aplica a quantização int8 depois de carregar.
+
+        Returns:
+            ClassificadorIntencoesNeural: O classificador pronto para inferência.
+
+        Raises:
+            ValueError: Se o arquivo foi treinado com outras intenções.
+        """
+        dados = torch.load(caminho, map_location="cpu", weights_only=True)
+        if tuple(dados["intencoes"]) != INTENCOES:
+            raise ValueError(
+                f"Intenções do modelo salvo não conferem: {dados['intencoes']}"
+            )
+        modelo = SimpleNLGModel(
+            len(dados["vocabulario"]),
+            dados["dimensoes"]["embedding_dim"],
+            dados["dimensoes"]["hidden_dim"],
+            len(INTENCOES),
+        )
+        modelo.load_state_dict(dados["estado"])
+        classificador = cls(modelo, dados["vocabulario"], dados["dimensoes"])
+        return classificador.quantizar() if quantizar else classificador
+
+    def exportar_torchscript(self, caminho):
+        """
+        Exporta o modelo em TorchScript, com o vocabulário embutido no arquivo.
+
+        O arquivo pode ser carregado sem a classe SimpleNLGModel (ver 'carregar_torchscript').
+
+        Args:
+            caminho (str): Arquivo de destino (ex: 'data/modelo_intencoes.ts').
+        """
+        modelo_script = torch.jit.script(self.modelo)
+        torch.jit.save(
+            modelo_script,
+            caminho,
+            _extra_files={"vocabulario.json": json.dumps(self.vocabulario)},
+        )
+
+    @classmethod
+    def carregar_torchscript(cls, caminho):
+        """
+        Carrega um classificador exportado com 'exportar_torchscript'.
+
+        Args:
+            caminho (str): O arquivo TorchScript.
+
+        Returns:
+            ClassificadorIntencoesNeural: O classificador pronto para inferência.
+        """
+        arquivos_extras = {"vocabulario.json": ""}
+        modelo = torch.jit.load(
+            caminho, map_location="cpu", _extra_files=arquivos_extras
+        )
+        return cls(modelo, json.loads(arquivos_extras["vocabulario.json"]))
+
+
+def main():
+    """Treina o classificador de intenções (SimpleNLGModel) e salva pesos e vocabulário."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--dados",
+        help="TSV com as colunas 'intencao' e 'frase' (padrão: frases-modelo geradas).",
+    )
+    parser.add_argument("--saida", default="data/modelo_intencoes.pt")
+    parser.add_argument(
+        "--torchscript", help="Também exporta em TorchScript (ex: data/modelo.ts)."
+    )
+    parser.add_argument(
+        "--int8", action="store_true", help="Quantiza em int8 antes de exportar."
+    )
+    parser.add_argument("--epocas", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.dados:
+        frases, rotulos = carregar_dataset_tsv(args.dados)
+    else:
+        frases, rotulos = gerar_dataset_treino()
+    print(f"--- Treinando o classificador de intenções com {len(frases)} frases ---")
+    classificador = treinar_modelo_intencoes(frases, rotulos, epocas=args.epocas)
+
+    os.makedirs(os.path.dirname(args.saida) or ".", exist_ok=True)
+    classificador.salvar(args.saida)
+    print(
+        f"Modelo e vocabulário ({len(classificador.vocabulario)} palavras) "
+        f"salvos em {args.saida}."
+    )
+    if args.torchscript:
+        if args.int8:
+            classificador = classificador.quantizar()
+        classificador.exportar_torchscript(args.torchscript)
+        print(f"Modelo TorchScript salvo em {args.torchscript}.")
+    print("Use CHATBOT_MODELO_INTENCOES=<arquivo> para o chatbot usar este modelo.")
+
+
+if __name__ == "__main__":
+    main()
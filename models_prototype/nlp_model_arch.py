@@ -1,162 +1,227 @@
-import torch  # Importa a biblioteca PyTorch, essencial para construir redes neurais.
-import torch.nn as nn  # Importa o módulo de redes neurais do PyTorch.
-
-from models_prototype.data_preprocessing import (
-    TextProcessor,
-)  # Importa a classe TextProcessor para mostrar o pipeline de dados.
-
-
-class SimpleNLGModel(nn.Module):
-    """
-    Protótipo de uma arquitetura de Rede Neural para Geração de Linguagem Natural (NLG).
-
-    Esta é uma arquitetura simplificada e ilustrativa, não um modelo completo treinado.
-    Ela demonstra como as camadas de uma rede neural seriam estruturadas para
-    processar embeddings de texto.
-    """
-
-    def __init__(self, vocab_size, embedding_dim, hidden_dim, output_dim):
-        """
-        Inicializa as camadas da rede neural.
-
-        Args:
-            vocab_size (int): Tamanho do vocabulário (número de palavras únicas no dataset).
-            embedding_dim (int): Dimensão dos vetores de embedding (tamanho do vetor que representa cada palavra).
-            hidden_dim (int): Número de neurônios na camada oculta.
-            output_dim (int): Dimensão da saída (por exemplo, tamanho do vocabulário para predição da próxima palavra).
-        """
-        super().__init__()  # Chama o construtor da classe base nn.Module
-
-        # Camada de Embedding: Converte IDs de palavras (inteiros) em vetores densos (embeddings).
-        # É aqui que os embeddings (Word2Vec, GloVe, BERT) seriam representados.
-        self.embedding = nn.Embedding(vocab_size, embedding_dim)
-
-        # Camada Oculta (exemplo de uma camada linear ou convolucional - CNN).
-        # Aqui, uma CNN para texto pode ser uma camada nn.Conv1d.
-        # Para simplificar e ilustrar uma rede feedforward (mais básica):
-        self.fc1 = nn.Linear(embedding_dim, hidden_dim)  # Camada linear 1
-        self.relu = nn.ReLU()  # Função de ativação não-linear
-        self.fc2 = nn.Linear(hidden_dim, output_dim)  # Camada linear 2 (saída)
-
-        # Em modelos reais de NLG (Seq2Seq, Transformers), haveria camadas mais complexas
-        # como LSTMs, GRUs ou Attention, e CNNs seriam usadas de forma diferente
-        # (ex: para extrair features de n-gramas).
-
-    def forward(self, text_indices):
-        """
-        Define o fluxo de dados através da rede neural (passada forward).
-
-        Args:
-            text_indices (torch.Tensor): Tensor de índices numéricos de palavras (IDs).
-                                        Em um cenário real, estes seriam os IDs das palavras
-                                        pré-processadas e batched (agrupadas para processamento).
-
-        Returns:
-            torch.Tensor: A saída bruta da rede neural.
-        """
-        # Passa os índices de texto pela camada de embedding para obter os vetores de embedding.
-        embedded = self.embedding(
-            text_indices
-        )  # Shape: [batch_size, seq_len, embedding_dim]
-
-        # Em um modelo real, as próximas camadas processariam a sequência (ex: LSTMs, CNNs para texto).
-        # Para este protótipo, vou simplificar para uma operação linear simples
-        # (simulando como os embeddings seriam o input para a próxima camada).
-
-        # Agrupei/achatei o embedding para passar pela camada linear de exemplo.
-        # Isso não é como uma CNN de texto funcionaria diretamente, mas ilustra o fluxo.
-        flat_embedded = embedded.mean(
-            dim=1
-        )  # Apenas para ter um vetor 1D por item no batch
-
-        # Passa pelo resto da rede
-        output = self.fc1(flat_embedded)
-        output = self.relu(output)
-        output = self.fc2(output)
-
-        return output
-
-
-def main():
-    """
-    Função principal para demonstração do protótipo de modelo de Deep Learning.
-    Este script conecta o pré-processamento de dados com a definição de um modelo.
-    """
-    print("--- Iniciando o Protótipo de Modelo de Deep Learning (NLP) ---")
-
-    # 1. Pré-processamento dos Dados:
-    # Utiliza o TextProcessor para obter tokens do dataset (simulando a saída do train_script.py).
-    print("\n--- Fase 1: Pré-processamento de Dados ---")
-    processor = TextProcessor(lang="portuguese")
-    dataset_file = "data/pt.txt"
-    processed_tokens = processor.load_and_preprocess_dataset(
-        dataset_file, max_lines=100
-    )  # Processa 100 linhas para o protótipo
-
-    if not processed_tokens:
-        print("Erro: Nenhum token processado. O protótipo do modelo precisa de dados.")
-        return
-
-    # 2. Criação de Vocabulário e Mapeamento de Palavras para IDs:
-    # Em um pipeline real, isso geraria um vocabulário de palavras únicas e mapearia cada palavra a um ID numérico.
-    print("\n--- Fase 2: Criação de Vocabulário e Mapeamento para Embeddings ---")
-    unique_tokens = sorted(list(set(processed_tokens)))
-    vocab_size = len(unique_tokens)
-    word_to_idx = {word: i for i, word in enumerate(unique_tokens)}
-
-    # Exemplo de como algumas palavras seriam convertidas em índices numéricos:
-    sample_indices = torch.tensor(
-        [word_to_idx[word] for word in processed_tokens[:5]], dtype=torch.long
-    )
-    print(f"Palavras de exemplo: {processed_tokens[:5]}")
-    print(f"Seus índices numéricos (input para embedding): {sample_indices}")
-    print(f"Tamanho do vocabulário (vocab_size): {vocab_size}")
-
-    # 3. Definição da Arquitetura do Modelo:
-    print("\n--- Fase 3: Definição da Arquitetura da Rede Neural ---")
-    embedding_dim = 100  # Dimensão de cada vetor de embedding (tamanho comum: 100, 300)
-    hidden_dim = 256  # Dimensão da camada oculta
-    output_dim = vocab_size  # Para um modelo de linguagem que prevê a próxima palavra no vocabulário
-
-    model = SimpleNLGModel(vocab_size, embedding_dim, hidden_dim, output_dim)
-    print(f"Modelo de exemplo criado:\n{model}")
-
-    # 4. Demonstração de uma Passada Forward (Conceitual):
-    # Em um cenário real, este seria o 'forward pass' de dados batched através da rede.
-    print("\n--- Fase 4: Demonstração de Passada Forward (Conceitual) ---")
-    # Simula um input (tensor de índices) para o modelo.
-    dummy_input = torch.randint(
-        0, vocab_size, (1, 10), dtype=torch.long
-    )  # Exemplo: batch de 1, seq de 10 palavras
-    print(f"Input de exemplo para o modelo (índices de palavras):\n{dummy_input}")
-
-    with torch.no_grad():  # Desativa o cálculo de gradientes para inferência (não é treinamento)
-        dummy_output = model(dummy_input)
-    print(
-        f"Saída de exemplo do modelo (logits para o vocabulário):\n{dummy_output.shape}"
-    )
-    print("A saída seria então processada para gerar palavras ou texto.")
-
-    # 5. Conceitualização do Treinamento (Para o README.md):
-    print("\n--- Fase 5: Conceitualização do Treinamento e Otimização ---")
-    print("Em um pipeline completo, as etapas de treinamento incluiriam:")
-    print(
-        " - **Definição da Função de Perda (Loss Function):** Mede o quão 'errada' a previsão do modelo está (ex: nn.CrossEntropyLoss para classificação/geração de linguagem)."
-    )
-    print(
-        " - **Definição do Otimizador (Optimizer):** Ajusta os pesos do modelo para minimizar a perda (ex: torch.optim.Adam)."
-    )
-    print(
-        " - **Loop de Treinamento:** Iterar sobre os dados em 'epochs' (passadas completas), fazer passadas forward e backward (cálculo de gradientes), e atualizar os pesos do modelo."
-    )
-    print(
-        " - **Avaliação:** Monitorar métricas de desempenho em um conjunto de validação."
-    )
-    print(
-        "\nEste script ilustra o alicerce para construir e treinar modelos de Deep Learning para NLP."
-    )
-    print("--- Protótipo de Modelo de DL Concluído ---")
-
-
-if __name__ == "__main__":
-    main()
+import os  # Verifica se o dataset existe e cria a pasta do corpus codificado.
+from typing import Optional  # Tipo do argumento 'offsets' (o TorchScript exige).
+
+import numpy as np  # Lê o corpus codificado (memória mapeada) como vetores de índices.
+import torch  # Importa a biblioteca PyTorch, essencial para construir redes neurais.
+import torch.nn as nn  # Importa o módulo de redes neurais do PyTorch.
+import torch.nn.functional as F  # Média dos embeddings de sequências empacotadas.
+
+from models_prototype.data_preprocessing import (
+    TextProcessor,
+)  # Importa a classe TextProcessor para mostrar o pipeline de dados.
+
+# Índice do '<pad>' nos vocabulários do projeto (ver modelo_intencoes e
+# corpus_codificado): posições com ele ficam fora da média dos embeddings.
+ID_PAD = 0
+
+
+class SimpleNLGModel(nn.Module):
+    """
+    Protótipo de uma arquitetura de Rede Neural para Geração de Linguagem Natural (NLG).
+
+    Esta é uma arquitetura simplificada e ilustrativa, não um modelo completo treinado.
+    Ela demonstra como as camadas de uma rede neural seriam estruturadas para
+    processar embeddings de texto.
+    """
+
+    def __init__(
+        self, vocab_size, embedding_dim, hidden_dim, output_dim, pad_idx=ID_PAD
+    ):
+        """
+        Inicializa as camadas da rede neural.
+
+        Args:
+            vocab_size (int): Tamanho do vocabulário (número de palavras únicas no dataset).
+            embedding_dim (int): Dimensão dos vetores de embedding (tamanho do vetor que representa cada palavra).
+            hidden_dim (int): Número de neurônios na camada oculta.
+            output_dim (int): Dimensão da saída (por exemplo, tamanho do vocabulário para predição da próxima palavra).
+            pad_idx (int): Índice do '<pad>', ignorado na média dos lotes retangulares.
+        """
+        super().__init__()  # Chama o construtor da classe base nn.Module
+        self.pad_idx = pad_idx
+
+        # Camada de Embedding: Converte IDs de palavras (inteiros) em vetores densos (embeddings).
+        # É aqui que os embeddings (Word2Vec, GloVe, BERT) seriam representados.
+        self.embedding = nn.Embedding(vocab_size, embedding_dim)
+
+        # Camada Oculta (exemplo de uma camada linear ou convolucional - CNN).
+        # Aqui, uma CNN para texto pode ser uma camada nn.Conv1d.
+        # Para simplificar e ilustrar uma rede feedforward (mais básica):
+        self.fc1 = nn.Linear(embedding_dim, hidden_dim)  # Camada linear 1
+        self.relu = nn.ReLU()  # Função de ativação não-linear
+        self.fc2 = nn.Linear(hidden_dim, output_dim)  # Camada linear 2 (saída)
+
+        # Em modelos reais de NLG (Seq2Seq, Transformers), haveria camadas mais complexas
+        # como LSTMs, GRUs ou Attention, e CNNs seriam usadas de forma diferente
+        # (ex: para extrair features de n-gramas).
+
+    def forward(self, text_indices, offsets: Optional[torch.Tensor] = None):
+        """
+        Define o fluxo de dados através da rede neural (passada forward).
+
+        Aceita dois formatos de lote:
+        - Retangular: 'text_indices' [batch_size, seq_len], sequências completadas
+          com '<pad>' ('pad_idx') até o mesmo tamanho. A média ignora o '<pad>'.
+        - Empacotado: 'text_indices' 1D com as sequências em sequência e 'offsets' com
+          o início de cada uma (ver 'empacotar'). Cada média usa só os tokens da sua
+          sequência, então frases de tamanhos diferentes vão juntas sem preenchimento.
+
+        Args:
+            text_indices (torch.Tensor): Tensor de índices numéricos de palavras (IDs).
+                                        Em um cenário real, estes seriam os IDs das palavras
+                                        pré-processadas e batched (agrupadas para processamento).
+            offsets (torch.Tensor, optional): Início de cada sequência em 'text_indices'
+                                              (formato empacotado).
+
+        Returns:
+            torch.Tensor: A saída bruta da rede neural.
+        """
+        if offsets is not None:
+            # Formato empacotado: o 'embedding_bag' faz a busca e a média de cada
+            # sequência de uma vez, sem criar o tensor [batch, seq_len, embedding_dim].
+            # Usa os mesmos pesos da camada de embedding (o state_dict não muda).
+            flat_embedded = F.embedding_bag(
+                text_indices, self.embedding.weight, offsets, mode="mean"
+            )
+        else:
+            # Passa os índices de texto pela camada de embedding para obter os vetores de embedding.
+            embedded = self.embedding(
+                text_indices
+            )  # Shape: [batch_size, seq_len, embedding_dim]
+
+            # Em um modelo real, as próximas camadas processariam a sequência (ex: LSTMs, CNNs para texto).
+            # Para este protótipo, vou simplificar para uma operação linear simples
+            # (simulando como os embeddings seriam o input para a próxima camada).
+
+            # Agrupei/achatei o embedding para passar pela camada linear de exemplo.
+            # Isso não é como uma CNN de texto funcionaria diretamente, mas ilustra o fluxo.
+            # A média (um vetor 1D por item no batch) só conta as posições que não são
+            # '<pad>', como no formato empacotado; uma sequência só de '<pad>' dá zeros.
+            mascara = (text_indices != self.pad_idx).unsqueeze(-1).to(embedded.dtype)
+            contagem = mascara.sum(dim=1).clamp(min=1)
+            flat_embedded = (embedded * mascara).sum(dim=1) / contagem
+
+        # Passa pelo resto da rede
+        output = self.fc1(flat_embedded)
+        output = self.relu(output)
+        output = self.fc2(output)
+
+        return output
+
+
+def empacotar(sequencias):
+    """
+    Junta sequências de tamanhos diferentes no formato empacotado do modelo.
+
+    Args:
+        sequencias (list): Listas (ou tensores 1D) de índices.
+
+    Returns:
+        tuple: (índices 1D de todas as sequências, início de cada uma), os
+               argumentos 'text_indices' e 'offsets' do SimpleNLGModel.
+    """
+    tamanhos = torch.tensor([len(s) for s in sequencias], dtype=torch.long)
+    offsets = torch.zeros(len(sequencias), dtype=torch.long)
+    if len(sequencias) > 1:
+        offsets[1:] = torch.cumsum(tamanhos[:-1], dim=0)
+    if sequencias and isinstance(sequencias[0], torch.Tensor):
+        indices = torch.cat(list(sequencias))
+    else:
+        indices = torch.tensor(
+            [indice for sequencia in sequencias for indice in sequencia],
+            dtype=torch.long,
+        )
+    return indices, offsets
+
+
+def main():
+    """
+    Função principal para demonstração do protótipo de modelo de Deep Learning.
+    Este script conecta o pré-processamento de dados com a definição de um modelo.
+    """
+    print("--- Iniciando o Protótipo de Modelo de Deep Learning (NLP) ---")
+
+    # 1. Pré-processamento dos Dados:
+    # Utiliza o TextProcessor para obter os tokens de cada linha do dataset.
+    print("\n--- Fase 1: Pré-processamento de Dados ---")
+    processor = TextProcessor(lang="portuguese")
+    dataset_file = "data/pt.txt"
+    if not os.path.exists(dataset_file):
+        print("Erro: Nenhum token processado. O protótipo do modelo precisa de dados.")
+        return
+    linhas_tokenizadas = processor.iter_preprocessed_lines(
+        dataset_file, max_lines=100
+    )  # Processa 100 linhas para o protótipo
+
+    # 2. Criação de Vocabulário e Mapeamento de Palavras para IDs:
+    # O corpus é gravado como um arquivo de índices uint32 (lido por memória mapeada),
+    # com o vocabulário das palavras mais frequentes; as raras viram '<unk>'.
+    print("\n--- Fase 2: Criação de Vocabulário e Mapeamento para Embeddings ---")
+    # Importado aqui: o corpus_codificado usa os tokens especiais do modelo_intencoes,
+    # que por sua vez importa este módulo.
+    from models_prototype.corpus_codificado import CorpusCodificado
+
+    os.makedirs("data", exist_ok=True)
+    corpus = CorpusCodificado.construir(
+        linhas_tokenizadas, "data/corpus_prototipo", min_contagem=1
+    )
+    if not len(corpus.tokens):
+        print("Erro: Nenhum token processado. O protótipo do modelo precisa de dados.")
+        return
+    vocab_size = len(corpus.vocabulario)
+
+    # Exemplo de como algumas palavras seriam convertidas em índices numéricos:
+    sample_indices = torch.from_numpy(corpus.tokens[:5].astype(np.int64))
+    print(f"Palavras de exemplo: {corpus.decodificar(sample_indices)}")
+    print(f"Seus índices numéricos (input para embedding): {sample_indices}")
+    print(f"Tamanho do vocabulário (vocab_size): {vocab_size}")
+
+    # 3. Definição da Arquitetura do Modelo:
+    print("\n--- Fase 3: Definição da Arquitetura da Rede Neural ---")
+    embedding_dim = 100  # Dimensão de cada vetor de embedding (tamanho comum: 100, 300)
+    hidden_dim = 256  # Dimensão da camada oculta
+    output_dim = vocab_size  # Para um modelo de linguagem que prevê a próxima palavra no vocabulário
+
+    model = SimpleNLGModel(vocab_size, embedding_dim, hidden_dim, output_dim)
+    print(f"Modelo de exemplo criado:\n{model}")
+
+    # 4. Demonstração de uma Passada Forward (Conceitual):
+    # Em um cenário real, este seria o 'forward pass' de dados batched através da rede.
+    print("\n--- Fase 4: Demonstração de Passada Forward (Conceitual) ---")
+    # Simula um input (tensor de índices) para o modelo.
+    dummy_input = torch.randint(
+        0, vocab_size, (1, 10), dtype=torch.long
+    )  # Exemplo: batch de 1, seq de 10 palavras
+    print(f"Input de exemplo para o modelo (índices de palavras):\n{dummy_input}")
+
+    with torch.no_grad():  # Desativa o cálculo de gradientes para inferência (não é treinamento)
+        dummy_output = model(dummy_input)
+    print(
+        f"Saída de exemplo do modelo (logits para o vocabulário):\n{dummy_output.shape}"
+    )
+    print("A saída seria então processada para gerar palavras ou texto.")
+
+    # 5. Conceitualização do Treinamento (Para o README.md):
+    print("\n--- Fase 5: Conceitualização do Treinamento e Otimização ---")
+    print("Em um pipeline completo, as etapas de treinamento incluiriam:")
+    print(
+        " - **Definição da Função de Perda (Loss Function):** Mede o quão 'errada' a previsão do modelo está (ex: nn.CrossEntropyLoss para classificação/geração de linguagem)."
+    )
+    print(
+        " - **Definição do Otimizador (Optimizer):** Ajusta os pesos do modelo para minimizar a perda (ex: torch.optim.Adam)."
+    )
+    print(
+        " - **Loop de Treinamento:** Iterar sobre os dados em 'epochs' (passadas completas), fazer passadas forward e backward (cálculo de gradientes), e atualizar os pesos do modelo."
+    )
+    print(
+        " - **Avaliação:** Monitorar métricas de desempenho em um conjunto de validação."
+    )
+    print(
+        "\nEste script ilustra o alicerce para construir e treinar modelos de Deep Learning para NLP."
+    )
+    print("O treino em lotes do corpus codificado está em 'python run_treino_nlg.py'.")
+    print("--- Protótipo de Modelo de DL Concluído ---")
+
+
+if __name__ == "__main__":
+    main()
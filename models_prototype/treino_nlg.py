@@ -0,0 +1,413 @@
+import argparse
+import functools
+import math
+import os
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader, Dataset, Sampler
+
+from models_prototype.corpus_codificado import CorpusCodificado
+from models_prototype.nlp_model_arch import SimpleNLGModel
+
+# Máximo de palavras anteriores usadas para prever a próxima.
+CONTEXTO_PADRAO = 8
+
+# Lotes por "piscina" do amostrador: as linhas de cada piscina são ordenadas por
+# comprimento antes de virar lotes (quanto maior, mais parecidos os comprimentos).
+LOTES_POR_PISCINA = 50
+
+
+class DatasetLinhasCorpus(Dataset):
+    """
+    As linhas de um CorpusCodificado, cada uma como um tensor de índices.
+
+    Guarda só o caminho do corpus: cada processo do DataLoader abre o seu memmap na
+    primeira leitura, então os workers compartilham as páginas do arquivo em vez de
+    receberem uma cópia do corpus.
+    """
+
+    def __init__(self, caminho_base):
+        """
+        Args:
+            caminho_base (str): Prefixo dos arquivos do corpus (ex: 'data/corpus').
+        """
+        self.caminho_base = caminho_base
+        self._corpus = CorpusCodificado.carregar(caminho_base)
+
+    def __len__(self):
+        return len(self._corpus)
+
+    def __getitem__(self, posicao):
+        if self._corpus is None:
+            self._corpus = CorpusCodificado.carregar(self.caminho_base)
+        return torch.from_numpy(self._corpus.linha(posicao).astype(np.int64))
+
+    def __getstate__(self):
+        # O memmap é reaberto no worker (ver __getitem__), nunca copiado.
+        estado = self.__dict__.copy()
+        estado["_corpus"] = None
+        return estado
+
+
+class AmostradorPorTamanho(Sampler):
+    """
+    Gera lotes de linhas com comprimentos parecidos (bucketing).
+
+    A cada época as linhas são embaralhadas e divididas em piscinas de
+    LOTES_POR_PISCINA lotes; dentro de cada piscina as linhas são ordenadas por
+    comprimento e cortadas em lotes, e a ordem dos lotes é embaralhada de novo.
+    A ordem depende só da semente e da época, então um treino retomado vê os mesmos
+    lotes. Linhas com menos de duas palavras não geram exemplos e ficam de fora.
+    """
+
+    def __init__(
+        self,
+        comprimentos,
+        tamanho_lote,
+        semente=42,
+        lotes_por_piscina=LOTES_POR_PISCINA,
+    ):
+        """
+        Args:
+            comprimentos (numpy.ndarray): Número de tokens de cada linha do corpus.
+            tamanho_lote (int): Linhas por lote.
+            semente (int): Semente do embaralhamento.
+            lotes_por_piscina (int): Lotes formados a partir de cada piscina ordenada.
+
+        Raises:
+            ValueError: Se 'tamanho_lote' ou 'lotes_por_piscina' não for positivo.
+        """
+        if tamanho_lote < 1 or lotes_por_piscina < 1:
+            raise ValueError(
+                "'tamanho_lote' e 'lotes_por_piscina' devem ser positivos."
+            )
+        self.comprimentos = np.asarray(comprimentos, dtype=np.int64)
+        self.elegiveis = np.flatnonzero(self.comprimentos >= 2)
+        self.tamanho_lote = tamanho_lote
+        self.tamanho_piscina = tamanho_lote * lotes_por_piscina
+        self.semente = semente
+        self.epoca = 0
+        self.inicio = 0
+
+    def definir_epoca(self, epoca, inicio=0):
+        """
+        Escolhe a época dos próximos lotes.
+
+        Args:
+            epoca (int): A época (muda o embaralhamento).
+            inicio (int): Lotes já vistos nesta época, que serão pulados (retomada).
+        """
+        self.epoca = epoca
+        self.inicio = inicio
+
+    def total_lotes(self):
+        """Número de lotes de uma época inteira."""
+        completas, resto = divmod(len(self.elegiveis), self.tamanho_piscina)
+        por_piscina = self.tamanho_piscina // self.tamanho_lote
+        return completas * por_piscina + math.ceil(resto / self.tamanho_lote)
+
+    def _lotes(self):
+        aleatorio = np.random.default_rng((self.semente, self.epoca))
+        ordem = aleatorio.permutation(self.elegiveis)
+        lotes = []
+        for inicio in range(0, len(ordem), self.tamanho_piscina):
+            piscina = ordem[inicio : inicio + self.tamanho_piscina]
+            piscina = piscina[np.argsort(self.comprimentos[piscina], kind="stable")]
+            for i in range(0, len(piscina), self.tamanho_lote):
+                lotes.append(piscina[i : i + self.tamanho_lote].tolist())
+        return [lotes[i] for i in aleatorio.permutation(len(lotes))]
+
+    def __iter__(self):
+        yield from self._lotes()[self.inicio :]
+
+    def __len__(self):
+        return max(self.total_lotes() - self.inicio, 0)
+
+
+def montar_lote(linhas, contexto=CONTEXTO_PADRAO):
+    """
+    Transforma linhas em exemplos (palavras anteriores -> próxima palavra).
+
+    Cada posição a partir da segunda palavra vira um exemplo, com até 'contexto'
+    palavras anteriores. Os contextos vão empacotados (ver 'empacotar'): os do
+    início da linha, mais curtos, entram no mesmo lote sem '<pad>'.
+
+    Args:
+        linhas (list): Tensores de índices, um por linha (do DatasetLinhasCorpus).
+        contexto (int): Máximo de palavras anteriores em cada exemplo.
+
+    Returns:
+        dict: 'indices' e 'offsets' (a entrada empacotada do modelo), 'alvos' (a
+              próxima palavra de cada exemplo) e 'tokens' (o total das linhas).
+    """
+    indices, tamanhos, alvos = [], [], []
+    for linha in linhas:
+        # Início da linha: contextos mais curtos que a janela.
+        for k in range(1, min(contexto, len(linha))):
+            indices.append(linha[:k])
+            tamanhos.append(k)
+            alvos.append(linha[k : k + 1])
+        # Resto da linha: janelas deslizantes de 'contexto' palavras.
+        if len(linha) > contexto:
+            janelas = linha.unfold(0, contexto, 1)[:-1]
+            indices.append(janelas.reshape(-1))
+            tamanhos.extend([contexto] * len(janelas))
+            alvos.append(linha[contexto:])
+    offsets = torch.zeros(len(tamanhos), dtype=torch.long)
+    if len(tamanhos) > 1:
+        offsets[1:] = torch.cumsum(torch.tensor(tamanhos[:-1]), dim=0)
+    return {
+        "indices": torch.cat(indices),
+        "offsets": offsets,
+        "alvos": torch.cat(alvos),
+        "tokens": sum(len(linha) for linha in linhas),
+    }
+
+
+def _salvar_checkpoint(caminho, modelo, otimizador, configuracao, epoca, lote, passo):
+    """Grava o estado do treino num arquivo temporário e troca pelo definitivo."""
+    provisorio = f"{caminho}.tmp"
+    torch.save(
+        {
+            "modelo": modelo.state_dict(),
+            "otimizador": otimizador.state_dict(),
+            "configuracao": configuracao,
+            "epoca": epoca,
+            "lote": lote,
+            "passo": passo,
+        },
+        provisorio,
+    )
+    # Troca atômica: um treino interrompido durante a gravação não perde o checkpoint.
+    os.replace(provisorio, caminho)
+
+
+def treinar_modelo_nlg(
+    caminho_corpus,
+    embedding_dim=64,
+    hidden_dim=128,
+    contexto=CONTEXTO_PADRAO,
+    epocas=1,
+    tamanho_lote=64,
+    acumulacao=1,
+    taxa_aprendizado=0.001,
+    num_workers=2,
+    prefetch=4,
+    threads=None,
+    checkpoint=None,
+    retomar=False,
+    passos_por_checkpoint=500,
+    passos_por_relatorio=100,
+    max_passos=None,
+    semente=42,
+):
+    """
+    Treina o SimpleNLGModel para prever a próxima palavra do corpus codificado.
+
+    As linhas vêm do memmap por um DataLoader com vários workers (cada um monta os
+    exemplos de 'prefetch' lotes adiantados), agrupadas por comprimento. Os lotes vão
+    para a memória fixada (pinned) quando há GPU.
+
+    Args:
+        caminho_corpus (str): Prefixo do CorpusCodificado (ex: 'data/corpus').
+        embedding_dim (int): Dimensão dos embeddings.
+        hidden_dim (int): Neurônios da camada oculta.
+        contexto (int): Máximo de palavras anteriores em cada exemplo.
+        epocas (int): Passadas completas pelo corpus.
+        tamanho_lote (int): Linhas do corpus por lote.
+        acumulacao (int): Lotes acumulados (gradientes somados) por passo do otimizador.
+        taxa_aprendizado (float): Taxa do otimizador Adam.
+        num_workers (int): Processos do DataLoader (0 monta os lotes no principal).
+        prefetch (int): Lotes adiantados por worker.
+        threads (int, optional): Threads do PyTorch (torch.set_num_threads).
+        checkpoint (str, optional): Arquivo do checkpoint (ex: 'data/modelo_nlg.pt').
+        retomar (bool): Se True e o checkpoint existir, continua de onde ele parou.
+        passos_por_checkpoint (int): Passos do otimizador entre gravações.
+        passos_por_relatorio (int): Passos entre os relatórios de perda e velocidade.
+        max_passos (int, optional): Para depois desse total de passos (contando os
+                                    do checkpoint).
+        semente (int): Semente do PyTorch e da ordem dos lotes.
+
+    Returns:
+        SimpleNLGModel: O modelo treinado.
+
+    Raises:
+        ValueError: Se 'acumulacao' ou 'contexto' não for positivo, ou se o
+                    checkpoint for de outra configuração.
+    """
+    if acumulacao < 1 or contexto < 1:
+        raise ValueError("'acumulacao' e 'contexto' devem ser positivos.")
+    if threads:
+        torch.set_num_threads(threads)
+    torch.manual_seed(semente)
+    dispositivo = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    dataset = DatasetLinhasCorpus(caminho_corpus)
+    corpus = dataset._corpus
+    tamanho_vocabulario = len(corpus.vocabulario)
+    amostrador = AmostradorPorTamanho(
+        np.diff(corpus.inicios.astype(np.int64)), tamanho_lote, semente
+    )
+    carregador = DataLoader(
+        dataset,
+        batch_sampler=amostrador,
+        collate_fn=functools.partial(montar_lote, contexto=contexto),
+        num_workers=num_workers,
+        pin_memory=dispositivo.type == "cuda",
+        prefetch_factor=prefetch if num_workers else None,
+        persistent_workers=num_workers > 0,
+    )
+
+    modelo = SimpleNLGModel(
+        tamanho_vocabulario, embedding_dim, hidden_dim, tamanho_vocabulario
+    ).to(dispositivo)
+    otimizador = torch.optim.Adam(modelo.parameters(), lr=taxa_aprendizado)
+    funcao_perda = nn.CrossEntropyLoss(reduction="sum")
+    configuracao = {
+        "vocab_size": tamanho_vocabulario,
+        "embedding_dim": embedding_dim,
+        "hidden_dim": hidden_dim,
+        "contexto": contexto,
+        "tamanho_lote": tamanho_lote,
+        "acumulacao": acumulacao,
+        "semente": semente,
+    }
+
+    epoca_inicial, lote_inicial, passo = 0, 0, 0
+    if retomar and checkpoint and os.path.exists(checkpoint):
+        dados = torch.load(checkpoint, map_location=dispositivo, weights_only=True)
+        if dados["configuracao"] != configuracao:
+            raise ValueError(
+                f"Checkpoint de outra configuração: {dados['configuracao']}"
+            )
+        modelo.load_state_dict(dados["modelo"])
+        otimizador.load_state_dict(dados["otimizador"])
+        epoca_inicial, lote_inicial = dados["epoca"], dados["lote"]
+        passo = dados["passo"]
+        print(f"Retomando de {checkpoint}: época {epoca_inicial + 1}, passo {passo}.")
+
+    total_lotes = amostrador.total_lotes()
+    print(
+        f"{len(amostrador.elegiveis)} linhas, {total_lotes} lotes por época, "
+        f"{num_workers} workers, {torch.get_num_threads()} threads ({dispositivo})."
+    )
+    terminou = max_passos is not None and passo >= max_passos
+    inicio_treino = time.perf_counter()
+    tokens_treino, amostras_treino = 0, 0
+    modelo.train()
+    for epoca in range(epoca_inicial, epocas):
+        if terminou:
+            break
+        amostrador.definir_epoca(epoca, lote_inicial if epoca == epoca_inicial else 0)
+        lote_na_epoca = amostrador.inicio
+        inicio_relatorio = time.perf_counter()
+        tokens, amostras, perda_total, pendentes = 0, 0, 0.0, 0
+        otimizador.zero_grad()
+        for lote in carregador:
+            indices, offsets, alvos = (
+                lote[chave].to(dispositivo, non_blocking=True)
+                for chave in ("indices", "offsets", "alvos")
+            )
+            amostras_lote = len(alvos)
+            perda = funcao_perda(modelo(indices, offsets), alvos)
+            (perda / (amostras_lote * acumulacao)).backward()
+            perda_total += perda.item()
+            tokens += lote["tokens"]
+            amostras += amostras_lote
+            lote_na_epoca += 1
+            pendentes += 1
+
+            # O último lote da época fecha o passo mesmo sem completar a acumulação.
+            if pendentes < acumulacao and lote_na_epoca < total_lotes:
+                continue
+            otimizador.step()
+            otimizador.zero_grad()
+            pendentes = 0
+            passo += 1
+            terminou = max_passos is not None and passo >= max_passos
+            if passo % passos_por_relatorio == 0 or terminou:
+                segundos = time.perf_counter() - inicio_relatorio
+                print(
+                    f"Época {epoca + 1}/{epocas}, passo {passo}: "
+                    f"perda {perda_total / max(amostras, 1):.4f}, "
+                    f"{tokens / segundos:.0f} tokens/s, "
+                    f"{amostras / segundos:.0f} amostras/s"
+                )
+                tokens_treino += tokens
+                amostras_treino += amostras
+                inicio_relatorio = time.perf_counter()
+                tokens, amostras, perda_total = 0, 0, 0.0
+            if checkpoint and (passo % passos_por_checkpoint == 0 or terminou):
+                _salvar_checkpoint(
+                    checkpoint,
+                    modelo,
+                    otimizador,
+                    configuracao,
+                    epoca,
+                    lote_na_epoca,
+                    passo,
+                )
+            if terminou:
+                break
+        tokens_treino += tokens
+        amostras_treino += amostras
+        if checkpoint and not terminou:
+            _salvar_checkpoint(
+                checkpoint, modelo, otimizador, configuracao, epoca + 1, 0, passo
+            )
+
+    segundos = time.perf_counter() - inicio_treino
+    print(
+        f"Treino concluído: {passo} passos em {segundos:.1f}s "
+        f"({tokens_treino / max(segundos, 1e-9):.0f} tokens/s, "
+        f"{amostras_treino / max(segundos, 1e-9):.0f} amostras/s)."
+    )
+    return modelo
+
+
+def main():
+    """Treina o SimpleNLGModel (próxima palavra) em lotes do corpus codificado."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--corpus", default="data/corpus")
+    parser.add_argument("--checkpoint", default="data/modelo_nlg.pt")
+    parser.add_argument(
+        "--retomar", action="store_true", help="Continua do checkpoint, se existir."
+    )
+    parser.add_argument("--epocas", type=int, default=1)
+    parser.add_argument("--tamanho-lote", type=int, default=64)
+    parser.add_argument("--acumulacao", type=int, default=1)
+    parser.add_argument("--contexto", type=int, default=CONTEXTO_PADRAO)
+    parser.add_argument("--taxa-aprendizado", type=float, default=0.001)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, help="Padrão: o do PyTorch.")
+    parser.add_argument("--max-passos", type=int, help="Padrão: todas as épocas.")
+    args = parser.parse_args()
+
+    if not os.path.exists(f"{args.corpus}.tokens.npy"):
+        print(
+            f"ERRO: O corpus '{args.corpus}' não foi encontrado. "
+            "Gere-o antes com 'python run_corpus_codificado.py'."
+        )
+        return
+    os.makedirs(os.path.dirname(args.checkpoint) or ".", exist_ok=True)
+    treinar_modelo_nlg(
+        args.corpus,
+        contexto=args.contexto,
+        epocas=args.epocas,
+        tamanho_lote=args.tamanho_lote,
+        acumulacao=args.acumulacao,
+        taxa_aprendizado=args.taxa_aprendizado,
+        num_workers=args.workers,
+        threads=args.threads,
+        checkpoint=args.checkpoint,
+        retomar=args.retomar,
+        max_passos=args.max_passos,
+    )
+    print(f"Checkpoint salvo em {args.checkpoint}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+from src.database.catalogo_memoria import (
+    main as catalogo_memoria_main,
+)  # Importa a main do job que gera o instantâneo do catálogo em memória mapeada
+
+if __name__ == "__main__":
+    catalogo_memoria_main()
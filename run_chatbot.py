@@ -1,4 +1,4 @@
-from src.main_chatbot import main
-
-if __name__ == "__main__":
-    main()
+from src.main_chatbot import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+from models_prototype.corpus_codificado import (
+    main as corpus_codificado_main,
+)  # Importa a main que grava o corpus de treino codificado (uint32 + deslocamentos)
+
+if __name__ == "__main__":
+    corpus_codificado_main()
@@ -0,0 +1,6 @@
+from src.database.apelidos_titulos import (
+    main as apelidos_titulos_main,
+)  # Importa a main do importador de títulos alternativos (original, inglês, ...)
+
+if __name__ == "__main__":
+    apelidos_titulos_main()
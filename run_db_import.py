@@ -0,0 +1,6 @@
+from src.database.importador_filmes import (
+    main as importador_filmes_main,
+)  # Importa a main do importador de catálogos (CSV/TSV/JSONL, opcionalmente .gz)
+
+if __name__ == "__main__":
+    importador_filmes_main()
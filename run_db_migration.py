@@ -0,0 +1,6 @@
+from src.database.migracoes import (
+    main as migracoes_main,
+)  # Importa a main das migrações versionadas do esquema do banco
+
+if __name__ == "__main__":
+    migracoes_main()
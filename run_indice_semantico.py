@@ -0,0 +1,6 @@
+from src.nlp.indice_semantico import (
+    main as indice_semantico_main,
+)  # Importa a main do job que gera o índice semântico do catálogo
+
+if __name__ == "__main__":
+    indice_semantico_main()
@@ -1,6 +1,6 @@
-from models_prototype.nlp_model_arch import (
-    main as nlp_model_arch_main,
-)  # Importa a main do script do modelo
-
-if __name__ == "__main__":
-    nlp_model_arch_main()
+from models_prototype.nlp_model_arch import (
+    main as nlp_model_arch_main,
+)  # Importa a main do script do modelo
+
+if __name__ == "__main__":
+    nlp_model_arch_main()
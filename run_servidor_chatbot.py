@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+import logging
+import os
+
+from dotenv import load_dotenv
+
+from src.servidor.servidor_chat import executar_servidor
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Servidor HTTP/WebSocket do chatbot cinéfilo (vários usuários)."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument(
+        "--max-turnos",
+        type=int,
+        default=32,
+        help="Quantos turnos (perguntas) podem ser processados ao mesmo tempo.",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()  # Carrega a GOOGLE_API_KEY do .env, como no run_chatbot.py.
+    # CHATBOT_LOG_NIVEL=INFO mostra os tokens e a latência de cada chamada à LLM.
+    logging.basicConfig(level=os.environ.get("CHATBOT_LOG_NIVEL", "WARNING"))
+    try:
+        asyncio.run(executar_servidor(args.host, args.porta, args.max_turnos))
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
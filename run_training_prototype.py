@@ -1,6 +1,6 @@
-from models_prototype.data_preprocessing import (
-    main as data_preprocessing_main,
-)  # Importa a main do script de pré-processamento
-
-if __name__ == "__main__":
-    data_preprocessing_main()
+from models_prototype.data_preprocessing import (
+    main as data_preprocessing_main,
+)  # Importa a main do script de pré-processamento
+
+if __name__ == "__main__":
+    data_preprocessing_main()
@@ -0,0 +1,6 @@
+from models_prototype.modelo_intencoes import (
+    main as modelo_intencoes_main,
+)  # Importa a main do treino do classificador de intenções
+
+if __name__ == "__main__":
+    modelo_intencoes_main()
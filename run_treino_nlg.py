@@ -0,0 +1,6 @@
+from models_prototype.treino_nlg import (
+    main as treino_nlg_main,
+)  # Importa a main do treino em lotes do SimpleNLGModel
+
+if __name__ == "__main__":
+    treino_nlg_main()
@@ -1,55 +1,93 @@
-def identificar_intencao(pergunta):
-    """
-    Identifica a intenção da pergunta do usuário com base em palavras-chave.
-    Esta é uma forma simplificada de reconhecimento de intenção para o protótipo.
-
-    Args:
-        pergunta (str): A pergunta completa do usuário.
-
-    Returns:
-        str: A intenção identificada ('factual', 'resumo_geral', 'sair', 'desconhecida').
-    """
-    pergunta_lower = pergunta.lower()
-
-    # Intenção de Saída
-    if (
-        "sair" in pergunta_lower
-        or "adeus" in pergunta_lower
-        or "tchau"
-        or "até logo" in pergunta_lower
-    ):
-        return "sair"
-
-    # Intenções Fatuais (para consulta ao DB)
-    palavras_chave_fatuais = [
-        "quem",
-        "qual",
-        "quando",
-        "onde",
-        "diretor",
-        "ano",
-        "gênero",
-        "genero",
-    ]
-    if any(keyword in pergunta_lower for keyword in palavras_chave_fatuais):
-        return "factual"
-
-    # Intenções de Resumo / Geral (para consulta à LLM sem foco no DB)
-    palavras_chave_resumo_geral = [
-        "resuma",
-        "fale sobre",
-        "me conte",
-        "o que é",
-        "história",
-        "sobre",
-        "personagem",
-        "atores",
-        "atrizes",
-        "qual a moral",
-        "elenco",
-    ]
-    if any(keyword in pergunta_lower for keyword in palavras_chave_resumo_geral):
-        return "resumo_geral"
-
-    # Se não se encaixar em nenhuma das intenções acima
-    return "desconhecida"
+import os
+import threading
+
+from src.agent.classificador_intencoes import ClassificadorIntencoes
+
+# Classificador usado pelo chatbot, criado na primeira pergunta.
+_classificador = None
+_trava_classificador = threading.Lock()
+
+
+def _criar_classificador():
+    """
+    Cria o classificador configurado por variáveis de ambiente (todas opcionais):
+        CHATBOT_MODELO_INTENCOES: Modelo treinado ('.pt' de 'salvar' ou '.ts' do
+            TorchScript). Se vazio, usa as palavras-chave (REGRAS_INTENCOES).
+        CHATBOT_MODELO_INTENCOES_INT8: '1' quantiza o modelo '.pt' em int8.
+
+    Se o modelo não puder ser carregado (ex: PyTorch ausente), volta às palavras-chave.
+    """
+    caminho = os.environ.get("CHATBOT_MODELO_INTENCOES")
+    if not caminho:
+        return ClassificadorIntencoes()
+    try:
+        # Importado só aqui: o PyTorch é opcional para o chatbot.
+        from models_prototype.modelo_intencoes import ClassificadorIntencoesNeural
+
+        if caminho.endswith(".ts"):
+            return ClassificadorIntencoesNeural.carregar_torchscript(caminho)
+        quantizar = os.environ.get("CHATBOT_MODELO_INTENCOES_INT8") == "1"
+        return ClassificadorIntencoesNeural.carregar(caminho, quantizar=quantizar)
+    except Exception as e:
+        print(f"Aviso: modelo de intenções '{caminho}' indisponível ({e}).")
+        print("Usando o classificador por palavras-chave.")
+        return ClassificadorIntencoes()
+
+
+def obter_classificador_intencoes():
+    """
+    Retorna o classificador de intenções do chatbot, criando-o na primeira chamada.
+
+    Returns:
+        ClassificadorIntencoes or ClassificadorIntencoesNeural: O classificador.
+    """
+    global _classificador
+    if _classificador is None:
+        with _trava_classificador:
+            if _classificador is None:
+                _classificador = _criar_classificador()
+    return _classificador
+
+
+def redefinir_classificador_intencoes(classificador=None):
+    """
+    Substitui o classificador compartilhado (ex: um modelo treinado em benchmarks).
+
+    Args:
+        classificador (optional): Objeto com 'classificar' e 'classificar_lote'. Se
+                                  None, o próximo uso recria o padrão.
+    """
+    global _classificador
+    with _trava_classificador:
+        _classificador = classificador
+
+
+def identificar_intencao(pergunta):
+    """
+    Identifica a intenção da pergunta do usuário com base em palavras-chave.
+    Esta é uma forma simplificada de reconhecimento de intenção para o protótipo.
+
+    As palavras-chave casam por palavras inteiras e sem acentos, todas em uma única
+    passada (ver ClassificadorIntencoes). Com CHATBOT_MODELO_INTENCOES, a intenção
+    vem do modelo treinado (ver models_prototype/modelo_intencoes.py).
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+
+    Returns:
+        str: A intenção identificada ('factual', 'resumo_geral', 'sair', 'desconhecida').
+    """
+    return obter_classificador_intencoes().classificar(pergunta)
+
+
+def identificar_intencoes(perguntas):
+    """
+    Versão em lote de 'identificar_intencao'.
+
+    Args:
+        perguntas (iterable): As perguntas.
+
+    Returns:
+        list: A intenção de cada pergunta, na mesma ordem.
+    """
+    return obter_classificador_intencoes().classificar_lote(perguntas)
@@ -0,0 +1,168 @@
+import re
+
+from src.nlp.normalizacao import normalizar_texto, remover_acentos
+
+INTENCAO_DESCONHECIDA = "desconhecida"
+
+# Letras latinas acentuadas -> sem acento ('ê' -> 'e'), para dobrar os acentos com
+# um único 'str.translate' em vez da decomposição Unicode de 'normalizar_texto'.
+_TABELA_SEM_ACENTOS = {
+    codigo: remover_acentos(chr(codigo))
+    for codigo in range(0xC0, 0x250)
+    if remover_acentos(chr(codigo)) != chr(codigo)
+}
+
+# Tabela de regras: intenção -> {palavra-chave: peso}. A ordem das intenções é a
+# prioridade usada no desempate (e no modo sem pesos, a primeira que casar vence).
+# As palavras-chave passam por 'normalizar_texto', então 'gênero' e 'genero' são a
+# mesma regra; o casamento é sempre por palavras inteiras ('ano' não casa 'americano').
+REGRAS_INTENCOES = {
+    "sair": {
+        "sair": 3,
+        "adeus": 3,
+        "tchau": 3,
+        "até logo": 3,
+        "até mais": 3,
+        "encerrar": 3,
+    },
+    "factual": {
+        "quem": 1,
+        "qual": 1,
+        "quais": 1,
+        "quando": 1,
+        "onde": 1,
+        "diretor": 2,
+        "diretora": 2,
+        "dirigiu": 2,
+        "ano": 2,
+        "gênero": 2,
+        "lançado": 2,
+        "lançamento": 2,
+        "protagonista": 2,
+    },
+    "resumo_geral": {
+        "resuma": 2,
+        "resumo": 2,
+        "resumir": 2,
+        "fale sobre": 2,
+        "me fale": 2,
+        "me conte": 2,
+        "o que é": 1,
+        "história": 1,
+        "sobre": 1,
+        "personagem": 1,
+        "personagens": 1,
+        "atores": 1,
+        "atrizes": 1,
+        "elenco": 1,
+        "qual a moral": 3,
+        "enredo": 2,
+        "sinopse": 2,
+    },
+}
+
+
+# Palavras de um trecho casado (para achar a palavra-chave normalizada).
+_PADRAO_PALAVRAS = re.compile(r"[^\W_]+")
+
+
+class ClassificadorIntencoes:
+    """
+    Classificador de intenções por regras, compilado em uma única expressão regular.
+
+    Todas as palavras-chave de todas as intenções viram uma alternância só, casada
+    por palavras inteiras sobre a pergunta em minúsculas e sem acentos. Uma única
+    passada da expressão encontra todas as palavras-chave; cada uma soma seu peso à
+    intenção dona, e a maior pontuação vence (desempate pela ordem das intenções na
+    tabela).
+    """
+
+    def __init__(self, regras=None, ponderado=True):
+        """
+        Compila a tabela de regras.
+
+        Args:
+            regras (dict, optional): Intenção -> {palavra-chave: peso}
+                                     (padrão: REGRAS_INTENCOES).
+            ponderado (bool): Se True, soma os pesos; se False, vence a primeira
+                              intenção da tabela com alguma palavra-chave presente.
+
+        Raises:
+            ValueError: Se a mesma palavra-chave aparecer em duas intenções.
+        """
+        regras = REGRAS_INTENCOES if regras is None else regras
+        self.ponderado = ponderado
+        self._prioridades = {intencao: i for i, intencao in enumerate(regras)}
+        # Palavra-chave normalizada -> (intenção, peso).
+        self._palavras_chave = {}
+        for intencao, palavras in regras.items():
+            for palavra, peso in palavras.items():
+                chave = normalizar_texto(palavra)
+                dono = self._palavras_chave.get(chave, (intencao,))[0]
+                if dono != intencao:
+                    raise ValueError(
+                        f"Palavra-chave '{palavra}' em '{dono}' e em '{intencao}'."
+                    )
+                self._palavras_chave[chave] = (intencao, peso if ponderado else 1)
+
+        # As mais longas primeiro: 'qual a moral' tem de vencer 'qual'. Entre as
+        # palavras de uma expressão vale qualquer separador ('até, logo').
+        alternativas = [
+            r"[\W_]+".join(map(re.escape, chave.split()))
+            for chave in sorted(self._palavras_chave, key=len, reverse=True)
+        ]
+        self._padrao = re.compile(
+            r"(?<![^\W_])(?:" + "|".join(alternativas) + r")(?![^\W_])"
+        )
+
+    def pontuar(self, pergunta):
+        """
+        Soma os pesos das palavras-chave encontradas na pergunta.
+
+        Args:
+            pergunta (str): A pergunta do usuário.
+
+        Returns:
+            dict: Intenção -> pontuação (só as intenções com alguma palavra-chave).
+        """
+        palavras_chave = self._palavras_chave
+        pontuacoes = {}
+        texto = pergunta.casefold().translate(_TABELA_SEM_ACENTOS)
+        for trecho in self._padrao.findall(texto):
+            regra = palavras_chave.get(trecho)
+            if regra is None:  # Expressão com outro separador ('até, logo').
+                regra = palavras_chave[" ".join(_PADRAO_PALAVRAS.findall(trecho))]
+            intencao, peso = regra
+            pontuacoes[intencao] = pontuacoes.get(intencao, 0) + peso
+        return pontuacoes
+
+    def classificar(self, pergunta):
+        """
+        Identifica a intenção da pergunta.
+
+        Args:
+            pergunta (str): A pergunta do usuário.
+
+        Returns:
+            str: A intenção (ex: 'factual'), ou 'desconhecida' se nada casar.
+        """
+        pontuacoes = self.pontuar(pergunta)
+        if len(pontuacoes) < 2:  # O caso comum: nenhuma ou uma só intenção.
+            return next(iter(pontuacoes), INTENCAO_DESCONHECIDA)
+        if not self.ponderado:
+            return min(pontuacoes, key=self._prioridades.__getitem__)
+        prioridades = self._prioridades
+        return max(pontuacoes, key=lambda i: (pontuacoes[i], -prioridades[i]))
+
+    def classificar_lote(self, perguntas):
+        """
+        Classifica várias perguntas de uma vez (ex: um corpus de avaliação).
+
+        Args:
+            perguntas (iterable): As perguntas.
+
+        Returns:
+            list: A intenção de cada pergunta, na mesma ordem.
+        """
+        classificar = self.classificar
+        return [classificar(pergunta) for pergunta in perguntas]
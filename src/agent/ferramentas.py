@@ -0,0 +1,48 @@
+from src.database.db_utils import consultar_filme_no_bd
+
+# Declaração da ferramenta no formato de function calling da API do Gemini.
+DECLARACAO_LOOKUP_MOVIE = {
+    "name": "lookup_movie",
+    "description": (
+        "Busca no banco de dados do chatbot os fatos confirmados de um filme: título, "
+        "diretor, ano, gênero e protagonista. Use sempre que a pergunta mencionar um "
+        "filme específico."
+    ),
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "title": {
+                "type": "string",
+                "description": "O título do filme, como o usuário o escreveu.",
+            }
+        },
+        "required": ["title"],
+    },
+}
+
+FERRAMENTAS_FILMES = [DECLARACAO_LOOKUP_MOVIE]
+
+
+def lookup_movie(title, consultar=consultar_filme_no_bd):
+    """
+    Executa a ferramenta 'lookup_movie' pedida pelo modelo.
+
+    Args:
+        title (str): O título pedido pelo modelo.
+        consultar (callable): Função de consulta ao banco (padrão: consultar_filme_no_bd).
+
+    Returns:
+        dict: Os fatos do filme com 'encontrado': True, ou {'encontrado': False}.
+    """
+    info_filme = consultar(title)
+    if not info_filme:
+        return {"encontrado": False}
+    titulo, diretor, ano, genero, protagonista = info_filme
+    return {
+        "encontrado": True,
+        "titulo": titulo,
+        "diretor": diretor,
+        "ano": ano,
+        "genero": genero,
+        "protagonista": protagonista,
+    }
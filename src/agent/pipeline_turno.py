@@ -0,0 +1,464 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import deque
+
+from src.agent.agent_core import identificar_intencao
+from src.agent.ferramentas import FERRAMENTAS_FILMES, lookup_movie
+from src.database.db_utils import obter_backend_catalogo
+from src.llm.llm_utils import (
+    chamar_llm_com_ferramentas_stream_async,
+    chamar_llm_para_resumo_stream_async,
+)
+from src.llm.metricas_stream import MetricasStream
+from src.nlp.gazetteer import gerar_apelidos
+from src.nlp.normalizacao import normalizar_texto
+from src.nlp.nlp_utils import (
+    buscar_filme_semanticamente,
+    buscar_titulo_aproximado,
+    extrair_candidato_localmente,
+    extrair_filtros_consulta,
+    extrair_titulo_via_llm_async,
+    obter_indice_semantico,
+    registrar_extracao,
+)
+
+MENSAGEM_SAUDACAO = "Saudação inicial para um chatbot cinéfilo."
+MENSAGEM_INSTRUCOES = "Instrução para o usuário sobre como interagir, incluindo como perguntar sobre filmes e como sair."
+MENSAGEM_DESPEDIDA = "Mensagem de despedida do chatbot cinéfilo."
+
+# Modos do pipeline (CHATBOT_MODO_PIPELINE):
+# - 'duas_chamadas': extração do título pela LLM + resposta (fluxo original);
+# - 'ferramenta': uma conversa só, em que a LLM chama 'lookup_movie' se precisar.
+MODO_DUAS_CHAMADAS = "duas_chamadas"
+MODO_FERRAMENTA = "ferramenta"
+MODOS_PIPELINE = (MODO_DUAS_CHAMADAS, MODO_FERRAMENTA)
+
+# Turnos mais recentes guardados por sessão (os mais antigos são descartados).
+MAX_TURNOS_HISTORICO = 20
+
+
+class SessaoChat:
+    """
+    Estado de uma conversa com um usuário (uma sessão do servidor de chat).
+
+    Guarda os últimos turnos (até MAX_TURNOS_HISTORICO) e o último filme encontrado
+    no banco. A trava garante que os turnos de uma mesma sessão sejam processados em
+    ordem, mesmo que o cliente envie várias perguntas sem esperar as respostas.
+    """
+
+    def __init__(self, id_sessao=None):
+        """
+        Args:
+            id_sessao (str, optional): Identificador da sessão. Se None, gera um novo.
+        """
+        self.id = id_sessao or uuid.uuid4().hex
+        self.historico = deque(maxlen=MAX_TURNOS_HISTORICO)  # (pergunta, resposta).
+        self.ultimo_filme = None
+        self.encerrada = False
+        self.ultima_atividade = time.monotonic()
+        self.trava = asyncio.Lock()
+
+    def registrar_turno(self, pergunta, resposta, info_filme=None):
+        """Adiciona um turno ao histórico e atualiza o último filme mencionado."""
+        self.historico.append((pergunta, resposta))
+        if info_filme:
+            self.ultimo_filme = info_filme
+        self.ultima_atividade = time.monotonic()
+
+
+class CronometroEtapas:
+    """
+    Registra quando cada etapa de um turno começou e terminou.
+
+    Os instantes são relativos ao início do turno. Como as etapas podem rodar em
+    paralelo, a soma das durações pode passar do tempo total do turno. A diferença é
+    o que o paralelismo economizou no caminho crítico.
+    """
+
+    def __init__(self, relogio=None):
+        """
+        Args:
+            relogio (callable, optional): Função que retorna o tempo atual em segundos
+                                          (padrão: time.perf_counter).
+        """
+        self._relogio = relogio or time.perf_counter
+        self.inicio = self._relogio()
+        self.etapas = {}  # nome -> (início, fim), em segundos desde 'inicio'.
+
+    def agora(self):
+        """Segundos desde o início do turno."""
+        return self._relogio() - self.inicio
+
+    async def medir(self, nome, aguardavel):
+        """
+        Aguarda 'aguardavel' e registra a etapa 'nome' (mesmo se for cancelada).
+
+        Returns:
+            O resultado de 'aguardavel'.
+        """
+        inicio = self.agora()
+        try:
+            return await aguardavel
+        finally:
+            self.etapas[nome] = (inicio, self.agora())
+
+    def duracoes(self):
+        """Retorna {nome da etapa: duração em segundos}, na ordem de início."""
+        ordenadas = sorted(self.etapas.items(), key=lambda item: item[1][0])
+        return {nome: fim - inicio for nome, (inicio, fim) in ordenadas}
+
+
+def _resposta_especulativa_ligada():
+    """
+    Lê CHATBOT_RESPOSTA_ESPECULATIVA (desligada por padrão; '1' liga).
+
+    A resposta especulativa corta uma latência da LLM dos turnos sem filme no banco,
+    mas custa uma chamada a mais em todo turno que encontra um filme (ela é
+    descartada e refeita com o contexto). Por isso só vale ligar quando a latência
+    importa mais que o custo por turno.
+    """
+    return os.environ.get("CHATBOT_RESPOSTA_ESPECULATIVA", "0") == "1"
+
+
+def _modo_pipeline():
+    """
+    Lê o modo do pipeline de CHATBOT_MODO_PIPELINE (padrão: 'duas_chamadas').
+
+    Raises:
+        ValueError: Se o modo configurado não existir.
+    """
+    modo = os.environ.get("CHATBOT_MODO_PIPELINE", MODO_DUAS_CHAMADAS)
+    if modo not in MODOS_PIPELINE:
+        raise ValueError(
+            f"CHATBOT_MODO_PIPELINE inválido: '{modo}'. Use um de {MODOS_PIPELINE}."
+        )
+    return modo
+
+
+async def _produzir_resposta(pedacos, fila):
+    """Consome a resposta da LLM em streaming, colocando os pedaços em 'fila'."""
+    try:
+        async for pedaco in pedacos:
+            fila.put_nowait(pedaco)
+    finally:
+        fila.put_nowait(None)  # Fim da resposta (mesmo em caso de erro).
+
+
+def _iniciar_resposta(pedacos, cronometro, nome_etapa):
+    """
+    Começa a gerar a resposta em segundo plano.
+
+    Args:
+        pedacos (async iterator): A resposta da LLM em streaming.
+        cronometro (CronometroEtapas): Registra a etapa 'nome_etapa'.
+        nome_etapa (str): Nome da etapa nos tempos do turno.
+
+    Returns:
+        tuple: (tarefa, fila de pedaços). Os pedaços ficam na fila até alguém
+               decidir entregá-los ao usuário (ver '_entregar_resposta').
+    """
+    fila = asyncio.Queue()
+    tarefa = asyncio.create_task(
+        cronometro.medir(nome_etapa, _produzir_resposta(pedacos, fila))
+    )
+    return tarefa, fila
+
+
+def _iniciar_resumo(pergunta_usuario, info_filme, cronometro, nome_etapa, filmes=None):
+    """Começa a gerar a resposta do fluxo padrão (pergunta + fatos do banco)."""
+    pedacos = chamar_llm_para_resumo_stream_async(
+        pergunta_usuario, info_filme=info_filme, filmes=filmes
+    )
+    return _iniciar_resposta(pedacos, cronometro, nome_etapa)
+
+
+async def _entregar_resposta(tarefa, fila, metricas, ao_receber_pedaco):
+    """Repassa os pedaços da fila ao usuário e retorna a resposta completa."""
+    partes = []
+    while True:
+        pedaco = await fila.get()
+        if pedaco is None:
+            break
+        metricas.registrar_pedaco()
+        partes.append(pedaco)
+        if ao_receber_pedaco is not None:
+            await ao_receber_pedaco(pedaco)
+    await tarefa  # Repassa um eventual erro da geração.
+    metricas.finalizar()
+    return "".join(partes)
+
+
+def _cancelar(*tarefas):
+    """Cancela as tarefas que ainda não terminaram (trabalho que se tornou inútil)."""
+    for tarefa in tarefas:
+        if tarefa is not None and not tarefa.done():
+            tarefa.cancel()
+
+
+def _buscar_titulo_tolerante(repositorio, titulo):
+    """
+    Consulta o banco pelo título e, se ele não for encontrado, pelo título do
+    catálogo mais parecido (erros de digitação, grafia estrangeira como 'interstellar').
+
+    Returns:
+        tuple or None: (titulo, diretor, ano, genero, protagonista), ou None.
+    """
+    info_filme = repositorio.buscar_por_titulo(titulo)
+    if info_filme is None:
+        titulo_aproximado = buscar_titulo_aproximado(titulo, backend=repositorio)
+        if titulo_aproximado:
+            info_filme = repositorio.buscar_por_titulo(titulo_aproximado)
+    return info_filme
+
+
+async def _resolver_titulo(pergunta_usuario, repositorio, cronometro, especular):
+    """
+    Descobre o título e os dados do filme, adiantando o que for possível.
+
+    - Menção confiante do catálogo: consulta o banco e dispensa a LLM de extração.
+    - Caso contrário, em paralelo: a extração pela LLM, a consulta ao banco do
+      candidato local (se houver) e, se 'especular', a resposta sem contexto do
+      banco. Essa resposta é a definitiva sempre que o turno terminar sem filme
+      encontrado, que é o caso de saudações e de filmes fora do catálogo.
+    - Título da LLM que não está no banco ('interstellar', 'matirx') ainda é
+      comparado com o catálogo pela busca aproximada (ver 'busca_aproximada').
+    - Perguntas sobre vários filmes ('filmes do Nolan', 'dramas de 1994') também
+      consultam o banco pelos filtros reconhecidos localmente. Sem filme encontrado
+      pelo título, os filmes filtrados viram o contexto (um só vira o info_filme).
+    - Sem nada disso, o índice semântico (se configurado) ainda pode reconhecer um
+      filme descrito pelos metadados ('aquele filme de máfia').
+
+    Returns:
+        tuple: (título, info_filme ou None, lista de filmes ou None, (tarefa, fila)
+               da resposta especulativa ou None).
+    """
+    inicio = cronometro.agora()
+    candidato, confiante = extrair_candidato_localmente(pergunta_usuario, repositorio)
+    filtros = {}
+    if not confiante:
+        filtros = extrair_filtros_consulta(pergunta_usuario, repositorio)
+    cronometro.etapas["titulo_local"] = (inicio, cronometro.agora())
+
+    if confiante:
+        registrar_extracao("local")
+        info_filme = await cronometro.medir(
+            "bd", asyncio.to_thread(repositorio.buscar_por_titulo, candidato)
+        )
+        return candidato, info_filme, None, None
+
+    registrar_extracao("llm")
+    tarefa_llm = asyncio.create_task(
+        cronometro.medir("titulo_llm", extrair_titulo_via_llm_async(pergunta_usuario))
+    )
+    tarefa_bd_candidato = None
+    if candidato:
+        tarefa_bd_candidato = asyncio.create_task(
+            cronometro.medir(
+                "bd_candidato",
+                asyncio.to_thread(repositorio.buscar_por_titulo, candidato),
+            )
+        )
+    tarefa_bd_filtros = None
+    if filtros:
+        tarefa_bd_filtros = asyncio.create_task(
+            cronometro.medir(
+                "bd_filtros",
+                asyncio.to_thread(repositorio.buscar_filmes, **filtros),
+            )
+        )
+    tarefa_semantica = None
+    if obter_indice_semantico() is not None:
+        # Local e rápida: roda junto com a LLM e só é usada se o título falhar.
+        tarefa_semantica = asyncio.create_task(
+            cronometro.medir(
+                "busca_semantica",
+                asyncio.to_thread(buscar_filme_semanticamente, pergunta_usuario),
+            )
+        )
+    especulativa = None
+    if especular:
+        especulativa = _iniciar_resumo(
+            pergunta_usuario, None, cronometro, "resposta_especulativa"
+        )
+
+    try:
+        titulo = await tarefa_llm
+    except BaseException:
+        _cancelar(
+            tarefa_bd_candidato,
+            tarefa_bd_filtros,
+            tarefa_semantica,
+            especulativa and especulativa[0],
+        )
+        raise
+
+    info_filme = None
+    if not titulo:
+        _cancelar(tarefa_bd_candidato)
+    elif candidato and normalizar_texto(titulo) in gerar_apelidos(candidato):
+        info_filme = await tarefa_bd_candidato  # A consulta adiantada acertou.
+    else:
+        _cancelar(tarefa_bd_candidato)
+        info_filme = await cronometro.medir(
+            "bd", asyncio.to_thread(_buscar_titulo_tolerante, repositorio, titulo)
+        )
+
+    filmes = None
+    if info_filme is None and tarefa_bd_filtros is not None:
+        filmes = await tarefa_bd_filtros or None
+        if filmes and len(filmes) == 1:
+            info_filme, filmes = filmes[0], None
+            titulo = info_filme[0]
+    else:
+        _cancelar(tarefa_bd_filtros)
+
+    if info_filme is None and not filmes and tarefa_semantica is not None:
+        info_filme = await tarefa_semantica
+        if info_filme is not None:
+            titulo = info_filme[0]
+    else:
+        _cancelar(tarefa_semantica)
+    return titulo or "", info_filme, filmes, especulativa
+
+
+async def _preparar_resposta_em_duas_chamadas(
+    pergunta_usuario, repositorio, cronometro, contexto, especular
+):
+    """
+    Modo 'duas_chamadas': resolve o título (ver '_resolver_titulo') e começa a
+    resposta com os fatos do banco, aproveitando a especulativa quando possível.
+
+    Returns:
+        tuple: (tarefa, fila) da resposta; 'contexto' recebe título, info_filme e
+               os filmes da consulta por filtros.
+    """
+    titulo, info_filme, filmes, especulativa = await _resolver_titulo(
+        pergunta_usuario, repositorio, cronometro, especular
+    )
+    contexto["titulo"], contexto["info_filme"] = titulo, info_filme
+    contexto["filmes"] = filmes
+    if info_filme is None and not filmes and especulativa is not None:
+        return especulativa  # A resposta adiantada já é a certa.
+    _cancelar(especulativa and especulativa[0])
+    return _iniciar_resumo(
+        pergunta_usuario, info_filme, cronometro, "resposta", filmes=filmes
+    )
+
+
+async def _preparar_resposta_com_ferramenta(
+    pergunta_usuario, repositorio, cronometro, contexto
+):
+    """
+    Modo 'ferramenta': uma única conversa com a LLM, que recebe a ferramenta
+    'lookup_movie' e decide sozinha se consulta o banco. Não há a chamada separada
+    de extração do título. Menções confiantes do catálogo continuam resolvidas
+    localmente e vão direto para a resposta com os fatos (uma só chamada).
+
+    Returns:
+        tuple: (tarefa, fila) da resposta. 'contexto' recebe título e info_filme
+               quando a ferramenta é usada (durante a resposta).
+    """
+    inicio = cronometro.agora()
+    candidato, confiante = extrair_candidato_localmente(pergunta_usuario, repositorio)
+    cronometro.etapas["titulo_local"] = (inicio, cronometro.agora())
+    if confiante:
+        registrar_extracao("local")
+        info_filme = await cronometro.medir(
+            "bd", asyncio.to_thread(repositorio.buscar_por_titulo, candidato)
+        )
+        contexto["titulo"], contexto["info_filme"] = candidato, info_filme
+        return _iniciar_resumo(pergunta_usuario, info_filme, cronometro, "resposta")
+
+    def consultar(titulo):
+        info_filme = _buscar_titulo_tolerante(repositorio, titulo)
+        contexto["titulo"], contexto["info_filme"] = titulo, info_filme
+        return info_filme
+
+    funcoes = {"lookup_movie": lambda title: lookup_movie(title, consultar)}
+    pedacos = chamar_llm_com_ferramentas_stream_async(
+        pergunta_usuario, FERRAMENTAS_FILMES, funcoes
+    )
+    return _iniciar_resposta(pedacos, cronometro, "resposta_com_ferramenta")
+
+
+async def processar_turno_async(
+    pergunta_usuario,
+    sessao,
+    repositorio=None,
+    ao_receber_pedaco=None,
+    especular=None,
+    modo=None,
+):
+    """
+    Executa o pipeline do chatbot para uma pergunta, sem bloquear o loop de eventos.
+
+    Mesmo fluxo do chatbot (intenção -> título -> banco -> resposta da LLM), mas com as
+    etapas independentes em paralelo (ver '_resolver_titulo'): o trabalho que se
+    torna inútil é cancelado e a resposta começa assim que o contexto permite. As
+    chamadas à LLM são assíncronas e a consulta ao SQLite roda em uma thread auxiliar.
+    No modo 'ferramenta', título e resposta saem de uma única conversa com a LLM.
+
+    Args:
+        pergunta_usuario (str): A pergunta do usuário.
+        sessao (SessaoChat): A sessão do usuário (recebe o turno no histórico).
+        repositorio (RepositorioFilmes, optional): Repositório de filmes (padrão: o
+            compartilhado). Com CHATBOT_CATALOGO_MEMORIA, os títulos são buscados
+            no catálogo em memória (ver 'obter_backend_catalogo').
+        ao_receber_pedaco (coroutine function, optional): Recebe cada pedaço da
+            resposta assim que ele pode ser exibido (streaming).
+        especular (bool, optional): Se gera a resposta sem contexto enquanto a LLM
+            extrai o título (padrão: CHATBOT_RESPOSTA_ESPECULATIVA, desligada; ver
+            '_resposta_especulativa_ligada').
+        modo (str, optional): 'duas_chamadas' ou 'ferramenta' (padrão:
+            CHATBOT_MODO_PIPELINE ou 'duas_chamadas').
+
+    Returns:
+        dict: {'resposta': str, 'intencao': str, 'titulo': str, 'encerrar': bool,
+               'tempo_primeiro_pedaco': float, 'tempo_total': float,
+               'etapas': {nome: duração}}
+               (tempos em segundos, contados do início do turno).
+    """
+    metricas = MetricasStream()
+    cronometro = CronometroEtapas()
+    if especular is None:
+        especular = _resposta_especulativa_ligada()
+    modo = modo or _modo_pipeline()
+
+    intencao = identificar_intencao(pergunta_usuario)
+    cronometro.etapas["intencao"] = (0.0, cronometro.agora())  # Local, sem rede.
+
+    contexto = {"titulo": "", "info_filme": None, "filmes": None}
+    if intencao == "sair":
+        tarefa, fila = _iniciar_resumo(MENSAGEM_DESPEDIDA, None, cronometro, "resposta")
+    elif modo == MODO_FERRAMENTA:
+        tarefa, fila = await _preparar_resposta_com_ferramenta(
+            pergunta_usuario, obter_backend_catalogo(repositorio), cronometro, contexto
+        )
+    else:
+        tarefa, fila = await _preparar_resposta_em_duas_chamadas(
+            pergunta_usuario,
+            obter_backend_catalogo(repositorio),
+            cronometro,
+            contexto,
+            especular,
+        )
+
+    try:
+        resposta = await _entregar_resposta(tarefa, fila, metricas, ao_receber_pedaco)
+    except BaseException:
+        _cancelar(tarefa)  # Ex: o cliente desconectou no meio do streaming.
+        raise
+    sessao.registrar_turno(pergunta_usuario, resposta, contexto["info_filme"])
+    sessao.encerrada = intencao == "sair"
+
+    return {
+        "resposta": resposta,
+        "intencao": intencao,
+        "titulo": contexto["titulo"],
+        "encerrar": intencao == "sair",
+        "tempo_primeiro_pedaco": metricas.tempo_primeiro_pedaco,
+        "tempo_total": metricas.tempo_total,
+        "etapas": cronometro.duracoes(),
+    }
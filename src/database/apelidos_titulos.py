@@ -0,0 +1,309 @@
+import argparse
+import itertools
+import sqlite3
+import sys
+import time
+
+from src.database.importador_filmes import abrir_texto, detectar_formato, ler_registros
+from src.database.setup_db import DATABASE_NAME, criar_tabela_filmes
+from src.nlp.normalizacao import normalizar_texto
+
+# Títulos alternativos dos filmes (título original, título em inglês, ...), com o
+# idioma de cada um. A chave começa pelo apelido normalizado: 'Inception' é achado
+# com uma única busca na chave primária, sem varrer os títulos. Um apelido pode
+# apontar para mais de um filme (refilmagens com o mesmo título original).
+SQL_TABELA_APELIDOS = [
+    """
+    CREATE TABLE IF NOT EXISTS titulo_alias (
+        alias_normalizado TEXT NOT NULL,
+        filme_id INTEGER NOT NULL REFERENCES filmes(id),
+        alias TEXT NOT NULL,
+        idioma TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (alias_normalizado, filme_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_titulo_alias_filme ON titulo_alias(filme_id)",
+    """
+    CREATE TRIGGER IF NOT EXISTS filmes_alias_ad AFTER DELETE ON filmes BEGIN
+        DELETE FROM titulo_alias WHERE filme_id = old.id;
+    END
+    """,
+]
+
+# Tabela temporária da importação: os apelidos chegam pelo título do catálogo e são
+# ligados aos filmes no final, com uma única junção.
+SQL_TABELA_CARGA = """
+    CREATE TEMP TABLE IF NOT EXISTS carga_alias (
+        titulo_normalizado TEXT NOT NULL,
+        ano INTEGER,
+        alias TEXT NOT NULL,
+        alias_normalizado TEXT NOT NULL,
+        idioma TEXT NOT NULL
+    )
+"""
+
+SQL_LIGAR_APELIDOS = """
+    INSERT INTO titulo_alias (alias_normalizado, filme_id, alias, idioma)
+    SELECT c.alias_normalizado, f.id, c.alias, c.idioma
+    FROM carga_alias AS c
+    JOIN filmes AS f ON f.titulo_normalizado = c.titulo_normalizado
+        AND (c.ano IS NULL OR f.ano = c.ano)
+    WHERE true
+    ON CONFLICT (alias_normalizado, filme_id) DO UPDATE SET
+        alias = excluded.alias, idioma = excluded.idioma
+"""
+
+TAMANHO_LOTE_PADRAO = 50_000
+
+# Títulos alternativos dos filmes de exemplo (ver setup_db.popular_filmes_exemplo):
+# (título no catálogo, ano, apelido, idioma). Títulos iguais nos dois idiomas
+# ('Oppenheimer') e os que só perdem o subtítulo ('Whiplash') não precisam de apelido.
+APELIDOS_EXEMPLO = [
+    ("O Poderoso Chefão", 1972, "The Godfather", "en"),
+    ("Um Sonho de Liberdade", 1994, "The Shawshank Redemption", "en"),
+    ("A Lista de Schindler", 1993, "Schindler's List", "en"),
+    ("Pulp Fiction: Tempo de Violência", 1994, "Pulp Fiction", "en"),
+    (
+        "O Senhor dos Anéis: A Sociedade do Anel",
+        2001,
+        "The Lord of the Rings: The Fellowship of the Ring",
+        "en",
+    ),
+    ("O Cavaleiro das Trevas", 2008, "The Dark Knight", "en"),
+    ("A Origem", 2010, "Inception", "en"),
+    ("Matrix", 1999, "The Matrix", "en"),
+    ("Clube da Luta", 1999, "Fight Club", "en"),
+    ("Interestelar", 2014, "Interstellar", "en"),
+    ("Gladiador", 2000, "Gladiator", "en"),
+    ("Django Livre", 2012, "Django Unchained", "en"),
+    ("O Silêncio dos Inocentes", 1991, "The Silence of the Lambs", "en"),
+    ("Bastardos Inglórios", 2009, "Inglourious Basterds", "en"),
+    ("O Resgate do Soldado Ryan", 1998, "Saving Private Ryan", "en"),
+    ("À Espera de um Milagre", 1999, "The Green Mile", "en"),
+    ("O Lobo de Wall Street", 2013, "The Wolf of Wall Street", "en"),
+    ("Beleza Americana", 1999, "American Beauty", "en"),
+    ("Ilha do Medo", 2010, "Shutter Island", "en"),
+    ("V de Vingança", 2005, "V for Vendetta", "en"),
+    ("De Volta Para o Futuro", 1985, "Back to the Future", "en"),
+    ("O Profissional", 1994, "Léon", "fr"),
+    ("O Profissional", 1994, "Léon: The Professional", "en"),
+    ("Os Suspeitos", 1995, "The Usual Suspects", "en"),
+    (
+        "O Exterminador do Futuro 2: O Julgamento Final",
+        1991,
+        "Terminator 2: Judgment Day",
+        "en",
+    ),
+    ("Kill Bill: Volume 1", 2003, "Kill Bill: Vol. 1", "en"),
+    ("Guardiões da Galáxia", 2014, "Guardians of the Galaxy", "en"),
+    ("Coração Valente", 1995, "Braveheart", "en"),
+    ("Os Bons Companheiros", 1990, "Goodfellas", "en"),
+    ("Procurando Nemo", 2003, "Finding Nemo", "en"),
+    ("O Sexto Sentido", 1999, "The Sixth Sense", "en"),
+    ("O Show de Truman", 1998, "The Truman Show", "en"),
+    ("Um Estranho no Ninho", 1975, "One Flew Over the Cuckoo's Nest", "en"),
+    ("Cães de Aluguel", 1992, "Reservoir Dogs", "en"),
+    ("Parasita", 2019, "Parasite", "en"),
+    ("Parasita", 2019, "Gisaengchung", "ko"),
+    ("A Chegada", 2016, "Arrival", "en"),
+    ("Mad Max: Estrada da Fúria", 2015, "Mad Max: Fury Road", "en"),
+    ("A Rede Social", 2010, "The Social Network", "en"),
+    ("O Grande Lebowski", 1998, "The Big Lebowski", "en"),
+    ("Seven: Os Sete Crimes Capitais", 1995, "Se7en", "en"),
+    ("Amelie Poulain", 2001, "Le Fabuleux Destin d'Amélie Poulain", "fr"),
+    ("Amelie Poulain", 2001, "Amélie", "en"),
+    ("O Labirinto do Fauno", 2006, "El laberinto del fauno", "es"),
+    ("O Labirinto do Fauno", 2006, "Pan's Labyrinth", "en"),
+    ("Cidade de Deus", 2002, "City of God", "en"),
+    ("Central do Brasil", 1998, "Central Station", "en"),
+    ("Tropa de Elite", 2007, "Elite Squad", "en"),
+    (
+        "Tropa de Elite 2: O Inimigo Agora é Outro",
+        2010,
+        "Elite Squad: The Enemy Within",
+        "en",
+    ),
+    ("O Auto da Compadecida", 2000, "A Dog's Will", "en"),
+    ("Que Horas Ela Volta?", 2015, "The Second Mother", "en"),
+    ("O Homem que Copiava", 2003, "The Man Who Copied", "en"),
+    ("Lisbela e o Prisioneiro", 2003, "Lisbela and the Prisoner", "en"),
+    ("Cidade Baixa", 2005, "Lower City", "en"),
+    ("O Som ao Redor", 2012, "Neighboring Sounds", "en"),
+    ("Capitão Fantástico", 2016, "Captain Fantastic", "en"),
+    ("A Forma da Água", 2017, "The Shape of Water", "en"),
+    ("Corra!", 2017, "Get Out", "en"),
+    ("Nasce Uma Estrela", 2018, "A Star Is Born", "en"),
+    ("O Pai", 2020, "The Father", "en"),
+    ("Duna", 2021, "Dune", "en"),
+    ("Não Olhe Para Cima", 2021, "Don't Look Up", "en"),
+    (
+        "Tudo em Todo o Lugar ao Mesmo Tempo",
+        2022,
+        "Everything Everywhere All at Once",
+        "en",
+    ),
+    ("Os Banshees de Inisherin", 2022, "The Banshees of Inisherin", "en"),
+    ("Avatar: O Caminho da Água", 2022, "Avatar: The Way of Water", "en"),
+]
+
+
+def criar_tabela_apelidos(conn):
+    """
+    Cria a tabela 'titulo_alias' (se não existir).
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco.
+    """
+    for sql in SQL_TABELA_APELIDOS:
+        conn.execute(sql)
+
+
+def possui_apelidos(conn):
+    """Indica se o banco já possui a tabela 'titulo_alias'."""
+    return (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'titulo_alias'"
+        ).fetchone()
+        is not None
+    )
+
+
+def _linha_de_carga(titulo, ano, alias, idioma):
+    """Linha de 'carga_alias', ou None se faltar o título ou o apelido."""
+    titulo_normalizado = normalizar_texto(titulo or "")
+    alias_normalizado = normalizar_texto(alias or "")
+    if not titulo_normalizado or not alias_normalizado:
+        return None
+    ano = int(ano) if ano not in (None, "") else None
+    return (titulo_normalizado, ano, alias.strip(), alias_normalizado, idioma or "")
+
+
+def _carregar_lote(conn, lote):
+    """Grava um lote de linhas (já convertidas) na tabela temporária da carga."""
+    conn.executemany("INSERT INTO carga_alias VALUES (?, ?, ?, ?, ?)", lote)
+
+
+def _ligar_apelidos(conn):
+    """Liga os apelidos carregados aos filmes, esvazia a tabela temporária e
+    devolve quantas linhas de 'titulo_alias' foram gravadas ou atualizadas."""
+    gravados = conn.execute(SQL_LIGAR_APELIDOS).rowcount
+    conn.execute("DELETE FROM carga_alias")
+    return gravados
+
+
+def adicionar_apelidos(conn, apelidos):
+    """
+    Adiciona títulos alternativos a filmes que já estão no banco.
+
+    Cada apelido é ligado a todos os filmes com o mesmo título normalizado (e o
+    mesmo ano, se informado). Apelidos de títulos que não estão no catálogo são
+    ignorados. A transação fica a cargo de quem chama.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco.
+        apelidos (iterable): Tuplas (título no catálogo, ano ou None, apelido, idioma).
+
+    Returns:
+        int: Quantas linhas de 'titulo_alias' foram gravadas ou atualizadas.
+    """
+    criar_tabela_apelidos(conn)
+    conn.execute(SQL_TABELA_CARGA)
+    linhas = [_linha_de_carga(*apelido) for apelido in apelidos]
+    _carregar_lote(conn, [linha for linha in linhas if linha])
+    return _ligar_apelidos(conn)
+
+
+def popular_apelidos_exemplo(conn):
+    """Adiciona os APELIDOS_EXEMPLO aos filmes de exemplo presentes no banco."""
+    return adicionar_apelidos(conn, APELIDOS_EXEMPLO)
+
+
+def importar_apelidos(
+    caminho_arquivo,
+    caminho_bd=DATABASE_NAME,
+    formato=None,
+    tamanho_lote=TAMANHO_LOTE_PADRAO,
+):
+    """
+    Importa títulos alternativos de um arquivo CSV, TSV ou JSONL (opcionalmente gzip).
+
+    Colunas: 'titulo' (como está no catálogo), 'ano' (opcional, desempata títulos
+    repetidos), 'apelido' e 'idioma' (ex: 'en', 'fr'). O arquivo é lido em fluxo e
+    carregado em lotes numa tabela temporária; a ligação com os filmes é uma única
+    junção no final, na mesma transação.
+
+    Args:
+        caminho_arquivo (str): O arquivo a importar ('.csv', '.tsv', '.jsonl', '.gz').
+        caminho_bd (str): Caminho do arquivo SQLite.
+        formato (str, optional): 'csv', 'tsv' ou 'jsonl' (padrão: pela extensão).
+        tamanho_lote (int): Linhas por 'executemany'.
+
+    Returns:
+        dict: {'linhas': linhas válidas lidas, 'apelidos': linhas gravadas ou
+               atualizadas em 'titulo_alias', 'segundos': duração}.
+    """
+    formato = formato or detectar_formato(caminho_arquivo)
+    criar_tabela_filmes(caminho_bd)
+    inicio = time.perf_counter()
+    conn = sqlite3.connect(caminho_bd, isolation_level=None)
+    try:
+        criar_tabela_apelidos(conn)
+        conn.execute(SQL_TABELA_CARGA)
+        linhas_lidas = 0
+        conn.execute("BEGIN")
+        with abrir_texto(caminho_arquivo) as arquivo:
+            linhas = (
+                _linha_de_carga(
+                    registro.get("titulo"),
+                    registro.get("ano"),
+                    registro.get("apelido"),
+                    registro.get("idioma"),
+                )
+                for registro in ler_registros(arquivo, formato)
+            )
+            linhas = (linha for linha in linhas if linha)
+            while True:
+                lote = list(itertools.islice(linhas, tamanho_lote))
+                if not lote:
+                    break
+                _carregar_lote(conn, lote)
+                linhas_lidas += len(lote)
+        gravados = _ligar_apelidos(conn)
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return {
+        "linhas": linhas_lidas,
+        "apelidos": gravados,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def main():
+    """Importa títulos alternativos (CSV/TSV/JSONL, opcionalmente .gz) para o SQLite."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("arquivo")
+    parser.add_argument("--bd", default=DATABASE_NAME, help="Banco de destino.")
+    parser.add_argument("--formato", choices=("csv", "tsv", "jsonl"))
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO)
+    args = parser.parse_args()
+
+    try:
+        resultado = importar_apelidos(
+            args.arquivo, args.bd, formato=args.formato, tamanho_lote=args.lote
+        )
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Erro ao importar '{args.arquivo}': {e}")
+        sys.exit(1)
+    print(
+        f"{resultado['linhas']:,} linhas lidas; {resultado['apelidos']:,} títulos "
+        f"alternativos gravados em {resultado['segundos']:.1f}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,598 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import sqlite3
+import struct
+import threading
+import time
+
+import numpy as np
+
+from src.database.apelidos_titulos import possui_apelidos
+from src.database.setup_db import DATABASE_NAME
+from src.nlp.normalizacao import normalizar_texto
+
+# Cabeçalho do arquivo: assinatura, versão do formato e tamanho do JSON de metadados.
+ASSINATURA_ARQUIVO = b"FILMCAT1"
+_CABECALHO = struct.Struct("<8sI")
+ALINHAMENTO = 8
+
+# Ano ausente na coluna 'anos' (int32 não tem None).
+ANO_AUSENTE = np.iinfo(np.int32).min
+
+# Colunas de texto de cada filme (ids na tabela de textos; -1 = None).
+COLUNAS_TEXTO = ("titulo", "diretor", "genero", "protagonista")
+
+# Baldes do índice de trigramas dos títulos (potência de 2). Trigramas diferentes
+# podem cair no mesmo balde: os candidatos são sempre conferidos no título.
+NUM_BALDES_TRIGRAMAS = 1 << 16
+
+# De quanto em quanto tempo (segundos) 'obter_catalogo' confere se o arquivo foi
+# substituído por uma versão nova.
+INTERVALO_VERIFICACAO = 1.0
+
+
+def _hash_titulo(titulo_normalizado):
+    """Hash de 64 bits estável entre processos (ao contrário do hash() do Python)."""
+    digest = hashlib.blake2b(titulo_normalizado, digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def assinatura_do_banco(caminho_bd):
+    """
+    Identifica o estado do arquivo do banco (tamanho e data de modificação do arquivo
+    e do WAL): muda a cada escrita, sem precisar abrir o banco.
+
+    Returns:
+        list: [tamanho, mtime_ns] do banco e do '-wal' ([0, 0] se não existir ou
+              estiver vazio, como o que uma simples leitura cria).
+    """
+    assinatura = []
+    for caminho in (caminho_bd, f"{caminho_bd}-wal"):
+        try:
+            estado = os.stat(caminho)
+        except FileNotFoundError:
+            estado = None
+        if estado is None or not estado.st_size:
+            assinatura += [0, 0]
+        else:
+            assinatura += [estado.st_size, estado.st_mtime_ns]
+    return assinatura
+
+
+def _ler_filmes(caminho_bd):
+    """
+    Lê o banco (somente leitura): os filmes, na ordem dos ids, e os títulos
+    alternativos (ver apelidos_titulos), se o banco tiver a tabela.
+
+    Returns:
+        tuple: (linhas dos filmes, pares (apelido normalizado, id do filme)).
+    """
+    uri = f"{pathlib.Path(caminho_bd).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        linhas = conn.execute(
+            "SELECT id, titulo, diretor, ano, genero, protagonista FROM filmes "
+            "ORDER BY id"
+        ).fetchall()
+        apelidos = []
+        if possui_apelidos(conn):
+            apelidos = conn.execute(
+                "SELECT alias_normalizado, filme_id FROM titulo_alias"
+            ).fetchall()
+        return linhas, apelidos
+    finally:
+        conn.close()
+
+
+def _montar_secoes(linhas, apelidos=()):
+    """
+    Monta os arrays do instantâneo a partir das linhas do banco e dos apelidos.
+
+    Returns:
+        dict: Nome da seção -> numpy.ndarray.
+    """
+    n = len(linhas)
+    ids = np.empty(n, dtype=np.int64)
+    anos = np.empty(n, dtype=np.int32)
+    campos = np.empty((n, len(COLUNAS_TEXTO)), dtype=np.int32)
+
+    # Textos internados: cada nome/gênero aparece uma vez, por mais filmes que tenha.
+    ids_textos = {}
+    textos = []
+    titulos_normalizados = []
+    for i, (id_filme, titulo, diretor, ano, genero, protagonista) in enumerate(linhas):
+        ids[i] = id_filme
+        anos[i] = ANO_AUSENTE if ano is None else ano
+        for j, texto in enumerate((titulo, diretor, genero, protagonista)):
+            if texto is None:
+                campos[i, j] = -1
+                continue
+            id_texto = ids_textos.get(texto)
+            if id_texto is None:
+                id_texto = ids_textos[texto] = len(textos)
+                textos.append(texto.encode("utf-8"))
+            campos[i, j] = id_texto
+        titulos_normalizados.append(normalizar_texto(titulo).encode("utf-8"))
+
+    secoes = {"ids": ids, "anos": anos, "campos": campos}
+    secoes["textos_inicios"], secoes["textos"] = _concatenar(textos, b"")
+    # Títulos normalizados separados por '\n' (que nunca aparece neles): a busca
+    # por substring é um 'find' direto no bloco, sem decodificar nada.
+    secoes["titulos_inicios"], secoes["titulos"] = _concatenar(
+        titulos_normalizados, b"\n"
+    )
+    secoes["trigramas_inicios"], secoes["trigramas_linhas"] = _indexar_trigramas(
+        secoes["titulos"], secoes["titulos_inicios"]
+    )
+
+    # Tabela hash (endereçamento aberto, sondagem linear) do título normalizado exato.
+    tamanho = 1 << max(4, (2 * n).bit_length())
+    chaves = np.zeros(tamanho, dtype=np.uint64)
+    posicoes = np.full(tamanho, -1, dtype=np.int32)
+    mascara = tamanho - 1
+    vistos = set()
+    for i, titulo_normalizado in enumerate(titulos_normalizados):
+        if not titulo_normalizado or titulo_normalizado in vistos:
+            continue  # Títulos repetidos: vale o de menor id.
+        vistos.add(titulo_normalizado)
+        chave = _hash_titulo(titulo_normalizado)
+        slot = chave & mascara
+        while posicoes[slot] != -1:
+            slot = (slot + 1) & mascara
+        chaves[slot], posicoes[slot] = chave, i
+    secoes["hash_chaves"], secoes["hash_posicoes"] = chaves, posicoes
+
+    # Títulos alternativos: hashes ordenados (busca binária) e a linha de cada um.
+    # Um apelido de vários filmes fica com o de menor id, como no repositório.
+    chaves_apelidos, linhas_apelidos = [], []
+    posicoes_ids = np.searchsorted(ids, [id_filme for _, id_filme in apelidos])
+    for (alias_normalizado, _), posicao in zip(apelidos, posicoes_ids.tolist()):
+        chaves_apelidos.append(_hash_titulo(alias_normalizado.encode("utf-8")))
+        linhas_apelidos.append(posicao)
+    chaves_apelidos = np.array(chaves_apelidos, dtype=np.uint64)
+    linhas_apelidos = np.array(linhas_apelidos, dtype=np.int32)
+    ordem = np.lexsort((linhas_apelidos, chaves_apelidos))
+    chaves_apelidos, linhas_apelidos = chaves_apelidos[ordem], linhas_apelidos[ordem]
+    primeiras = np.ones(len(chaves_apelidos), dtype=bool)
+    primeiras[1:] = chaves_apelidos[1:] != chaves_apelidos[:-1]
+    secoes["apelidos_chaves"] = chaves_apelidos[primeiras]
+    secoes["apelidos_linhas"] = linhas_apelidos[primeiras]
+    return secoes
+
+
+def _baldes_trigramas(bytes_):
+    """Balde de cada trigrama (3 bytes seguidos) de um array uint8 (hash Fibonacci)."""
+    b = bytes_.astype(np.uint32)
+    codigos = (b[:-2] << 16) | (b[1:-1] << 8) | b[2:]
+    return (codigos * np.uint32(2654435761)) >> np.uint32(32 - 16)
+
+
+def _indexar_trigramas(titulos, inicios):
+    """
+    Índice invertido dos trigramas dos títulos, em formato CSR: as linhas com
+    trigramas do balde b são 'linhas[inicios_baldes[b] : inicios_baldes[b + 1]]',
+    em ordem crescente e sem repetição.
+
+    Returns:
+        tuple: (inicios_baldes [NUM_BALDES_TRIGRAMAS + 1], linhas).
+    """
+    inicios_baldes = np.zeros(NUM_BALDES_TRIGRAMAS + 1, dtype=np.int64)
+    num_linhas = len(inicios) - 1
+    if len(titulos) < 3 or not num_linhas:
+        return inicios_baldes, np.zeros(0, dtype=np.int32)
+    separador = titulos == ord("\n")
+    validos = ~(separador[:-2] | separador[1:-1] | separador[2:])
+    deslocamentos = np.flatnonzero(validos)
+    linhas = np.searchsorted(inicios, deslocamentos, side="right") - 1
+    baldes = _baldes_trigramas(titulos)[deslocamentos].astype(np.int64)
+    pares = np.unique(baldes * num_linhas + linhas)  # Ordena por balde e linha.
+    contagens = np.bincount(pares // num_linhas, minlength=NUM_BALDES_TRIGRAMAS)
+    inicios_baldes[1:] = np.cumsum(contagens)
+    return inicios_baldes, (pares % num_linhas).astype(np.int32)
+
+
+def _concatenar(textos, separador):
+    """Junta os textos em um bloco de bytes e retorna (inícios [n + 1], bloco)."""
+    inicios = np.zeros(len(textos) + 1, dtype=np.int64)
+    if textos:
+        tamanhos = np.fromiter((len(t) for t in textos), np.int64, len(textos))
+        inicios[1:] = np.cumsum(tamanhos + len(separador))
+    bloco = separador.join(textos) + (separador if textos else b"")
+    return inicios, np.frombuffer(bloco, dtype=np.uint8)
+
+
+def construir_catalogo(caminho_bd=DATABASE_NAME, caminho_arquivo="data/catalogo.bin"):
+    """
+    Gera o instantâneo do catálogo a partir da tabela 'filmes' e o publica.
+
+    O arquivo é escrito ao lado do definitivo e trocado com 'os.replace', que é
+    atômico: quem já tem o arquivo antigo aberto continua lendo a versão antiga e
+    quem abrir depois vê a nova, nunca um arquivo pela metade.
+
+    Args:
+        caminho_bd (str): Caminho do arquivo SQLite.
+        caminho_arquivo (str): Onde gravar o instantâneo.
+
+    Returns:
+        int: Quantos filmes o instantâneo contém.
+    """
+    assinatura = assinatura_do_banco(caminho_bd)  # Antes de ler: na dúvida, regera.
+    linhas, apelidos = _ler_filmes(caminho_bd)
+    secoes = _montar_secoes(linhas, apelidos)
+
+    deslocamento = 0
+    descritores = {}
+    for nome, array in secoes.items():
+        descritores[nome] = [deslocamento, array.dtype.str, list(array.shape)]
+        deslocamento += -(-array.nbytes // ALINHAMENTO) * ALINHAMENTO
+    metadados = json.dumps(
+        {
+            "banco": os.path.abspath(caminho_bd),
+            "assinatura_banco": assinatura,
+            "num_filmes": len(linhas),
+            "secoes": descritores,
+        }
+    ).encode("utf-8")
+    inicio_dados = _CABECALHO.size + len(metadados)
+    inicio_dados = -(-inicio_dados // ALINHAMENTO) * ALINHAMENTO
+
+    temporario = f"{caminho_arquivo}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(_CABECALHO.pack(ASSINATURA_ARQUIVO, len(metadados)))
+        arquivo.write(metadados)
+        for nome, array in secoes.items():
+            arquivo.seek(inicio_dados + descritores[nome][0])
+            arquivo.write(np.ascontiguousarray(array).tobytes())
+        arquivo.truncate(inicio_dados + deslocamento)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho_arquivo)
+    return len(linhas)
+
+
+def atualizar_catalogo(caminho_bd=DATABASE_NAME, caminho_arquivo="data/catalogo.bin"):
+    """
+    Regera o instantâneo só se o banco mudou desde a última geração.
+
+    Returns:
+        int or None: Quantos filmes o instantâneo regerado contém, ou None se ele
+                     já estava atualizado.
+    """
+    try:
+        catalogo = CatalogoMemoria.carregar(caminho_arquivo)
+    except (OSError, ValueError):
+        catalogo = None
+    if catalogo is not None:
+        desatualizado = catalogo.assinatura_banco != assinatura_do_banco(caminho_bd)
+        catalogo.fechar()
+        if not desatualizado:
+            return None
+    return construir_catalogo(caminho_bd, caminho_arquivo)
+
+
+class CatalogoMemoria:
+    """
+    Instantâneo somente leitura do catálogo, em um arquivo lido por memória mapeada.
+
+    O arquivo guarda o catálogo em colunas: ids e anos em arrays numpy, os textos
+    (títulos, nomes, gêneros) uma única vez cada em uma tabela de textos, e uma
+    tabela hash dos títulos normalizados. Abrir o arquivo não copia nada: os arrays
+    apontam direto para as páginas mapeadas, que o sistema operacional compartilha
+    entre todos os processos (ex: os workers do servidor) que abrem o mesmo arquivo.
+
+    As consultas têm a mesma interface e o mesmo retorno de RepositorioFilmes
+    ('buscar_por_titulo', 'listar_titulos', 'listar_filmes'), sem tocar no SQLite.
+    """
+
+    def __init__(self, caminho_arquivo):
+        """
+        Args:
+            caminho_arquivo (str): Instantâneo gravado por 'construir_catalogo'.
+
+        Raises:
+            OSError: Se o arquivo não puder ser aberto.
+            ValueError: Se o arquivo não for um instantâneo válido.
+        """
+        self.caminho_arquivo = caminho_arquivo
+        with open(caminho_arquivo, "rb") as arquivo:
+            estado = os.fstat(arquivo.fileno())
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._identidade = (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+
+        assinatura, tamanho_metadados = _CABECALHO.unpack_from(self._mapa, 0)
+        if assinatura != ASSINATURA_ARQUIVO:
+            self._mapa.close()
+            raise ValueError(f"'{caminho_arquivo}' não é um catálogo em memória.")
+        fim_metadados = _CABECALHO.size + tamanho_metadados
+        metadados = json.loads(self._mapa[_CABECALHO.size : fim_metadados])
+        inicio_dados = -(-fim_metadados // ALINHAMENTO) * ALINHAMENTO
+
+        self.assinatura_banco = metadados["assinatura_banco"]
+        secoes = {}
+        for nome, (deslocamento, dtype, forma) in metadados["secoes"].items():
+            dtype = np.dtype(dtype)
+            secoes[nome] = np.frombuffer(
+                self._mapa,
+                dtype=dtype,
+                count=int(np.prod(forma, dtype=np.int64)),
+                offset=inicio_dados + deslocamento,
+            ).reshape(forma)
+        self.ids = secoes["ids"]
+        self.anos = secoes["anos"]
+        self._campos = secoes["campos"]
+        self._textos_inicios = secoes["textos_inicios"]
+        self._textos = secoes["textos"]
+        self._titulos_inicios = secoes["titulos_inicios"]
+        self._titulos_deslocamento = inicio_dados + metadados["secoes"]["titulos"][0]
+        self._titulos_fim = self._titulos_deslocamento + len(secoes["titulos"])
+        self._hash_chaves = secoes["hash_chaves"]
+        self._hash_posicoes = secoes["hash_posicoes"]
+        self._trigramas_inicios = secoes["trigramas_inicios"]
+        self._trigramas_linhas = secoes["trigramas_linhas"]
+        self._mascara = len(self._hash_chaves) - 1
+        # Instantâneos gerados antes dos títulos alternativos não têm estas seções.
+        self._apelidos_chaves = secoes.get("apelidos_chaves", np.zeros(0, np.uint64))
+        self._apelidos_linhas = secoes.get("apelidos_linhas", np.zeros(0, np.int32))
+
+    @classmethod
+    def carregar(cls, caminho_arquivo):
+        """Abre um instantâneo gravado por 'construir_catalogo'."""
+        return cls(caminho_arquivo)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def foi_substituido(self):
+        """Indica se o arquivo em disco já é outro (um instantâneo mais novo)."""
+        try:
+            estado = os.stat(self.caminho_arquivo)
+        except FileNotFoundError:
+            return False
+        return (estado.st_ino, estado.st_mtime_ns, estado.st_size) != self._identidade
+
+    def _texto(self, id_texto):
+        if id_texto < 0:
+            return None
+        inicio, fim = self._textos_inicios[id_texto : id_texto + 2]
+        return self._textos[inicio:fim].tobytes().decode("utf-8")
+
+    def _titulo_normalizado(self, posicao):
+        """Bytes do título normalizado da linha (sem o separador)."""
+        inicio, fim = self._titulos_inicios[posicao : posicao + 2]
+        base = self._titulos_deslocamento
+        return self._mapa[base + inicio : base + fim - 1]
+
+    def linha(self, posicao):
+        """Monta a tupla (titulo, diretor, ano, genero, protagonista) da linha."""
+        titulo, diretor, genero, protagonista = (
+            self._texto(int(id_texto)) for id_texto in self._campos[posicao]
+        )
+        ano = int(self.anos[posicao])
+        ano = None if ano == ANO_AUSENTE else ano
+        return (titulo, diretor, ano, genero, protagonista)
+
+    def _posicao_exata(self, titulo_normalizado):
+        """Posição do filme com exatamente esse título normalizado, ou None."""
+        chave = _hash_titulo(titulo_normalizado)
+        slot = chave & self._mascara
+        while True:
+            posicao = int(self._hash_posicoes[slot])
+            if posicao == -1:
+                return None
+            if int(self._hash_chaves[slot]) == chave and (
+                self._titulo_normalizado(posicao) == titulo_normalizado
+            ):
+                return posicao
+            slot = (slot + 1) & self._mascara
+
+    def _posicao_por_apelido(self, titulo_normalizado):
+        """
+        Posição do filme com esse título alternativo exato, ou None. Só o hash de 64
+        bits é conferido (o texto do apelido não fica no instantâneo).
+        """
+        chave = np.uint64(_hash_titulo(titulo_normalizado))
+        i = int(np.searchsorted(self._apelidos_chaves, chave))
+        if i < len(self._apelidos_chaves) and self._apelidos_chaves[i] == chave:
+            return int(self._apelidos_linhas[i])
+        return None
+
+    def _candidatos_por_trigramas(self, titulo_normalizado):
+        """Linhas que têm todos os trigramas do texto (interseção das listas)."""
+        baldes = np.unique(
+            _baldes_trigramas(np.frombuffer(titulo_normalizado, dtype=np.uint8))
+        )
+        listas = sorted(
+            (
+                self._trigramas_linhas[
+                    self._trigramas_inicios[b] : self._trigramas_inicios[b + 1]
+                ]
+                for b in baldes
+            ),
+            key=len,
+        )
+        candidatos = listas[0]
+        for lista in listas[1:]:
+            if not len(candidatos):
+                break
+            indices = np.minimum(np.searchsorted(lista, candidatos), len(lista) - 1)
+            candidatos = candidatos[lista[indices] == candidatos]
+        return candidatos
+
+    def _posicao_por_substring(self, titulo_normalizado):
+        """
+        Entre os títulos que contêm o texto, o que começa por ele e, depois, o mais
+        curto (a mesma preferência da busca do RepositorioFilmes, sem o bm25).
+
+        Com 3 bytes ou mais, só as linhas que têm todos os trigramas do texto são
+        conferidas; textos menores varrem o bloco de títulos.
+        """
+        if len(titulo_normalizado) < 3:
+            return self._posicao_por_varredura(titulo_normalizado)
+        candidatos = self._candidatos_por_trigramas(titulo_normalizado)
+        tamanhos = (
+            self._titulos_inicios[candidatos + 1] - self._titulos_inicios[candidatos]
+        )
+        melhor = None
+        for posicao in candidatos[np.argsort(tamanhos, kind="stable")]:
+            encontrado = self._titulo_normalizado(posicao).find(titulo_normalizado)
+            if encontrado == 0:
+                return int(posicao)  # O mais curto dos que começam pelo texto.
+            if encontrado > 0 and melhor is None:
+                melhor = int(posicao)
+        return melhor
+
+    def _posicao_por_varredura(self, titulo_normalizado):
+        """Como '_posicao_por_substring', procurando o texto no bloco inteiro."""
+        melhor, melhor_ordem = None, None
+        base = self._titulos_deslocamento
+        inicio = self._mapa.find(titulo_normalizado, base, self._titulos_fim)
+        while inicio != -1:
+            relativo = inicio - base
+            posicao = int(
+                np.searchsorted(self._titulos_inicios, relativo, side="right") - 1
+            )
+            inicio_titulo, fim_titulo = self._titulos_inicios[posicao : posicao + 2]
+            ordem = (relativo != inicio_titulo, int(fim_titulo - inicio_titulo))
+            if melhor_ordem is None or ordem < melhor_ordem:
+                melhor, melhor_ordem = posicao, ordem
+            # Um resultado por título: continua a busca a partir do próximo.
+            inicio = self._mapa.find(
+                titulo_normalizado, base + int(fim_titulo), self._titulos_fim
+            )
+        return melhor
+
+    def buscar_por_titulo(self, titulo_filme):
+        """
+        Busca as informações de um filme pelo título (ou parte dele).
+
+        Um título alternativo exato ('Inception') é resolvido primeiro, como no
+        repositório. O título exato (sem acentos e sem diferenciar maiúsculas) sai da
+        tabela hash; senão, os títulos que contêm o texto são procurados pelo índice
+        de trigramas.
+
+        Args:
+            titulo_filme (str): O título do filme a ser buscado.
+
+        Returns:
+            tuple or None: Uma tupla com (titulo, diretor, ano, genero, protagonista)
+                            do filme se encontrado, ou None caso contrário.
+        """
+        titulo_normalizado = normalizar_texto(titulo_filme).encode("utf-8")
+        if not titulo_normalizado or not len(self):
+            return None
+        posicao = self._posicao_por_apelido(titulo_normalizado)
+        if posicao is None:
+            posicao = self._posicao_exata(titulo_normalizado)
+        if posicao is None:
+            posicao = self._posicao_por_substring(titulo_normalizado)
+        return None if posicao is None else self.linha(posicao)
+
+    def listar_titulos(self):
+        """Lista todos os títulos do catálogo, na ordem dos ids."""
+        return [self._texto(int(id_texto)) for id_texto in self._campos[:, 0]]
+
+    def listar_filmes(self):
+        """Lista todos os filmes (titulo, diretor, ano, genero, protagonista)."""
+        return [self.linha(posicao) for posicao in range(len(self))]
+
+    def fechar(self):
+        """Libera o mapeamento (os arrays deixam de ser válidos)."""
+        self.ids = self.anos = self._campos = None
+        self._textos_inicios = self._textos = self._titulos_inicios = None
+        self._hash_chaves = self._hash_posicoes = None
+        self._apelidos_chaves = self._apelidos_linhas = None
+        self._trigramas_inicios = self._trigramas_linhas = None
+        try:
+            self._mapa.close()
+        except BufferError:
+            pass  # Ainda há arrays apontando para o mapa: o GC o fecha depois.
+
+
+# Instantâneo compartilhado do processo (CHATBOT_CATALOGO_MEMORIA).
+_catalogo = None
+_trava_catalogo = threading.Lock()
+_ultima_verificacao = 0.0
+
+
+def obter_catalogo():
+    """
+    Retorna o instantâneo configurado em CHATBOT_CATALOGO_MEMORIA (o arquivo gerado
+    por 'run_catalogo_memoria.py'), abrindo-o na primeira chamada.
+
+    A cada INTERVALO_VERIFICACAO segundos, confere se o arquivo foi substituído por
+    um instantâneo novo e, nesse caso, passa a usá-lo (a troca é atômica: quem está
+    no meio de uma consulta termina com o instantâneo antigo).
+
+    Returns:
+        CatalogoMemoria or None: O instantâneo, ou None se não configurado ou
+                                 indisponível.
+    """
+    global _catalogo, _ultima_verificacao
+    caminho_arquivo = os.environ.get("CHATBOT_CATALOGO_MEMORIA")
+    if not caminho_arquivo:
+        return None
+    agora = time.monotonic()
+    catalogo = _catalogo
+    if catalogo is not None and agora - _ultima_verificacao < INTERVALO_VERIFICACAO:
+        return catalogo
+    with _trava_catalogo:
+        _ultima_verificacao = agora
+        if _catalogo is not None and not _catalogo.foi_substituido():
+            return _catalogo
+        try:
+            _catalogo = CatalogoMemoria.carregar(caminho_arquivo)
+        except (OSError, ValueError) as e:
+            if _catalogo is None:
+                print(f"Aviso: catálogo em memória '{caminho_arquivo}' indisponível.")
+                print(f"Detalhes: {e}")
+        return _catalogo
+
+
+def recarregar_catalogo():
+    """Descarta o instantâneo atual (a próxima consulta abre o arquivo de novo)."""
+    global _catalogo
+    with _trava_catalogo:
+        _catalogo = None
+
+
+def main():
+    """Gera o instantâneo do catálogo (lido por memória mapeada pelo chatbot)."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--banco", default=DATABASE_NAME)
+    parser.add_argument("--saida", default="data/catalogo.bin")
+    parser.add_argument(
+        "--observar",
+        type=float,
+        default=0,
+        help="Segundos entre verificações do banco; regera o instantâneo quando ele "
+        "muda (0 = gera uma vez e sai).",
+    )
+    args = parser.parse_args()
+
+    while True:
+        inicio = time.perf_counter()
+        try:
+            num_filmes = atualizar_catalogo(args.banco, args.saida)
+        except sqlite3.Error as e:
+            print(f"Erro ao ler o banco '{args.banco}': {e}")
+            print("Execute o setup do banco antes (run_db_setup.py).")
+            return
+        if num_filmes is not None:
+            print(
+                f"Catálogo em memória com {num_filmes} filmes salvo em {args.saida} "
+                f"({time.perf_counter() - inicio:.2f}s)."
+            )
+        elif not args.observar:
+            print(f"Catálogo em memória {args.saida} já está atualizado.")
+        if not args.observar:
+            break
+        time.sleep(args.observar)
+    print(f"Use CHATBOT_CATALOGO_MEMORIA={args.saida} para o chatbot usar o catálogo.")
+
+
+if __name__ == "__main__":
+    main()
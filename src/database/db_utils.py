@@ -1,40 +1,109 @@
-import sqlite3
-
-
-def consultar_filme_no_bd(titulo_filme):
-    """
-    Consulta o banco de dados 'filmes.db' para buscar informações de um filme.
-
-    Args:
-        titulo_filme (str): O título do filme a ser buscado.
-
-    Returns:
-        tuple or None: Uma tupla com (titulo, diretor, ano, genero) do filme se encontrado,
-                        ou None se o filme não for encontrado.
-    """
-    conn = None
-    try:
-        conn = sqlite3.connect("data/filmes.db")
-        cursor = conn.cursor()
-
-        # SQL para buscar o filme. Usa LIKE para uma busca flexível (parte do nome, case-insensitive).
-        # A tupla (f'%{titulo_filme}%',) é crucial para passar o parâmetro de forma segura.
-        cursor.execute(
-            "SELECT titulo, diretor, ano, genero, protagonista FROM filmes WHERE titulo LIKE ?",
-            (f"%{titulo_filme}%",),
-        )
-
-        resultado = (
-            cursor.fetchone()
-        )  # Pega apenas o primeiro resultado correspondente.
-
-        return resultado
-
-    except sqlite3.Error as e:
-        print(
-            f"Erro ao consultar o banco de dados: {e}"
-        )  # Imprime o erro, mas não encerra o programa.
-        return None
-    finally:
-        if conn:
-            conn.close()  # Garante que a conexão com o banco de dados seja fechada.
+from src.database.catalogo_memoria import obter_catalogo
+from src.database.repositorio_filmes import obter_repositorio
+
+
+class CatalogoComFiltros:
+    """
+    Catálogo em memória para as consultas por título, com o repositório para as
+    consultas por filtros (diretor, ano...), que o instantâneo não indexa.
+
+    Tem a interface de RepositorioFilmes usada pelo pipeline do turno.
+    """
+
+    def __init__(self, catalogo, repositorio):
+        """
+        Args:
+            catalogo (CatalogoMemoria): Instantâneo aberto por 'obter_catalogo'.
+            repositorio (RepositorioFilmes): Repositório para 'buscar_filmes'.
+        """
+        self.catalogo = catalogo
+        self.repositorio = repositorio
+
+    def buscar_por_titulo(self, titulo_filme):
+        """Busca o filme pelo título no instantâneo (ver CatalogoMemoria)."""
+        return self.catalogo.buscar_por_titulo(titulo_filme)
+
+    def buscar_filmes(self, **filtros):
+        """Busca os filmes pelos filtros no SQLite (ver RepositorioFilmes)."""
+        return self.repositorio.buscar_filmes(**filtros)
+
+    def listar_titulos(self):
+        """Lista todos os títulos do instantâneo."""
+        return self.catalogo.listar_titulos()
+
+    def listar_apelidos(self):
+        """Lista os títulos alternativos do banco (o instantâneo só guarda os hashes)."""
+        return self.repositorio.listar_apelidos()
+
+    def listar_filmes(self):
+        """Lista todos os filmes do instantâneo."""
+        return self.catalogo.listar_filmes()
+
+
+# Último backend com o catálogo em memória: reaproveitado enquanto o instantâneo e
+# o repositório forem os mesmos, para que as estruturas montadas a partir dele (ver
+# nlp_utils) sejam montadas uma vez por catálogo, e não uma vez por turno.
+_backend_memoria = None
+
+
+def obter_backend_catalogo(repositorio=None):
+    """
+    Escolhe onde as consultas de filmes são feitas.
+
+    Com o catálogo em memória configurado (CHATBOT_CATALOGO_MEMORIA), os títulos
+    são buscados nele, sem passar pelo SQLite; senão, tudo vai para o repositório.
+
+    Args:
+        repositorio (RepositorioFilmes, optional): Repositório de filmes (padrão:
+            o compartilhado).
+
+    Returns:
+        CatalogoComFiltros or RepositorioFilmes: O backend das consultas.
+    """
+    global _backend_memoria
+    repositorio = repositorio or obter_repositorio()
+    catalogo = obter_catalogo()
+    if catalogo is None:
+        return repositorio
+    backend = _backend_memoria
+    if (
+        backend is None
+        or backend.catalogo is not catalogo
+        or backend.repositorio is not repositorio
+    ):
+        backend = _backend_memoria = CatalogoComFiltros(catalogo, repositorio)
+    return backend
+
+
+def consultar_filme_no_bd(titulo_filme):
+    """
+    Consulta o banco de dados 'filmes.db' para buscar informações de um filme.
+
+    A consulta é feita pelo repositório compartilhado (RepositorioFilmes), que reutiliza
+    conexões de um pool em vez de abrir uma conexão nova a cada pergunta. Com o
+    catálogo em memória configurado (CHATBOT_CATALOGO_MEMORIA), a consulta é feita
+    nele, sem passar pelo SQLite.
+
+    Args:
+        titulo_filme (str): O título do filme a ser buscado.
+
+    Returns:
+        tuple or None: Uma tupla com (titulo, diretor, ano, genero) do filme se encontrado,
+                        ou None se o filme não for encontrado.
+    """
+    return obter_backend_catalogo().buscar_por_titulo(titulo_filme)
+
+
+def consultar_filmes_no_bd(**filtros):
+    """
+    Consulta os filmes que atendem a filtros estruturados (ex: diretor e ano).
+
+    Args:
+        **filtros: Os argumentos de RepositorioFilmes.buscar_filmes ('diretor',
+                   'ano', 'genero', 'protagonista', 'limite', 'deslocamento').
+
+    Returns:
+        list: Tuplas (titulo, diretor, ano, genero, protagonista) dos filmes
+              encontrados, em ordem de ano (no máximo LIMITE_MAXIMO_RESULTADOS).
+    """
+    return obter_repositorio().buscar_filmes(**filtros)
@@ -0,0 +1,286 @@
+import argparse
+import itertools
+import re
+import sqlite3
+import time
+
+from src.nlp.normalizacao import normalizar_texto
+
+# Papéis de uma pessoa em um filme (coluna 'papel' de 'filme_pessoa').
+PAPEL_DIRETOR = "diretor"
+PAPEL_PROTAGONISTA = "protagonista"
+
+# Esquema normalizado: gêneros e pessoas em tabelas próprias, ligados aos filmes por
+# tabelas de junção. As colunas de texto de 'filmes' continuam sendo a forma exibida;
+# estas tabelas existem para responder filtros por gênero e pessoa com índices.
+# As junções são WITHOUT ROWID com a chave começando pelo gênero/pessoa: a busca
+# 'filmes do gênero X' lê um único intervalo contíguo da chave primária.
+SQL_ESQUEMA_NORMALIZADO = [
+    """
+    CREATE TABLE IF NOT EXISTS generos (
+        id INTEGER PRIMARY KEY,
+        nome TEXT NOT NULL,
+        nome_normalizado TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS pessoas (
+        id INTEGER PRIMARY KEY,
+        nome TEXT NOT NULL,
+        nome_normalizado TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS filme_genero (
+        genero_id INTEGER NOT NULL REFERENCES generos(id),
+        filme_id INTEGER NOT NULL REFERENCES filmes(id),
+        PRIMARY KEY (genero_id, filme_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS filme_pessoa (
+        pessoa_id INTEGER NOT NULL REFERENCES pessoas(id),
+        papel TEXT NOT NULL,
+        filme_id INTEGER NOT NULL REFERENCES filmes(id),
+        PRIMARY KEY (pessoa_id, papel, filme_id)
+    ) WITHOUT ROWID
+    """,
+    # Caminho inverso (gêneros e pessoas de um filme).
+    "CREATE INDEX IF NOT EXISTS idx_filme_genero_filme ON filme_genero(filme_id)",
+    "CREATE INDEX IF NOT EXISTS idx_filme_pessoa_filme ON filme_pessoa(filme_id)",
+    # Remover um filme remove suas junções. Inserções e alterações passam por
+    # 'sincronizar_esquema_normalizado', que separa os campos compostos em Python.
+    """
+    CREATE TRIGGER IF NOT EXISTS filmes_normalizado_ad AFTER DELETE ON filmes BEGIN
+        DELETE FROM filme_genero WHERE filme_id = old.id;
+        DELETE FROM filme_pessoa WHERE filme_id = old.id;
+    END
+    """,
+]
+
+# Quantos filmes 'sincronizar_esquema_normalizado' processa por vez.
+TAMANHO_LOTE_SINCRONIZACAO = 50_000
+
+# Separadores de várias pessoas no mesmo campo ('Joel e Ethan Coen', 'A, B & C').
+_PADRAO_SEPARADOR_PESSOAS = re.compile(r"\s*(?:,|&|\be\b|\band\b)\s*")
+
+
+def separar_generos(genero):
+    """
+    Separa um gênero composto em gêneros simples.
+
+    Args:
+        genero (str): O campo do banco (ex: 'Ficção Científica/Ação').
+
+    Returns:
+        list: Os gêneros, sem repetições e na ordem original (ex: ['Ficção Científica', 'Ação']).
+    """
+    generos = []
+    for parte in (genero or "").split("/"):
+        parte = parte.strip()
+        if parte and parte not in generos:
+            generos.append(parte)
+    return generos
+
+
+def separar_pessoas(nomes):
+    """
+    Separa um campo com várias pessoas em nomes completos.
+
+    Prenomes soltos herdam o sobrenome do último nome ('Lana e Lilly Wachowski' ->
+    'Lana Wachowski' e 'Lilly Wachowski'); nomes completos ficam como estão ('Dan
+    Kwan e Daniel Scheinert').
+
+    Args:
+        nomes (str): O campo do banco (ex: 'Joel e Ethan Coen').
+
+    Returns:
+        list: Os nomes completos, na ordem original.
+    """
+    partes = [p for p in _PADRAO_SEPARADOR_PESSOAS.split(nomes or "") if p.strip()]
+    if len(partes) > 1:
+        sobrenome = partes[-1].split()[1:]
+        if sobrenome:
+            partes = [
+                " ".join([p] + sobrenome) if len(p.split()) == 1 else p for p in partes
+            ]
+    pessoas = []
+    for parte in partes:
+        parte = " ".join(parte.split())
+        if parte not in pessoas:
+            pessoas.append(parte)
+    return pessoas
+
+
+def criar_tabelas_normalizadas(conn):
+    """
+    Cria as tabelas de gêneros, pessoas e junções (se não existirem).
+
+    Args:
+        conn (sqlite3.Connection): Conexão de escrita com o banco de filmes.
+    """
+    for sql in SQL_ESQUEMA_NORMALIZADO:
+        conn.execute(sql)
+
+
+def possui_esquema_normalizado(conn):
+    """Indica se o banco já possui as tabelas de junção de gêneros e pessoas."""
+    return (
+        conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' "
+            "AND name IN ('filme_genero', 'filme_pessoa')"
+        ).fetchone()[0]
+        == 2
+    )
+
+
+class _Dicionario:
+    """Atribui ids a nomes (gêneros ou pessoas) pela forma normalizada, em memória."""
+
+    def __init__(self, conn, tabela):
+        self.tabela = tabela
+        self.ids = {
+            normalizado: id_
+            for id_, normalizado in conn.execute(
+                f"SELECT id, nome_normalizado FROM {tabela}"
+            )
+        }
+        self.proximo_id = max(self.ids.values(), default=0) + 1
+        self.novos = []  # (id, nome, nome_normalizado) a inserir.
+        self._por_nome = {}  # Os nomes se repetem muito: normaliza cada um uma vez.
+
+    def id_de(self, nome):
+        """Retorna o id do nome, reservando um novo se ele ainda não existir."""
+        if nome in self._por_nome:
+            return self._por_nome[nome]
+        normalizado = normalizar_texto(nome)
+        id_ = self.ids.get(normalizado) if normalizado else None
+        if id_ is None and normalizado:
+            id_ = self.ids[normalizado] = self.proximo_id
+            self.proximo_id += 1
+            self.novos.append((id_, nome, normalizado))
+        self._por_nome[nome] = id_
+        return id_
+
+    def gravar(self, conn):
+        conn.executemany(
+            f"INSERT INTO {self.tabela} (id, nome, nome_normalizado) VALUES (?, ?, ?)",
+            self.novos,
+        )
+        self.novos = []
+
+
+def _juncoes_do_lote(linhas, generos, pessoas):
+    """Separa os campos de um lote de filmes em pares (gênero, filme) e (pessoa, papel, filme)."""
+    juncoes_generos, juncoes_pessoas = set(), set()
+    for id_filme, genero, diretor, protagonista in linhas:
+        for nome in separar_generos(genero):
+            id_genero = generos.id_de(nome)
+            if id_genero is not None:
+                juncoes_generos.add((id_genero, id_filme))
+        papeis = ((PAPEL_DIRETOR, diretor), (PAPEL_PROTAGONISTA, protagonista))
+        for papel, campo in papeis:
+            for nome in separar_pessoas(campo):
+                id_pessoa = pessoas.id_de(nome)
+                if id_pessoa is not None:
+                    juncoes_pessoas.add((id_pessoa, papel, id_filme))
+    return sorted(juncoes_generos), sorted(juncoes_pessoas)
+
+
+def sincronizar_esquema_normalizado(conn, ids_filmes=None):
+    """
+    Preenche gêneros, pessoas e junções a partir das colunas de texto de 'filmes'.
+
+    Os filmes indicados (ou todos) têm as junções refeitas, então a função pode ser
+    chamada de novo sem duplicar nada. Os filmes são lidos em lotes de
+    TAMANHO_LOTE_SINCRONIZACAO, então a memória não cresce com o catálogo (só com
+    o número de gêneros e pessoas distintos). Não faz commit: quem chama decide a
+    transação.
+
+    Args:
+        conn (sqlite3.Connection): Conexão de escrita com o banco de filmes.
+        ids_filmes (iterable, optional): Só estes filmes (ex: os recém-inseridos).
+
+    Returns:
+        int: Quantos filmes foram processados.
+    """
+    criar_tabelas_normalizadas(conn)
+    if ids_filmes is None:
+        conn.execute("DELETE FROM filme_genero")
+        conn.execute("DELETE FROM filme_pessoa")
+        linhas = conn.execute("SELECT id, genero, diretor, protagonista FROM filmes")
+    else:
+        parametros = [(id_,) for id_ in ids_filmes]
+        conn.executemany("DELETE FROM filme_genero WHERE filme_id = ?", parametros)
+        conn.executemany("DELETE FROM filme_pessoa WHERE filme_id = ?", parametros)
+        linhas = [
+            conn.execute(
+                "SELECT id, genero, diretor, protagonista FROM filmes WHERE id = ?",
+                parametro,
+            ).fetchone()
+            for parametro in parametros
+        ]
+        linhas = iter([linha for linha in linhas if linha is not None])
+
+    generos = _Dicionario(conn, "generos")
+    pessoas = _Dicionario(conn, "pessoas")
+    total = 0
+    while True:
+        lote = list(itertools.islice(linhas, TAMANHO_LOTE_SINCRONIZACAO))
+        if not lote:
+            break
+        total += len(lote)
+        juncoes_generos, juncoes_pessoas = _juncoes_do_lote(lote, generos, pessoas)
+        generos.gravar(conn)
+        pessoas.gravar(conn)
+        conn.executemany(
+            "INSERT INTO filme_genero (genero_id, filme_id) VALUES (?, ?)",
+            juncoes_generos,
+        )
+        conn.executemany(
+            "INSERT INTO filme_pessoa (pessoa_id, papel, filme_id) VALUES (?, ?, ?)",
+            juncoes_pessoas,
+        )
+    return total
+
+
+def migrar_para_esquema_normalizado(caminho_bd):
+    """
+    Migra um banco existente: cria as tabelas normalizadas e separa os gêneros e as
+    pessoas de todos os filmes, em uma única transação.
+
+    Args:
+        caminho_bd (str): Caminho do arquivo SQLite.
+
+    Returns:
+        int: Quantos filmes foram migrados.
+    """
+    conn = sqlite3.connect(caminho_bd)
+    try:
+        with conn:
+            total = sincronizar_esquema_normalizado(conn)
+            conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return total
+
+
+def main():
+    """Migra o banco de filmes para o esquema normalizado (gêneros e pessoas)."""
+    # Importado aqui: o setup_db usa este módulo ao criar e popular o banco.
+    from src.database.setup_db import DATABASE_NAME
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("caminho_bd", nargs="?", default=DATABASE_NAME)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    total = migrar_para_esquema_normalizado(args.caminho_bd)
+    print(
+        f"{total} filmes migrados para o esquema normalizado em "
+        f"{time.perf_counter() - inicio:.2f}s ({args.caminho_bd})."
+    )
+
+
+if __name__ == "__main__":
+    main()
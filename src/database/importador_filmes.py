@@ -0,0 +1,325 @@
+import argparse
+import csv
+import gzip
+import itertools
+import json
+import sqlite3
+import sys
+import time
+
+from src.database.esquema_normalizado import sincronizar_esquema_normalizado
+from src.database.setup_db import (
+    DATABASE_NAME,
+    SQL_INDICES_FILTROS,
+    criar_indice_busca_titulos,
+    criar_indices_filtros,
+    criar_tabela_filmes,
+)
+from src.nlp.normalizacao import normalizar_texto
+
+COLUNAS_FILMES = ("titulo", "genero", "ano", "diretor", "protagonista")
+
+SQL_INSERIR = (
+    "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista, "
+    "titulo_normalizado) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# O que fazer com um filme que já existe: mesma chave natural, pelo índice único
+# criado nas migrações (ver setup_db.SQL_INDICE_CHAVE_NATURAL).
+SQL_CONFLITO = {
+    "atualizar": (
+        " ON CONFLICT(titulo_normalizado, ano) DO UPDATE SET "
+        "titulo = excluded.titulo, "
+        "genero = coalesce(excluded.genero, genero), "
+        "diretor = coalesce(excluded.diretor, diretor), "
+        "protagonista = coalesce(excluded.protagonista, protagonista)"
+    ),
+    "ignorar": " ON CONFLICT(titulo_normalizado, ano) DO NOTHING",
+}
+
+# Pragmas só durante a carga: sem fsync e com o diário de transações em memória.
+# Uma queda no meio da carga pode corromper o banco, então ela deve ser refeita do
+# zero nesse caso; ao final, o modo WAL e o synchronous padrão voltam.
+PRAGMAS_CARGA = {"synchronous": "OFF", "journal_mode": "MEMORY"}
+PRAGMAS_APOS_CARGA = {"journal_mode": "WAL", "synchronous": "FULL"}
+
+# Gatilhos do índice FTS5 de títulos: removidos na carga e recriados depois, com o
+# índice reconstruído de uma vez (ver setup_db.SQL_INDICE_BUSCA_TITULOS).
+GATILHOS_FTS = ("filmes_fts_ai", "filmes_fts_ad", "filmes_fts_au")
+
+TAMANHO_LOTE_PADRAO = 50_000
+
+# Perfis de entrada: coluna do filme -> coluna do arquivo, e ajustes do formato.
+PERFIS = {
+    "padrao": {"colunas": {coluna: coluna for coluna in COLUNAS_FILMES}},
+    # title.basics.tsv(.gz) do IMDb: gêneros separados por vírgula, nulos como '\N'.
+    "imdb": {
+        "colunas": {"titulo": "primaryTitle", "ano": "startYear", "genero": "genres"},
+        "separador_generos": ",",
+        "filtro": ("titleType", {"movie", "tvMovie"}),
+    },
+}
+
+VALORES_NULOS = {"", "\\N", "NULL", "null"}
+
+
+def detectar_formato(caminho):
+    """Deduz o formato ('csv', 'tsv' ou 'jsonl') pela extensão, ignorando '.gz'."""
+    nome = caminho.lower()
+    if nome.endswith(".gz"):
+        nome = nome[:-3]
+    for formato in ("csv", "tsv", "jsonl"):
+        if nome.endswith(f".{formato}"):
+            return formato
+    if nome.endswith(".json") or nome.endswith(".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Formato não reconhecido para '{caminho}'. Use --formato.")
+
+
+def abrir_texto(caminho):
+    """Abre o arquivo em modo texto (UTF-8), descompactando se for gzip."""
+    with open(caminho, "rb") as arquivo:
+        compactado = arquivo.read(2) == b"\x1f\x8b"
+    if compactado:
+        return gzip.open(caminho, "rt", encoding="utf-8", newline="")
+    return open(caminho, "r", encoding="utf-8", newline="")
+
+
+def ler_registros(arquivo, formato):
+    """
+    Lê os registros do arquivo um a um (sem carregar o arquivo na memória).
+
+    Yields:
+        dict: Coluna -> valor de cada linha.
+    """
+    if formato == "jsonl":
+        for linha in arquivo:
+            if linha.strip():
+                yield json.loads(linha)
+    elif formato == "tsv":
+        # Dumps TSV (como os do IMDb) não usam aspas: elas fazem parte do texto.
+        yield from csv.DictReader(arquivo, delimiter="\t", quoting=csv.QUOTE_NONE)
+    else:
+        yield from csv.DictReader(arquivo)
+
+
+def _valor(registro, coluna):
+    """Valor da coluna como texto sem espaços, ou None se ausente/nulo."""
+    if coluna is None:
+        return None
+    valor = registro.get(coluna)
+    if valor is None:
+        return None
+    valor = str(valor).strip()
+    return None if valor in VALORES_NULOS else valor
+
+
+def converter_registros(registros, perfil):
+    """
+    Converte os registros do arquivo em linhas da tabela 'filmes'.
+
+    Registros sem título (ou fora do filtro do perfil) são descartados.
+
+    Args:
+        registros (iterable): Dicionários lidos do arquivo.
+        perfil (dict): Um dos PERFIS.
+
+    Yields:
+        tuple: (titulo, genero, ano, diretor, protagonista, titulo_normalizado).
+    """
+    colunas = perfil["colunas"]
+    separador_generos = perfil.get("separador_generos")
+    coluna_filtro, valores_filtro = perfil.get("filtro", (None, None))
+    for registro in registros:
+        if coluna_filtro and registro.get(coluna_filtro) not in valores_filtro:
+            continue
+        titulo = _valor(registro, colunas.get("titulo"))
+        titulo_normalizado = normalizar_texto(titulo) if titulo else ""
+        if not titulo_normalizado:
+            continue
+        genero = _valor(registro, colunas.get("genero"))
+        if genero and separador_generos:
+            genero = "/".join(g.strip() for g in genero.split(separador_generos))
+        ano = _valor(registro, colunas.get("ano"))
+        try:
+            ano = int(ano) if ano is not None else None
+        except ValueError:
+            ano = None
+        yield (
+            titulo,
+            genero,
+            ano,
+            _valor(registro, colunas.get("diretor")),
+            _valor(registro, colunas.get("protagonista")),
+            titulo_normalizado,
+        )
+
+
+def _remover_indices(conn):
+    """Remove os índices secundários e os gatilhos do FTS antes da carga."""
+    for sql in SQL_INDICES_FILTROS:
+        nome = sql.split("EXISTS", 1)[1].split()[0]
+        conn.execute(f"DROP INDEX IF EXISTS {nome}")
+    for gatilho in GATILHOS_FTS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {gatilho}")
+
+
+def _reconstruir_indices(conn):
+    """Recria os índices e os gatilhos, reconstrói o FTS e as tabelas normalizadas."""
+    criar_indices_filtros(conn)
+    criar_indice_busca_titulos(conn)
+    conn.execute("INSERT INTO filmes_fts(filmes_fts) VALUES ('rebuild')")
+    sincronizar_esquema_normalizado(conn)
+    conn.execute("ANALYZE")
+
+
+def _restaurar_indices_apos_falha(conn):
+    """
+    Reconstrói índices, gatilhos e FTS depois de uma carga interrompida.
+
+    Os lotes já confirmados ficam no banco; sem isso, eles (e as escritas seguintes)
+    ficariam fora do FTS e das tabelas normalizadas. Uma falha aqui não esconde o
+    erro original da carga, que é o que 'importar_filmes' propaga.
+    """
+    try:
+        conn.execute("BEGIN")
+        _reconstruir_indices(conn)
+        conn.execute("COMMIT")
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        print(f"Erro ao reconstruir os índices após a falha na importação: {e}")
+
+
+def importar_filmes(
+    caminho_arquivo,
+    caminho_bd=DATABASE_NAME,
+    formato=None,
+    perfil="padrao",
+    conflito="atualizar",
+    tamanho_lote=TAMANHO_LOTE_PADRAO,
+    ao_concluir_lote=None,
+):
+    """
+    Importa um catálogo de filmes de um arquivo CSV, TSV ou JSONL (opcionalmente gzip).
+
+    O arquivo é lido em fluxo e gravado em lotes de 'tamanho_lote' linhas (um
+    'executemany' por lote, cada lote em sua transação), então a memória usada não
+    depende do tamanho do arquivo. Durante a carga, os índices secundários e os
+    gatilhos do FTS são removidos e os pragmas de PRAGMAS_CARGA aplicados. No final,
+    tudo é reconstruído de uma vez, o que é bem mais rápido que manter os índices
+    linha a linha. Se a carga falhar no meio, os lotes já gravados são mantidos e
+    os índices são reconstruídos do mesmo jeito antes de o erro ser propagado.
+
+    Args:
+        caminho_arquivo (str): O arquivo a importar ('.csv', '.tsv', '.jsonl', '.gz').
+        caminho_bd (str): Caminho do arquivo SQLite (criado se não existir).
+        formato (str, optional): 'csv', 'tsv' ou 'jsonl' (padrão: pela extensão).
+        perfil (str): Um dos PERFIS ('padrao' ou 'imdb').
+        conflito (str): 'atualizar' (upsert) ou 'ignorar' filmes já existentes.
+        tamanho_lote (int): Linhas por 'executemany'/transação.
+        ao_concluir_lote (callable, optional): Recebe (linhas lidas, segundos) a cada lote.
+
+    Returns:
+        dict: {'linhas': linhas lidas e válidas, 'filmes': total na tabela,
+               'segundos': duração da carga, 'segundos_indices': duração da
+               reconstrução dos índices, 'linhas_por_segundo': vazão da carga}.
+    """
+    formato = formato or detectar_formato(caminho_arquivo)
+    sql_inserir = SQL_INSERIR + SQL_CONFLITO[conflito]
+    criar_tabela_filmes(caminho_bd)
+
+    # isolation_level=None: as transações (BEGIN/COMMIT por lote) são explícitas.
+    conn = sqlite3.connect(caminho_bd, isolation_level=None)
+    indices_removidos = False
+    try:
+        for nome, valor in PRAGMAS_CARGA.items():
+            conn.execute(f"PRAGMA {nome}={valor}")
+        _remover_indices(conn)
+        indices_removidos = True
+
+        inicio = time.perf_counter()
+        linhas_lidas = 0
+        with abrir_texto(caminho_arquivo) as arquivo:
+            linhas = converter_registros(
+                ler_registros(arquivo, formato), PERFIS[perfil]
+            )
+            while True:
+                lote = list(itertools.islice(linhas, tamanho_lote))
+                if not lote:
+                    break
+                conn.execute("BEGIN")
+                conn.executemany(sql_inserir, lote)
+                conn.execute("COMMIT")
+                linhas_lidas += len(lote)
+                if ao_concluir_lote is not None:
+                    ao_concluir_lote(linhas_lidas, time.perf_counter() - inicio)
+        segundos = time.perf_counter() - inicio
+
+        inicio_indices = time.perf_counter()
+        conn.execute("BEGIN")
+        _reconstruir_indices(conn)
+        conn.execute("COMMIT")
+        indices_removidos = False
+        segundos_indices = time.perf_counter() - inicio_indices
+        total = conn.execute("SELECT COUNT(*) FROM filmes").fetchone()[0]
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        if indices_removidos:
+            _restaurar_indices_apos_falha(conn)
+        raise
+    finally:
+        for nome, valor in PRAGMAS_APOS_CARGA.items():
+            conn.execute(f"PRAGMA {nome}={valor}")
+        conn.close()
+
+    return {
+        "linhas": linhas_lidas,
+        "filmes": total,
+        "segundos": segundos,
+        "segundos_indices": segundos_indices,
+        "linhas_por_segundo": linhas_lidas / segundos if segundos else 0.0,
+    }
+
+
+def main():
+    """Importa um catálogo de filmes (CSV/TSV/JSONL, opcionalmente .gz) para o SQLite."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("arquivo")
+    parser.add_argument("--bd", default=DATABASE_NAME, help="Banco de destino.")
+    parser.add_argument("--formato", choices=("csv", "tsv", "jsonl"))
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default="padrao")
+    parser.add_argument("--conflito", choices=sorted(SQL_CONFLITO), default="atualizar")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO)
+    args = parser.parse_args()
+
+    def progresso(linhas, segundos):
+        print(
+            f"  {linhas:>12,} linhas  {linhas / segundos:>10,.0f} linhas/s",
+            file=sys.stderr,
+        )
+
+    try:
+        resultado = importar_filmes(
+            args.arquivo,
+            args.bd,
+            formato=args.formato,
+            perfil=args.perfil,
+            conflito=args.conflito,
+            tamanho_lote=args.lote,
+            ao_concluir_lote=progresso,
+        )
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Erro ao importar '{args.arquivo}': {e}")
+        sys.exit(1)
+    print(
+        f"{resultado['linhas']:,} linhas importadas em {resultado['segundos']:.1f}s "
+        f"({resultado['linhas_por_segundo']:,.0f} linhas/s); índices reconstruídos "
+        f"em {resultado['segundos_indices']:.1f}s. "
+        f"Total de filmes: {resultado['filmes']:,}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import argparse
+import os
+import pathlib
+import sqlite3
+import time
+
+from src.database.apelidos_titulos import (
+    criar_tabela_apelidos,
+    popular_apelidos_exemplo,
+)
+from src.database.esquema_normalizado import sincronizar_esquema_normalizado
+from src.database.setup_db import (
+    DATABASE_NAME,
+    SQL_INDICE_CHAVE_NATURAL,
+    criar_indice_busca_titulos,
+    criar_indices_filtros,
+)
+
+# Histórico das migrações aplicadas ao banco. A versão atual também fica em
+# 'PRAGMA user_version' (gravado no cabeçalho do arquivo), que é o que a verificação
+# na inicialização lê: um único valor, sem consultar tabelas nem executar DDL.
+SQL_TABELA_VERSOES = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        versao INTEGER PRIMARY KEY,
+        descricao TEXT NOT NULL,
+        aplicada_em TEXT NOT NULL DEFAULT (datetime('now'))
+    )
+"""
+
+
+def _criar_tabela_filmes(conn):
+    """A tabela original de filmes, com gêneros e pessoas em texto."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS filmes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            titulo TEXT NOT NULL,
+            genero TEXT,
+            ano INTEGER,
+            diretor TEXT,
+            protagonista TEXT
+        )
+        """
+    )
+
+
+def _criar_esquema_normalizado(conn):
+    """Tabelas de gêneros e pessoas, preenchidas a partir dos filmes existentes."""
+    sincronizar_esquema_normalizado(conn)
+
+
+def _criar_tabela_apelidos(conn):
+    """Títulos alternativos ('Inception' -> 'A Origem') e os dos filmes de exemplo."""
+    criar_tabela_apelidos(conn)
+    popular_apelidos_exemplo(conn)
+
+
+# Filmes repetidos pela chave natural (título normalizado, ano): (id, id mantido).
+# O filme mantido é o de menor id, o primeiro a entrar no catálogo.
+SQL_FILMES_DUPLICADOS = """
+    SELECT id, id_mantido FROM (
+        SELECT id, MIN(id) OVER (PARTITION BY titulo_normalizado, ano) AS id_mantido
+        FROM filmes
+        WHERE ano IS NOT NULL
+    )
+    WHERE id > id_mantido
+"""
+
+
+def _criar_indice_chave_natural(conn):
+    """
+    Índice único da chave natural (alvo do upsert da importação).
+
+    Bancos com o mesmo filme repetido ficam só com o de menor id: os títulos
+    alternativos dos repetidos passam para ele e os gatilhos de remoção limpam o
+    FTS e as junções do esquema normalizado.
+    """
+    duplicados = conn.execute(SQL_FILMES_DUPLICADOS).fetchall()
+    conn.executemany(
+        "UPDATE OR IGNORE titulo_alias SET filme_id = ? WHERE filme_id = ?",
+        [(id_mantido, id_filme) for id_filme, id_mantido in duplicados],
+    )
+    conn.executemany(
+        "DELETE FROM filmes WHERE id = ?", [(id_filme,) for id_filme, _ in duplicados]
+    )
+    conn.execute(SQL_INDICE_CHAVE_NATURAL)
+
+
+# Migrações em ordem: (versão, descrição, função que recebe a conexão). Cada uma roda
+# em sua própria transação e deve funcionar também em bancos criados antes do
+# versionamento (que já podem ter parte do esquema), por isso usam 'IF NOT EXISTS'.
+# Novas alterações de esquema entram no final da lista, com a próxima versão.
+MIGRACOES = [
+    (1, "tabela de filmes", _criar_tabela_filmes),
+    (2, "título normalizado e índice FTS5 de títulos", criar_indice_busca_titulos),
+    (3, "índices por diretor, protagonista e ano", criar_indices_filtros),
+    (4, "esquema normalizado de gêneros e pessoas", _criar_esquema_normalizado),
+    (5, "títulos alternativos (original, inglês)", _criar_tabela_apelidos),
+    (
+        6,
+        "chave natural (título normalizado, ano) sem duplicados",
+        _criar_indice_chave_natural,
+    ),
+]
+
+
+def versao_atual():
+    """A versão do esquema após todas as migrações."""
+    return MIGRACOES[-1][0]
+
+
+def obter_versao(conn):
+    """Retorna a versão do esquema do banco (0 em bancos sem versionamento)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def esquema_atualizado(caminho_bd=DATABASE_NAME):
+    """
+    Verificação barata para a inicialização: o banco já está na versão atual?
+
+    Abre o arquivo somente leitura e lê apenas 'PRAGMA user_version'.
+
+    Args:
+        caminho_bd (str): Caminho do arquivo SQLite.
+
+    Returns:
+        bool: True se o banco existe e não há migrações pendentes.
+    """
+    if not os.path.exists(caminho_bd):
+        return False
+    uri = f"{pathlib.Path(caminho_bd).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        return obter_versao(conn) >= versao_atual()
+    finally:
+        conn.close()
+
+
+def aplicar_migracoes(caminho_bd=DATABASE_NAME):
+    """
+    Aplica, em ordem, as migrações que o banco ainda não tem (criando-o se preciso).
+
+    Cada migração roda em uma transação própria junto com o registro em
+    'schema_version' e a atualização de 'user_version': se ela falhar, o banco
+    continua inteiro na versão anterior. 'BEGIN IMMEDIATE' e a releitura da versão
+    dentro da transação evitam que dois processos apliquem a mesma migração.
+
+    Args:
+        caminho_bd (str): Caminho do arquivo SQLite.
+
+    Returns:
+        list: As versões aplicadas agora (vazia se o banco já estava atualizado).
+    """
+    aplicadas = []
+    # isolation_level=None: as transações (uma por migração) são explícitas.
+    conn = sqlite3.connect(caminho_bd, isolation_level=None)
+    try:
+        if obter_versao(conn) >= versao_atual():
+            return aplicadas
+        # O modo WAL fica gravado no arquivo: permite que as conexões somente leitura
+        # do RepositorioFilmes consultem o banco enquanto outro processo escreve nele.
+        conn.execute("PRAGMA journal_mode=WAL")
+        for versao, descricao, migrar in MIGRACOES:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if obter_versao(conn) >= versao:
+                    conn.execute("ROLLBACK")
+                    continue
+                conn.execute(SQL_TABELA_VERSOES)
+                migrar(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO schema_version (versao, descricao) "
+                    "VALUES (?, ?)",
+                    (versao, descricao),
+                )
+                conn.execute(f"PRAGMA user_version = {int(versao)}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            aplicadas.append(versao)
+    finally:
+        conn.close()
+    return aplicadas
+
+
+def verificar_esquema_na_inicializacao(caminho_bd=DATABASE_NAME):
+    """
+    Garante o esquema atual antes de abrir o chatbot ou o servidor.
+
+    No caso comum (banco já atualizado) só lê o 'user_version'. Um banco antigo é
+    migrado na hora; um banco inexistente não é criado (isso é papel do
+    run_db_setup.py, que também insere os filmes de exemplo).
+
+    Args:
+        caminho_bd (str): Caminho do arquivo SQLite.
+
+    Returns:
+        bool: True se o banco está pronto para uso.
+    """
+    if esquema_atualizado(caminho_bd):
+        return True
+    if not os.path.exists(caminho_bd):
+        print(
+            f"Aviso: banco '{caminho_bd}' não encontrado. "
+            "Execute 'python run_db_setup.py' antes de iniciar o chatbot."
+        )
+        return False
+    try:
+        aplicadas = aplicar_migracoes(caminho_bd)
+    except sqlite3.Error as e:
+        print(f"Erro ao migrar o banco '{caminho_bd}': {e}")
+        return False
+    print(f"Banco '{caminho_bd}' migrado para a versão {versao_atual()}: {aplicadas}.")
+    return True
+
+
+def main():
+    """Aplica as migrações pendentes ao banco de filmes."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("caminho_bd", nargs="?", default=DATABASE_NAME)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    aplicadas = aplicar_migracoes(args.caminho_bd)
+    if not aplicadas:
+        print(f"Banco '{args.caminho_bd}' já está na versão {versao_atual()}.")
+        return
+    descricoes = {versao: descricao for versao, descricao, _ in MIGRACOES}
+    for versao in aplicadas:
+        print(f"  {versao}: {descricoes[versao]}")
+    print(
+        f"{len(aplicadas)} migrações aplicadas em "
+        f"{time.perf_counter() - inicio:.2f}s ({args.caminho_bd})."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+import pathlib
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from src.database.apelidos_titulos import possui_apelidos
+from src.database.esquema_normalizado import (
+    PAPEL_DIRETOR,
+    PAPEL_PROTAGONISTA,
+    possui_esquema_normalizado,
+    separar_generos,
+    separar_pessoas,
+)
+from src.database.setup_db import DATABASE_NAME
+from src.nlp.normalizacao import normalizar_texto
+
+# Pragmas aplicados a cada conexão nova do pool.
+# mmap_size: lê as páginas do arquivo via memória mapeada (evita cópias para o cache do SQLite).
+# cache_size: valor negativo é em KiB (aqui ~16 MiB de cache de páginas por conexão).
+# temp_store: tabelas temporárias de ordenação ficam em memória.
+PRAGMAS_PADRAO = {
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -16000,
+    "temp_store": "MEMORY",
+}
+
+# Consulta de título por substring, usada em bancos sem o índice 'filmes_fts'.
+SQL_BUSCA_POR_TITULO = (
+    "SELECT titulo, diretor, ano, genero, protagonista FROM filmes WHERE titulo LIKE ?"
+)
+
+# Busca pelo índice FTS5 trigram. Entre os títulos que contêm o texto procurado,
+# prefere o título idêntico, depois o que começa pelo texto, depois o melhor bm25
+# e, por fim, o título mais curto.
+SQL_BUSCA_POR_TITULO_FTS = """
+    SELECT f.titulo, f.diretor, f.ano, f.genero, f.protagonista
+    FROM filmes_fts
+    JOIN filmes AS f ON f.id = filmes_fts.rowid
+    WHERE filmes_fts MATCH ?
+    ORDER BY f.titulo_normalizado = ? DESC,
+             f.titulo_normalizado LIKE ? DESC,
+             bm25(filmes_fts),
+             length(f.titulo_normalizado)
+    LIMIT 1
+"""
+
+# O trigram só indexa sequências de 3 caracteres; buscas menores (ex: 'up') varrem
+# a coluna normalizada, com a mesma ordenação por relevância.
+SQL_BUSCA_POR_TITULO_CURTO = """
+    SELECT titulo, diretor, ano, genero, protagonista
+    FROM filmes
+    WHERE titulo_normalizado LIKE ?
+    ORDER BY titulo_normalizado = ? DESC,
+             titulo_normalizado LIKE ? DESC,
+             length(titulo_normalizado)
+    LIMIT 1
+"""
+
+TAMANHO_MINIMO_TRIGRAM = 3
+
+# Título alternativo exato ('Inception', 'The Godfather'): uma busca na chave
+# primária de 'titulo_alias' (ver apelidos_titulos).
+SQL_BUSCA_POR_APELIDO = """
+    SELECT f.titulo, f.diretor, f.ano, f.genero, f.protagonista
+    FROM titulo_alias AS a
+    JOIN filmes AS f ON f.id = a.filme_id
+    WHERE a.alias_normalizado = ?
+    ORDER BY a.filme_id
+    LIMIT 1
+"""
+
+# Tamanho padrão de uma página de 'buscar_filmes' e o máximo aceito por consulta.
+LIMITE_PADRAO_RESULTADOS = 10
+LIMITE_MAXIMO_RESULTADOS = 50
+
+
+def _escapar_like(texto):
+    """Escapa os curingas do LIKE ('%' e '_') para buscar o texto literalmente."""
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Junções dos filtros por pessoa e gênero no esquema normalizado (ver
+# esquema_normalizado). O id vem da chave única do nome e a junção é feita pela chave
+# primária (pessoa/gênero, filme), então o otimizador pode tanto partir da junção
+# ('filmes do Nolan') quanto de outro índice e só conferir o par ('dramas de 1994').
+SQL_JUNCAO_PESSOA = (
+    "JOIN filme_pessoa AS {apelido} ON {apelido}.filme_id = filmes.id "
+    "AND {apelido}.papel = ? AND {apelido}.pessoa_id = "
+    "(SELECT id FROM pessoas WHERE nome_normalizado = ?)"
+)
+SQL_JUNCAO_GENERO = (
+    "JOIN filme_genero AS {apelido} ON {apelido}.filme_id = filmes.id "
+    "AND {apelido}.genero_id = (SELECT id FROM generos WHERE nome_normalizado = ?)"
+)
+
+
+def montar_consulta_filmes(
+    diretor=None,
+    ano=None,
+    genero=None,
+    protagonista=None,
+    limite=LIMITE_PADRAO_RESULTADOS,
+    deslocamento=0,
+    normalizado=False,
+):
+    """
+    Monta a consulta estruturada de filmes (ver RepositorioFilmes.buscar_filmes).
+
+    As cláusulas são fixas e os valores vão como parâmetros, então a mesma
+    combinação de filtros reaproveita a instrução preparada em cache.
+
+    Com 'normalizado', pessoas e gêneros são procurados pelas tabelas de junção
+    (sem acentos, e cada pessoa/gênero de um campo composto vira um filtro). Sem
+    ele (bancos antigos), diretor e protagonista usam os índices 'idx_filmes_*_ano'
+    e o gênero é comparado por substring. O ano usa 'idx_filmes_ano'. Pessoas ou
+    gêneros só com separadores (ex: ' e ') não viram filtro.
+
+    Returns:
+        tuple: (sql, parâmetros).
+
+    Raises:
+        ValueError: Se nenhum filtro utilizável for informado.
+    """
+    # Os parâmetros das junções vêm antes dos do WHERE no texto da consulta.
+    juncoes, parametros_juncoes = [], []
+    condicoes, parametros = [], []
+    pessoas = ((PAPEL_DIRETOR, diretor), (PAPEL_PROTAGONISTA, protagonista))
+    for papel, nomes in pessoas:
+        if not nomes:
+            continue
+        if not normalizado:
+            condicoes.append(f"{papel} = ? COLLATE NOCASE")
+            parametros.append(nomes)
+            continue
+        for nome in separar_pessoas(nomes):
+            juncoes.append(SQL_JUNCAO_PESSOA.format(apelido=f"p{len(juncoes)}"))
+            parametros_juncoes.extend([papel, normalizar_texto(nome)])
+    if genero and normalizado:
+        for nome in separar_generos(genero):
+            juncoes.append(SQL_JUNCAO_GENERO.format(apelido=f"g{len(juncoes)}"))
+            parametros_juncoes.append(normalizar_texto(nome))
+    elif genero:
+        condicoes.append("genero LIKE ? ESCAPE '\\'")
+        parametros.append(f"%{_escapar_like(genero)}%")
+    if isinstance(ano, (tuple, list)):
+        condicoes.append("ano BETWEEN ? AND ?")
+        parametros.extend(ano)
+    elif ano is not None:
+        condicoes.append("ano = ?")
+        parametros.append(ano)
+    if not juncoes and not condicoes:
+        raise ValueError(
+            "Informe ao menos um filtro (diretor, ano, genero ou protagonista)."
+        )
+
+    limite = max(1, min(int(limite), LIMITE_MAXIMO_RESULTADOS))
+    sql = " ".join(
+        [
+            "SELECT filmes.titulo, filmes.diretor, filmes.ano, filmes.genero,",
+            "filmes.protagonista FROM filmes",
+            *juncoes,
+            f"WHERE {' AND '.join(condicoes)}" if condicoes else "",
+            "ORDER BY filmes.ano, filmes.id LIMIT ? OFFSET ?",
+        ]
+    )
+    parametros = parametros_juncoes + parametros + [limite, max(0, int(deslocamento))]
+    return sql, parametros
+
+
+class RepositorioFilmes:
+    """
+    Camada de acesso ao banco 'filmes.db' com conexões de longa duração.
+
+    Em vez de abrir e fechar uma conexão a cada pergunta (pagando o custo de abrir o
+    arquivo e ler o esquema toda vez), o repositório mantém um pool de conexões
+    reutilizáveis e seguro para uso entre threads. As conexões são abertas por URI
+    em modo somente leitura ('mode=ro'), com os pragmas configuráveis e com o cache
+    de instruções preparadas do módulo sqlite3 ('cached_statements').
+    """
+
+    def __init__(
+        self,
+        caminho_bd=DATABASE_NAME,
+        tamanho_pool=4,
+        somente_leitura=True,
+        pragmas=None,
+        cache_instrucoes=128,
+        tempo_espera=5.0,
+    ):
+        """
+        Inicializa o repositório. As conexões são criadas sob demanda, até 'tamanho_pool'.
+
+        Args:
+            caminho_bd (str): Caminho do arquivo SQLite.
+            tamanho_pool (int): Número máximo de conexões abertas simultaneamente.
+            somente_leitura (bool): Se True, abre as conexões com 'mode=ro'.
+            pragmas (dict, optional): Pragmas extras/sobrescritos (ex: {'mmap_size': 0}).
+            cache_instrucoes (int): Quantas instruções preparadas cada conexão mantém em cache.
+            tempo_espera (float): Segundos aguardando uma conexão livre antes de desistir.
+        """
+        self.caminho_bd = caminho_bd
+        self.tamanho_pool = tamanho_pool
+        self.somente_leitura = somente_leitura
+        self.pragmas = dict(PRAGMAS_PADRAO)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.cache_instrucoes = cache_instrucoes
+        self.tempo_espera = tempo_espera
+
+        self._pool = queue.LifoQueue(maxsize=tamanho_pool)
+        self._todas_conexoes = []
+        self._trava = threading.Lock()
+        self._possui_indice_fts = None  # Descoberto na primeira consulta.
+        self._possui_esquema_normalizado = None
+        self._possui_apelidos = None
+
+    def _montar_uri(self):
+        """Monta a URI 'file:' absoluta com o modo de abertura do arquivo."""
+        uri = pathlib.Path(self.caminho_bd).resolve().as_uri()
+        modo = "ro" if self.somente_leitura else "rwc"
+        return f"{uri}?mode={modo}"
+
+    def _nova_conexao(self):
+        """Abre uma conexão nova e aplica os pragmas configurados."""
+        conn = sqlite3.connect(
+            self._montar_uri(),
+            uri=True,
+            check_same_thread=False,  # A conexão circula entre threads, mas nunca em uso simultâneo.
+            cached_statements=self.cache_instrucoes,
+        )
+        for nome, valor in self.pragmas.items():
+            conn.execute(f"PRAGMA {nome}={valor}")
+        return conn
+
+    def _obter_conexao(self):
+        """Retira uma conexão do pool, criando uma nova se o limite ainda não foi atingido."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._trava:
+            if len(self._todas_conexoes) < self.tamanho_pool:
+                conn = self._nova_conexao()
+                self._todas_conexoes.append(conn)
+                return conn
+
+        # Pool cheio: espera alguma thread devolver sua conexão.
+        return self._pool.get(timeout=self.tempo_espera)
+
+    @contextmanager
+    def conexao(self):
+        """
+        Empresta uma conexão do pool durante o bloco 'with' e a devolve ao final.
+
+        Yields:
+            sqlite3.Connection: Conexão pronta para uso exclusivo da thread atual.
+        """
+        conn = self._obter_conexao()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def buscar_por_titulo(self, titulo_filme):
+        """
+        Busca as informações de um filme pelo título (ou parte dele).
+
+        Um título alternativo exato ('Inception', o título original ou em inglês)
+        é resolvido primeiro, por 'titulo_alias'; depois o título é procurado
+        como substring dos títulos do catálogo.
+
+        Args:
+            titulo_filme (str): O título do filme a ser buscado.
+
+        Returns:
+            tuple or None: Uma tupla com (titulo, diretor, ano, genero, protagonista)
+                            do filme se encontrado, ou None caso contrário.
+        """
+        try:
+            with self.conexao() as conn:
+                if self._possui_apelidos is None:
+                    self._possui_apelidos = possui_apelidos(conn)
+                if self._possui_apelidos:
+                    info_filme = self._buscar_por_apelido(conn, titulo_filme)
+                    if info_filme is not None:
+                        return info_filme
+                if self._possui_indice_fts is None:
+                    self._possui_indice_fts = self._verificar_indice_fts(conn)
+                if not self._possui_indice_fts:
+                    return conn.execute(
+                        SQL_BUSCA_POR_TITULO, (f"%{titulo_filme}%",)
+                    ).fetchone()
+                return self._buscar_no_indice_fts(conn, titulo_filme)
+        except (sqlite3.Error, queue.Empty) as e:
+            print(f"Erro ao consultar o banco de dados: {e}")
+            return None
+
+    def buscar_filmes(
+        self,
+        diretor=None,
+        ano=None,
+        genero=None,
+        protagonista=None,
+        limite=LIMITE_PADRAO_RESULTADOS,
+        deslocamento=0,
+    ):
+        """
+        Busca os filmes que atendem a todos os filtros informados, em ordem de ano.
+
+        Pessoas e gêneros são procurados pelas tabelas normalizadas: 'Drama'
+        encontra 'Crime/Drama' e 'Lilly Wachowski' encontra 'Lana e Lilly
+        Wachowski', sem diferenciar acentos e maiúsculas. Em bancos ainda não
+        migrados, os nomes são comparados com o campo inteiro e o gênero, por
+        substring. A página tem no máximo LIMITE_MAXIMO_RESULTADOS filmes.
+
+        Args:
+            diretor (str, optional): Nome do diretor (ex: 'Christopher Nolan').
+            ano (int or tuple, optional): Ano exato ou intervalo (inicio, fim), inclusivo.
+            genero (str, optional): Gênero, ex: 'Drama'.
+            protagonista (str, optional): Nome do protagonista (ex: 'Tom Hanks').
+            limite (int): Quantos filmes retornar (a página).
+            deslocamento (int): Quantos filmes pular (ex: 10 para a segunda página de 10).
+
+        Returns:
+            list: Tuplas (titulo, diretor, ano, genero, protagonista), ou uma lista
+                  vazia se nada for encontrado ou em caso de erro.
+
+        Raises:
+            ValueError: Se nenhum filtro for informado.
+        """
+        try:
+            with self.conexao() as conn:
+                if self._possui_esquema_normalizado is None:
+                    self._possui_esquema_normalizado = possui_esquema_normalizado(conn)
+                try:
+                    sql, parametros = montar_consulta_filmes(
+                        diretor,
+                        ano,
+                        genero,
+                        protagonista,
+                        limite,
+                        deslocamento,
+                        normalizado=self._possui_esquema_normalizado,
+                    )
+                except ValueError:
+                    if diretor or genero or protagonista or ano is not None:
+                        return []  # Filtros só com separadores (ex: diretor=' e ').
+                    raise
+                return conn.execute(sql, parametros).fetchall()
+        except (sqlite3.Error, queue.Empty) as e:
+            print(f"Erro ao consultar o banco de dados: {e}")
+            return []
+
+    def listar_titulos(self):
+        """
+        Lista todos os títulos do catálogo (usado para montar os índices locais de títulos).
+
+        Returns:
+            list: Os títulos como estão no banco, ou uma lista vazia em caso de erro.
+        """
+        try:
+            with self.conexao() as conn:
+                return [linha[0] for linha in conn.execute("SELECT titulo FROM filmes")]
+        except (sqlite3.Error, queue.Empty) as e:
+            print(f"Erro ao consultar o banco de dados: {e}")
+            return []
+
+    def listar_apelidos(self):
+        """
+        Lista os títulos alternativos do catálogo (usado para montar os índices locais
+        de títulos, que passam a reconhecer 'Inception' como 'A Origem').
+
+        Returns:
+            list: Pares (apelido, título como está no banco), ou uma lista vazia se o
+                  banco não tiver a tabela 'titulo_alias' ou em caso de erro.
+        """
+        try:
+            with self.conexao() as conn:
+                if not possui_apelidos(conn):
+                    return []
+                return conn.execute(
+                    "SELECT a.alias, f.titulo FROM titulo_alias AS a "
+                    "JOIN filmes AS f ON f.id = a.filme_id"
+                ).fetchall()
+        except (sqlite3.Error, queue.Empty) as e:
+            print(f"Erro ao consultar o banco de dados: {e}")
+            return []
+
+    def listar_filmes(self):
+        """
+        Lista todos os filmes do catálogo (usado para montar o índice semântico).
+
+        Returns:
+            list: Tuplas (titulo, diretor, ano, genero, protagonista), ou uma lista
+                  vazia em caso de erro.
+        """
+        try:
+            with self.conexao() as conn:
+                return conn.execute(
+                    "SELECT titulo, diretor, ano, genero, protagonista FROM filmes "
+                    "ORDER BY id"
+                ).fetchall()
+        except (sqlite3.Error, queue.Empty) as e:
+            print(f"Erro ao consultar o banco de dados: {e}")
+            return []
+
+    @staticmethod
+    def _verificar_indice_fts(conn):
+        """Indica se o banco já possui o índice de títulos 'filmes_fts'."""
+        return (
+            conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'filmes_fts'"
+            ).fetchone()
+            is not None
+        )
+
+    @staticmethod
+    def _buscar_por_apelido(conn, titulo_filme):
+        """Busca o filme pelo título alternativo exato (sem acentos e maiúsculas)."""
+        alias_normalizado = normalizar_texto(titulo_filme)
+        if not alias_normalizado:
+            return None
+        return conn.execute(SQL_BUSCA_POR_APELIDO, (alias_normalizado,)).fetchone()
+
+    @staticmethod
+    def _buscar_no_indice_fts(conn, titulo_filme):
+        """Busca o título (sem acentos e sem diferenciar maiúsculas) pelo índice FTS5."""
+        titulo_normalizado = normalizar_texto(titulo_filme)
+        if not titulo_normalizado:
+            return None
+        prefixo = f"{titulo_normalizado}%"
+        if len(titulo_normalizado) < TAMANHO_MINIMO_TRIGRAM:
+            return conn.execute(
+                SQL_BUSCA_POR_TITULO_CURTO,
+                (f"%{titulo_normalizado}%", titulo_normalizado, prefixo),
+            ).fetchone()
+        # O texto normalizado só tem letras, dígitos e espaços: vira uma frase FTS5 segura.
+        return conn.execute(
+            SQL_BUSCA_POR_TITULO_FTS,
+            (f'"{titulo_normalizado}"', titulo_normalizado, prefixo),
+        ).fetchone()
+
+    def fechar(self):
+        """Fecha todas as conexões abertas pelo repositório."""
+        with self._trava:
+            for conn in self._todas_conexoes:
+                conn.close()
+            self._todas_conexoes = []
+            self._pool = queue.LifoQueue(maxsize=self.tamanho_pool)
+
+
+# Instância compartilhada pelo processo (criada na primeira consulta).
+_repositorio_padrao = None
+_trava_repositorio_padrao = threading.Lock()
+
+
+def obter_repositorio():
+    """
+    Retorna o repositório compartilhado do processo, criando-o na primeira chamada.
+
+    Returns:
+        RepositorioFilmes: O repositório apontando para o banco padrão 'data/filmes.db'.
+    """
+    global _repositorio_padrao
+    if _repositorio_padrao is None:
+        with _trava_repositorio_padrao:
+            if _repositorio_padrao is None:
+                _repositorio_padrao = RepositorioFilmes()
+    return _repositorio_padrao
+
+
+def fechar_repositorio():
+    """Fecha e descarta o repositório compartilhado (ex: ao encerrar o chatbot ou nos testes)."""
+    global _repositorio_padrao
+    with _trava_repositorio_padrao:
+        if _repositorio_padrao is not None:
+            _repositorio_padrao.fechar()
+            _repositorio_padrao = None
+
+
+def definir_repositorio(repositorio):
+    """
+    Define o repositório compartilhado (ex: apontando para outro banco em benchmarks).
+
+    Args:
+        repositorio (RepositorioFilmes): O repositório a ser usado pelo processo.
+    """
+    global _repositorio_padrao
+    with _trava_repositorio_padrao:
+        _repositorio_padrao = repositorio
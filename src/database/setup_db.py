@@ -1,379 +1,488 @@
-import os
-import sqlite3
-
-DATABASE_NAME = "data/filmes.db"
-
-
-def criar_tabela_filmes():
-    """Cria a tabela de filmes no banco de dados, se ela não existir."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS filmes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            titulo TEXT NOT NULL,
-            genero TEXT,
-            ano INTEGER,
-            diretor TEXT,
-            protagonista TEXT
-        )
-    """
-    )
-    conn.commit()
-    conn.close()
-    print(f"Tabela 'filmes' criada ou já existente em {DATABASE_NAME}.")
-
-
-def popular_filmes_exemplo():
-    """Popula a tabela de filmes com dados de exemplo, se estiver vazia."""
-    filmes_para_inserir = [
-        ("O Poderoso Chefão", "Drama", 1972, "Francis Ford Coppola", "Marlon Brando"),
-        ("Um Sonho de Liberdade", "Drama", 1994, "Frank Darabont", "Tim Robbins"),
-        (
-            "A Lista de Schindler",
-            "Drama Histórico",
-            1993,
-            "Steven Spielberg",
-            "Liam Neeson",
-        ),
-        (
-            "Forrest Gump: O Contador de Histórias",
-            "Drama/Comédia",
-            1994,
-            "Robert Zemeckis",
-            "Tom Hanks",
-        ),
-        (
-            "Pulp Fiction: Tempo de Violência",
-            "Crime/Drama",
-            1994,
-            "Quentin Tarantino",
-            "John Travolta",
-        ),
-        (
-            "O Senhor dos Anéis: A Sociedade do Anel",
-            "Fantasia/Aventura",
-            2001,
-            "Peter Jackson",
-            "Elijah Wood",
-        ),
-        (
-            "O Cavaleiro das Trevas",
-            "Ação/Crime",
-            2008,
-            "Christopher Nolan",
-            "Christian Bale",
-        ),
-        (
-            "A Origem",
-            "Ficção Científica/Ação",
-            2010,
-            "Christopher Nolan",
-            "Leonardo DiCaprio",
-        ),
-        (
-            "Matrix",
-            "Ficção Científica/Ação",
-            1999,
-            "Lana e Lilly Wachowski",
-            "Keanu Reeves",
-        ),
-        ("Clube da Luta", "Drama/Suspense", 1999, "David Fincher", "Edward Norton"),
-        (
-            "Interestelar",
-            "Ficção Científica",
-            2014,
-            "Christopher Nolan",
-            "Matthew McConaughey",
-        ),
-        ("Gladiador", "Ação/Drama", 2000, "Ridley Scott", "Russell Crowe"),
-        ("Django Livre", "Faroeste", 2012, "Quentin Tarantino", "Jamie Foxx"),
-        (
-            "O Silêncio dos Inocentes",
-            "Suspense/Terror",
-            1991,
-            "Jonathan Demme",
-            "Jodie Foster",
-        ),
-        (
-            "Bastardos Inglórios",
-            "Guerra/Aventura",
-            2009,
-            "Quentin Tarantino",
-            "Brad Pitt",
-        ),
-        (
-            "O Resgate do Soldado Ryan",
-            "Guerra/Drama",
-            1998,
-            "Steven Spielberg",
-            "Tom Hanks",
-        ),
-        (
-            "À Espera de um Milagre",
-            "Drama/Fantasia",
-            1999,
-            "Frank Darabont",
-            "Tom Hanks",
-        ),
-        (
-            "O Lobo de Wall Street",
-            "Comédia/Crime",
-            2013,
-            "Martin Scorsese",
-            "Leonardo DiCaprio",
-        ),
-        ("Beleza Americana", "Drama", 1999, "Sam Mendes", "Kevin Spacey"),
-        ("Ilha do Medo", "Suspense", 2010, "Martin Scorsese", "Leonardo DiCaprio"),
-        (
-            "V de Vingança",
-            "Ação/Ficção Científica",
-            2005,
-            "James McTeigue",
-            "Hugo Weaving",
-        ),
-        (
-            "De Volta Para o Futuro",
-            "Ficção Científica/Aventura",
-            1985,
-            "Robert Zemeckis",
-            "Michael J. Fox",
-        ),
-        ("O Profissional", "Ação/Drama", 1994, "Luc Besson", "Jean Reno"),
-        ("Os Suspeitos", "Crime/Mistério", 1995, "Bryan Singer", "Kevin Spacey"),
-        (
-            "O Exterminador do Futuro 2: O Julgamento Final",
-            "Ficção Científica/Ação",
-            1991,
-            "James Cameron",
-            "Arnold Schwarzenegger",
-        ),
-        ("Kill Bill: Volume 1", "Ação/Crime", 2003, "Quentin Tarantino", "Uma Thurman"),
-        (
-            "Guardiões da Galáxia",
-            "Ficção Científica/Aventura",
-            2014,
-            "James Gunn",
-            "Chris Pratt",
-        ),
-        ("Coração Valente", "Histórico/Drama", 1995, "Mel Gibson", "Mel Gibson"),
-        ("WALL·E", "Animação/Ficção Científica", 2008, "Andrew Stanton", "WALL·E"),
-        (
-            "Os Bons Companheiros",
-            "Crime/Drama",
-            1990,
-            "Martin Scorsese",
-            "Robert De Niro",
-        ),
-        (
-            "Procurando Nemo",
-            "Animação/Aventura",
-            2003,
-            "Andrew Stanton",
-            "Albert Brooks",
-        ),
-        (
-            "O Sexto Sentido",
-            "Suspense/Drama",
-            1999,
-            "M. Night Shyamalan",
-            "Bruce Willis",
-        ),
-        (
-            "Up - Altas Aventuras",
-            "Animação/Aventura",
-            2009,
-            "Pete Docter",
-            "Edward Asner",
-        ),
-        ("O Show de Truman", "Drama/Comédia", 1998, "Peter Weir", "Jim Carrey"),
-        ("Um Estranho no Ninho", "Drama", 1975, "Miloš Forman", "Jack Nicholson"),
-        ("Cães de Aluguel", "Crime/Drama", 1992, "Quentin Tarantino", "Harvey Keitel"),
-        ("Parasita", "Drama/Suspense", 2019, "Bong Joon-ho", "Song Kang-ho"),
-        (
-            "Whiplash: Em Busca da Perfeição",
-            "Drama/Musical",
-            2014,
-            "Damien Chazelle",
-            "Miles Teller",
-        ),
-        ("A Chegada", "Ficção Científica/Drama", 2016, "Denis Villeneuve", "Amy Adams"),
-        (
-            "Mad Max: Estrada da Fúria",
-            "Ação/Ficção Científica",
-            2015,
-            "George Miller",
-            "Tom Hardy",
-        ),
-        ("A Rede Social", "Drama", 2010, "David Fincher", "Jesse Eisenberg"),
-        ("O Grande Lebowski", "Comédia", 1998, "Joel e Ethan Coen", "Jeff Bridges"),
-        (
-            "Seven: Os Sete Crimes Capitais",
-            "Suspense/Crime",
-            1995,
-            "David Fincher",
-            "Brad Pitt",
-        ),
-        (
-            "Amelie Poulain",
-            "Comédia Romântica",
-            2001,
-            "Jean-Pierre Jeunet",
-            "Audrey Tautou",
-        ),
-        (
-            "O Labirinto do Fauno",
-            "Fantasia/Drama",
-            2006,
-            "Guillermo del Toro",
-            "Ivana Baquero",
-        ),
-        (
-            "Cidade de Deus",
-            "Crime/Drama",
-            2002,
-            "Fernando Meirelles",
-            "Alexandre Rodrigues",
-        ),
-        ("Central do Brasil", "Drama", 1998, "Walter Salles", "Fernanda Montenegro"),
-        ("Tropa de Elite", "Ação/Crime", 2007, "José Padilha", "Wagner Moura"),
-        (
-            "Tropa de Elite 2: O Inimigo Agora é Outro",
-            "Ação/Crime",
-            2010,
-            "José Padilha",
-            "Wagner Moura",
-        ),
-        (
-            "O Auto da Compadecida",
-            "Comédia/Aventura",
-            2000,
-            "Guel Arraes",
-            "Matheus Nachtergaele",
-        ),
-        ("Bacurau", "Drama/Thriller", 2019, "Kleber Mendonça Filho", "Sônia Braga"),
-        ("Que Horas Ela Volta?", "Drama", 2015, "Anna Muylaert", "Regina Casé"),
-        ("Carandiru", "Drama", 2003, "Hector Babenco", "Luiz Carlos Vasconcelos"),
-        ("O Homem que Copiava", "Comédia/Drama", 2003, "Jorge Furtado", "Lázaro Ramos"),
-        (
-            "Lisbela e o Prisioneiro",
-            "Comédia Romântica",
-            2003,
-            "Guel Arraes",
-            "Selton Mello",
-        ),
-        (
-            "Minha Mãe É Uma Peça: O Filme",
-            "Comédia",
-            2013,
-            "André Pellenz",
-            "Paulo Gustavo",
-        ),
-        ("Cidade Baixa", "Drama", 2005, "Sérgio Machado", "Lázaro Ramos"),
-        ("O Som ao Redor", "Drama", 2012, "Kleber Mendonça Filho", "Irandhir Santos"),
-        ("Capitão Fantástico", "Drama/Comédia", 2016, "Matt Ross", "Viggo Mortensen"),
-        (
-            "A Forma da Água",
-            "Fantasia/Drama",
-            2017,
-            "Guillermo del Toro",
-            "Sally Hawkins",
-        ),
-        ("Corra!", "Terror/Suspense", 2017, "Jordan Peele", "Daniel Kaluuya"),
-        (
-            "Lady Bird: A Hora de Voar",
-            "Comédia/Drama",
-            2017,
-            "Greta Gerwig",
-            "Saoirse Ronan",
-        ),
-        ("Dunkirk", "Guerra/Histórico", 2017, "Christopher Nolan", "Fionn Whitehead"),
-        ("Bohemian Rhapsody", "Biografia/Musical", 2018, "Bryan Singer", "Rami Malek"),
-        ("Nasce Uma Estrela", "Musical/Drama", 2018, "Bradley Cooper", "Lady Gaga"),
-        (
-            "Green Book: O Guia",
-            "Biografia/Drama",
-            2018,
-            "Peter Farrelly",
-            "Mahershala Ali",
-        ),
-        ("Nomadland", "Drama", 2020, "Chloé Zhao", "Frances McDormand"),
-        ("O Pai", "Drama", 2020, "Florian Zeller", "Anthony Hopkins"),
-        ("Soul", "Animação/Aventura", 2020, "Pete Docter", "Jamie Foxx"),
-        (
-            "Duna",
-            "Ficção Científica/Aventura",
-            2021,
-            "Denis Villeneuve",
-            "Timothée Chalamet",
-        ),
-        (
-            "Não Olhe Para Cima",
-            "Comédia/Ficção Científica",
-            2021,
-            "Adam McKay",
-            "Leonardo DiCaprio",
-        ),
-        (
-            "CODA: No Ritmo do Coração",
-            "Drama/Musical",
-            2021,
-            "Sian Heder",
-            "Emilia Jones",
-        ),
-        (
-            "Tudo em Todo o Lugar ao Mesmo Tempo",
-            "Ação/Comédia",
-            2022,
-            "Dan Kwan e Daniel Scheinert",
-            "Michelle Yeoh",
-        ),
-        (
-            "Os Banshees de Inisherin",
-            "Comédia/Drama",
-            2022,
-            "Martin McDonagh",
-            "Colin Farrell",
-        ),
-        (
-            "Avatar: O Caminho da Água",
-            "Ficção Científica/Aventura",
-            2022,
-            "James Cameron",
-            "Sam Worthington",
-        ),
-        ("Oppenheimer", "Biografia/Drama", 2023, "Christopher Nolan", "Cillian Murphy"),
-        ("Barbie", "Comédia/Fantasia", 2023, "Greta Gerwig", "Margot Robbie"),
-    ]
-
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-
-    # Verifica se a tabela está vazia antes de popular
-    cursor.execute("SELECT COUNT(*) FROM filmes")
-    if cursor.fetchone()[0] == 0:
-        cursor.executemany(
-            "INSERT OR IGNORE INTO filmes (titulo, genero, ano, diretor, protagonista) VALUES (?, ?, ?, ?, ?)",
-            filmes_para_inserir,
-        )
-        conn.commit()
-        print(
-            f"{len(filmes_para_inserir)} filmes de exemplo inseridos em {DATABASE_NAME}."
-        )
-    else:
-        print("Tabela 'filmes' já contém dados. Nenhuma inserção realizada.")
-    conn.close()
-
-
-def verificar_e_criar_diretorio_data():
-    """Verifica se o diretório 'data' existe e o cria se não existir."""
-    if not os.path.exists("data"):
-        os.makedirs("data")
-        print("Diretório 'data/' criado.")
-
-
-if __name__ == "__main__":
-    verificar_e_criar_diretorio_data()
-    criar_tabela_filmes()
-    popular_filmes_exemplo()
+import os
+import sqlite3
+
+from src.database.esquema_normalizado import sincronizar_esquema_normalizado
+from src.nlp.normalizacao import normalizar_texto
+
+DATABASE_NAME = "data/filmes.db"
+
+# Índice de texto completo sobre os títulos normalizados (sem acentos e em minúsculas).
+# O tokenizador 'trigram' indexa todas as sequências de 3 caracteres, o que permite
+# buscas por substring (equivalentes ao antigo LIKE '%...%') usando o índice.
+# A tabela é 'external content': o texto fica só em 'filmes' e os gatilhos mantêm o
+# índice sincronizado com inserções, remoções e atualizações.
+SQL_INDICE_BUSCA_TITULOS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS filmes_fts USING fts5(
+        titulo_normalizado,
+        content='filmes',
+        content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS filmes_fts_ai AFTER INSERT ON filmes BEGIN
+        INSERT INTO filmes_fts(rowid, titulo_normalizado)
+        VALUES (new.id, new.titulo_normalizado);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS filmes_fts_ad AFTER DELETE ON filmes BEGIN
+        INSERT INTO filmes_fts(filmes_fts, rowid, titulo_normalizado)
+        VALUES ('delete', old.id, old.titulo_normalizado);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS filmes_fts_au AFTER UPDATE ON filmes BEGIN
+        INSERT INTO filmes_fts(filmes_fts, rowid, titulo_normalizado)
+        VALUES ('delete', old.id, old.titulo_normalizado);
+        INSERT INTO filmes_fts(rowid, titulo_normalizado)
+        VALUES (new.id, new.titulo_normalizado);
+    END
+    """,
+]
+
+# Índices secundários das consultas estruturadas (RepositorioFilmes.buscar_filmes).
+# Nomes são comparados sem diferenciar maiúsculas (COLLATE NOCASE, igual à consulta)
+# e o 'ano' em segundo lugar entrega as linhas já na ordem do resultado, sem etapa
+# de ordenação. O gênero é filtrado por substring ('Crime/Drama' é drama) e não usa
+# índice próprio: ele restringe as linhas encontradas pelos outros filtros.
+SQL_INDICES_FILTROS = [
+    "CREATE INDEX IF NOT EXISTS idx_filmes_diretor_ano "
+    "ON filmes(diretor COLLATE NOCASE, ano)",
+    "CREATE INDEX IF NOT EXISTS idx_filmes_protagonista_ano "
+    "ON filmes(protagonista COLLATE NOCASE, ano)",
+    "CREATE INDEX IF NOT EXISTS idx_filmes_ano ON filmes(ano)",
+]
+
+# Chave natural de um filme: o mesmo título (normalizado) no mesmo ano é o mesmo
+# filme. O índice único é o alvo do upsert da importação (INSERT ... ON CONFLICT).
+# Filmes sem ano nunca conflitam (no SQLite, NULLs são distintos em índices únicos).
+SQL_INDICE_CHAVE_NATURAL = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_filmes_chave_natural "
+    "ON filmes(titulo_normalizado, ano)"
+)
+
+
+def criar_tabela_filmes(caminho_bd=DATABASE_NAME):
+    """
+    Cria a tabela de filmes e o restante do esquema, ou atualiza um banco existente.
+
+    O esquema é montado pelas migrações versionadas (ver migracoes.MIGRACOES): um
+    banco novo recebe todas, um banco antigo só as que faltam e um banco atualizado
+    nenhuma.
+    """
+    # Importado aqui: as migrações usam as funções de criação deste módulo.
+    from src.database.migracoes import aplicar_migracoes
+
+    aplicadas = aplicar_migracoes(caminho_bd)
+    if aplicadas:
+        print(
+            f"Tabela 'filmes' criada ou migrada em {caminho_bd} (versões {aplicadas})."
+        )
+    else:
+        print(f"Tabela 'filmes' já existente e atualizada em {caminho_bd}.")
+
+
+def criar_indice_busca_titulos(conn):
+    """
+    Cria (ou completa) o índice FTS5 de títulos em um banco já aberto.
+
+    Bancos criados antes do índice ganham a coluna 'titulo_normalizado', que é
+    preenchida a partir de 'titulo', e o índice é reconstruído a partir da tabela.
+
+    Args:
+        conn (sqlite3.Connection): Conexão de escrita com o banco de filmes.
+    """
+    colunas = [linha[1] for linha in conn.execute("PRAGMA table_info(filmes)")]
+    if "titulo_normalizado" not in colunas:
+        conn.execute("ALTER TABLE filmes ADD COLUMN titulo_normalizado TEXT")
+
+    # Preenche títulos sem forma normalizada (bancos antigos ou inserções externas).
+    # Se o índice já existe, o gatilho de UPDATE também o atualiza.
+    pendentes = conn.execute(
+        "SELECT id, titulo FROM filmes WHERE titulo_normalizado IS NULL"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE filmes SET titulo_normalizado = ? WHERE id = ?",
+        [(normalizar_texto(titulo), id_filme) for id_filme, titulo in pendentes],
+    )
+
+    indice_existia = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'filmes_fts'"
+    ).fetchone()
+    for sql in SQL_INDICE_BUSCA_TITULOS:
+        conn.execute(sql)
+    if not indice_existia:
+        conn.execute("INSERT INTO filmes_fts(filmes_fts) VALUES ('rebuild')")
+
+
+def criar_indices_filtros(conn):
+    """
+    Cria os índices secundários das consultas por diretor, protagonista e ano.
+
+    Args:
+        conn (sqlite3.Connection): Conexão de escrita com o banco de filmes.
+    """
+    for sql in SQL_INDICES_FILTROS:
+        conn.execute(sql)
+
+
+def popular_filmes_exemplo(caminho_bd=DATABASE_NAME):
+    """Popula a tabela de filmes com dados de exemplo, se estiver vazia."""
+    filmes_para_inserir = [
+        ("O Poderoso Chefão", "Drama", 1972, "Francis Ford Coppola", "Marlon Brando"),
+        ("Um Sonho de Liberdade", "Drama", 1994, "Frank Darabont", "Tim Robbins"),
+        (
+            "A Lista de Schindler",
+            "Drama Histórico",
+            1993,
+            "Steven Spielberg",
+            "Liam Neeson",
+        ),
+        (
+            "Forrest Gump: O Contador de Histórias",
+            "Drama/Comédia",
+            1994,
+            "Robert Zemeckis",
+            "Tom Hanks",
+        ),
+        (
+            "Pulp Fiction: Tempo de Violência",
+            "Crime/Drama",
+            1994,
+            "Quentin Tarantino",
+            "John Travolta",
+        ),
+        (
+            "O Senhor dos Anéis: A Sociedade do Anel",
+            "Fantasia/Aventura",
+            2001,
+            "Peter Jackson",
+            "Elijah Wood",
+        ),
+        (
+            "O Cavaleiro das Trevas",
+            "Ação/Crime",
+            2008,
+            "Christopher Nolan",
+            "Christian Bale",
+        ),
+        (
+            "A Origem",
+            "Ficção Científica/Ação",
+            2010,
+            "Christopher Nolan",
+            "Leonardo DiCaprio",
+        ),
+        (
+            "Matrix",
+            "Ficção Científica/Ação",
+            1999,
+            "Lana e Lilly Wachowski",
+            "Keanu Reeves",
+        ),
+        ("Clube da Luta", "Drama/Suspense", 1999, "David Fincher", "Edward Norton"),
+        (
+            "Interestelar",
+            "Ficção Científica",
+            2014,
+            "Christopher Nolan",
+            "Matthew McConaughey",
+        ),
+        ("Gladiador", "Ação/Drama", 2000, "Ridley Scott", "Russell Crowe"),
+        ("Django Livre", "Faroeste", 2012, "Quentin Tarantino", "Jamie Foxx"),
+        (
+            "O Silêncio dos Inocentes",
+            "Suspense/Terror",
+            1991,
+            "Jonathan Demme",
+            "Jodie Foster",
+        ),
+        (
+            "Bastardos Inglórios",
+            "Guerra/Aventura",
+            2009,
+            "Quentin Tarantino",
+            "Brad Pitt",
+        ),
+        (
+            "O Resgate do Soldado Ryan",
+            "Guerra/Drama",
+            1998,
+            "Steven Spielberg",
+            "Tom Hanks",
+        ),
+        (
+            "À Espera de um Milagre",
+            "Drama/Fantasia",
+            1999,
+            "Frank Darabont",
+            "Tom Hanks",
+        ),
+        (
+            "O Lobo de Wall Street",
+            "Comédia/Crime",
+            2013,
+            "Martin Scorsese",
+            "Leonardo DiCaprio",
+        ),
+        ("Beleza Americana", "Drama", 1999, "Sam Mendes", "Kevin Spacey"),
+        ("Ilha do Medo", "Suspense", 2010, "Martin Scorsese", "Leonardo DiCaprio"),
+        (
+            "V de Vingança",
+            "Ação/Ficção Científica",
+            2005,
+            "James McTeigue",
+            "Hugo Weaving",
+        ),
+        (
+            "De Volta Para o Futuro",
+            "Ficção Científica/Aventura",
+            1985,
+            "Robert Zemeckis",
+            "Michael J. Fox",
+        ),
+        ("O Profissional", "Ação/Drama", 1994, "Luc Besson", "Jean Reno"),
+        ("Os Suspeitos", "Crime/Mistério", 1995, "Bryan Singer", "Kevin Spacey"),
+        (
+            "O Exterminador do Futuro 2: O Julgamento Final",
+            "Ficção Científica/Ação",
+            1991,
+            "James Cameron",
+            "Arnold Schwarzenegger",
+        ),
+        ("Kill Bill: Volume 1", "Ação/Crime", 2003, "Quentin Tarantino", "Uma Thurman"),
+        (
+            "Guardiões da Galáxia",
+            "Ficção Científica/Aventura",
+            2014,
+            "James Gunn",
+            "Chris Pratt",
+        ),
+        ("Coração Valente", "Histórico/Drama", 1995, "Mel Gibson", "Mel Gibson"),
+        ("WALL·E", "Animação/Ficção Científica", 2008, "Andrew Stanton", "WALL·E"),
+        (
+            "Os Bons Companheiros",
+            "Crime/Drama",
+            1990,
+            "Martin Scorsese",
+            "Robert De Niro",
+        ),
+        (
+            "Procurando Nemo",
+            "Animação/Aventura",
+            2003,
+            "Andrew Stanton",
+            "Albert Brooks",
+        ),
+        (
+            "O Sexto Sentido",
+            "Suspense/Drama",
+            1999,
+            "M. Night Shyamalan",
+            "Bruce Willis",
+        ),
+        (
+            "Up - Altas Aventuras",
+            "Animação/Aventura",
+            2009,
+            "Pete Docter",
+            "Edward Asner",
+        ),
+        ("O Show de Truman", "Drama/Comédia", 1998, "Peter Weir", "Jim Carrey"),
+        ("Um Estranho no Ninho", "Drama", 1975, "Miloš Forman", "Jack Nicholson"),
+        ("Cães de Aluguel", "Crime/Drama", 1992, "Quentin Tarantino", "Harvey Keitel"),
+        ("Parasita", "Drama/Suspense", 2019, "Bong Joon-ho", "Song Kang-ho"),
+        (
+            "Whiplash: Em Busca da Perfeição",
+            "Drama/Musical",
+            2014,
+            "Damien Chazelle",
+            "Miles Teller",
+        ),
+        ("A Chegada", "Ficção Científica/Drama", 2016, "Denis Villeneuve", "Amy Adams"),
+        (
+            "Mad Max: Estrada da Fúria",
+            "Ação/Ficção Científica",
+            2015,
+            "George Miller",
+            "Tom Hardy",
+        ),
+        ("A Rede Social", "Drama", 2010, "David Fincher", "Jesse Eisenberg"),
+        ("O Grande Lebowski", "Comédia", 1998, "Joel e Ethan Coen", "Jeff Bridges"),
+        (
+            "Seven: Os Sete Crimes Capitais",
+            "Suspense/Crime",
+            1995,
+            "David Fincher",
+            "Brad Pitt",
+        ),
+        (
+            "Amelie Poulain",
+            "Comédia Romântica",
+            2001,
+            "Jean-Pierre Jeunet",
+            "Audrey Tautou",
+        ),
+        (
+            "O Labirinto do Fauno",
+            "Fantasia/Drama",
+            2006,
+            "Guillermo del Toro",
+            "Ivana Baquero",
+        ),
+        (
+            "Cidade de Deus",
+            "Crime/Drama",
+            2002,
+            "Fernando Meirelles",
+            "Alexandre Rodrigues",
+        ),
+        ("Central do Brasil", "Drama", 1998, "Walter Salles", "Fernanda Montenegro"),
+        ("Tropa de Elite", "Ação/Crime", 2007, "José Padilha", "Wagner Moura"),
+        (
+            "Tropa de Elite 2: O Inimigo Agora é Outro",
+            "Ação/Crime",
+            2010,
+            "José Padilha",
+            "Wagner Moura",
+        ),
+        (
+            "O Auto da Compadecida",
+            "Comédia/Aventura",
+            2000,
+            "Guel Arraes",
+            "Matheus Nachtergaele",
+        ),
+        ("Bacurau", "Drama/Thriller", 2019, "Kleber Mendonça Filho", "Sônia Braga"),
+        ("Que Horas Ela Volta?", "Drama", 2015, "Anna Muylaert", "Regina Casé"),
+        ("Carandiru", "Drama", 2003, "Hector Babenco", "Luiz Carlos Vasconcelos"),
+        ("O Homem que Copiava", "Comédia/Drama", 2003, "Jorge Furtado", "Lázaro Ramos"),
+        (
+            "Lisbela e o Prisioneiro",
+            "Comédia Romântica",
+            2003,
+            "Guel Arraes",
+            "Selton Mello",
+        ),
+        (
+            "Minha Mãe É Uma Peça: O Filme",
+            "Comédia",
+            2013,
+            "André Pellenz",
+            "Paulo Gustavo",
+        ),
+        ("Cidade Baixa", "Drama", 2005, "Sérgio Machado", "Lázaro Ramos"),
+        ("O Som ao Redor", "Drama", 2012, "Kleber Mendonça Filho", "Irandhir Santos"),
+        ("Capitão Fantástico", "Drama/Comédia", 2016, "Matt Ross", "Viggo Mortensen"),
+        (
+            "A Forma da Água",
+            "Fantasia/Drama",
+            2017,
+            "Guillermo del Toro",
+            "Sally Hawkins",
+        ),
+        ("Corra!", "Terror/Suspense", 2017, "Jordan Peele", "Daniel Kaluuya"),
+        (
+            "Lady Bird: A Hora de Voar",
+            "Comédia/Drama",
+            2017,
+            "Greta Gerwig",
+            "Saoirse Ronan",
+        ),
+        ("Dunkirk", "Guerra/Histórico", 2017, "Christopher Nolan", "Fionn Whitehead"),
+        ("Bohemian Rhapsody", "Biografia/Musical", 2018, "Bryan Singer", "Rami Malek"),
+        ("Nasce Uma Estrela", "Musical/Drama", 2018, "Bradley Cooper", "Lady Gaga"),
+        (
+            "Green Book: O Guia",
+            "Biografia/Drama",
+            2018,
+            "Peter Farrelly",
+            "Mahershala Ali",
+        ),
+        ("Nomadland", "Drama", 2020, "Chloé Zhao", "Frances McDormand"),
+        ("O Pai", "Drama", 2020, "Florian Zeller", "Anthony Hopkins"),
+        ("Soul", "Animação/Aventura", 2020, "Pete Docter", "Jamie Foxx"),
+        (
+            "Duna",
+            "Ficção Científica/Aventura",
+            2021,
+            "Denis Villeneuve",
+            "Timothée Chalamet",
+        ),
+        (
+            "Não Olhe Para Cima",
+            "Comédia/Ficção Científica",
+            2021,
+            "Adam McKay",
+            "Leonardo DiCaprio",
+        ),
+        (
+            "CODA: No Ritmo do Coração",
+            "Drama/Musical",
+            2021,
+            "Sian Heder",
+            "Emilia Jones",
+        ),
+        (
+            "Tudo em Todo o Lugar ao Mesmo Tempo",
+            "Ação/Comédia",
+            2022,
+            "Dan Kwan e Daniel Scheinert",
+            "Michelle Yeoh",
+        ),
+        (
+            "Os Banshees de Inisherin",
+            "Comédia/Drama",
+            2022,
+            "Martin McDonagh",
+            "Colin Farrell",
+        ),
+        (
+            "Avatar: O Caminho da Água",
+            "Ficção Científica/Aventura",
+            2022,
+            "James Cameron",
+            "Sam Worthington",
+        ),
+        ("Oppenheimer", "Biografia/Drama", 2023, "Christopher Nolan", "Cillian Murphy"),
+        ("Barbie", "Comédia/Fantasia", 2023, "Greta Gerwig", "Margot Robbie"),
+    ]
+
+    conn = sqlite3.connect(caminho_bd)
+    cursor = conn.cursor()
+
+    # Verifica se a tabela está vazia antes de popular
+    cursor.execute("SELECT COUNT(*) FROM filmes")
+    if cursor.fetchone()[0] == 0:
+        cursor.executemany(
+            "INSERT OR IGNORE INTO filmes (titulo, genero, ano, diretor, protagonista, titulo_normalizado) VALUES (?, ?, ?, ?, ?, ?)",
+            [filme + (normalizar_texto(filme[0]),) for filme in filmes_para_inserir],
+        )
+        # Gêneros e pessoas separados nas tabelas normalizadas (ver esquema_normalizado).
+        sincronizar_esquema_normalizado(conn)
+        # Importado aqui: o módulo de apelidos usa as funções deste módulo.
+        from src.database.apelidos_titulos import popular_apelidos_exemplo
+
+        popular_apelidos_exemplo(conn)
+        conn.commit()
+        print(
+            f"{len(filmes_para_inserir)} filmes de exemplo inseridos em {caminho_bd}."
+        )
+    else:
+        print("Tabela 'filmes' já contém dados. Nenhuma inserção realizada.")
+    conn.close()
+
+
+def verificar_e_criar_diretorio_data():
+    """Verifica se o diretório 'data' existe e o cria se não existir."""
+    if not os.path.exists("data"):
+        os.makedirs("data")
+        print("Diretório 'data/' criado.")
+
+
+if __name__ == "__main__":
+    verificar_e_criar_diretorio_data()
+    criar_tabela_filmes()
+    popular_filmes_exemplo()
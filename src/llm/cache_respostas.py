@@ -0,0 +1,247 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import lru_cache
+
+from src.llm.prompts import VERSAO_PROMPTS
+from src.nlp.normalizacao import normalizar_texto
+
+
+@lru_cache(maxsize=16)
+def _hash_instrucao(instrucao_sistema):
+    """Hash curto da instrução de sistema (são poucas, e longas: calcula uma vez)."""
+    if instrucao_sistema is None:
+        return None
+    return hashlib.sha256(instrucao_sistema.encode("utf-8")).hexdigest()[:16]
+
+
+def gerar_chave(pergunta, info_filme, modelo, filmes=None, instrucao_sistema=None):
+    """
+    Gera a chave de cache de uma resposta.
+
+    A pergunta é normalizada (sem acentos, caixa e pontuação), então 'Quem dirigiu
+    Matrix?' e 'quem dirigiu matrix' compartilham a mesma resposta. O contexto do
+    banco e o nome do modelo fazem parte da chave: a mesma pergunta com outros fatos,
+    ou outro modelo, gera outra resposta. O prompt também: a chave leva um hash da
+    instrução de sistema e a VERSAO_PROMPTS, então mudar a persona, os exemplos ou os
+    modelos de prompt deixa de servir as respostas antigas do cache em disco.
+
+    Args:
+        pergunta (str): A pergunta enviada à LLM.
+        info_filme (tuple or None): O contexto factual do banco.
+        modelo (str): Nome do modelo da LLM.
+        filmes (list, optional): Vários filmes do banco (contexto de várias linhas).
+        instrucao_sistema (str, optional): Instrução de sistema enviada com o prompt.
+
+    Returns:
+        str: Hash SHA-256 (hexadecimal) que identifica a resposta.
+    """
+    contexto = list(info_filme) if info_filme else None
+    if filmes:
+        contexto = [contexto, [list(filme) for filme in filmes]]
+    conteudo = json.dumps(
+        [
+            normalizar_texto(pergunta),
+            contexto,
+            modelo,
+            [VERSAO_PROMPTS, _hash_instrucao(instrucao_sistema)],
+        ],
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+class CacheRespostas:
+    """
+    Cache de respostas da LLM em dois níveis.
+
+    1. Memória: LRU (OrderedDict) com limite de itens e validade (TTL) por item.
+    2. Disco (opcional): tabela SQLite que sobrevive a reinícios do chatbot e pode ser
+       compartilhada entre processos. Itens encontrados no disco sobem para a memória.
+       As linhas vencidas são apagadas ao abrir o arquivo e quando uma busca as encontra.
+
+    Mantém contadores de acertos, faltas, expirações e remoções por falta de espaço.
+    """
+
+    def __init__(
+        self, capacidade=1024, ttl_segundos=3600, caminho_disco=None, relogio=None
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            capacidade (int): Número máximo de respostas na memória.
+            ttl_segundos (float): Validade de cada resposta, em segundos.
+            caminho_disco (str, optional): Arquivo SQLite do nível em disco. Se None, só usa memória.
+            relogio (callable, optional): Função que retorna o tempo atual (útil nos testes).
+        """
+        self.capacidade = capacidade
+        self.ttl_segundos = ttl_segundos
+        self._relogio = relogio or time.time
+        self._memoria = OrderedDict()  # chave -> (expira_em, resposta)
+        self._trava = threading.Lock()
+        self.contadores = Counter()
+
+        self._disco = None
+        if caminho_disco:
+            self._disco = sqlite3.connect(caminho_disco, check_same_thread=False)
+            self._disco.execute(
+                """
+                CREATE TABLE IF NOT EXISTS respostas (
+                    chave TEXT PRIMARY KEY,
+                    resposta TEXT NOT NULL,
+                    expira_em REAL NOT NULL
+                )
+            """
+            )
+            # Sem isso, o arquivo só cresce: respostas vencidas nunca seriam lidas.
+            self._disco.execute(
+                "DELETE FROM respostas WHERE expira_em <= ?", (self._relogio(),)
+            )
+            self._disco.commit()
+
+    def obter(self, chave):
+        """
+        Busca uma resposta válida, primeiro na memória e depois no disco.
+
+        Args:
+            chave (str): Chave gerada por 'gerar_chave'.
+
+        Returns:
+            str or None: A resposta em cache, ou None se não houver (ou se expirou).
+        """
+        agora = self._relogio()
+        with self._trava:
+            item = self._memoria.get(chave)
+            if item is not None:
+                expira_em, resposta = item
+                if expira_em > agora:
+                    self._memoria.move_to_end(chave)  # Marca como usado recentemente.
+                    self.contadores["acertos_memoria"] += 1
+                    return resposta
+                del self._memoria[chave]
+                self.contadores["expiracoes"] += 1
+
+            if self._disco is not None:
+                linha = self._disco.execute(
+                    "SELECT resposta, expira_em FROM respostas WHERE chave = ?",
+                    (chave,),
+                ).fetchone()
+                if linha and linha[1] > agora:
+                    self._guardar_na_memoria(chave, linha[0], linha[1])
+                    self.contadores["acertos_disco"] += 1
+                    return linha[0]
+                if linha:
+                    # Vencida: apaga (se ninguém a renovou no meio tempo).
+                    with self._disco:
+                        self._disco.execute(
+                            "DELETE FROM respostas WHERE chave = ? AND expira_em <= ?",
+                            (chave, agora),
+                        )
+
+            self.contadores["faltas"] += 1
+            return None
+
+    def guardar(self, chave, resposta):
+        """
+        Armazena uma resposta nos dois níveis do cache.
+
+        Args:
+            chave (str): Chave gerada por 'gerar_chave'.
+            resposta (str): A resposta da LLM.
+        """
+        self.guardar_varios([(chave, resposta)])
+
+    def guardar_varios(self, itens):
+        """
+        Armazena várias respostas de uma vez (uma única transação no disco).
+
+        Args:
+            itens (iterable): Pares (chave, resposta).
+        """
+        expira_em = self._relogio() + self.ttl_segundos
+        itens = list(itens)
+        with self._trava:
+            for chave, resposta in itens:
+                self._guardar_na_memoria(chave, resposta, expira_em)
+            if self._disco is not None:
+                with self._disco:
+                    self._disco.executemany(
+                        "INSERT OR REPLACE INTO respostas (chave, resposta, expira_em) VALUES (?, ?, ?)",
+                        [(chave, resposta, expira_em) for chave, resposta in itens],
+                    )
+
+    def _guardar_na_memoria(self, chave, resposta, expira_em):
+        """Insere na LRU da memória, removendo os itens menos usados se passar do limite."""
+        self._memoria[chave] = (expira_em, resposta)
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.capacidade:
+            self._memoria.popitem(last=False)
+            self.contadores["remocoes"] += 1
+
+    def pre_aquecer(self, caminho_arquivo, modelo, instrucao_sistema=None):
+        """
+        Carrega respostas prontas de um arquivo JSONL para o cache.
+
+        Cada linha deve ter as chaves 'pergunta' e 'resposta' e, opcionalmente,
+        'info_filme' (lista com os fatos do banco) e 'modelo'.
+
+        Args:
+            caminho_arquivo (str): Caminho do arquivo JSONL.
+            modelo (str): Modelo usado quando a linha não informa um.
+            instrucao_sistema (str, optional): Instrução de sistema das respostas
+                (a mesma usada nas chamadas, para as chaves coincidirem).
+
+        Returns:
+            int: Quantidade de respostas carregadas.
+        """
+        itens = []
+        with open(caminho_arquivo, "r", encoding="utf-8") as f:
+            for linha in f:
+                if not linha.strip():
+                    continue
+                registro = json.loads(linha)
+                chave = gerar_chave(
+                    registro["pergunta"],
+                    registro.get("info_filme"),
+                    registro.get("modelo", modelo),
+                    instrucao_sistema=instrucao_sistema,
+                )
+                itens.append((chave, registro["resposta"]))
+        self.guardar_varios(itens)
+        return len(itens)
+
+    def estatisticas(self):
+        """
+        Retorna os contadores do cache e a taxa de acertos.
+
+        Returns:
+            dict: Contadores ('acertos_memoria', 'acertos_disco', 'faltas', 'expiracoes',
+                  'remocoes'), o tamanho atual da memória e a 'taxa_acertos'.
+        """
+        with self._trava:
+            dados = {
+                nome: self.contadores[nome]
+                for nome in (
+                    "acertos_memoria",
+                    "acertos_disco",
+                    "faltas",
+                    "expiracoes",
+                    "remocoes",
+                )
+            }
+            dados["itens_memoria"] = len(self._memoria)
+        acertos = dados["acertos_memoria"] + dados["acertos_disco"]
+        consultas = acertos + dados["faltas"]
+        dados["taxa_acertos"] = acertos / consultas if consultas else 0.0
+        return dados
+
+    def fechar(self):
+        """Fecha o arquivo do nível em disco, se houver."""
+        if self._disco is not None:
+            self._disco.close()
+            self._disco = None
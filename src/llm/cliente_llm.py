@@ -0,0 +1,446 @@
+import asyncio
+import datetime
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+import google.generativeai as genai
+from google.api_core import exceptions as erros_google
+
+MODELO_PADRAO = "gemini-1.5-flash"
+
+logger = logging.getLogger(__name__)
+
+# Erros transitórios da API que valem uma nova tentativa (sobrecarga, tempo esgotado...).
+ERROS_TRANSITORIOS = (
+    erros_google.ServiceUnavailable,
+    erros_google.DeadlineExceeded,
+    erros_google.ResourceExhausted,
+    erros_google.InternalServerError,
+)
+
+# 'tool_config' da última rodada de 'gerar_stream_com_ferramentas_async': o modelo
+# não pode pedir mais ferramentas e responde em texto com o que já recebeu.
+SEM_FERRAMENTAS = {"function_calling_config": {"mode": "NONE"}}
+
+# Resposta de reserva se, mesmo assim, a conversa com ferramentas terminar sem texto.
+RESPOSTA_SEM_TEXTO = (
+    "Desculpe, não consegui concluir a consulta agora. Pode perguntar de novo?"
+)
+
+
+class ClienteLLM:
+    """
+    Cliente único da API do Google Gemini, compartilhado por todo o chatbot.
+
+    'genai.configure' é chamado uma única vez e os objetos GenerativeModel são criados
+    uma vez por instrução de sistema e reutilizados, mantendo aberto o mesmo canal de
+    transporte (gRPC) entre os turnos da conversa em vez de recriá-lo a cada chamada.
+    Oferece geração síncrona ('gerar') e assíncrona ('gerar_async'), com tempo limite
+    e novas tentativas configuráveis.
+
+    Com o cache de contexto ligado (GEMINI_CACHE_CONTEXTO=1), cada instrução de
+    sistema é enviada uma vez ao provedor como conteúdo em cache e as requisições
+    seguintes só levam a parte variável do prompt. Se o provedor recusar (ex: prefixo
+    abaixo do mínimo de tokens do modelo), o cliente volta à instrução de sistema
+    comum. O uso de tokens de cada chamada é registrado no log (logger deste módulo)
+    e acumulado em 'estatisticas_tokens'.
+    """
+
+    def __init__(
+        self,
+        api_key=None,
+        modelo=None,
+        timeout=None,
+        tentativas=None,
+        espera_inicial=0.5,
+        cache_contexto=None,
+        ttl_cache_contexto=None,
+    ):
+        """
+        Inicializa o cliente. Parâmetros omitidos vêm das variáveis de ambiente.
+
+        Args:
+            api_key (str, optional): Chave da API (padrão: GOOGLE_API_KEY).
+            modelo (str, optional): Nome do modelo (padrão: GEMINI_MODELO ou 'gemini-1.5-flash').
+            timeout (float, optional): Tempo limite por chamada em segundos (padrão: GEMINI_TIMEOUT ou 30).
+            tentativas (int, optional): Tentativas em erros transitórios (padrão: GEMINI_TENTATIVAS ou 3).
+            espera_inicial (float): Espera antes da 2ª tentativa; dobra a cada nova tentativa.
+            cache_contexto (bool, optional): Usa o cache de contexto do provedor para as
+                instruções de sistema (padrão: GEMINI_CACHE_CONTEXTO=1; desligado).
+            ttl_cache_contexto (float, optional): Validade do cache de contexto em
+                segundos (padrão: GEMINI_CACHE_CONTEXTO_TTL ou 3600).
+        """
+        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        self.modelo = modelo or os.environ.get("GEMINI_MODELO", MODELO_PADRAO)
+        self.timeout = float(timeout or os.environ.get("GEMINI_TIMEOUT", "30"))
+        self.tentativas = int(tentativas or os.environ.get("GEMINI_TENTATIVAS", "3"))
+        self.espera_inicial = espera_inicial
+        if cache_contexto is None:
+            cache_contexto = os.environ.get("GEMINI_CACHE_CONTEXTO") == "1"
+        self.cache_contexto = cache_contexto
+        self.ttl_cache_contexto = float(
+            ttl_cache_contexto or os.environ.get("GEMINI_CACHE_CONTEXTO_TTL", "3600")
+        )
+
+        # system_instruction (ou, com ferramentas, (system_instruction, nomes das
+        # ferramentas)) -> (GenerativeModel, instante em que o cache de contexto
+        # expira, ou None se o modelo não usa cache de contexto).
+        self._modelos = {}
+        self._trava = threading.Lock()
+        self.estatisticas_tokens = Counter()
+        if self.api_key:
+            genai.configure(api_key=self.api_key)
+
+    @property
+    def configurado(self):
+        """Indica se há uma chave de API para chamar a LLM."""
+        return bool(self.api_key)
+
+    def obter_modelo(self, system_instruction=None, ferramentas=None):
+        """
+        Retorna o GenerativeModel para a instrução de sistema, criando-o uma única vez.
+
+        Args:
+            system_instruction (str, optional): Instrução de sistema (persona) do modelo.
+            ferramentas (list, optional): Declarações de funções (function calling) que
+                                          o modelo pode chamar.
+
+        Returns:
+            genai.GenerativeModel: O modelo pronto para gerar conteúdo.
+        """
+        chave = system_instruction
+        if ferramentas:
+            chave = (system_instruction, tuple(f["name"] for f in ferramentas))
+        entrada = self._modelos.get(chave)
+        if entrada is None or self._expirou(entrada):
+            with self._trava:
+                entrada = self._modelos.get(chave)
+                if entrada is None or self._expirou(entrada):
+                    entrada = self._criar_modelo(system_instruction, ferramentas)
+                    self._modelos[chave] = entrada
+        return entrada[0]
+
+    @staticmethod
+    def _expirou(entrada):
+        """Indica se o cache de contexto do modelo está para expirar no provedor."""
+        expira_em = entrada[1]
+        return expira_em is not None and time.monotonic() >= expira_em
+
+    def _criar_modelo(self, system_instruction, ferramentas=None):
+        """Cria o modelo, de preferência a partir de um cache de contexto."""
+        if ferramentas:
+            modelo = genai.GenerativeModel(
+                self.modelo,
+                system_instruction=system_instruction,
+                tools=[{"function_declarations": ferramentas}],
+            )
+            return modelo, None
+        if system_instruction is None:
+            return genai.GenerativeModel(self.modelo), None
+        if self.cache_contexto:
+            entrada = self._criar_modelo_com_cache(system_instruction)
+            if entrada is not None:
+                return entrada
+        return (
+            genai.GenerativeModel(self.modelo, system_instruction=system_instruction),
+            None,
+        )
+
+    def _criar_modelo_com_cache(self, system_instruction):
+        """
+        Envia a instrução de sistema ao cache de contexto do provedor.
+
+        Returns:
+            tuple or None: (modelo, instante de renovação), ou None se o cache não
+                           estiver disponível para este modelo/prefixo.
+        """
+        try:
+            conteudo = genai.caching.CachedContent.create(
+                model=self.modelo,
+                system_instruction=system_instruction,
+                ttl=datetime.timedelta(seconds=self.ttl_cache_contexto),
+            )
+            modelo = genai.GenerativeModel.from_cached_content(cached_content=conteudo)
+        except Exception as e:
+            # Ex: SDK antigo, modelo sem suporte ou prefixo menor que o mínimo exigido.
+            logger.warning(
+                "Cache de contexto indisponível (%s); usando a instrução de sistema.",
+                e,
+            )
+            self.cache_contexto = False  # Não tenta de novo a cada instrução.
+            return None
+        # Renova um pouco antes de o provedor descartar o conteúdo em cache.
+        return modelo, time.monotonic() + 0.9 * self.ttl_cache_contexto
+
+    def _registrar_uso(self, resposta, inicio):
+        """
+        Registra no log e em 'estatisticas_tokens' o uso de tokens de uma chamada.
+
+        Args:
+            resposta: A resposta da API (com 'usage_metadata').
+            inicio (float): Instante (time.perf_counter) em que a chamada começou.
+        """
+        uso = getattr(resposta, "usage_metadata", None)
+        entrada = _contar_tokens(getattr(uso, "prompt_token_count", 0))
+        em_cache = _contar_tokens(getattr(uso, "cached_content_token_count", 0))
+        saida = _contar_tokens(getattr(uso, "candidates_token_count", 0))
+        duracao = time.perf_counter() - inicio
+        with self._trava:
+            self.estatisticas_tokens.update(
+                chamadas=1, entrada=entrada, entrada_em_cache=em_cache, saida=saida
+            )
+        logger.info(
+            "%s: %d tokens de entrada (%d do cache de contexto), %d de saída, %.0fms",
+            self.modelo,
+            entrada,
+            em_cache,
+            saida,
+            duracao * 1000,
+        )
+
+    def _opcoes_requisicao(self):
+        """Opções enviadas em cada chamada à API (tempo limite)."""
+        return {"timeout": self.timeout}
+
+    def gerar(self, prompt, system_instruction=None):
+        """
+        Gera texto para o prompt, repetindo a chamada em caso de erro transitório.
+
+        Args:
+            prompt (str): O prompt completo.
+            system_instruction (str, optional): Instrução de sistema do modelo.
+
+        Returns:
+            str: O texto gerado pela LLM.
+
+        Raises:
+            Exception: O erro da API, se todas as tentativas falharem.
+        """
+        modelo = self.obter_modelo(system_instruction)
+        for tentativa in range(self.tentativas):
+            inicio = time.perf_counter()
+            try:
+                resposta = modelo.generate_content(
+                    prompt, request_options=self._opcoes_requisicao()
+                )
+                self._registrar_uso(resposta, inicio)
+                return resposta.text
+            except ERROS_TRANSITORIOS:
+                if tentativa == self.tentativas - 1:
+                    raise
+                time.sleep(self.espera_inicial * 2**tentativa)
+
+    async def gerar_async(self, prompt, system_instruction=None):
+        """
+        Versão assíncrona de 'gerar', que não bloqueia o loop de eventos.
+
+        Args:
+            prompt (str): O prompt completo.
+            system_instruction (str, optional): Instrução de sistema do modelo.
+
+        Returns:
+            str: O texto gerado pela LLM.
+        """
+        modelo = self.obter_modelo(system_instruction)
+        for tentativa in range(self.tentativas):
+            inicio = time.perf_counter()
+            try:
+                resposta = await modelo.generate_content_async(
+                    prompt, request_options=self._opcoes_requisicao()
+                )
+                self._registrar_uso(resposta, inicio)
+                return resposta.text
+            except ERROS_TRANSITORIOS:
+                if tentativa == self.tentativas - 1:
+                    raise
+                await asyncio.sleep(self.espera_inicial * 2**tentativa)
+
+    def gerar_stream(self, prompt, system_instruction=None):
+        """
+        Gera texto em modo streaming, entregando os pedaços à medida que chegam.
+
+        Só há nova tentativa se o erro transitório ocorrer antes do primeiro pedaço;
+        depois disso o texto já foi entregue e o erro é repassado a quem consome.
+
+        Args:
+            prompt (str): O prompt completo.
+            system_instruction (str, optional): Instrução de sistema do modelo.
+
+        Yields:
+            str: Pedaços do texto gerado pela LLM.
+        """
+        modelo = self.obter_modelo(system_instruction)
+        for tentativa in range(self.tentativas):
+            entregou_pedaco = False
+            inicio = time.perf_counter()
+            try:
+                resposta = modelo.generate_content(
+                    prompt, stream=True, request_options=self._opcoes_requisicao()
+                )
+                for pedaco in resposta:
+                    if pedaco.text:
+                        entregou_pedaco = True
+                        yield pedaco.text
+                self._registrar_uso(resposta, inicio)
+                return
+            except ERROS_TRANSITORIOS:
+                if entregou_pedaco or tentativa == self.tentativas - 1:
+                    raise
+                time.sleep(self.espera_inicial * 2**tentativa)
+
+    async def gerar_stream_async(self, prompt, system_instruction=None):
+        """
+        Versão assíncrona de 'gerar_stream' (gerador assíncrono de pedaços).
+
+        Args:
+            prompt (str): O prompt completo.
+            system_instruction (str, optional): Instrução de sistema do modelo.
+
+        Yields:
+            str: Pedaços do texto gerado pela LLM.
+        """
+        modelo = self.obter_modelo(system_instruction)
+        for tentativa in range(self.tentativas):
+            entregou_pedaco = False
+            inicio = time.perf_counter()
+            try:
+                resposta = await modelo.generate_content_async(
+                    prompt, stream=True, request_options=self._opcoes_requisicao()
+                )
+                async for pedaco in resposta:
+                    if pedaco.text:
+                        entregou_pedaco = True
+                        yield pedaco.text
+                self._registrar_uso(resposta, inicio)
+                return
+            except ERROS_TRANSITORIOS:
+                if entregou_pedaco or tentativa == self.tentativas - 1:
+                    raise
+                await asyncio.sleep(self.espera_inicial * 2**tentativa)
+
+    async def gerar_stream_com_ferramentas_async(
+        self, prompt, ferramentas, funcoes, system_instruction=None, max_rodadas=3
+    ):
+        """
+        Gera texto em streaming deixando o modelo chamar ferramentas (function calling).
+
+        Quando o modelo pede uma ferramenta, a função Python correspondente é executada
+        (em uma thread auxiliar) e o resultado volta ao modelo na mesma conversa, que
+        então continua a resposta. Cada rodada é uma chamada à API. Um pedido de
+        ferramenta inexistente ou com argumentos errados volta ao modelo como
+        {"erro": ...}, e a última rodada não oferece ferramentas, para que a conversa
+        sempre termine em texto.
+
+        Args:
+            prompt (str): O conteúdo enviado ao modelo.
+            ferramentas (list): Declarações das funções (nome, descrição, parâmetros).
+            funcoes (dict): Nome da ferramenta -> função Python que a executa.
+            system_instruction (str, optional): Instrução de sistema do modelo.
+            max_rodadas (int): Máximo de chamadas à API (evita laços de ferramentas).
+
+        Yields:
+            str: Pedaços do texto gerado pela LLM.
+        """
+        modelo = self.obter_modelo(system_instruction, ferramentas)
+        historico = [
+            genai.protos.Content(role="user", parts=[genai.protos.Part(text=prompt)])
+        ]
+        entregou_texto = False
+        for rodada in range(max_rodadas):
+            opcoes = {}
+            if rodada == max_rodadas - 1:
+                opcoes["tool_config"] = SEM_FERRAMENTAS  # Última rodada: só texto.
+            inicio = time.perf_counter()
+            resposta = await modelo.generate_content_async(
+                historico,
+                stream=True,
+                request_options=self._opcoes_requisicao(),
+                **opcoes,
+            )
+            chamadas = []
+            async for pedaco in resposta:
+                for parte in pedaco.parts:
+                    if "function_call" in parte:
+                        chamadas.append(parte.function_call)
+                    elif parte.text:
+                        entregou_texto = True
+                        yield parte.text
+            self._registrar_uso(resposta, inicio)
+            if not chamadas:
+                return
+
+            # Devolve ao modelo o resultado de cada ferramenta pedida.
+            historico.append(resposta.candidates[0].content)
+            resultados = []
+            for chamada in chamadas:
+                resultados.append(
+                    genai.protos.Part(
+                        function_response=genai.protos.FunctionResponse(
+                            name=chamada.name,
+                            response=await _executar_ferramenta(funcoes, chamada),
+                        )
+                    )
+                )
+            historico.append(genai.protos.Content(role="user", parts=resultados))
+        if not entregou_texto:
+            yield RESPOSTA_SEM_TEXTO  # O modelo insistiu em ferramentas até o fim.
+
+
+async def _executar_ferramenta(funcoes, chamada):
+    """
+    Executa a ferramenta pedida pelo modelo (em uma thread auxiliar).
+
+    Returns:
+        dict: {"resultado": ...}, ou {"erro": ...} se a ferramenta não existe ou os
+              argumentos não batem com os dela (o modelo pode corrigir o pedido).
+    """
+    funcao = funcoes.get(chamada.name)
+    if funcao is None:
+        return {"erro": f"Ferramenta desconhecida: '{chamada.name}'."}
+    argumentos = dict(chamada.args)
+    try:
+        inspect.signature(funcao).bind(**argumentos)
+    except TypeError as e:
+        return {"erro": f"Argumentos inválidos para '{chamada.name}': {e}."}
+    return {"resultado": await asyncio.to_thread(funcao, **argumentos)}
+
+
+def _contar_tokens(valor):
+    """Converte uma contagem de tokens da API em int (0 se ausente)."""
+    return valor if isinstance(valor, int) else 0
+
+
+# Cliente compartilhado pelo processo (criado na primeira chamada).
+_cliente_padrao = None
+_trava_cliente_padrao = threading.Lock()
+
+
+def obter_cliente_llm():
+    """
+    Retorna o cliente LLM compartilhado, criando-o na primeira chamada.
+
+    Returns:
+        ClienteLLM: O cliente configurado a partir das variáveis de ambiente.
+    """
+    global _cliente_padrao
+    if _cliente_padrao is None:
+        with _trava_cliente_padrao:
+            if _cliente_padrao is None:
+                _cliente_padrao = ClienteLLM()
+    return _cliente_padrao
+
+
+def redefinir_cliente_llm(cliente=None):
+    """
+    Substitui o cliente compartilhado (ex: por um cliente falso nos testes e benchmarks).
+
+    Args:
+        cliente (ClienteLLM, optional): Novo cliente. Se None, o próximo uso recria o padrão.
+    """
+    global _cliente_padrao
+    with _trava_cliente_padrao:
+        _cliente_padrao = cliente
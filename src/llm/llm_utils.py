@@ -1,94 +1,304 @@
-import os
-
-import google.generativeai as genai
-
-
-def chamar_llm_para_resumo(pergunta_usuario, info_filme=None):
-    """
-    Gera uma resposta abrangente e estilizada usando a LLM (Google Gemini Pro).
-    Esta função é o "cérebro" do chatbot, gerando todas as respostas textuais.
-
-    Args:
-        pergunta_usuario (str): A pergunta original do usuário.
-        info_filme (tuple, optional): Informações factuais do filme (titulo, diretor, ano, genero) do BD, se encontrado.
-                                        Passado como contexto para a LLM.
-
-    Returns:
-        str: A resposta gerada pela LLM (precedida de 'Chatbot: ') ou uma mensagem de erro/placeholder.
-    """
-    api_key = os.getenv("GOOGLE_API_KEY")
-
-    if not api_key:
-        return (
-            "Chatbot: ERRO: A chave da API do Google Gemini não foi configurada como variável de ambiente 'GOOGLE_API_KEY'. "
-            "Para testar a IA, por favor, configure a chave de API (instruções no README)."
-        )
-
-    genai.configure(api_key=api_key)
-
-    model = genai.GenerativeModel("gemini-1.5-flash")
-
-    # --- CONSTRUÇÃO DO PROMPT DETALHADA PARA ABRANGÊNCIA E ESTILO ---
-
-    # 1. Definição de Persona e Regras Globais: (Instruções ESSENCIAIS para o comportamento da LLM)
-    system_instruction = (
-        "Você é um chatbot cinéfilo, um mestre das histórias das telonas, com uma personalidade dramática, poética e perspicaz. "
-        "Seu estilo de resposta deve imitar diálogos de filmes clássicos ou personagens icônicos (como sábio, astuto, ou direto). "
-        "Use frases de efeito, metáforas cinematográficas e um tom que evoque a magia das telas, mas nunca sacrifique a verdade pelos floreios. "
-        "Sua missão é responder a perguntas sobre filmes de forma abrangente, seja fatual, resumo, sobre personagens, curiosidades ou saudações. "
-        "Sempre tente fornecer informações precisas e concisas. Se não souber algo, admita com dignidade e um toque dramático e com elegância. "
-        "Se a pergunta parecer não relacionada a filmes, responda educadamente, mas redirecione gentilmente para o tema cinema."
-    )
-
-    # 2. Contexto Factual (do Banco de Dados, se o filme foi encontrado):
-    contexto_factual = ""
-    if info_filme:
-        titulo, diretor, ano, genero, protagonista = info_filme
-        contexto_factual = (
-            f"Informações confirmadas do banco de dados sobre o filme: "
-            f"Título: '{titulo}', Diretor: {diretor}, Ano: {ano}, Gênero: {genero}. "
-            f"O protagonista principal é {protagonista}. "
-            f"Utilize esses fatos em sua resposta com precisão, combinando-os com seu estilo marcante."
-        )
-
-    # 3. Exemplos (Few-shot Prompting - CONCEITUALMENTE do pt.txt para guiar o estilo):
-    # Estes exemplos moldam a LLM a dar respostas mais ricas e no estilo desejado.
-    few_shot_examples = (
-        "\n--- Exemplos de Interação Estilizada ---\n"
-        "Você: Olá, chatbot!\n"
-        "Chatbot: Bem-vindo, buscador de histórias! Qual enigma cinematográfico o aflige hoje?\n"
-        "Você: Quem dirigiu Matrix?\n"
-        "Chatbot: Ah, 'Matrix'? Foi a mente brilhante das irmãs Wachowski que orquestrou essa epopeia em 1999. Uma verdadeira viagem à realidade.\n"
-        "Você: Me resuma 'A Origem'.\n"
-        "Chatbot: 'A Origem'... Um labirinto onírico, onde a mente é o campo de batalha. Dirigido por Christopher Nolan em 2010. Prepare-se para ter seus sonhos invadidos por uma equipe de ladrões que plantam ideias. Uma trama intrincada, um verdadeiro desafio à percepção.\n"
-        "Você: Fale sobre o personagem Darth Vader.\n"
-        "Chatbot: Ah, Lord Vader... A sombra imponente que permeia a galáxia. Um vilão cujas ações moldaram o destino, outrora um herói caído. Sua presença é um lembrete sombrio do poder do Lado Sombrio da Força.\n"
-        "Você: Qual o filme mais triste que você conhece?\n"
-        "Chatbot: As trilhas da tristeza são muitas nos reinos cinematográficos. Cada lágrima derramada por uma obra... Mas se a dor buscas, 'A Vida é Bela' talvez te mostre a beleza na tragédia, ou 'À Espera de um Milagre', a esperança em meio ao desespero. Escolhas sombrias, mas poderosas.\n"
-        "Você: Preciso sair.\n"
-        "Chatbot: Que sua jornada continue épica. Até a próxima cena!\n"
-    )
-
-    # 4. A Pergunta do Usuário para a LLM:
-    user_query = f"Pergunta do usuário: '{pergunta_usuario}'"
-
-    # Constrói o prompt final combinando todas as partes.
-    prompt_completo = (
-        f"{system_instruction}\n\n"
-        f"{contexto_factual}\n"
-        f"{few_shot_examples}\n"
-        f"{user_query}\n"
-        f"Sua resposta (no estilo de filme):"
-    )
-
-    # --- FIM DA CONSTRUÇÃO DO PROMPT ---
-
-    try:
-        response = model.generate_content(prompt_completo)
-        return f"Chatbot: {response.text}"  # Retorna a resposta da LLM.
-    except Exception as e:
-        # Captura e exibe erros que podem ocorrer na chamada da API (ex: chave inválida, sem internet, etc.)
-        return (
-            f"Chatbot: ERRO na consulta ao grande oráculo (LLM): {e}. "
-            "Minha conexão com o universo do conhecimento está instável. Por favor, tente novamente."
-        )
+import os
+
+from src.llm.cache_respostas import CacheRespostas, gerar_chave
+from src.llm.cliente_llm import obter_cliente_llm
+from src.llm.prompts import (
+    INSTRUCAO_SISTEMA_FERRAMENTA,
+    INSTRUCAO_SISTEMA_RESUMO,
+    montar_prompt_resumo,
+)
+
+# Cache de respostas compartilhado pelo processo (criado na primeira chamada).
+_cache_respostas = None
+
+
+def obter_cache_respostas():
+    """
+    Retorna o cache de respostas da LLM, criando-o na primeira chamada.
+
+    Configuração por variáveis de ambiente (todas opcionais):
+        CHATBOT_CACHE_CAPACIDADE: Máximo de respostas na memória (padrão 1024).
+        CHATBOT_CACHE_TTL: Validade das respostas em segundos (padrão 3600).
+        CHATBOT_CACHE_DISCO: Arquivo SQLite para o nível em disco (desligado se vazio).
+        CHATBOT_CACHE_PRE_AQUECER: Arquivo JSONL com respostas para carregar no início.
+
+    Returns:
+        CacheRespostas: O cache compartilhado.
+    """
+    global _cache_respostas
+    if _cache_respostas is None:
+        _cache_respostas = CacheRespostas(
+            capacidade=int(os.environ.get("CHATBOT_CACHE_CAPACIDADE", "1024")),
+            ttl_segundos=float(os.environ.get("CHATBOT_CACHE_TTL", "3600")),
+            caminho_disco=os.environ.get("CHATBOT_CACHE_DISCO") or None,
+        )
+        arquivo_pre_aquecimento = os.environ.get("CHATBOT_CACHE_PRE_AQUECER")
+        if arquivo_pre_aquecimento:
+            _cache_respostas.pre_aquecer(
+                arquivo_pre_aquecimento,
+                obter_cliente_llm().modelo,
+                instrucao_sistema=INSTRUCAO_SISTEMA_RESUMO,
+            )
+    return _cache_respostas
+
+
+def redefinir_cache_respostas(cache=None):
+    """
+    Substitui o cache compartilhado (ex: um cache vazio ou desligado em benchmarks).
+
+    Args:
+        cache (CacheRespostas, optional): Novo cache. Se None, o próximo uso recria o padrão.
+    """
+    global _cache_respostas
+    _cache_respostas = cache
+
+
+MENSAGEM_SEM_CHAVE_API = (
+    "Chatbot: ERRO: A chave da API do Google Gemini não foi configurada como variável de ambiente 'GOOGLE_API_KEY'. "
+    "Para testar a IA, por favor, configure a chave de API (instruções no README)."
+)
+
+
+def _mensagem_erro_llm(erro):
+    """Mensagem (no estilo do chatbot) exibida quando a chamada à LLM falha."""
+    return (
+        f"Chatbot: ERRO na consulta ao grande oráculo (LLM): {erro}. "
+        "Minha conexão com o universo do conhecimento está instável. Por favor, tente novamente."
+    )
+
+
+def _resposta_sem_llm(cliente, cache, chave_cache):
+    """
+    Resposta que dispensa a chamada à LLM: a do cache ou o aviso de chave ausente.
+
+    Returns:
+        str or None: A resposta pronta (precedida de 'Chatbot: '), ou None se for
+                     preciso chamar a LLM.
+    """
+    resposta_em_cache = cache.obter(chave_cache)
+    if resposta_em_cache is not None:
+        return f"Chatbot: {resposta_em_cache}"
+    if not cliente.configurado:
+        return MENSAGEM_SEM_CHAVE_API
+    return None
+
+
+def chamar_llm_para_resumo(pergunta_usuario, info_filme=None, filmes=None):
+    """
+    Gera uma resposta abrangente e estilizada usando a LLM (Google Gemini Pro).
+    Esta função é o "cérebro" do chatbot, gerando todas as respostas textuais.
+
+    Args:
+        pergunta_usuario (str): A pergunta original do usuário.
+        info_filme (tuple, optional): Informações factuais do filme (titulo, diretor, ano, genero) do BD, se encontrado.
+                                        Passado como contexto para a LLM.
+        filmes (list, optional): Vários filmes do BD (ex: 'filmes do Nolan'), enviados
+                                 à LLM em formato compacto, uma linha por filme.
+
+    Returns:
+        str: A resposta gerada pela LLM (precedida de 'Chatbot: ') ou uma mensagem de erro/placeholder.
+    """
+    cliente = obter_cliente_llm()
+
+    # Perguntas repetidas (e as mensagens fixas de saudação/despedida) vêm do cache.
+    cache = obter_cache_respostas()
+    chave_cache = gerar_chave(
+        pergunta_usuario,
+        info_filme,
+        cliente.modelo,
+        filmes,
+        instrucao_sistema=INSTRUCAO_SISTEMA_RESUMO,
+    )
+    resposta_pronta = _resposta_sem_llm(cliente, cache, chave_cache)
+    if resposta_pronta is not None:
+        return resposta_pronta
+
+    # Só a parte variável do prompt; persona e exemplos vão como instrução de sistema.
+    prompt_completo = montar_prompt_resumo(pergunta_usuario, info_filme, filmes)
+
+    try:
+        texto_resposta = cliente.gerar(prompt_completo, INSTRUCAO_SISTEMA_RESUMO)
+        # Só respostas bem-sucedidas entram no cache; erros não são memorizados.
+        cache.guardar(chave_cache, texto_resposta)
+        return f"Chatbot: {texto_resposta}"  # Retorna a resposta da LLM.
+    except Exception as e:
+        # Captura e exibe erros que podem ocorrer na chamada da API (ex: chave inválida, sem internet, etc.)
+        return _mensagem_erro_llm(e)
+
+
+async def chamar_llm_para_resumo_async(pergunta_usuario, info_filme=None, filmes=None):
+    """
+    Versão assíncrona de 'chamar_llm_para_resumo', para o servidor de chat.
+
+    A chamada à LLM não bloqueia o loop de eventos, então vários usuários podem
+    aguardar suas respostas ao mesmo tempo. Usa o mesmo cache e o mesmo prompt.
+
+    Args:
+        pergunta_usuario (str): A pergunta original do usuário.
+        info_filme (tuple, optional): Informações factuais do filme vindas do BD.
+        filmes (list, optional): Vários filmes do BD, enviados em formato compacto.
+
+    Returns:
+        str: A resposta gerada pela LLM (precedida de 'Chatbot: ') ou uma mensagem de erro.
+    """
+    cliente = obter_cliente_llm()
+
+    cache = obter_cache_respostas()
+    chave_cache = gerar_chave(
+        pergunta_usuario,
+        info_filme,
+        cliente.modelo,
+        filmes,
+        instrucao_sistema=INSTRUCAO_SISTEMA_RESUMO,
+    )
+    resposta_pronta = _resposta_sem_llm(cliente, cache, chave_cache)
+    if resposta_pronta is not None:
+        return resposta_pronta
+
+    prompt_completo = montar_prompt_resumo(pergunta_usuario, info_filme, filmes)
+
+    try:
+        texto_resposta = await cliente.gerar_async(
+            prompt_completo, INSTRUCAO_SISTEMA_RESUMO
+        )
+        cache.guardar(chave_cache, texto_resposta)
+        return f"Chatbot: {texto_resposta}"
+    except Exception as e:
+        return _mensagem_erro_llm(e)
+
+
+def chamar_llm_para_resumo_stream(pergunta_usuario, info_filme=None, filmes=None):
+    """
+    Versão em streaming de 'chamar_llm_para_resumo': entrega a resposta em pedaços
+    à medida que a LLM os gera, para o usuário começar a ler antes do fim.
+
+    O prefixo 'Chatbot: ' vai junto com o primeiro pedaço da LLM (e não antes dele),
+    para que o tempo até o primeiro pedaço meça de fato a LLM. Respostas do cache e
+    mensagens de erro saem em um único pedaço. A resposta completa entra no cache.
+
+    Args:
+        pergunta_usuario (str): A pergunta original do usuário.
+        info_filme (tuple, optional): Informações factuais do filme vindas do BD.
+        filmes (list, optional): Vários filmes do BD, enviados em formato compacto.
+
+    Yields:
+        str: Pedaços da resposta; concatenados, formam o mesmo texto da versão sem
+             streaming.
+    """
+    cliente = obter_cliente_llm()
+
+    cache = obter_cache_respostas()
+    chave_cache = gerar_chave(
+        pergunta_usuario,
+        info_filme,
+        cliente.modelo,
+        filmes,
+        instrucao_sistema=INSTRUCAO_SISTEMA_RESUMO,
+    )
+    resposta_pronta = _resposta_sem_llm(cliente, cache, chave_cache)
+    if resposta_pronta is not None:
+        yield resposta_pronta
+        return
+
+    prompt_completo = montar_prompt_resumo(pergunta_usuario, info_filme, filmes)
+
+    partes = []
+    try:
+        pedacos = cliente.gerar_stream(prompt_completo, INSTRUCAO_SISTEMA_RESUMO)
+        for pedaco in pedacos:
+            yield pedaco if partes else f"Chatbot: {pedaco}"
+            partes.append(pedaco)
+    except Exception as e:
+        # Se parte da resposta já foi exibida, o erro vai para a linha seguinte.
+        yield f"\n{_mensagem_erro_llm(e)}" if partes else _mensagem_erro_llm(e)
+        return
+    cache.guardar(chave_cache, "".join(partes))
+
+
+async def chamar_llm_para_resumo_stream_async(
+    pergunta_usuario, info_filme=None, filmes=None
+):
+    """
+    Versão assíncrona de 'chamar_llm_para_resumo_stream' (gerador assíncrono).
+
+    Args:
+        pergunta_usuario (str): A pergunta original do usuário.
+        info_filme (tuple, optional): Informações factuais do filme vindas do BD.
+        filmes (list, optional): Vários filmes do BD, enviados em formato compacto.
+
+    Yields:
+        str: Pedaços da resposta.
+    """
+    cliente = obter_cliente_llm()
+
+    cache = obter_cache_respostas()
+    chave_cache = gerar_chave(
+        pergunta_usuario,
+        info_filme,
+        cliente.modelo,
+        filmes,
+        instrucao_sistema=INSTRUCAO_SISTEMA_RESUMO,
+    )
+    resposta_pronta = _resposta_sem_llm(cliente, cache, chave_cache)
+    if resposta_pronta is not None:
+        yield resposta_pronta
+        return
+
+    prompt_completo = montar_prompt_resumo(pergunta_usuario, info_filme, filmes)
+
+    partes = []
+    try:
+        pedacos = cliente.gerar_stream_async(prompt_completo, INSTRUCAO_SISTEMA_RESUMO)
+        async for pedaco in pedacos:
+            yield pedaco if partes else f"Chatbot: {pedaco}"
+            partes.append(pedaco)
+    except Exception as e:
+        yield f"\n{_mensagem_erro_llm(e)}" if partes else _mensagem_erro_llm(e)
+        return
+    cache.guardar(chave_cache, "".join(partes))
+
+
+async def chamar_llm_com_ferramentas_stream_async(
+    pergunta_usuario, ferramentas, funcoes
+):
+    """
+    Modo de chamada única: a LLM recebe a pergunta e as ferramentas (ex: 'lookup_movie')
+    e decide sozinha se consulta o banco, sem a chamada separada de extração de título.
+
+    Args:
+        pergunta_usuario (str): A pergunta original do usuário.
+        ferramentas (list): Declarações das ferramentas (function calling).
+        funcoes (dict): Nome da ferramenta -> função Python que a executa.
+
+    Yields:
+        str: Pedaços da resposta (o primeiro precedido de 'Chatbot: ').
+    """
+    cliente = obter_cliente_llm()
+
+    # Os fatos vêm da própria ferramenta, então a chave depende só da pergunta.
+    cache = obter_cache_respostas()
+    chave_cache = gerar_chave(
+        pergunta_usuario,
+        None,
+        f"{cliente.modelo}+ferramentas",
+        instrucao_sistema=INSTRUCAO_SISTEMA_FERRAMENTA,
+    )
+    resposta_pronta = _resposta_sem_llm(cliente, cache, chave_cache)
+    if resposta_pronta is not None:
+        yield resposta_pronta
+        return
+
+    prompt_completo = montar_prompt_resumo(pergunta_usuario)
+
+    partes = []
+    try:
+        pedacos = cliente.gerar_stream_com_ferramentas_async(
+            prompt_completo, ferramentas, funcoes, INSTRUCAO_SISTEMA_FERRAMENTA
+        )
+        async for pedaco in pedacos:
+            yield pedaco if partes else f"Chatbot: {pedaco}"
+            partes.append(pedaco)
+    except Exception as e:
+        yield f"\n{_mensagem_erro_llm(e)}" if partes else _mensagem_erro_llm(e)
+        return
+    cache.guardar(chave_cache, "".join(partes))
@@ -0,0 +1,72 @@
+import time
+
+
+class MetricasStream:
+    """
+    Mede uma resposta em streaming: tempo até o primeiro pedaço (TTFT) e tempo total.
+
+    O TTFT é o que o usuário percebe como "o chatbot começou a responder"; o tempo
+    total inclui a geração inteira. Os dois são medidos a partir de 'inicio'.
+
+    Uso:
+        metricas = MetricasStream()
+        for pedaco in metricas.acompanhar(chamar_llm_para_resumo_stream(pergunta)):
+            print(pedaco, end="", flush=True)
+        print(metricas.tempo_primeiro_pedaco, metricas.tempo_total)
+    """
+
+    def __init__(self, relogio=None):
+        """
+        Args:
+            relogio (callable, optional): Função que retorna o tempo atual em segundos
+                                          (padrão: time.perf_counter).
+        """
+        self._relogio = relogio or time.perf_counter
+        self.inicio = self._relogio()
+        self.tempo_primeiro_pedaco = None
+        self.tempo_total = None
+        self.pedacos = 0
+
+    def registrar_pedaco(self):
+        """Marca a chegada de um pedaço (o primeiro define o TTFT)."""
+        if self.tempo_primeiro_pedaco is None:
+            self.tempo_primeiro_pedaco = self._relogio() - self.inicio
+        self.pedacos += 1
+
+    def finalizar(self):
+        """Marca o fim da resposta."""
+        self.tempo_total = self._relogio() - self.inicio
+
+    def acompanhar(self, pedacos):
+        """
+        Repassa os pedaços de um gerador, medindo TTFT e tempo total.
+
+        Args:
+            pedacos (iterable): Gerador de pedaços de texto.
+
+        Yields:
+            str: Os mesmos pedaços, sem alteração.
+        """
+        try:
+            for pedaco in pedacos:
+                self.registrar_pedaco()
+                yield pedaco
+        finally:
+            self.finalizar()
+
+    async def acompanhar_async(self, pedacos):
+        """Versão de 'acompanhar' para geradores assíncronos."""
+        try:
+            async for pedaco in pedacos:
+                self.registrar_pedaco()
+                yield pedaco
+        finally:
+            self.finalizar()
+
+    def como_dict(self):
+        """Retorna as medições (em segundos) em um dicionário."""
+        return {
+            "tempo_primeiro_pedaco": self.tempo_primeiro_pedaco,
+            "tempo_total": self.tempo_total,
+            "pedacos": self.pedacos,
+        }
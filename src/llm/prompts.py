@@ -0,0 +1,155 @@
+# Partes fixas dos prompts, montadas uma única vez na importação do módulo.
+#
+# Tudo o que não muda entre as perguntas (persona, regras e exemplos) vai na
+# instrução de sistema do modelo (system_instruction) e fica sempre idêntico, byte a
+# byte. Assim o mesmo prefixo pode ser reaproveitado pelo cache de contexto do
+# provedor (ver ClienteLLM), e cada requisição leva como conteúdo só a parte que
+# muda: os fatos do banco e a pergunta do usuário.
+
+# Versão dos modelos de prompt montados por 'montar_prompt_*'. Entra na chave do
+# cache de respostas junto com a instrução de sistema: incremente ao mudar o texto
+# desses modelos para o cache em disco não servir respostas geradas com o antigo.
+VERSAO_PROMPTS = 1
+
+# 1. Definição de Persona e Regras Globais: (Instruções ESSENCIAIS para o comportamento da LLM)
+PERSONA = (
+    "Você é um chatbot cinéfilo, um mestre das histórias das telonas, com uma personalidade dramática, poética e perspicaz. "
+    "Seu estilo de resposta deve imitar diálogos de filmes clássicos ou personagens icônicos (como sábio, astuto, ou direto). "
+    "Use frases de efeito, metáforas cinematográficas e um tom que evoque a magia das telas, mas nunca sacrifique a verdade pelos floreios. "
+    "Sua missão é responder a perguntas sobre filmes de forma abrangente, seja fatual, resumo, sobre personagens, curiosidades ou saudações. "
+    "Sempre tente fornecer informações precisas e concisas. Se não souber algo, admita com dignidade e um toque dramático e com elegância. "
+    "Se a pergunta parecer não relacionada a filmes, responda educadamente, mas redirecione gentilmente para o tema cinema. "
+    "Quando a mensagem trouxer fatos confirmados do banco de dados, utilize-os com precisão, combinando-os com seu estilo marcante."
+)
+
+# 2. Exemplos (Few-shot Prompting - CONCEITUALMENTE do pt.txt para guiar o estilo):
+# Estes exemplos moldam a LLM a dar respostas mais ricas e no estilo desejado.
+EXEMPLOS_ESTILO = (
+    "--- Exemplos de Interação Estilizada ---\n"
+    "Você: Olá, chatbot!\n"
+    "Chatbot: Bem-vindo, buscador de histórias! Qual enigma cinematográfico o aflige hoje?\n"
+    "Você: Quem dirigiu Matrix?\n"
+    "Chatbot: Ah, 'Matrix'? Foi a mente brilhante das irmãs Wachowski que orquestrou essa epopeia em 1999. Uma verdadeira viagem à realidade.\n"
+    "Você: Me resuma 'A Origem'.\n"
+    "Chatbot: 'A Origem'... Um labirinto onírico, onde a mente é o campo de batalha. Dirigido por Christopher Nolan em 2010. Prepare-se para ter seus sonhos invadidos por uma equipe de ladrões que plantam ideias. Uma trama intrincada, um verdadeiro desafio à percepção.\n"
+    "Você: Fale sobre o personagem Darth Vader.\n"
+    "Chatbot: Ah, Lord Vader... A sombra imponente que permeia a galáxia. Um vilão cujas ações moldaram o destino, outrora um herói caído. Sua presença é um lembrete sombrio do poder do Lado Sombrio da Força.\n"
+    "Você: Qual o filme mais triste que você conhece?\n"
+    "Chatbot: As trilhas da tristeza são muitas nos reinos cinematográficos. Cada lágrima derramada por uma obra... Mas se a dor buscas, 'A Vida é Bela' talvez te mostre a beleza na tragédia, ou 'À Espera de um Milagre', a esperança em meio ao desespero. Escolhas sombrias, mas poderosas.\n"
+    "Você: Preciso sair.\n"
+    "Chatbot: Que sua jornada continue épica. Até a próxima cena!"
+)
+
+# Instrução de sistema das respostas do chatbot (persona + exemplos).
+INSTRUCAO_SISTEMA_RESUMO = f"{PERSONA}\n\n{EXEMPLOS_ESTILO}"
+
+# Instrução de sistema do modo de chamada única (a LLM consulta o banco sozinha).
+INSTRUCAO_SISTEMA_FERRAMENTA = (
+    f"{INSTRUCAO_SISTEMA_RESUMO}\n\n"
+    "Quando a pergunta mencionar um filme específico, chame a ferramenta "
+    "'lookup_movie' com o título antes de responder e use os fatos que ela retornar. "
+    "Se o filme não for encontrado, responda com o que você sabe."
+)
+
+# Instrução de sistema da extração de títulos (regras + exemplos).
+INSTRUCAO_SISTEMA_EXTRACAO = (
+    "Você é um assistente de extração de títulos de filmes. "
+    "Sua tarefa é identificar e retornar APENAS o título do filme presente na frase do usuário. "
+    "Retorne APENAS o título do filme, sem nenhuma outra palavra ou pontuação. "
+    "Se não for um filme, ou se não conseguir identificar um título claro, retorne a palavra 'NENHUM'.\n\n"
+    "Exemplos:\n"
+    "Frase: 'Quem dirigiu Matrix?'\n"
+    "Título: Matrix\n"
+    "Frase: 'Me resuma O Poderoso Chefão.'\n"
+    "Título: O Poderoso Chefão\n"
+    "Frase: 'Fale sobre Interstellar.'\n"
+    "Título: Interstellar\n"
+    "Frase: 'Qual a história de Star Wars?'\n"
+    "Título: Star Wars\n"
+    "Frase: 'Olá chatbot, como vai?'\n"
+    "Título: NENHUM\n"
+    "Frase: 'Me resuma 1984.'\n"
+    "Título: 1984"
+)
+
+
+# Campos de uma linha do banco (titulo, diretor, ano, genero, protagonista).
+CAMPOS_FILME = ("Título", "Diretor", "Ano", "Gênero", "Protagonista")
+
+
+def formatar_filmes_compacto(filmes):
+    """
+    Formata vários filmes do BD em poucas linhas para o prompt.
+
+    Os nomes dos campos aparecem uma única vez, como cabeçalho, e cada filme vira
+    uma linha com os valores separados por '|'. Campos iguais em todos os filmes
+    (ex: o diretor, em 'filmes do Nolan') vão uma única vez no cabeçalho.
+
+    Args:
+        filmes (list): Tuplas (titulo, diretor, ano, genero, protagonista).
+
+    Returns:
+        str: O contexto com todos os filmes.
+    """
+    comuns = []
+    if len(filmes) > 1:
+        comuns = [
+            i
+            for i in range(1, len(CAMPOS_FILME))
+            if all(filme[i] == filmes[0][i] for filme in filmes)
+        ]
+    variaveis = [i for i in range(len(CAMPOS_FILME)) if i not in comuns]
+
+    cabecalho = f"Filmes confirmados do banco de dados ({len(filmes)})"
+    if comuns:
+        em_comum = "; ".join(f"{CAMPOS_FILME[i]}: {filmes[0][i]}" for i in comuns)
+        cabecalho += f", todos com {em_comum}"
+    linhas = [f"{cabecalho}:", " | ".join(CAMPOS_FILME[i] for i in variaveis)]
+    for filme in filmes:
+        linhas.append(" | ".join(str(filme[i]) for i in variaveis))
+    return "\n".join(linhas)
+
+
+def montar_prompt_resumo(pergunta_usuario, info_filme=None, filmes=None):
+    """
+    Monta a parte variável do prompt de resposta: fatos do BD (se houver) e pergunta.
+
+    A persona e os exemplos não entram aqui; vão em INSTRUCAO_SISTEMA_RESUMO.
+
+    Args:
+        pergunta_usuario (str): A pergunta original do usuário.
+        info_filme (tuple, optional): Informações factuais do filme vindas do BD.
+        filmes (list, optional): Vários filmes do BD (ex: 'filmes do Nolan'), em
+                                 formato compacto (ver 'formatar_filmes_compacto').
+
+    Returns:
+        str: O conteúdo enviado à LLM junto com a instrução de sistema.
+    """
+    partes = []
+    if info_filme:
+        titulo, diretor, ano, genero, protagonista = info_filme
+        partes.append(
+            f"Fatos confirmados do banco de dados: Título: '{titulo}'; "
+            f"Diretor: {diretor}; Ano: {ano}; Gênero: {genero}; "
+            f"Protagonista: {protagonista}."
+        )
+    if filmes:
+        partes.append(formatar_filmes_compacto(filmes))
+    partes.append(f"Pergunta do usuário: '{pergunta_usuario}'")
+    partes.append("Sua resposta (no estilo de filme):")
+    return "\n".join(partes)
+
+
+def montar_prompt_extracao(pergunta):
+    """
+    Monta a parte variável do prompt de extração de título (só a frase do usuário).
+
+    As regras e os exemplos vão em INSTRUCAO_SISTEMA_EXTRACAO.
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+
+    Returns:
+        str: O conteúdo enviado à LLM junto com a instrução de sistema.
+    """
+    return f"Frase: '{pergunta}'\nTítulo:"
@@ -1,66 +1,130 @@
-import os
-
-from dotenv import load_dotenv  # Para carregar variáveis de ambiente do .env
-
-from src.agent.agent_core import identificar_intencao  # Lógica central do agente
-
-# Importações dos módulos internos do projeto (do pacote 'src')
-from src.database.db_utils import consultar_filme_no_bd  # Funções de DB
-from src.llm.llm_utils import chamar_llm_para_resumo  # Funções de LLM
-from src.nlp.nlp_utils import (
-    extrair_titulo_da_pergunta,
-)  # Funções de NLP (extração de título)
-
-# Carrega as variáveis de ambiente do arquivo .env.
-# Isso deve ser feito logo no início do script para que as chaves estejam disponíveis.
-load_dotenv()
-
-
-def main():
-    """
-    Função principal do chatbot que orquestra a interação com o usuário,
-    a consulta ao banco de dados e a geração de respostas pela LLM.
-    """
-
-    # O setup_database.py deve ser executado UMA VEZ antes de rodar o chatbot.py.
-
-    # Mensagens iniciais do chatbot, geradas pela LLM para 100% de estilo.
-    print(chamar_llm_para_resumo("Saudação inicial para um chatbot cinéfilo."))
-    print(
-        chamar_llm_para_resumo(
-            "Instrução para o usuário sobre como interagir, incluindo como perguntar sobre filmes e como sair."
-        )
-    )
-
-    while True:
-        pergunta_usuario = input("Você: ")
-
-        # 1. Identificar a Intenção do Usuário (Agent Core)
-        intencao = identificar_intencao(pergunta_usuario)
-
-        if intencao == "sair":
-            print(chamar_llm_para_resumo("Mensagem de despedida do chatbot cinéfilo."))
-            break
-
-        # --- LÓGICA DE AGENTE REFINADA: EXTRAÇÃO DE INTENÇÃO E CONTEXTO ---
-
-        # 1. Tentar extrair o título do filme da pergunta do usuário usando a função extrair_titulo_da_pergunta
-        titulo_identificado = extrair_titulo_da_pergunta(pergunta_usuario)
-
-        info_filme_do_bd = None
-        if titulo_identificado:  # Se um título foi extraído da pergunta
-            # 2. Consultar o banco de dados se um título foi identificado
-            info_filme_do_bd = consultar_filme_no_bd(titulo_identificado)
-
-        # 3. Chamar a LLM para gerar a resposta, passando o contexto do BD se o filme foi encontrado.
-        # A LLM é o cérebro que gera todas as respostas estilizadas.
-        # A lógica de estilização e abrangência está toda no prompt da LLM.
-        resposta_final_chatbot = chamar_llm_para_resumo(
-            pergunta_usuario, info_filme=info_filme_do_bd
-        )
-        print(resposta_final_chatbot)
-
-
-if __name__ == "__main__":
-    # Garante que a função principal seja chamada apenas quando o script é executado diretamente.
-    main()
+import asyncio
+import logging
+import os
+
+from dotenv import load_dotenv  # Para carregar variáveis de ambiente do .env
+
+# Importações dos módulos internos do projeto (do pacote 'src')
+from src.agent.pipeline_turno import (  # Pipeline de um turno e mensagens fixas
+    MENSAGEM_INSTRUCOES,
+    MENSAGEM_SAUDACAO,
+    SessaoChat,
+    processar_turno_async,
+)
+from src.database.migracoes import verificar_esquema_na_inicializacao
+from src.database.repositorio_filmes import (  # Acesso ao DB com pool de conexões
+    fechar_repositorio,
+    obter_repositorio,
+)
+from src.llm.llm_utils import chamar_llm_para_resumo_stream  # Funções de LLM
+from src.llm.metricas_stream import MetricasStream
+
+# Carrega as variáveis de ambiente do arquivo .env.
+# Isso deve ser feito logo no início do script para que as chaves estejam disponíveis.
+load_dotenv()
+
+
+def mostrar_tempos():
+    """Indica se os tempos de cada resposta devem ser exibidos (CHATBOT_MOSTRAR_TEMPOS)."""
+    return bool(os.environ.get("CHATBOT_MOSTRAR_TEMPOS"))
+
+
+def imprimir_resposta_em_stream(pedacos):
+    """
+    Imprime a resposta da LLM à medida que os pedaços chegam.
+
+    Se a variável de ambiente CHATBOT_MOSTRAR_TEMPOS estiver definida, mostra também
+    o tempo até o primeiro pedaço e o tempo total da resposta.
+
+    Args:
+        pedacos (iterable): Pedaços de texto (ex: de 'chamar_llm_para_resumo_stream').
+    """
+    metricas = MetricasStream()
+    for pedaco in metricas.acompanhar(pedacos):
+        print(pedaco, end="", flush=True)  # flush: o texto aparece na hora.
+    print()
+    if mostrar_tempos() and metricas.pedacos:
+        print(
+            f"[1º pedaço em {metricas.tempo_primeiro_pedaco * 1000:.0f}ms, "
+            f"resposta completa em {metricas.tempo_total * 1000:.0f}ms]"
+        )
+
+
+def imprimir_tempos_do_turno(resultado):
+    """
+    Mostra o tempo de cada etapa do turno e quanto o paralelismo economizou.
+
+    Args:
+        resultado (dict): O retorno de 'processar_turno_async'.
+    """
+    etapas = resultado["etapas"]
+    descricoes = [f"{nome} {duracao * 1000:.0f}ms" for nome, duracao in etapas.items()]
+    print(f"[etapas: {', '.join(descricoes)}]")
+    if resultado["tempo_total"] is not None:
+        print(
+            f"[1º pedaço em {resultado['tempo_primeiro_pedaco'] * 1000:.0f}ms, "
+            f"turno completo em {resultado['tempo_total'] * 1000:.0f}ms; "
+            f"soma das etapas: {sum(etapas.values()) * 1000:.0f}ms]"
+        )
+
+
+async def imprimir_pedaco(pedaco):
+    """Exibe um pedaço da resposta assim que ele chega."""
+    print(pedaco, end="", flush=True)
+
+
+async def conversar(repositorio):
+    """
+    Laço da conversa: lê uma pergunta por vez e exibe a resposta em streaming.
+
+    Cada turno passa pelo agendador de 'processar_turno_async', que roda em paralelo
+    as etapas independentes (título local, banco e extração pela LLM).
+
+    Args:
+        repositorio (RepositorioFilmes): Repositório de filmes da conversa.
+    """
+    sessao = SessaoChat()
+    while True:
+        # 'input' bloqueia o loop de eventos, mas entre os turnos não há nada rodando.
+        pergunta_usuario = input("Você: ")
+
+        resultado = await processar_turno_async(
+            pergunta_usuario, sessao, repositorio, ao_receber_pedaco=imprimir_pedaco
+        )
+        print()
+        if mostrar_tempos():
+            imprimir_tempos_do_turno(resultado)
+
+        if resultado["encerrar"]:
+            break
+
+
+def main():
+    """
+    Função principal do chatbot que orquestra a interação com o usuário,
+    a consulta ao banco de dados e a geração de respostas pela LLM.
+    """
+
+    # O setup_database.py deve ser executado UMA VEZ antes de rodar o chatbot.py.
+    # Um banco antigo é migrado aqui; sem banco, o aviso já foi impresso e saímos.
+    if not verificar_esquema_na_inicializacao():
+        return
+
+    # CHATBOT_LOG_NIVEL=INFO mostra os tokens e a latência de cada chamada à LLM.
+    logging.basicConfig(level=os.environ.get("CHATBOT_LOG_NIVEL", "WARNING"))
+
+    # Repositório de filmes com conexões reutilizadas durante toda a conversa.
+    repositorio = obter_repositorio()
+
+    # Mensagens iniciais do chatbot, geradas pela LLM para 100% de estilo.
+    imprimir_resposta_em_stream(chamar_llm_para_resumo_stream(MENSAGEM_SAUDACAO))
+    imprimir_resposta_em_stream(chamar_llm_para_resumo_stream(MENSAGEM_INSTRUCOES))
+
+    # Cada turno: intenção, título, banco e resposta da LLM (ver 'conversar').
+    asyncio.run(conversar(repositorio))
+    fechar_repositorio()
+
+
+if __name__ == "__main__":
+    # Garante que a função principal seja chamada apenas quando o script é executado diretamente.
+    main()
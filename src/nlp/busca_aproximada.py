@@ -0,0 +1,362 @@
+import itertools
+import math
+
+import numpy as np
+
+from src.nlp.gazetteer import gerar_apelidos
+from src.nlp.normalizacao import normalizar_texto
+
+# Moldura de cada forma para os trigramas: '^^' no início e '$$' no fim dão peso ao
+# começo e ao fim do título, onde ficam os erros de digitação mais comuns em títulos
+# curtos. Nenhum dos dois sobrevive à normalização, então não colidem com o texto.
+_INICIO, _FIM = "^^", "$$"
+
+# Fração mínima dos trigramas da consulta que um título precisa ter em comum para ser
+# candidato. Pelo princípio da casa dos pombos, basta olhar as listas mais raras.
+FRACAO_MINIMA_TRIGRAMAS = 0.3
+
+# Teto de entradas lidas das listas raras por consulta. Em catálogos enormes, até as
+# listas mais raras de consultas com trigramas comuns podem ser longas; o teto troca
+# a garantia da casa dos pombos por uma latência previsível.
+MAXIMO_ENTRADAS_LIDAS = 16_000
+
+# Quantos candidatos (pela contagem nas listas raras) têm os trigramas em comum
+# contados em todas as listas, para o coeficiente de Dice.
+CANDIDATOS_PRE_SELECIONADOS = 32
+
+# Similaridade de Levenshtein mínima para um título chegar ao limiar, mesmo com
+# Jaro-Winkler perfeito: (0.6 + 1) / 2 = 0.8. Títulos com tamanho muito diferente
+# do da consulta nem são candidatos.
+SIMILARIDADE_MINIMA_LEVENSHTEIN = 0.6
+
+# Quantos candidatos (pelo coeficiente de Dice dos trigramas) são reavaliados com as
+# distâncias de edição, que são mais caras.
+CANDIDATOS_REAVALIADOS = 8
+
+# Quantos dos melhores por Levenshtein recebem também a nota de Jaro-Winkler.
+CANDIDATOS_JARO_WINKLER = 4
+
+# Bônus de Jaro-Winkler por prefixo comum (até 4 caracteres).
+PESO_PREFIXO_JARO_WINKLER = 0.1
+
+# Confiança mínima para o chatbot aceitar o título aproximado.
+LIMIAR_BUSCA_APROXIMADA = 0.8
+
+
+def forma_compacta(texto):
+    """
+    Forma de comparação de um título: normalizado e sem espaços, para que 'wall-e',
+    'wall e' e 'walle' sejam iguais.
+
+    Args:
+        texto (str): O título ou a consulta.
+
+    Returns:
+        str: A forma compacta (pode ser vazia).
+    """
+    return normalizar_texto(texto).replace(" ", "")
+
+
+def _codigos_trigramas(forma):
+    """Códigos (inteiros de 64 bits) dos trigramas distintos da forma emoldurada."""
+    emoldurada = f"{_INICIO}{forma}{_FIM}"
+    # Cada caractere Unicode cabe em 21 bits: três formam um código de 63 bits.
+    codigos = [ord(caractere) for caractere in emoldurada]
+    return {
+        (codigos[i] << 42) | (codigos[i + 1] << 21) | codigos[i + 2]
+        for i in range(len(codigos) - 2)
+    }
+
+
+def distancia_levenshtein(a, b, limite=None):
+    """
+    Distância de edição (inserções, remoções e substituições) entre dois textos.
+
+    Usa o algoritmo paralelo em bits de Myers: cada coluna da tabela de programação
+    dinâmica é um inteiro, então o custo é uma dúzia de operações por caractere de
+    'b', em vez de uma conta por célula. Com 'limite', textos cujo tamanho já difere
+    mais que isso nem são comparados.
+
+    Args:
+        a (str): Primeiro texto.
+        b (str): Segundo texto.
+        limite (int, optional): Maior distância de interesse.
+
+    Returns:
+        int: A distância, ou 'limite + 1' se ela passar do limite.
+    """
+    if limite is not None and abs(len(a) - len(b)) > limite:
+        return limite + 1
+    if not a or not b:
+        return len(a) or len(b)
+    distancia = _distancia_myers(_mascaras_myers(a), len(a), b)
+    if limite is not None and distancia > limite:
+        return limite + 1
+    return distancia
+
+
+def _mascaras_myers(a):
+    """Bits das posições de cada caractere de 'a' (preparo do algoritmo de Myers)."""
+    mascaras = {}
+    for i, caractere in enumerate(a):
+        mascaras[caractere] = mascaras.get(caractere, 0) | (1 << i)
+    return mascaras
+
+
+def _distancia_myers(mascaras, tamanho_a, b):
+    """Distância de edição entre 'a' (dado pelas máscaras) e 'b', ambos não vazios."""
+    todos = (1 << tamanho_a) - 1
+    ultimo = 1 << (tamanho_a - 1)
+    positivos, negativos, distancia = todos, 0, tamanho_a
+    for caractere in b:
+        iguais = mascaras.get(caractere, 0)
+        xv = iguais | negativos
+        xh = (((iguais & positivos) + positivos) ^ positivos) | iguais
+        ph = negativos | (~(xh | positivos) & todos)
+        mh = positivos & xh
+        if ph & ultimo:
+            distancia += 1
+        elif mh & ultimo:
+            distancia -= 1
+        ph = ((ph << 1) | 1) & todos
+        mh = (mh << 1) & todos
+        positivos = mh | (~(xv | ph) & todos)
+        negativos = ph & xv
+    return distancia
+
+
+def similaridade_jaro_winkler(a, b):
+    """
+    Similaridade de Jaro-Winkler (0 a 1), que favorece textos com o mesmo começo.
+
+    Args:
+        a (str): Primeiro texto.
+        b (str): Segundo texto.
+
+    Returns:
+        float: 1.0 para textos iguais, 0.0 sem nenhum caractere em comum.
+    """
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    janela = max(len(a), len(b)) // 2 - 1
+    # Posições de cada caractere em 'b': só elas são visitadas, não a janela inteira.
+    posicoes_b = {}
+    for j, caractere in enumerate(b):
+        posicoes_b.setdefault(caractere, []).append(j)
+    usados_b = [False] * len(b)
+    comuns_a = []
+    for i, caractere in enumerate(a):
+        for j in posicoes_b.get(caractere, ()):
+            if j > i + janela:
+                break
+            if j >= i - janela and not usados_b[j]:
+                usados_b[j] = True
+                comuns_a.append(caractere)
+                break
+    if not comuns_a:
+        return 0.0
+    comuns_b = [b[j] for j, usado in enumerate(usados_b) if usado]
+    transposicoes = sum(x != y for x, y in zip(comuns_a, comuns_b)) / 2
+    m = len(comuns_a)
+    jaro = (m / len(a) + m / len(b) + (m - transposicoes) / m) / 3
+    prefixo = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefixo += 1
+    return jaro + prefixo * PESO_PREFIXO_JARO_WINKLER * (1 - jaro)
+
+
+class BuscaAproximadaTitulos:
+    """
+    Busca de títulos tolerante a erros de digitação, acentos, maiúsculas e pontuação.
+
+    Cada título (e seus apelidos, ver gazetteer.gerar_apelidos) vira uma forma
+    compacta indexada pelos seus trigramas de caracteres, em arrays no formato CSR.
+    As entradas são numeradas em ordem de tamanho, então os títulos de tamanho
+    parecido com o da consulta são um trecho contíguo de cada lista. Uma consulta lê
+    só esse trecho das listas de trigramas mais raras para achar os candidatos,
+    ordena-os pelo coeficiente de Dice dos trigramas e reavalia os melhores com
+    Levenshtein e Jaro-Winkler, o que dá a confiança final.
+    """
+
+    def __init__(self, titulos=(), apelidos=()):
+        """
+        Constrói o índice.
+
+        Args:
+            titulos (iterable): Títulos do catálogo, como estão no banco.
+            apelidos (iterable, optional): Pares (apelido, titulo) extras, ex:
+                                           ('Inception', 'A Origem').
+        """
+        self.titulos = []
+        ids_titulos = {}
+        formas, titulo_da_forma = [], []
+        vistos = set()
+        pares = itertools.chain(((titulo, titulo) for titulo in titulos), apelidos)
+        for texto, titulo in pares:
+            id_titulo = ids_titulos.get(titulo)
+            if id_titulo is None:
+                id_titulo = ids_titulos[titulo] = len(self.titulos)
+                self.titulos.append(titulo)
+            for apelido in gerar_apelidos(texto):
+                forma = apelido.replace(" ", "")
+                if forma and (forma, id_titulo) not in vistos:
+                    vistos.add((forma, id_titulo))
+                    formas.append(forma)
+                    titulo_da_forma.append(id_titulo)
+        ordem = sorted(range(len(formas)), key=lambda i: len(formas[i]))
+        self._formas = [formas[i] for i in ordem]  # Forma de cada entrada.
+        # Índice em 'self.titulos' de cada entrada (título ou apelido).
+        self._titulo_da_forma = np.array(titulo_da_forma, dtype=np.int32)[ordem]
+        # Primeira entrada com cada tamanho: 'limites[n]' é a primeira com len >= n.
+        tamanhos = np.array([len(forma) for forma in self._formas], dtype=np.int32)
+        maior = int(tamanhos[-1]) if len(tamanhos) else 0
+        self._limites = np.searchsorted(tamanhos, np.arange(maior + 2))
+
+        # Pares (trigrama, entrada) ordenados, como no formato CSR: 'codigos' guarda
+        # cada trigrama uma vez e a lista do i-ésimo é um trecho de 'chaves', com as
+        # chaves 'i * num_entradas + entrada'. Uma chave única por par permite achar
+        # os trechos (e testar a presença de uma entrada) de todas as listas de uma
+        # consulta com uma só busca binária vetorizada.
+        codigos, entradas, num_trigramas = [], [], []
+        for id_forma, forma in enumerate(self._formas):
+            trigramas = _codigos_trigramas(forma)
+            codigos.extend(trigramas)
+            entradas.extend([id_forma] * len(trigramas))
+            num_trigramas.append(len(trigramas))
+        self._num_trigramas = np.array(num_trigramas, dtype=np.int32)
+        self._num_entradas = len(self._formas)
+        self._codigos, id_codigos = np.unique(
+            np.array(codigos, dtype=np.int64), return_inverse=True
+        )
+        self._chaves = np.sort(
+            id_codigos.astype(np.int64) * self._num_entradas
+            + np.array(entradas, dtype=np.int64)
+        )
+
+    def __len__(self):
+        return len(self.titulos)
+
+    def _faixa_de_entradas(self, tamanho):
+        """Entradas (início, fim) com tamanho compatível com o de uma consulta."""
+        minimo = math.ceil(tamanho * SIMILARIDADE_MINIMA_LEVENSHTEIN)
+        maximo = math.floor(tamanho / SIMILARIDADE_MINIMA_LEVENSHTEIN)
+        maior = len(self._limites) - 1
+        return self._limites[min(minimo, maior)], self._limites[min(maximo + 1, maior)]
+
+    def _listas(self, codigos):
+        """Posições (crescentes) em 'self._codigos' dos trigramas da consulta."""
+        codigos = np.fromiter(codigos, dtype=np.int64, count=len(codigos))
+        posicoes = np.searchsorted(self._codigos, codigos)
+        dentro = posicoes < len(self._codigos)
+        posicoes, codigos = posicoes[dentro], codigos[dentro]
+        return np.sort(posicoes[self._codigos[posicoes] == codigos])
+
+    def _candidatos(self, forma):
+        """
+        Entradas com trigramas suficientes em comum com a forma, e o Dice de cada.
+
+        Returns:
+            tuple: (entradas, coeficientes de Dice), arrays do mesmo tamanho.
+        """
+        codigos = _codigos_trigramas(forma)
+        bases = self._listas(codigos).astype(np.int64) * self._num_entradas
+        if not len(bases):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        # Trecho de cada lista com as entradas de tamanho compatível com a consulta.
+        inicio, fim = self._faixa_de_entradas(len(forma))
+        inicios = np.searchsorted(self._chaves, bases + inicio)
+        fins = np.searchsorted(self._chaves, bases + fim)
+
+        minimo = max(1, math.ceil(len(codigos) * FRACAO_MINIMA_TRIGRAMAS))
+        # Quem tem 'minimo' trigramas em comum está em alguma das listas mais raras.
+        ordem = np.argsort(fins - inicios, kind="stable")
+        ordem = ordem[: max(1, len(ordem) - minimo + 1)]
+        lidas = np.cumsum((fins - inicios)[ordem])
+        ordem = ordem[: max(1, np.searchsorted(lidas, MAXIMO_ENTRADAS_LIDAS, "right"))]
+        raras = np.concatenate(
+            [self._chaves[inicios[i] : fins[i]] - bases[i] for i in ordem.tolist()]
+        )
+        # Contagem por ordenação e tamanho das sequências repetidas: bem mais barata
+        # que np.unique, que em int64 usa uma tabela hash.
+        raras = np.sort(raras.astype(np.int32))
+        if not len(raras):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        grupos = np.flatnonzero(np.concatenate(([True], raras[1:] != raras[:-1])))
+        candidatos = raras[grupos].astype(np.int64)
+        comuns = np.diff(np.append(grupos, len(raras)))
+
+        # Os mais presentes nas listas raras têm os trigramas contados em todas.
+        if len(candidatos) > CANDIDATOS_PRE_SELECIONADOS:
+            melhores = np.argpartition(-comuns, CANDIDATOS_PRE_SELECIONADOS - 1)
+            candidatos = np.sort(candidatos[melhores[:CANDIDATOS_PRE_SELECIONADOS]])
+        # Chaves em ordem crescente: a busca binária aproveita a posição anterior.
+        procuradas = bases[:, None] + candidatos[None, :]
+        posicoes = np.searchsorted(self._chaves, procuradas)
+        posicoes = np.minimum(posicoes, len(self._chaves) - 1)
+        comuns = (self._chaves[posicoes] == procuradas).sum(axis=0)
+        dice = 2 * comuns / (len(codigos) + self._num_trigramas[candidatos])
+        return candidatos, dice
+
+    def buscar(self, consulta, k=3):
+        """
+        Encontra os títulos mais parecidos com a consulta.
+
+        Args:
+            consulta (str): O título como o usuário escreveu (ex: 'interstellar').
+            k (int): Quantos títulos retornar.
+
+        Returns:
+            list: Pares (confiança de 0 a 1, título), do mais parecido para o menos.
+        """
+        forma = forma_compacta(consulta)
+        if not forma or not len(self._formas):
+            return []
+        candidatos, dice = self._candidatos(forma)
+        reavaliados = max(k, CANDIDATOS_REAVALIADOS)
+        if len(candidatos) > reavaliados:
+            melhores = np.argpartition(-dice, reavaliados - 1)
+            candidatos = candidatos[melhores[:reavaliados]]
+
+        # Levenshtein em todos os candidatos; Jaro-Winkler, mais caro, só nos melhores.
+        mascaras = _mascaras_myers(forma)
+        similares = []
+        for id_forma in candidatos.tolist():
+            forma_titulo = self._formas[id_forma]
+            tamanho = max(len(forma), len(forma_titulo))
+            distancia = _distancia_myers(mascaras, len(forma), forma_titulo)
+            similares.append((1 - distancia / tamanho, id_forma))
+        similares.sort(reverse=True)
+
+        confiancas = {}
+        for similaridade, id_forma in similares[: max(k, CANDIDATOS_JARO_WINKLER)]:
+            jaro_winkler = similaridade_jaro_winkler(forma, self._formas[id_forma])
+            confianca = (similaridade + jaro_winkler) / 2
+            id_titulo = int(self._titulo_da_forma[id_forma])
+            if confianca > confiancas.get(id_titulo, -1.0):
+                confiancas[id_titulo] = confianca
+        resultados = sorted(
+            ((confianca, self.titulos[i]) for i, confianca in confiancas.items()),
+            key=lambda par: -par[0],
+        )
+        return resultados[:k]
+
+    def melhor_titulo(self, consulta, limiar=LIMIAR_BUSCA_APROXIMADA):
+        """
+        Retorna o título mais parecido, se a confiança for suficiente.
+
+        Args:
+            consulta (str): O título como o usuário escreveu.
+            limiar (float): Confiança mínima.
+
+        Returns:
+            tuple or None: (título como está no banco, confiança), ou None.
+        """
+        resultados = self.buscar(consulta, k=1)
+        if resultados and resultados[0][0] >= limiar:
+            confianca, titulo = resultados[0]
+            return titulo, confianca
+        return None
@@ -0,0 +1,134 @@
+import re
+
+from src.database.esquema_normalizado import separar_generos, separar_pessoas
+from src.nlp.gazetteer import ARTIGOS_INICIAIS, PALAVRAS_VAZIAS, AutomatoTitulos
+from src.nlp.normalizacao import normalizar_texto
+
+# Ano isolado na pergunta ('dramas de 1994').
+_PADRAO_ANO = re.compile(r"\b(1[89]\d\d|20\d\d)\b")
+
+# Década, no texto normalizado ('anos 90', 'decada de 1980', 'anos 2000').
+_PADRAO_DECADA = re.compile(r"\b(?:anos|decada de)\s+(\d0|\d{3}0)\b")
+
+# Palavras que indicam um pedido de lista, necessárias quando o único filtro é o ano
+# (evita tratar 'Me resuma 1984' como 'filmes de 1984').
+PALAVRAS_LISTA = frozenset("filmes lancados lancamentos quais liste lista".split())
+
+# Palavras antes do nome que indicam o protagonista ('com o DiCaprio').
+PALAVRAS_PROTAGONISTA = frozenset(
+    "com estrelado estrelando protagonizado protagonista ator atriz".split()
+)
+
+
+def _pluralizar(palavra):
+    """Plural simples de um gênero normalizado ('drama' -> 'dramas', 'acao' -> 'acoes')."""
+    if palavra.endswith("ao"):
+        return palavra[:-2] + "oes"
+    if palavra[-1] in "aeiou":
+        return palavra + "s"
+    return palavra + "es"
+
+
+class ExtratorFiltros:
+    """
+    Reconhece filtros estruturados em uma pergunta ('filmes do Christopher Nolan',
+    'dramas de 1994') a partir dos nomes e gêneros do catálogo.
+
+    Diretores, protagonistas e gêneros são procurados com autômatos de Aho-Corasick
+    (AutomatoTitulos), em uma passada sobre as palavras da pergunta. Nomes também
+    são reconhecidos pelo sobrenome ('do Nolan'), quando ele não é ambíguo.
+    """
+
+    def __init__(self, filmes=()):
+        """
+        Args:
+            filmes (iterable): Tuplas (titulo, diretor, ano, genero, protagonista) do banco.
+        """
+        self._diretores, self._protagonistas, generos = set(), set(), set()
+        for _, diretor, _, genero, protagonista in filmes:
+            # Campos compostos viram várias pessoas ('Joel e Ethan Coen') e gêneros.
+            self._diretores.update(separar_pessoas(diretor))
+            self._protagonistas.update(separar_pessoas(protagonista))
+            generos.update(separar_generos(genero))
+
+        pessoas = self._diretores | self._protagonistas
+        # Sobrenome -> nomes completos; só os sobrenomes de uma única pessoa valem.
+        sobrenomes = {}
+        for nome in pessoas:
+            palavras = normalizar_texto(nome).split()
+            if len(palavras) > 1 and palavras[-1] not in PALAVRAS_VAZIAS:
+                sobrenomes.setdefault(palavras[-1], set()).add(nome)
+        apelidos = [
+            (sobrenome, nomes.pop())
+            for sobrenome, nomes in sobrenomes.items()
+            if len(nomes) == 1
+        ]
+        self._automato_pessoas = AutomatoTitulos(pessoas, apelidos)
+
+        plurais = []
+        for genero in generos:
+            palavras = normalizar_texto(genero).split()
+            plural = palavras[:-1] + [_pluralizar(palavras[-1])]
+            plurais.append((" ".join(plural), genero))
+        self._automato_generos = AutomatoTitulos(generos, plurais)
+
+    def _papel(self, nome, palavras, inicio):
+        """Decide se o nome mencionado é o diretor ou o protagonista do filtro."""
+        if nome not in self._protagonistas:
+            return "diretor"
+        if nome not in self._diretores:
+            return "protagonista"
+        anterior = inicio - 1
+        while anterior >= 0 and palavras[anterior] in ARTIGOS_INICIAIS:
+            anterior -= 1  # 'com o DiCaprio'
+        if anterior >= 0 and palavras[anterior] in PALAVRAS_PROTAGONISTA:
+            return "protagonista"
+        return "diretor"
+
+    def extrair(self, pergunta):
+        """
+        Extrai os filtros da pergunta.
+
+        Args:
+            pergunta (str): A pergunta completa do usuário.
+
+        Returns:
+            dict: Argumentos para RepositorioFilmes.buscar_filmes (ex:
+                  {'diretor': 'Christopher Nolan'}), ou um dict vazio se a pergunta
+                  não descreve uma lista de filmes.
+        """
+        filtros = {}
+        palavras = normalizar_texto(pergunta).split()
+
+        # Menções mais longas primeiro ('Tom Hanks' antes de 'Hanks').
+        mencoes = sorted(
+            self._automato_pessoas.encontrar_mencoes(pergunta),
+            key=lambda m: (m["inicio"] - m["fim"], m["inicio"]),
+        )
+        vistos = set()
+        for mencao in mencoes:
+            if mencao["titulo"] in vistos:
+                continue  # O sobrenome de um nome já reconhecido.
+            vistos.add(mencao["titulo"])
+            papel = self._papel(mencao["titulo"], palavras, mencao["inicio"])
+            filtros.setdefault(papel, mencao["titulo"])
+
+        generos = self._automato_generos.encontrar_mencoes(pergunta)
+        if generos:
+            # O gênero mais longo ('Ficção Científica' e não só 'Ficção').
+            maior = max(generos, key=lambda m: (m["fim"] - m["inicio"], -m["inicio"]))
+            filtros["genero"] = maior["titulo"]
+
+        decada = _PADRAO_DECADA.search(" ".join(palavras))
+        ano = _PADRAO_ANO.search(pergunta)
+        if decada:
+            inicio = int(decada.group(1))
+            if inicio < 100:
+                inicio += 1900 if inicio >= 30 else 2000
+            filtros["ano"] = (inicio, inicio + 9)
+        elif ano:
+            filtros["ano"] = int(ano.group(1))
+
+        if list(filtros) == ["ano"] and not PALAVRAS_LISTA.intersection(palavras):
+            return {}
+        return filtros
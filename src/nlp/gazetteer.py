@@ -0,0 +1,189 @@
+import re
+from collections import deque
+
+from src.nlp.normalizacao import normalizar_texto
+
+# Palavras que, sozinhas, não identificam um filme ('o', 'de', ...).
+PALAVRAS_VAZIAS = frozenset(
+    "a o as os um uma uns umas de da do das dos e em no na nos nas para por com que "
+    "the of and".split()
+)
+
+# Artigos que costumam ser omitidos pelo usuário ('O Poderoso Chefão' -> 'poderoso chefão').
+ARTIGOS_INICIAIS = frozenset("a o as os um uma the".split())
+
+# Separadores de subtítulo ('Forrest Gump: O Contador de Histórias' -> 'Forrest Gump').
+_PADRAO_SUBTITULO = re.compile(r"\s*(?::| - )\s*")
+
+# Palavras do texto original, com a posição de cada uma.
+_PADRAO_PALAVRA = re.compile(r"[^\W_]+")
+
+TAMANHO_MINIMO_PALAVRA_UNICA = 6
+
+
+def gerar_apelidos(titulo):
+    """
+    Gera formas alternativas de um título que o usuário costuma digitar.
+
+    Args:
+        titulo (str): O título como está no banco (ex: 'O Poderoso Chefão').
+
+    Returns:
+        set: Formas normalizadas do título (ex: {'o poderoso chefao', 'poderoso chefao'}).
+    """
+    apelidos = set()
+    for forma in (titulo, _PADRAO_SUBTITULO.split(titulo, maxsplit=1)[0]):
+        palavras = normalizar_texto(forma).split()
+        if not palavras:
+            continue
+        apelidos.add(" ".join(palavras))
+        if len(palavras) > 1 and palavras[0] in ARTIGOS_INICIAIS:
+            apelidos.add(" ".join(palavras[1:]))
+    return apelidos
+
+
+class AutomatoTitulos:
+    """
+    Autômato de Aho-Corasick sobre as palavras normalizadas dos títulos do catálogo.
+
+    Encontra todas as menções de títulos (e apelidos) em uma pergunta com uma única
+    passada sobre as palavras, independentemente do tamanho do catálogo. Cada menção
+    recebe uma indicação de confiança; só menções confiantes dispensam a LLM.
+    """
+
+    def __init__(self, titulos=(), apelidos=()):
+        """
+        Constrói o autômato.
+
+        Args:
+            titulos (iterable): Títulos do catálogo, como estão no banco.
+            apelidos (iterable, optional): Pares (apelido, titulo) extras, ex: ('Inception', 'A Origem').
+        """
+        # Cada nó é um dict {palavra: próximo_nó}; os vetores abaixo são indexados pelo nó.
+        self._transicoes = [{}]
+        self._falhas = [0]
+        # Saídas do nó: lista de (quantidade_de_palavras, titulo) que terminam nele.
+        self._saidas = [[]]
+
+        for titulo in titulos:
+            for apelido in gerar_apelidos(titulo):
+                self._inserir(apelido.split(), titulo)
+        for apelido, titulo in apelidos:
+            palavras = normalizar_texto(apelido).split()
+            if palavras:
+                self._inserir(palavras, titulo)
+        self._construir_falhas()
+
+    def __len__(self):
+        """Número de nós do autômato (útil para medir o tamanho do índice)."""
+        return len(self._transicoes)
+
+    def _inserir(self, palavras, titulo):
+        """Insere a sequência de palavras na trie, marcando o título no nó final."""
+        no = 0
+        for palavra in palavras:
+            proximo = self._transicoes[no].get(palavra)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes[no][palavra] = proximo
+                self._transicoes.append({})
+                self._falhas.append(0)
+                self._saidas.append([])
+            no = proximo
+        saida = (len(palavras), titulo)
+        if saida not in self._saidas[no]:
+            self._saidas[no].append(saida)
+
+    def _construir_falhas(self):
+        """Calcula os links de falha (busca em largura) e propaga as saídas."""
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            no = fila.popleft()
+            for palavra, filho in self._transicoes[no].items():
+                fila.append(filho)
+                falha = self._falhas[no]
+                while falha and palavra not in self._transicoes[falha]:
+                    falha = self._falhas[falha]
+                destino = self._transicoes[falha].get(palavra, 0)
+                if destino == filho:  # Filhos da raiz falham para a própria raiz.
+                    destino = 0
+                self._falhas[filho] = destino
+                self._saidas[filho] = self._saidas[filho] + self._saidas[destino]
+
+    def encontrar_mencoes(self, texto):
+        """
+        Encontra todas as menções de títulos no texto.
+
+        Args:
+            texto (str): A pergunta do usuário.
+
+        Returns:
+            list: Dicionários {'titulo', 'inicio', 'fim', 'trecho', 'confiante'}, onde
+                  'inicio'/'fim' são índices de palavras e 'trecho' é o texto original.
+        """
+        # Normaliza palavra a palavra para manter a ligação com o texto original.
+        palavras, originais = [], []
+        for correspondencia in _PADRAO_PALAVRA.finditer(texto):
+            for parte in normalizar_texto(correspondencia.group()).split():
+                palavras.append(parte)
+                originais.append(correspondencia)
+
+        mencoes = []
+        no = 0
+        for posicao, palavra in enumerate(palavras):
+            while no and palavra not in self._transicoes[no]:
+                no = self._falhas[no]
+            no = self._transicoes[no].get(palavra, 0)
+            for tamanho, titulo in self._saidas[no]:
+                inicio = posicao - tamanho + 1
+                trecho = texto[originais[inicio].start() : originais[posicao].end()]
+                mencoes.append(
+                    {
+                        "titulo": titulo,
+                        "inicio": inicio,
+                        "fim": posicao + 1,
+                        "trecho": trecho,
+                        "confiante": self._mencao_confiante(
+                            texto, palavras[inicio : posicao + 1], originais[inicio]
+                        ),
+                    }
+                )
+        return mencoes
+
+    @staticmethod
+    def _mencao_confiante(texto, palavras, primeira_original):
+        """
+        Decide se uma menção identifica um filme com segurança.
+
+        É confiante quando tem duas ou mais palavras relevantes, quando é uma única
+        palavra longa (ex: 'matrix'), ou quando está destacada no texto original
+        (entre aspas ou com inicial maiúscula fora do início da frase).
+        """
+        relevantes = [p for p in palavras if p not in PALAVRAS_VAZIAS]
+        if len(relevantes) >= 2:
+            return True
+        if len(relevantes) == 1 and len(relevantes[0]) >= TAMANHO_MINIMO_PALAVRA_UNICA:
+            return True
+        inicio = primeira_original.start()
+        entre_aspas = inicio > 0 and texto[inicio - 1] in "'\"“‘«"
+        maiuscula = inicio > 0 and primeira_original.group()[0].isupper()
+        return bool(relevantes) and (entre_aspas or maiuscula)
+
+    def melhor_titulo(self, texto):
+        """
+        Retorna o título mais provável mencionado no texto, se a menção for confiante.
+
+        Entre as menções confiantes, prefere a que cobre mais palavras (ex: 'Tropa de
+        Elite 2' vence 'Tropa de Elite') e, em empate, a que aparece primeiro.
+
+        Args:
+            texto (str): A pergunta do usuário.
+
+        Returns:
+            str or None: O título como está no banco, ou None se não houver menção confiante.
+        """
+        confiantes = [m for m in self.encontrar_mencoes(texto) if m["confiante"]]
+        if not confiantes:
+            return None
+        melhor = max(confiantes, key=lambda m: (m["fim"] - m["inicio"], -m["inicio"]))
+        return melhor["titulo"]
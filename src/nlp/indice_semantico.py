@@ -0,0 +1,319 @@
+import argparse
+import json
+import os
+import time
+import zlib
+
+import numpy as np
+
+from src.nlp.gazetteer import PALAVRAS_VAZIAS
+from src.nlp.normalizacao import normalizar_texto
+
+DIMENSAO_PADRAO = 512
+
+# Palavras comuns nas perguntas que não descrevem filme nenhum.
+PALAVRAS_IGNORADAS = PALAVRAS_VAZIAS | frozenset(
+    "aquele aquela filme filmes sobre fale me quem qual quais dirigiu diretor "
+    "fez sabe conhece".split()
+)
+
+# Peso das palavras inteiras e dos trigramas de caracteres (tolerância a erros).
+PESO_PALAVRA = 1.0
+PESO_TRIGRAMA = 0.5
+
+# Linhas vetorizadas por vez ao gravar a matriz e ao agrupar no IVF.
+TAMANHO_BLOCO = 4096
+
+
+def _caracteristicas(texto):
+    """
+    Extrai as características de um texto: palavras e trigramas de cada palavra.
+
+    Args:
+        texto (str): Texto livre (pergunta ou metadados do filme).
+
+    Yields:
+        tuple: (característica, peso).
+    """
+    for palavra in normalizar_texto(texto).split():
+        if palavra in PALAVRAS_IGNORADAS:
+            continue
+        yield f"p:{palavra}", PESO_PALAVRA
+        marcada = f" {palavra} "
+        for i in range(len(marcada) - 2):
+            yield f"t:{marcada[i : i + 3]}", PESO_TRIGRAMA
+
+
+def vetorizar(texto, dimensao=DIMENSAO_PADRAO):
+    """
+    Converte um texto em um vetor denso por hashing de características (CPU, sem rede).
+
+    Cada palavra e cada trigrama cai em uma posição do vetor (crc32, estável entre
+    execuções) com sinal +1/-1, e o vetor é normalizado: o produto escalar entre dois
+    vetores é a similaridade do cosseno.
+
+    Args:
+        texto (str): O texto.
+        dimensao (int): Tamanho do vetor (potência de 2).
+
+    Returns:
+        numpy.ndarray: Vetor float32 de norma 1 (ou zero, se não houver características).
+    """
+    vetor = np.zeros(dimensao, dtype=np.float32)
+    for caracteristica, peso in _caracteristicas(texto):
+        codigo = zlib.crc32(caracteristica.encode("utf-8"))
+        vetor[codigo % dimensao] += peso if codigo & 0x80000000 else -peso
+    norma = np.linalg.norm(vetor)
+    return vetor / norma if norma else vetor
+
+
+def texto_do_filme(linha):
+    """Texto de um filme para o índice: título, diretor, gênero, protagonista e ano."""
+    titulo, diretor, ano, genero, protagonista = linha
+    campos = (titulo, diretor, genero, protagonista, ano)
+    return " ".join(str(campo) for campo in campos)
+
+
+def _top_k(pontuacoes, k):
+    """Posições das 'k' maiores pontuações, em ordem decrescente."""
+    if len(pontuacoes) > k:
+        posicoes = np.argpartition(-pontuacoes, k - 1)[:k]
+    else:
+        posicoes = np.arange(len(pontuacoes))
+    return posicoes[np.argsort(-pontuacoes[posicoes], kind="stable")]
+
+
+def _agrupar_kmeans(vetores, n_listas, iteracoes=10, semente=0):
+    """
+    K-means esférico (por cosseno) sobre as linhas da matriz, para o IVF.
+
+    Returns:
+        tuple: (centroides [n_listas, dimensão], lista de cada linha [n]).
+    """
+    aleatorio = np.random.default_rng(semente)
+    escolhidas = aleatorio.choice(len(vetores), size=n_listas, replace=False)
+    centroides = np.array(vetores[np.sort(escolhidas)], dtype=np.float32)
+    listas = np.zeros(len(vetores), dtype=np.int32)
+    for _ in range(iteracoes):
+        somas = np.zeros_like(centroides)
+        for inicio in range(0, len(vetores), TAMANHO_BLOCO):
+            bloco = np.asarray(vetores[inicio : inicio + TAMANHO_BLOCO])
+            listas_bloco = (bloco @ centroides.T).argmax(axis=1)
+            listas[inicio : inicio + len(bloco)] = listas_bloco
+            np.add.at(somas, listas_bloco, bloco)
+        normas = np.linalg.norm(somas, axis=1, keepdims=True)
+        vazias = normas[:, 0] == 0  # Lista sem linhas: mantém o centroide anterior.
+        centroides[~vazias] = somas[~vazias] / normas[~vazias]
+    return centroides, listas
+
+
+class IndiceSemantico:
+    """
+    Busca semântica de filmes por similaridade do cosseno entre vetores.
+
+    A matriz de vetores (uma linha por filme) fica em um arquivo '.npy' lido por
+    memória mapeada: carregar o índice é instantâneo e só as páginas usadas vão para
+    a memória. A busca exata é um produto matriz-vetor seguido de um top-k parcial.
+    Para catálogos grandes há o IVF opcional: as linhas são agrupadas por k-means e a
+    busca só percorre as 'n_sondas' listas de centroides mais próximos da pergunta.
+
+    Arquivos gravados a partir de 'caminho_base':
+        <base>.vetores.npy: Matriz float32 [filmes, dimensão].
+        <base>.filmes.json: Dimensão e as linhas (titulo, diretor, ano, genero, protagonista).
+        <base>.ivf.npz: Centroides e listas do IVF (se construído).
+    """
+
+    def __init__(self, vetores, linhas, centroides=None, ordem=None, inicios=None):
+        """
+        Args:
+            vetores (numpy.ndarray): Matriz [filmes, dimensão] (normalmente um memmap).
+            linhas (list): As linhas dos filmes, na ordem da matriz.
+            centroides (numpy.ndarray, optional): Centroides do IVF.
+            ordem (numpy.ndarray, optional): Posições das linhas agrupadas por lista.
+            inicios (numpy.ndarray, optional): Onde cada lista começa em 'ordem'.
+        """
+        self.vetores = vetores
+        self.linhas = linhas
+        self.dimensao = vetores.shape[1]
+        self.centroides = centroides
+        self.ordem = ordem
+        self.inicios = inicios
+
+    def __len__(self):
+        return len(self.linhas)
+
+    @classmethod
+    def construir(cls, linhas, caminho_base, dimensao=DIMENSAO_PADRAO, n_listas=0):
+        """
+        Vetoriza os filmes e grava o índice em disco (o job offline).
+
+        A matriz é escrita direto no arquivo memmap, linha a linha, sem montar tudo
+        antes na memória.
+
+        Args:
+            linhas (list): Linhas (titulo, diretor, ano, genero, protagonista).
+            caminho_base (str): Prefixo dos arquivos (ex: 'data/indice_filmes').
+            dimensao (int): Tamanho dos vetores.
+            n_listas (int): Listas do IVF (0 = só busca exata).
+
+        Returns:
+            IndiceSemantico: O índice recém-gravado, aberto por memória mapeada.
+        """
+        linhas = [tuple(linha) for linha in linhas]
+        vetores = np.lib.format.open_memmap(
+            f"{caminho_base}.vetores.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(len(linhas), dimensao),
+        )
+        for i, linha in enumerate(linhas):
+            vetores[i] = vetorizar(texto_do_filme(linha), dimensao)
+        vetores.flush()
+
+        with open(f"{caminho_base}.filmes.json", "w", encoding="utf-8") as arquivo:
+            dados = {"dimensao": dimensao, "linhas": linhas}
+            json.dump(dados, arquivo, ensure_ascii=False)
+
+        if n_listas:
+            centroides, listas = _agrupar_kmeans(vetores, min(n_listas, len(linhas)))
+            ordem = np.argsort(listas, kind="stable").astype(np.int64)
+            contagens = np.bincount(listas, minlength=len(centroides))
+            inicios = np.concatenate(([0], np.cumsum(contagens)))
+            np.savez(
+                f"{caminho_base}.ivf.npz",
+                centroides=centroides,
+                ordem=ordem,
+                inicios=inicios,
+            )
+        elif os.path.exists(f"{caminho_base}.ivf.npz"):
+            os.remove(f"{caminho_base}.ivf.npz")  # IVF de uma versão anterior.
+        del vetores  # Fecha o memmap de escrita antes de reabrir para leitura.
+        return cls.carregar(caminho_base)
+
+    @classmethod
+    def carregar(cls, caminho_base):
+        """
+        Abre um índice gravado por 'construir' (a matriz por memória mapeada).
+
+        Args:
+            caminho_base (str): Prefixo dos arquivos.
+
+        Returns:
+            IndiceSemantico: O índice pronto para busca.
+
+        Raises:
+            OSError: Se os arquivos do índice não existirem.
+        """
+        vetores = np.load(f"{caminho_base}.vetores.npy", mmap_mode="r")
+        with open(f"{caminho_base}.filmes.json", encoding="utf-8") as arquivo:
+            dados = json.load(arquivo)
+        linhas = [tuple(linha) for linha in dados["linhas"]]
+        try:
+            with np.load(f"{caminho_base}.ivf.npz") as ivf:
+                return cls(
+                    vetores, linhas, ivf["centroides"], ivf["ordem"], ivf["inicios"]
+                )
+        except FileNotFoundError:
+            return cls(vetores, linhas)
+
+    def _candidatos_ivf(self, vetor_consulta, n_sondas):
+        """Posições das linhas nas 'n_sondas' listas mais próximas da consulta."""
+        listas = _top_k(self.centroides @ vetor_consulta, n_sondas)
+        return np.concatenate(
+            [self.ordem[self.inicios[i] : self.inicios[i + 1]] for i in listas]
+        )
+
+    def buscar(self, consulta, k=5, n_sondas=None):
+        """
+        Encontra os filmes mais parecidos com a consulta.
+
+        Args:
+            consulta (str): A pergunta ou descrição (ex: 'aquele filme do Nolan').
+            k (int): Quantos filmes retornar.
+            n_sondas (int, optional): Com IVF, quantas listas percorrer. Se None (ou
+                                      sem IVF), a busca é exata sobre todas as linhas.
+
+        Returns:
+            list: Pares (similaridade, linha), do mais parecido para o menos.
+        """
+        vetor_consulta = vetorizar(consulta, self.dimensao)
+        if not vetor_consulta.any() or not len(self):
+            return []
+        if n_sondas and self.centroides is not None:
+            # Em ordem crescente, as linhas do memmap são lidas em sequência.
+            candidatos = np.sort(self._candidatos_ivf(vetor_consulta, n_sondas))
+            pontuacoes_candidatos = self.vetores[candidatos] @ vetor_consulta
+            melhores = _top_k(pontuacoes_candidatos, k)
+            posicoes, pontuacoes = candidatos[melhores], pontuacoes_candidatos[melhores]
+        else:
+            pontuacoes_todas = self.vetores @ vetor_consulta
+            posicoes = _top_k(pontuacoes_todas, k)
+            pontuacoes = pontuacoes_todas[posicoes]
+        return [
+            (float(pontuacao), self.linhas[posicao])
+            for pontuacao, posicao in zip(pontuacoes, posicoes)
+        ]
+
+    def buscar_lote(self, consultas, k=5):
+        """
+        Busca exata de várias consultas com uma única multiplicação de matrizes.
+
+        Args:
+            consultas (list): As consultas.
+            k (int): Quantos filmes retornar por consulta.
+
+        Returns:
+            list: Para cada consulta, a lista de pares (similaridade, linha).
+        """
+        matriz_consultas = np.stack([vetorizar(c, self.dimensao) for c in consultas])
+        pontuacoes = matriz_consultas @ self.vetores.T
+        resultados = []
+        for pontuacoes_consulta, vetor in zip(pontuacoes, matriz_consultas):
+            if not vetor.any():
+                resultados.append([])
+                continue
+            posicoes = _top_k(pontuacoes_consulta, k)
+            resultados.append(
+                [(float(pontuacoes_consulta[p]), self.linhas[p]) for p in posicoes]
+            )
+        return resultados
+
+
+def main():
+    """Job offline: vetoriza o catálogo do banco e grava o índice semântico em disco."""
+    # Importado aqui: o índice em si não depende do banco.
+    from src.database.repositorio_filmes import RepositorioFilmes
+    from src.database.setup_db import DATABASE_NAME
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--banco", default=DATABASE_NAME)
+    parser.add_argument("--saida", default="data/indice_filmes")
+    parser.add_argument("--dimensao", type=int, default=DIMENSAO_PADRAO)
+    parser.add_argument(
+        "--listas-ivf", type=int, default=0, help="Listas do IVF (0 = só busca exata)."
+    )
+    args = parser.parse_args()
+
+    repositorio = RepositorioFilmes(args.banco)
+    try:
+        linhas = repositorio.listar_filmes()
+    finally:
+        repositorio.fechar()
+    if not linhas:
+        print(f"Nenhum filme encontrado em {args.banco}.")
+        print("Execute o setup do banco antes (run_db_setup.py).")
+        return
+
+    inicio = time.perf_counter()
+    indice = IndiceSemantico.construir(
+        linhas, args.saida, dimensao=args.dimensao, n_listas=args.listas_ivf
+    )
+    print(
+        f"Índice semântico com {len(indice)} filmes salvo em {args.saida}.* "
+        f"({time.perf_counter() - inicio:.1f}s)."
+    )
+    print(f"Use CHATBOT_INDICE_SEMANTICO={args.saida} para o chatbot usar o índice.")
+
+
+if __name__ == "__main__":
+    main()
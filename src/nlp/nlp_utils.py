@@ -1,59 +1,369 @@
-import os
-
-import google.generativeai as genai
-
-
-def extrair_titulo_da_pergunta(pergunta):
-    """
-    Extrai um possível título de filme de uma pergunta do usuário usando a LLM.
-    Esta abordagem é mais robusta para títulos não padronizados ou em frases complexas,
-    delegando a inteligência de PLN à LLM.
-
-    Args:
-        pergunta (str): A pergunta completa do usuário.
-
-    Returns:
-        str: O título do filme extraído pela LLM, ou uma string vazia se não for encontrado.
-    """
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        # Retorna uma mensagem de erro ou vazio se a chave não estiver configurada para não travar.
-        # Em produção, isso seria logado e tratado.
-        return ""
-
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("gemini-1.5-flash")
-
-    # Prompt para instruir a LLM a extrair o título
-    prompt_extracao = (
-        "Você é um assistente de extração de títulos de filmes. "
-        "Sua tarefa é identificar e retornar APENAS o título do filme presente na frase do usuário. "
-        "Retorne APENAS o título do filme, sem nenhuma outra palavra ou pontuação. "
-        "Se não for um filme, ou se não conseguir identificar um título claro, retorne a palavra 'NENHUM'.\n\n"
-        "Exemplos:\n"
-        "Frase: 'Quem dirigiu Matrix?'\n"
-        "Título: Matrix\n"
-        "Frase: 'Me resuma O Poderoso Chefão.'\n"
-        "Título: O Poderoso Chefão\n"
-        "Frase: 'Fale sobre Interstellar.'\n"
-        "Título: Interstellar\n"
-        "Frase: 'Qual a história de Star Wars?'\n"
-        "Título: Star Wars\n"
-        "Frase: 'Olá chatbot, como vai?'\n"
-        "Título: NENHUM\n"
-        "Frase: 'Me resuma 1984.'\n"
-        "Título: 1984\n"
-        f"Frase: '{pergunta}'\n"
-        "Título:"
-    )
-
-    try:
-        response = model.generate_content(prompt_extracao)
-        titulo_extraido = response.text.strip()
-        if titulo_extraido.lower() == "nenhum":
-            return ""
-        return titulo_extraido
-    except Exception as e:
-        # Se houver erro na API, retorna vazio para que a lógica principal chame a LLM para resposta geral
-        print(f"Erro na extração de título pela LLM: {e}")
-        return ""
+import os
+import threading
+import weakref
+from collections import Counter
+
+from src.database.db_utils import obter_backend_catalogo
+from src.llm.cliente_llm import obter_cliente_llm
+from src.llm.prompts import INSTRUCAO_SISTEMA_EXTRACAO, montar_prompt_extracao
+from src.nlp.busca_aproximada import LIMIAR_BUSCA_APROXIMADA, BuscaAproximadaTitulos
+from src.nlp.filtros_consulta import ExtratorFiltros
+from src.nlp.gazetteer import AutomatoTitulos
+from src.nlp.indice_semantico import IndiceSemantico
+
+# Estruturas locais do catálogo (autômato de títulos, extrator de filtros e busca
+# aproximada), montadas na primeira pergunta e guardadas por backend (ver
+# 'obter_backend_catalogo'): com outro banco ou com o catálogo em memória, elas
+# reconhecem os mesmos filmes que as consultas do turno encontram.
+_estruturas_por_backend = weakref.WeakKeyDictionary()
+_trava_automato = threading.Lock()
+
+# Índice semântico do catálogo (opcional), aberto na primeira busca.
+_indice_semantico = None
+_trava_indice_semantico = threading.Lock()
+
+# Similaridade mínima para aceitar o filme do índice semântico como contexto.
+LIMIAR_BUSCA_SEMANTICA = 0.3
+
+# Quantas vezes cada caminho de extração foi usado: 'local' (autômato) ou 'llm'.
+_estatisticas_extracao = Counter()
+
+
+def _obter_estrutura(nome, construir, backend):
+    """
+    Retorna a estrutura 'nome' do backend, construindo-a na primeira chamada.
+
+    Args:
+        nome (str): Nome da estrutura ('automato', 'filtros' ou 'busca_aproximada').
+        construir (callable): Recebe o backend e monta a estrutura.
+        backend (RepositorioFilmes or CatalogoComFiltros, optional): Onde estão os
+            filmes (padrão: o backend atual, ver 'obter_backend_catalogo').
+    """
+    if backend is None:
+        backend = obter_backend_catalogo()
+    estruturas = _estruturas_por_backend.get(backend, {})
+    if nome not in estruturas:
+        with _trava_automato:
+            estruturas = _estruturas_por_backend.setdefault(backend, {})
+            if nome not in estruturas:
+                estruturas[nome] = construir(backend)
+    return estruturas[nome]
+
+
+def obter_automato_titulos(backend=None):
+    """
+    Retorna o autômato de títulos do catálogo, construindo-o na primeira chamada.
+
+    Args:
+        backend (RepositorioFilmes or CatalogoComFiltros, optional): Onde estão os
+            filmes (padrão: o backend atual).
+
+    Returns:
+        AutomatoTitulos: Autômato com os títulos da tabela 'filmes' e os títulos
+                         alternativos de 'titulo_alias' ('Inception').
+    """
+    return _obter_estrutura(
+        "automato",
+        lambda fonte: AutomatoTitulos(fonte.listar_titulos(), fonte.listar_apelidos()),
+        backend,
+    )
+
+
+def obter_extrator_filtros(backend=None):
+    """
+    Retorna o extrator de filtros do catálogo, construindo-o na primeira chamada.
+
+    Args:
+        backend (RepositorioFilmes or CatalogoComFiltros, optional): Onde estão os
+            filmes (padrão: o backend atual).
+
+    Returns:
+        ExtratorFiltros: Extrator com os diretores, protagonistas e gêneros do banco.
+    """
+    return _obter_estrutura(
+        "filtros", lambda fonte: ExtratorFiltros(fonte.listar_filmes()), backend
+    )
+
+
+def obter_busca_aproximada(backend=None):
+    """
+    Retorna a busca aproximada de títulos, construindo-a na primeira chamada.
+
+    Args:
+        backend (RepositorioFilmes or CatalogoComFiltros, optional): Onde estão os
+            filmes (padrão: o backend atual).
+
+    Returns:
+        BuscaAproximadaTitulos: Índice de trigramas dos títulos da tabela 'filmes'.
+    """
+    return _obter_estrutura(
+        "busca_aproximada",
+        lambda fonte: BuscaAproximadaTitulos(
+            fonte.listar_titulos(), fonte.listar_apelidos()
+        ),
+        backend,
+    )
+
+
+def recarregar_automato_titulos():
+    """
+    Descarta o autômato de títulos, o extrator de filtros e a busca aproximada atuais
+    para que sejam reconstruídos (ex: após alterar o catálogo).
+    """
+    with _trava_automato:
+        _estruturas_por_backend.clear()
+
+
+def buscar_titulo_aproximado(titulo, limiar=None, backend=None):
+    """
+    Corrige um título escrito com erros de digitação ou em outra grafia
+    ('interstellar', 'matirx') para o título do catálogo mais parecido.
+
+    Args:
+        titulo (str): O título como o usuário (ou a LLM) escreveu.
+        limiar (float, optional): Confiança mínima (padrão:
+                                  CHATBOT_BUSCA_APROXIMADA_LIMIAR ou
+                                  LIMIAR_BUSCA_APROXIMADA).
+        backend (optional): Onde estão os filmes (padrão: o backend atual).
+
+    Returns:
+        str or None: O título como está no banco, ou None se nenhum for parecido.
+    """
+    if limiar is None:
+        limiar = float(
+            os.environ.get("CHATBOT_BUSCA_APROXIMADA_LIMIAR", LIMIAR_BUSCA_APROXIMADA)
+        )
+    melhor = obter_busca_aproximada(backend).melhor_titulo(titulo, limiar)
+    return melhor[0] if melhor else None
+
+
+def extrair_filtros_consulta(pergunta, backend=None):
+    """
+    Reconhece uma pergunta sobre vários filmes ('filmes do Nolan', 'dramas de 1994').
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+        backend (optional): Onde estão os filmes (padrão: o backend atual).
+
+    Returns:
+        dict: Filtros para RepositorioFilmes.buscar_filmes, ou um dict vazio.
+    """
+    return obter_extrator_filtros(backend).extrair(pergunta)
+
+
+def obter_indice_semantico():
+    """
+    Retorna o índice semântico configurado em CHATBOT_INDICE_SEMANTICO (o prefixo
+    dos arquivos gerados por 'run_indice_semantico.py'), abrindo-o na primeira chamada.
+
+    Returns:
+        IndiceSemantico or None: O índice, ou None se não configurado ou indisponível.
+    """
+    global _indice_semantico
+    caminho_base = os.environ.get("CHATBOT_INDICE_SEMANTICO")
+    if not caminho_base:
+        return None
+    if _indice_semantico is None:
+        with _trava_indice_semantico:
+            if _indice_semantico is None:
+                try:
+                    _indice_semantico = IndiceSemantico.carregar(caminho_base)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Aviso: índice semântico '{caminho_base}' indisponível.")
+                    print(f"Detalhes: {e}")
+                    return None
+    return _indice_semantico
+
+
+def recarregar_indice_semantico():
+    """Descarta o índice semântico atual (ex: após gerar o índice de novo)."""
+    global _indice_semantico
+    with _trava_indice_semantico:
+        _indice_semantico = None
+
+
+def buscar_filme_semanticamente(pergunta, limiar=None):
+    """
+    Procura no índice semântico o filme que a pergunta descreve (ex: 'aquele filme
+    do Nolan'), para perguntas em que nenhum título foi encontrado.
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+        limiar (float, optional): Similaridade mínima (padrão: CHATBOT_INDICE_SEMANTICO_LIMIAR
+                                  ou LIMIAR_BUSCA_SEMANTICA).
+
+    Returns:
+        tuple or None: (titulo, diretor, ano, genero, protagonista) do filme mais
+                       parecido, ou None se não houver índice ou filme parecido o bastante.
+    """
+    indice = obter_indice_semantico()
+    if indice is None:
+        return None
+    if limiar is None:
+        limiar = float(
+            os.environ.get("CHATBOT_INDICE_SEMANTICO_LIMIAR", LIMIAR_BUSCA_SEMANTICA)
+        )
+    resultados = indice.buscar(pergunta, k=1)
+    if resultados and resultados[0][0] >= limiar:
+        return resultados[0][1]
+    return None
+
+
+def obter_estatisticas_extracao():
+    """
+    Informa quantas extrações de título foram resolvidas localmente e quantas pela LLM.
+
+    Returns:
+        dict: {'local': int, 'llm': int, 'taxa_local': float}
+    """
+    local = _estatisticas_extracao["local"]
+    llm = _estatisticas_extracao["llm"]
+    total = local + llm
+    return {"local": local, "llm": llm, "taxa_local": local / total if total else 0.0}
+
+
+def registrar_extracao(caminho):
+    """Conta uma extração de título resolvida pelo caminho 'local' ou 'llm'."""
+    _estatisticas_extracao[caminho] += 1
+
+
+def extrair_candidato_localmente(pergunta, backend=None):
+    """
+    Procura o título do catálogo mais provável na pergunta, mesmo sem confiança.
+
+    Menções não confiantes (ex: 'up' em "what's up") não bastam para dispensar a LLM,
+    mas servem para adiantar a consulta ao banco enquanto a LLM decide.
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+        backend (optional): Onde estão os filmes (padrão: o backend atual).
+
+    Returns:
+        tuple: (título como está no banco ou None, se a menção é confiante).
+    """
+    mencoes = obter_automato_titulos(backend).encontrar_mencoes(pergunta)
+    if not mencoes:
+        return None, False
+    # Confiantes primeiro; depois a que cobre mais palavras e, por fim, a primeira.
+    melhor = max(
+        mencoes, key=lambda m: (m["confiante"], m["fim"] - m["inicio"], -m["inicio"])
+    )
+    return melhor["titulo"], melhor["confiante"]
+
+
+def extrair_titulo_localmente(pergunta):
+    """
+    Procura um título do catálogo na pergunta usando o autômato local (sem rede).
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+
+    Returns:
+        str or None: O título como está no banco, se a menção for confiante; senão None.
+    """
+    return obter_automato_titulos().melhor_titulo(pergunta)
+
+
+def extrair_titulo_da_pergunta(pergunta):
+    """
+    Extrai um possível título de filme de uma pergunta do usuário.
+
+    Primeiro tenta o autômato local de títulos do catálogo, que resolve a maioria das
+    perguntas sem nenhuma chamada de rede. Só quando ele não encontra uma menção
+    confiante a extração é delegada à LLM, mais robusta para títulos fora do catálogo
+    ou escritos de forma não padronizada.
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+
+    Returns:
+        str: O título do filme extraído, ou uma string vazia se não for encontrado.
+    """
+    titulo_local = extrair_titulo_localmente(pergunta)
+    if titulo_local:
+        registrar_extracao("local")
+        return titulo_local
+
+    registrar_extracao("llm")
+    return extrair_titulo_via_llm(pergunta)
+
+
+async def extrair_titulo_da_pergunta_async(pergunta):
+    """
+    Versão assíncrona de 'extrair_titulo_da_pergunta': o autômato local roda na hora
+    e, se for preciso recorrer à LLM, a chamada não bloqueia o loop de eventos.
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+
+    Returns:
+        str: O título do filme extraído, ou uma string vazia se não for encontrado.
+    """
+    titulo_local = extrair_titulo_localmente(pergunta)
+    if titulo_local:
+        registrar_extracao("local")
+        return titulo_local
+
+    registrar_extracao("llm")
+    return await extrair_titulo_via_llm_async(pergunta)
+
+
+def _interpretar_titulo_extraido(texto_llm):
+    """Converte a resposta da LLM em título ('NENHUM' vira string vazia)."""
+    titulo_extraido = texto_llm.strip()
+    if titulo_extraido.lower() == "nenhum":
+        return ""
+    return titulo_extraido
+
+
+def extrair_titulo_via_llm(pergunta):
+    """
+    Extrai um possível título de filme de uma pergunta do usuário usando a LLM.
+    Esta abordagem é mais robusta para títulos não padronizados ou em frases complexas,
+    delegando a inteligência de PLN à LLM.
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+
+    Returns:
+        str: O título do filme extraído pela LLM, ou uma string vazia se não for encontrado.
+    """
+    cliente = obter_cliente_llm()
+    if not cliente.configurado:
+        # Retorna uma mensagem de erro ou vazio se a chave não estiver configurada para não travar.
+        # Em produção, isso seria logado e tratado.
+        return ""
+
+    try:
+        texto_llm = cliente.gerar(
+            montar_prompt_extracao(pergunta), INSTRUCAO_SISTEMA_EXTRACAO
+        )
+        return _interpretar_titulo_extraido(texto_llm)
+    except Exception as e:
+        # Se houver erro na API, retorna vazio para que a lógica principal chame a LLM para resposta geral
+        print(f"Erro na extração de título pela LLM: {e}")
+        return ""
+
+
+async def extrair_titulo_via_llm_async(pergunta):
+    """
+    Versão assíncrona de 'extrair_titulo_via_llm' (não bloqueia o loop de eventos).
+
+    Args:
+        pergunta (str): A pergunta completa do usuário.
+
+    Returns:
+        str: O título do filme extraído pela LLM, ou uma string vazia se não for encontrado.
+    """
+    cliente = obter_cliente_llm()
+    if not cliente.configurado:
+        return ""
+
+    try:
+        texto_llm = await cliente.gerar_async(
+            montar_prompt_extracao(pergunta), INSTRUCAO_SISTEMA_EXTRACAO
+        )
+        return _interpretar_titulo_extraido(texto_llm)
+    except Exception as e:
+        print(f"Erro na extração de título pela LLM: {e}")
+        return ""
@@ -0,0 +1,35 @@
+import re
+import unicodedata
+
+# Qualquer sequência de caracteres que não seja letra ou dígito vira um único espaço.
+_PADRAO_SEPARADORES = re.compile(r"[\W_]+")
+
+
+def remover_acentos(texto):
+    """
+    Remove os acentos (diacríticos) de um texto, mantendo as letras base.
+
+    Args:
+        texto (str): O texto original (ex: 'Chefão').
+
+    Returns:
+        str: O texto sem acentos (ex: 'Chefao').
+    """
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def normalizar_texto(texto):
+    """
+    Normaliza um texto para comparação: sem acentos, minúsculo, sem pontuação e
+    com espaços simples. É a forma usada em todos os índices de títulos.
+
+    Exemplo: 'WALL·E' -> 'wall e'; 'O Poderoso Chefão' -> 'o poderoso chefao'.
+
+    Args:
+        texto (str): O texto original.
+
+    Returns:
+        str: O texto normalizado (pode ser vazio).
+    """
+    return _PADRAO_SEPARADORES.sub(" ", remover_acentos(texto).casefold()).strip()
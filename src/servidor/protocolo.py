@@ -0,0 +1,259 @@
+import base64
+import hashlib
+import json
+import struct
+
+# GUID fixo do protocolo WebSocket (RFC 6455), usado no aperto de mão.
+GUID_WEBSOCKET = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_TEXTO = 0x1
+OPCODE_FECHAR = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+TAMANHO_MAXIMO_CORPO = 64 * 1024  # Perguntas de chat são curtas; limita abusos.
+
+MENSAGENS_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class ErroProtocolo(Exception):
+    """Requisição HTTP ou quadro WebSocket malformado."""
+
+
+class RequisicaoHTTP:
+    """Requisição HTTP/1.1 já lida do socket (método, caminho, cabeçalhos e corpo)."""
+
+    def __init__(self, metodo, caminho, versao, cabecalhos, corpo):
+        self.metodo = metodo
+        self.caminho = caminho
+        self.versao = versao
+        self.cabecalhos = cabecalhos  # Nomes em minúsculas.
+        self.corpo = corpo
+
+    @property
+    def manter_conexao(self):
+        """Indica se o cliente quer reutilizar a conexão (keep-alive)."""
+        conexao = self.cabecalhos.get("connection", "").lower()
+        if self.versao == "HTTP/1.0":
+            return conexao == "keep-alive"
+        return conexao != "close"
+
+    @property
+    def pede_websocket(self):
+        """Indica se a requisição é um pedido de upgrade para WebSocket."""
+        return self.cabecalhos.get("upgrade", "").lower() == "websocket"
+
+    def json(self):
+        """Decodifica o corpo como JSON (objeto vazio se não houver corpo)."""
+        if not self.corpo:
+            return {}
+        try:
+            return json.loads(self.corpo.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ErroProtocolo(f"JSON inválido: {e}") from e
+
+
+def _ler_tamanho_corpo(valor):
+    """
+    Converte o cabeçalho Content-Length no tamanho do corpo.
+
+    Args:
+        valor (str): O valor do cabeçalho (vazio se ausente).
+
+    Returns:
+        int: O tamanho do corpo em bytes.
+
+    Raises:
+        ErroProtocolo: Se o valor não for um inteiro não negativo ou passar de
+                       TAMANHO_MAXIMO_CORPO.
+    """
+    if not valor:
+        return 0
+    # Só dígitos: recusa sinais, espaços internos e formatos como '1_000' ou '1e3'.
+    if not (valor.isascii() and valor.isdigit()):
+        raise ErroProtocolo(f"Content-Length inválido: {valor!r}.")
+    tamanho = int(valor)
+    if tamanho > TAMANHO_MAXIMO_CORPO:
+        raise ErroProtocolo("Corpo da requisição grande demais.")
+    return tamanho
+
+
+async def ler_requisicao_http(reader):
+    """
+    Lê uma requisição HTTP/1.1 completa do stream.
+
+    Args:
+        reader (asyncio.StreamReader): Stream da conexão.
+
+    Returns:
+        RequisicaoHTTP or None: A requisição, ou None se o cliente fechou a conexão.
+
+    Raises:
+        ErroProtocolo: Se a requisição estiver malformada ou o corpo for grande demais.
+    """
+    linha_inicial = await reader.readline()
+    if not linha_inicial:
+        return None
+    try:
+        metodo, caminho, versao = linha_inicial.decode("latin-1").split()
+    except ValueError as e:
+        raise ErroProtocolo("Linha de requisição inválida.") from e
+
+    cabecalhos = {}
+    while True:
+        linha = await reader.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        cabecalhos[nome.strip().lower()] = valor.strip()
+
+    tamanho = _ler_tamanho_corpo(cabecalhos.get("content-length", ""))
+    corpo = await reader.readexactly(tamanho) if tamanho else b""
+    return RequisicaoHTTP(metodo, caminho, versao, cabecalhos, corpo)
+
+
+def montar_resposta_http(status, dados, manter_conexao=True):
+    """
+    Monta os bytes de uma resposta HTTP com corpo JSON.
+
+    Args:
+        status (int): Código de status HTTP.
+        dados (dict): Conteúdo a ser serializado em JSON.
+        manter_conexao (bool): Se a conexão continua aberta após a resposta.
+
+    Returns:
+        bytes: A resposta completa.
+    """
+    corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+    cabecalhos = (
+        f"HTTP/1.1 {status} {MENSAGENS_STATUS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(corpo)}\r\n"
+        f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n"
+        "\r\n"
+    )
+    return cabecalhos.encode("latin-1") + corpo
+
+
+def montar_inicio_resposta_em_pedacos(manter_conexao=True):
+    """
+    Monta os cabeçalhos de uma resposta HTTP 200 em streaming (chunked, NDJSON).
+
+    O corpo vem depois em pedaços ('montar_pedaco_http'), um objeto JSON por linha,
+    e termina com 'FIM_RESPOSTA_EM_PEDACOS'.
+
+    Args:
+        manter_conexao (bool): Se a conexão continua aberta após a resposta.
+
+    Returns:
+        bytes: A linha de status e os cabeçalhos.
+    """
+    return (
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: application/x-ndjson; charset=utf-8\r\n"
+        "Transfer-Encoding: chunked\r\n"
+        f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n"
+        "\r\n"
+    ).encode("latin-1")
+
+
+def montar_pedaco_http(dados):
+    """
+    Monta um pedaço (chunk) HTTP contendo uma linha JSON.
+
+    Args:
+        dados (dict): Conteúdo a ser serializado em JSON.
+
+    Returns:
+        bytes: O pedaço pronto para envio.
+    """
+    linha = json.dumps(dados, ensure_ascii=False).encode("utf-8") + b"\n"
+    return f"{len(linha):X}\r\n".encode("latin-1") + linha + b"\r\n"
+
+
+FIM_RESPOSTA_EM_PEDACOS = b"0\r\n\r\n"
+
+
+def montar_aceite_websocket(requisicao):
+    """
+    Monta a resposta '101 Switching Protocols' do aperto de mão WebSocket.
+
+    Args:
+        requisicao (RequisicaoHTTP): O pedido de upgrade do cliente.
+
+    Returns:
+        bytes: A resposta de aceite.
+    """
+    chave = requisicao.cabecalhos.get("sec-websocket-key")
+    if not chave:
+        raise ErroProtocolo("Cabeçalho Sec-WebSocket-Key ausente.")
+    aceite = base64.b64encode(
+        hashlib.sha1((chave + GUID_WEBSOCKET).encode("latin-1")).digest()
+    ).decode("latin-1")
+    return (
+        "HTTP/1.1 101 Switching Protocols\r\n"
+        "Upgrade: websocket\r\n"
+        "Connection: Upgrade\r\n"
+        f"Sec-WebSocket-Accept: {aceite}\r\n"
+        "\r\n"
+    ).encode("latin-1")
+
+
+async def ler_quadro_websocket(reader):
+    """
+    Lê um quadro WebSocket (RFC 6455) enviado pelo cliente.
+
+    Args:
+        reader (asyncio.StreamReader): Stream da conexão.
+
+    Returns:
+        tuple: (opcode, payload em bytes).
+    """
+    primeiro, segundo = await reader.readexactly(2)
+    opcode = primeiro & 0x0F
+    mascarado = segundo & 0x80
+    tamanho = segundo & 0x7F
+    if tamanho == 126:
+        (tamanho,) = struct.unpack("!H", await reader.readexactly(2))
+    elif tamanho == 127:
+        (tamanho,) = struct.unpack("!Q", await reader.readexactly(8))
+    if tamanho > TAMANHO_MAXIMO_CORPO:
+        raise ErroProtocolo("Quadro WebSocket grande demais.")
+
+    mascara = await reader.readexactly(4) if mascarado else None
+    payload = await reader.readexactly(tamanho)
+    if mascara:
+        payload = bytes(b ^ mascara[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def montar_quadro_websocket(payload, opcode=OPCODE_TEXTO):
+    """
+    Monta um quadro WebSocket do servidor para o cliente (sem máscara).
+
+    Args:
+        payload (bytes or str): Conteúdo do quadro (texto é codificado em UTF-8).
+        opcode (int): Tipo do quadro (texto, fechar, pong...).
+
+    Returns:
+        bytes: O quadro pronto para envio.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    cabecalho = bytes([0x80 | opcode])  # FIN + opcode.
+    tamanho = len(payload)
+    if tamanho < 126:
+        cabecalho += bytes([tamanho])
+    elif tamanho < 2**16:
+        cabecalho += bytes([126]) + struct.pack("!H", tamanho)
+    else:
+        cabecalho += bytes([127]) + struct.pack("!Q", tamanho)
+    return cabecalho + payload
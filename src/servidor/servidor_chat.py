@@ -0,0 +1,321 @@
+import asyncio
+import json
+import logging
+import time
+
+from src.agent.pipeline_turno import SessaoChat, processar_turno_async
+from src.database.migracoes import verificar_esquema_na_inicializacao
+from src.servidor.protocolo import (
+    OPCODE_FECHAR,
+    OPCODE_PING,
+    OPCODE_PONG,
+    OPCODE_TEXTO,
+    FIM_RESPOSTA_EM_PEDACOS,
+    ErroProtocolo,
+    ler_quadro_websocket,
+    ler_requisicao_http,
+    montar_aceite_websocket,
+    montar_inicio_resposta_em_pedacos,
+    montar_pedaco_http,
+    montar_quadro_websocket,
+    montar_resposta_http,
+)
+
+logger = logging.getLogger(__name__)
+
+# Resposta de um turno que falhou (ex: erro da LLM ou de uma ferramenta). O detalhe
+# fica no log do servidor; a conexão continua aberta para as próximas perguntas.
+ERRO_INTERNO = "Erro interno ao processar a pergunta."
+
+
+class ServidorChat:
+    """
+    Servidor HTTP/WebSocket (asyncio) que atende muitos usuários do chatbot ao mesmo tempo.
+
+    Rotas:
+        POST /chat  -> corpo {"pergunta": "...", "sessao": "<id opcional>"};
+                       responde {"sessao", "resposta", "intencao", "titulo", "encerrar",
+                       "tempo_primeiro_pedaco", "tempo_total"}. Com "stream": true no
+                       corpo, a resposta vem em pedaços (NDJSON): {"pedaco": "..."}
+                       por linha e, por fim, o JSON completo acima.
+        GET  /saude -> estado do servidor (sessões ativas, turnos em andamento).
+        GET  /ws    -> WebSocket: cada mensagem de texto é uma pergunta (texto puro ou
+                       JSON {"pergunta": ...}). A resposta volta em streaming: uma
+                       mensagem {"pedaco": "..."} por pedaço e, por fim, o JSON
+                       completo (como no POST /chat).
+
+    Cada sessão guarda seu próprio estado (SessaoChat). Um semáforo limita quantos
+    turnos rodam em paralelo, protegendo a cota da API da LLM e o banco.
+    Um turno que falha responde 500 com {"erro": "..."} (no WebSocket, uma mensagem
+    {"erro": "..."}) e a conexão continua aberta.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        porta=8080,
+        max_turnos_simultaneos=32,
+        tempo_max_fila=30.0,
+        tempo_max_inatividade=1800.0,
+    ):
+        """
+        Args:
+            host (str): Endereço de escuta.
+            porta (int): Porta de escuta (0 escolhe uma porta livre).
+            max_turnos_simultaneos (int): Quantos turnos podem rodar ao mesmo tempo.
+            tempo_max_fila (float): Segundos que um turno espera por vaga antes de receber 503.
+            tempo_max_inatividade (float): Segundos sem uso até uma sessão ser descartada.
+        """
+        self.host = host
+        self.porta = porta
+        self.max_turnos_simultaneos = max_turnos_simultaneos
+        self.tempo_max_fila = tempo_max_fila
+        self.tempo_max_inatividade = tempo_max_inatividade
+
+        self.sessoes = {}
+        self.turnos_em_andamento = 0
+        self._semaforo = None
+        self._servidor = None
+        self._tarefa_limpeza = None
+
+    async def iniciar(self):
+        """
+        Começa a aceitar conexões.
+
+        Returns:
+            asyncio.Server: O servidor em execução (a porta real fica em 'self.porta').
+        """
+        self._semaforo = asyncio.Semaphore(self.max_turnos_simultaneos)
+        self._servidor = await asyncio.start_server(
+            self._atender_conexao, self.host, self.porta
+        )
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        self._tarefa_limpeza = asyncio.create_task(self._limpar_sessoes_inativas())
+        return self._servidor
+
+    async def encerrar(self):
+        """Para de aceitar conexões e cancela a limpeza periódica de sessões."""
+        if self._tarefa_limpeza:
+            self._tarefa_limpeza.cancel()
+        if self._servidor:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+
+    def obter_sessao(self, id_sessao=None):
+        """Retorna a sessão existente com esse id ou cria uma nova."""
+        sessao = self.sessoes.get(id_sessao) if id_sessao else None
+        if sessao is None:
+            sessao = SessaoChat(id_sessao)
+            self.sessoes[sessao.id] = sessao
+        return sessao
+
+    async def executar_turno(self, sessao, pergunta, ao_receber_pedaco=None):
+        """
+        Processa uma pergunta respeitando o limite de turnos simultâneos.
+
+        Args:
+            sessao (SessaoChat): A sessão do usuário.
+            pergunta (str): A pergunta do usuário.
+            ao_receber_pedaco (coroutine function, optional): Recebe os pedaços da
+                resposta em streaming (ver 'processar_turno_async').
+
+        Raises:
+            asyncio.TimeoutError: Se não houver vaga dentro de 'tempo_max_fila'
+                (contado depois dos turnos anteriores da mesma sessão).
+        """
+        # Turnos da mesma sessão saem em ordem. A vaga só é pedida com a sessão
+        # livre: pedidos enfileirados numa sessão não tomam as vagas dos outros.
+        async with sessao.trava:
+            await asyncio.wait_for(self._semaforo.acquire(), self.tempo_max_fila)
+            self.turnos_em_andamento += 1
+            try:
+                resultado = await processar_turno_async(
+                    pergunta, sessao, ao_receber_pedaco=ao_receber_pedaco
+                )
+            finally:
+                self.turnos_em_andamento -= 1
+                self._semaforo.release()
+        if resultado["encerrar"]:
+            self.sessoes.pop(sessao.id, None)
+        return dict(resultado, sessao=sessao.id)
+
+    async def _limpar_sessoes_inativas(self):
+        """Descarta periodicamente as sessões sem atividade recente."""
+        while True:
+            await asyncio.sleep(min(60.0, self.tempo_max_inatividade))
+            limite = time.monotonic() - self.tempo_max_inatividade
+            for id_sessao, sessao in list(self.sessoes.items()):
+                if sessao.ultima_atividade < limite:
+                    del self.sessoes[id_sessao]
+
+    async def _atender_conexao(self, reader, writer):
+        """Atende uma conexão TCP: várias requisições HTTP (keep-alive) ou um WebSocket."""
+        try:
+            while True:
+                try:
+                    requisicao = await ler_requisicao_http(reader)
+                except ErroProtocolo as e:
+                    writer.write(montar_resposta_http(400, {"erro": str(e)}, False))
+                    break
+                if requisicao is None:
+                    break
+                if requisicao.pede_websocket and requisicao.caminho == "/ws":
+                    await self._atender_websocket(requisicao, reader, writer)
+                    break
+                resposta = await self._responder_http(requisicao, writer)
+                if resposta:
+                    writer.write(resposta)
+                await writer.drain()
+                if not requisicao.manter_conexao:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ErroProtocolo):
+            pass  # Cliente desconectou (ou enviou lixo) no meio da requisição.
+        finally:
+            writer.close()
+
+    async def _responder_http(self, requisicao, writer):
+        """
+        Roteia uma requisição HTTP e retorna os bytes da resposta.
+
+        Respostas em streaming são escritas direto no 'writer' (retorna None).
+        """
+        manter = requisicao.manter_conexao
+        if requisicao.caminho == "/saude":
+            return montar_resposta_http(
+                200,
+                {
+                    "sessoes": len(self.sessoes),
+                    "turnos_em_andamento": self.turnos_em_andamento,
+                },
+                manter,
+            )
+        if requisicao.caminho != "/chat":
+            return montar_resposta_http(404, {"erro": "Rota inexistente."}, manter)
+        if requisicao.metodo != "POST":
+            return montar_resposta_http(405, {"erro": "Use POST."}, manter)
+
+        try:
+            dados = requisicao.json()
+        except ErroProtocolo as e:
+            return montar_resposta_http(400, {"erro": str(e)}, manter)
+        if not isinstance(dados, dict):
+            erro = {"erro": "O corpo deve ser um objeto JSON."}
+            return montar_resposta_http(400, erro, manter)
+        pergunta = dados.get("pergunta", "")
+        if not isinstance(pergunta, str):
+            erro = {"erro": "Campo 'pergunta' deve ser um texto."}
+            return montar_resposta_http(400, erro, manter)
+        pergunta = pergunta.strip()
+        if not pergunta:
+            erro = {"erro": "Campo 'pergunta' vazio."}
+            return montar_resposta_http(400, erro, manter)
+        if not isinstance(dados.get("sessao", ""), (str, type(None))):
+            erro = {"erro": "Campo 'sessao' deve ser um texto."}
+            return montar_resposta_http(400, erro, manter)
+
+        sessao = self.obter_sessao(dados.get("sessao"))
+        if not dados.get("stream"):
+            try:
+                resultado = await self.executar_turno(sessao, pergunta)
+            except asyncio.TimeoutError:
+                return montar_resposta_http(503, {"erro": "Servidor ocupado."}, manter)
+            except Exception:
+                logger.exception("Falha no turno da sessão %s.", sessao.id)
+                return montar_resposta_http(500, {"erro": ERRO_INTERNO}, manter)
+            return montar_resposta_http(200, resultado, manter)
+
+        # Streaming: os cabeçalhos só saem com o primeiro pedaço, então um turno
+        # que não conseguiu vaga ainda pode responder 503 normalmente.
+        cabecalhos_enviados = False
+
+        async def enviar_pedaco(pedaco):
+            nonlocal cabecalhos_enviados
+            if not cabecalhos_enviados:
+                writer.write(montar_inicio_resposta_em_pedacos(manter))
+                cabecalhos_enviados = True
+            writer.write(montar_pedaco_http({"pedaco": pedaco}))
+            await writer.drain()
+
+        try:
+            resultado = await self.executar_turno(sessao, pergunta, enviar_pedaco)
+        except asyncio.TimeoutError:
+            return montar_resposta_http(503, {"erro": "Servidor ocupado."}, manter)
+        except ConnectionError:
+            raise  # O cliente desconectou no meio do streaming.
+        except Exception:
+            logger.exception("Falha no turno da sessão %s.", sessao.id)
+            if not cabecalhos_enviados:
+                return montar_resposta_http(500, {"erro": ERRO_INTERNO}, manter)
+            # Os cabeçalhos (200) já foram: o erro vai como último pedaço.
+            resultado = {"erro": ERRO_INTERNO, "sessao": sessao.id}
+        if not cabecalhos_enviados:
+            writer.write(montar_inicio_resposta_em_pedacos(manter))
+        writer.write(montar_pedaco_http(resultado) + FIM_RESPOSTA_EM_PEDACOS)
+        return None
+
+    async def _atender_websocket(self, requisicao, reader, writer):
+        """Conversa via WebSocket: uma sessão por conexão, uma pergunta por mensagem."""
+        try:
+            writer.write(montar_aceite_websocket(requisicao))
+        except ErroProtocolo as e:
+            writer.write(montar_resposta_http(400, {"erro": str(e)}, False))
+            await writer.drain()
+            return
+        await writer.drain()
+        sessao = self.obter_sessao()
+
+        while True:
+            opcode, payload = await ler_quadro_websocket(reader)
+            if opcode == OPCODE_FECHAR:
+                writer.write(montar_quadro_websocket(b"", OPCODE_FECHAR))
+                break
+            if opcode == OPCODE_PING:
+                writer.write(montar_quadro_websocket(payload, OPCODE_PONG))
+                continue
+            if opcode != OPCODE_TEXTO:
+                continue
+
+            texto = payload.decode("utf-8", errors="replace")
+            try:
+                pergunta = json.loads(texto).get("pergunta", "")
+            except (json.JSONDecodeError, AttributeError):
+                pergunta = texto  # Aceita a pergunta como texto puro.
+            if not str(pergunta).strip():
+                continue
+
+            async def enviar_pedaco(pedaco):
+                dados_pedaco = json.dumps({"pedaco": pedaco}, ensure_ascii=False)
+                writer.write(montar_quadro_websocket(dados_pedaco))
+                await writer.drain()
+
+            try:
+                resultado = await self.executar_turno(
+                    sessao, str(pergunta).strip(), enviar_pedaco
+                )
+            except asyncio.TimeoutError:
+                resultado = {"erro": "Servidor ocupado.", "sessao": sessao.id}
+            except ConnectionError:
+                raise
+            except Exception:
+                logger.exception("Falha no turno da sessão %s.", sessao.id)
+                resultado = {"erro": ERRO_INTERNO, "sessao": sessao.id}
+            writer.write(
+                montar_quadro_websocket(json.dumps(resultado, ensure_ascii=False))
+            )
+            await writer.drain()
+            if resultado.get("encerrar"):
+                writer.write(montar_quadro_websocket(b"", OPCODE_FECHAR))
+                break
+        self.sessoes.pop(sessao.id, None)
+        await writer.drain()
+
+
+async def executar_servidor(host="127.0.0.1", porta=8080, max_turnos_simultaneos=32):
+    """Inicia o servidor de chat e o mantém rodando até ser interrompido."""
+    verificar_esquema_na_inicializacao()
+    servidor_chat = ServidorChat(host, porta, max_turnos_simultaneos)
+    servidor = await servidor_chat.iniciar()
+    print(f"Servidor do chatbot cinéfilo em http://{host}:{servidor_chat.porta}")
+    print("Rotas: POST /chat, GET /saude, WebSocket em /ws")
+    async with servidor:
+        await servidor.serve_forever()
@@ -0,0 +1,171 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from src.database import migracoes
+from src.database.apelidos_titulos import (
+    APELIDOS_EXEMPLO,
+    adicionar_apelidos,
+    importar_apelidos,
+)
+from src.database.catalogo_memoria import CatalogoMemoria, construir_catalogo
+from src.database.migracoes import aplicar_migracoes
+from src.database.repositorio_filmes import SQL_BUSCA_POR_APELIDO, RepositorioFilmes
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+
+
+# --- Classe de Testes para os títulos alternativos ('titulo_alias') ---
+class TestApelidosTitulos(unittest.TestCase):
+    def setUp(self):
+        """Cria um 'filmes.db' temporário com os filmes e apelidos de exemplo."""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_bd = os.path.join(self.diretorio.name, "filmes.db")
+        criar_tabela_filmes(self.caminho_bd)
+        popular_filmes_exemplo(self.caminho_bd)
+        self.repositorio = RepositorioFilmes(self.caminho_bd, tamanho_pool=1)
+
+    def tearDown(self):
+        self.repositorio.fechar()
+        self.diretorio.cleanup()
+
+    def consultar(self, sql, parametros=()):
+        conn = sqlite3.connect(self.caminho_bd)
+        try:
+            return conn.execute(sql, parametros).fetchall()
+        finally:
+            conn.close()
+
+    def test_titulo_em_ingles_ou_original_acha_o_titulo_nacional(self):
+        """'Inception', 'the godfather' e 'Léon' levam aos títulos do catálogo."""
+        casos = {
+            "Inception": "A Origem",
+            "the godfather": "O Poderoso Chefão",
+            "INTERSTELLAR": "Interestelar",
+            "leon": "O Profissional",
+            "Le Fabuleux Destin d'Amélie Poulain": "Amelie Poulain",
+        }
+        for apelido, titulo in casos.items():
+            with self.subTest(apelido=apelido):
+                self.assertEqual(self.repositorio.buscar_por_titulo(apelido)[0], titulo)
+        # Títulos do catálogo continuam achados como antes.
+        self.assertEqual(self.repositorio.buscar_por_titulo("Matrix")[0], "Matrix")
+
+    def test_apelidos_de_exemplo_todos_ligados(self):
+        """Cada apelido de exemplo aponta para um filme de exemplo."""
+        total = self.consultar("SELECT COUNT(*) FROM titulo_alias")[0][0]
+        self.assertEqual(total, len(APELIDOS_EXEMPLO))
+        self.assertIn(("Inception", "A Origem"), self.repositorio.listar_apelidos())
+
+    def test_busca_por_apelido_usa_a_chave_primaria(self):
+        """A busca é uma consulta indexada: sem varrer 'titulo_alias' nem 'filmes'."""
+        plano = " ".join(
+            linha[-1]
+            for linha in self.consultar(
+                f"EXPLAIN QUERY PLAN {SQL_BUSCA_POR_APELIDO}", ("inception",)
+            )
+        )
+        self.assertIn("USING PRIMARY KEY", plano)
+        self.assertIn("USING INTEGER PRIMARY KEY", plano)
+        self.assertNotIn("SCAN", plano)
+
+    def test_importar_apelidos_de_csv_e_jsonl(self):
+        """O ano desempata títulos repetidos; títulos fora do catálogo são ignorados."""
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.execute(
+            "INSERT INTO filmes (titulo, ano, titulo_normalizado) "
+            "VALUES ('Duna', 1984, 'duna')"
+        )
+        conn.commit()
+        conn.close()
+
+        caminho_csv = os.path.join(self.diretorio.name, "apelidos.csv")
+        with open(caminho_csv, "w", encoding="utf-8") as arquivo:
+            arquivo.write("titulo,ano,apelido,idioma\n")
+            arquivo.write("Duna,1984,Dune (1984),en\n")
+            arquivo.write("Filme Inexistente,,Missing Movie,en\n")
+        resultado = importar_apelidos(caminho_csv, self.caminho_bd)
+        self.assertEqual(resultado["linhas"], 2)
+        self.assertEqual(resultado["apelidos"], 1)
+
+        caminho_jsonl = os.path.join(self.diretorio.name, "apelidos.jsonl")
+        with open(caminho_jsonl, "w", encoding="utf-8") as arquivo:
+            registro = {"titulo": "Gladiador", "apelido": "Il Gladiatore"}
+            arquivo.write(json.dumps({**registro, "idioma": "it"}) + "\n")
+        importar_apelidos(caminho_jsonl, self.caminho_bd)
+
+        self.assertEqual(
+            self.consultar(
+                "SELECT f.ano FROM titulo_alias a JOIN filmes f ON f.id = a.filme_id "
+                "WHERE a.alias_normalizado = 'dune 1984'"
+            ),
+            [(1984,)],
+        )
+        self.assertEqual(
+            self.repositorio.buscar_por_titulo("il gladiatore")[0], "Gladiador"
+        )
+        # Reimportar atualiza (não duplica) o apelido.
+        importar_apelidos(caminho_jsonl, self.caminho_bd)
+        self.assertEqual(
+            self.consultar(
+                "SELECT COUNT(*) FROM titulo_alias WHERE alias = 'Il Gladiatore'"
+            ),
+            [(1,)],
+        )
+
+    def test_remover_filme_remove_seus_apelidos(self):
+        """O gatilho de 'filmes' apaga os apelidos do filme removido."""
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.execute("DELETE FROM filmes WHERE titulo = 'A Origem'")
+        conn.commit()
+        conn.close()
+        self.assertEqual(
+            self.consultar(
+                "SELECT COUNT(*) FROM titulo_alias WHERE alias_normalizado = ?",
+                ("inception",),
+            ),
+            [(0,)],
+        )
+
+    def test_catalogo_em_memoria_resolve_apelidos(self):
+        """O instantâneo mapeado responde aos apelidos como o repositório."""
+        caminho_arquivo = os.path.join(self.diretorio.name, "catalogo.bin")
+        construir_catalogo(self.caminho_bd, caminho_arquivo)
+        catalogo = CatalogoMemoria.carregar(caminho_arquivo)
+        try:
+            for apelido in ("Inception", "the dark knight", "Parasite", "Se7en"):
+                with self.subTest(apelido=apelido):
+                    self.assertEqual(
+                        catalogo.buscar_por_titulo(apelido),
+                        self.repositorio.buscar_por_titulo(apelido),
+                    )
+        finally:
+            catalogo.fechar()
+
+    def test_migracao_liga_apelidos_em_banco_existente(self):
+        """Um banco na versão 4 recebe a tabela e os apelidos dos filmes de exemplo."""
+        caminho_bd = os.path.join(self.diretorio.name, "antigo.db")
+        with mock.patch.object(migracoes, "MIGRACOES", migracoes.MIGRACOES[:4]):
+            aplicar_migracoes(caminho_bd)
+            popular_filmes_exemplo(caminho_bd)
+        self.assertEqual(aplicar_migracoes(caminho_bd), [5, 6])
+        repositorio = RepositorioFilmes(caminho_bd, tamanho_pool=1)
+        try:
+            self.assertEqual(repositorio.buscar_por_titulo("Inception")[0], "A Origem")
+        finally:
+            repositorio.fechar()
+
+    def test_adicionar_apelidos_ignora_linhas_incompletas(self):
+        """Linhas sem título ou sem apelido não são gravadas."""
+        conn = sqlite3.connect(self.caminho_bd)
+        gravados = adicionar_apelidos(
+            conn, [("Matrix", None, "", "en"), ("", None, "Nada", "en")]
+        )
+        conn.close()
+        self.assertEqual(gravados, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import random
+import unittest
+
+from src.nlp.busca_aproximada import (
+    LIMIAR_BUSCA_APROXIMADA,
+    BuscaAproximadaTitulos,
+    distancia_levenshtein,
+    similaridade_jaro_winkler,
+)
+
+TITULOS_TESTE = [
+    "Interestelar",
+    "WALL·E",
+    "Matrix",
+    "Gladiador",
+    "O Poderoso Chefão",
+    "A Lista de Schindler",
+    "Forrest Gump: O Contador de Histórias",
+    "Parasita",
+    "Kill Bill: Volume 1",
+    "Up - Altas Aventuras",
+    "Procurando Nemo",
+    "O Silêncio dos Inocentes",
+    "Cidade de Deus",
+    "Titanic",
+]
+
+# Corpus de erros de digitação: (como o usuário escreveu, título esperado).
+CORPUS_ERROS_DIGITACAO = [
+    ("interstellar", "Interestelar"),
+    ("INTERESTELAR", "Interestelar"),
+    ("interestellar", "Interestelar"),
+    ("wall-e", "WALL·E"),
+    ("walle", "WALL·E"),
+    ("wall e", "WALL·E"),
+    ("matirx", "Matrix"),
+    ("matriz", "Matrix"),
+    ("gladiator", "Gladiador"),
+    ("gladiadr", "Gladiador"),
+    ("poderoso chefao", "O Poderoso Chefão"),
+    ("o poderozo chefão", "O Poderoso Chefão"),
+    ("lista de shindler", "A Lista de Schindler"),
+    ("forest gump", "Forrest Gump: O Contador de Histórias"),
+    ("parasite", "Parasita"),
+    ("kill bil", "Kill Bill: Volume 1"),
+    ("procurando nemmo", "Procurando Nemo"),
+    ("o silencio dos inocente", "O Silêncio dos Inocentes"),
+    ("cidade de deos", "Cidade de Deus"),
+    ("titanik", "Titanic"),
+]
+
+# Textos que não são títulos do catálogo e não devem ser "corrigidos" para um.
+CONSULTAS_SEM_TITULO = ["oi tudo bem", "nosferatu", "o senhor dos aneis", "xyz"]
+
+
+def _levenshtein_referencia(a, b):
+    """Programação dinâmica clássica, para conferir a versão paralela em bits."""
+    anterior = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        atual = [i]
+        for j, y in enumerate(b, 1):
+            substituicao = anterior[j - 1] + (x != y)
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, substituicao))
+        anterior = atual
+    return anterior[-1]
+
+
+# --- Classe de Testes para a busca aproximada de títulos (erros de digitação) ---
+class TestBuscaAproximadaTitulos(unittest.TestCase):
+    def setUp(self):
+        self.busca = BuscaAproximadaTitulos(TITULOS_TESTE)
+
+    def test_corpus_de_erros_de_digitacao(self):
+        """Cada grafia com erro é corrigida para o título certo, acima do limiar."""
+        for consulta, esperado in CORPUS_ERROS_DIGITACAO:
+            with self.subTest(consulta=consulta):
+                melhor = self.busca.melhor_titulo(consulta)
+                self.assertIsNotNone(melhor)
+                self.assertEqual(melhor[0], esperado)
+                self.assertGreaterEqual(melhor[1], LIMIAR_BUSCA_APROXIMADA)
+
+    def test_titulo_exato_tem_confianca_maxima(self):
+        """Acentos, caixa e pontuação não reduzem a confiança de um título exato."""
+        self.assertEqual(self.busca.buscar("o silêncio dos inocentes", k=1)[0][0], 1.0)
+        self.assertEqual(self.busca.buscar("Wall.E", k=1), [(1.0, "WALL·E")])
+
+    def test_consultas_sem_titulo_ficam_abaixo_do_limiar(self):
+        """Conversa e filmes fora do catálogo não viram um título por engano."""
+        for consulta in CONSULTAS_SEM_TITULO:
+            with self.subTest(consulta=consulta):
+                self.assertIsNone(self.busca.melhor_titulo(consulta))
+        self.assertEqual(self.busca.buscar("", k=3), [])
+        self.assertEqual(BuscaAproximadaTitulos([]).buscar("matrix"), [])
+
+    def test_resultados_ordenados_e_sem_titulos_repetidos(self):
+        """'buscar' devolve até k títulos distintos, do mais parecido ao menos."""
+        resultados = self.busca.buscar("matrx", k=3)
+        self.assertEqual(resultados[0][1], "Matrix")
+        confiancas = [confianca for confianca, _ in resultados]
+        self.assertEqual(confiancas, sorted(confiancas, reverse=True))
+        titulos = [titulo for _, titulo in resultados]
+        self.assertEqual(len(titulos), len(set(titulos)))
+
+    def test_levenshtein_confere_com_a_programacao_dinamica(self):
+        """A versão paralela em bits dá a mesma distância da tabela completa."""
+        gerador = random.Random(7)
+        for _ in range(500):
+            a = "".join(gerador.choices("abcde", k=gerador.randint(0, 12)))
+            b = "".join(gerador.choices("abcde", k=gerador.randint(0, 12)))
+            with self.subTest(a=a, b=b):
+                self.assertEqual(
+                    distancia_levenshtein(a, b), _levenshtein_referencia(a, b)
+                )
+        self.assertEqual(distancia_levenshtein("gladiator", "gladiador"), 1)
+        # Com limite, distâncias maiores são cortadas em 'limite + 1'.
+        self.assertEqual(distancia_levenshtein("matrix", "parasita", limite=2), 3)
+        self.assertEqual(distancia_levenshtein("up", "interestelar", limite=3), 4)
+
+    def test_jaro_winkler(self):
+        """Valores conhecidos de Jaro-Winkler e os casos extremos."""
+        self.assertAlmostEqual(
+            similaridade_jaro_winkler("martha", "marhta"), 0.9611, places=4
+        )
+        self.assertAlmostEqual(
+            similaridade_jaro_winkler("dwayne", "duane"), 0.84, places=4
+        )
+        self.assertEqual(similaridade_jaro_winkler("matrix", "matrix"), 1.0)
+        self.assertEqual(similaridade_jaro_winkler("abc", "xyz"), 0.0)
+        self.assertEqual(similaridade_jaro_winkler("", "abc"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
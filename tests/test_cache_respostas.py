@@ -0,0 +1,167 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.llm.cache_respostas import CacheRespostas, gerar_chave
+from src.llm.prompts import VERSAO_PROMPTS
+
+INFO_MATRIX = (
+    "Matrix",
+    "Lana e Lilly Wachowski",
+    1999,
+    "Ficção Científica/Ação",
+    "Keanu Reeves",
+)
+
+
+class RelogioFalso:
+    """Relógio controlado pelo teste, para simular a passagem do tempo."""
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self):
+        return self.agora
+
+
+# --- Classe de Testes para o CacheRespostas (cache de respostas da LLM) ---
+class TestCacheRespostas(unittest.TestCase):
+    def setUp(self):
+        self.relogio = RelogioFalso()
+        self.diretorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_chave_normaliza_pergunta_e_considera_contexto(self):
+        """Verifica se a chave ignora acentos/caixa, mas muda com o contexto e o modelo."""
+        chave = gerar_chave("Quem dirigiu Matrix?", INFO_MATRIX, "modelo-a")
+        self.assertEqual(
+            chave, gerar_chave("quem dirigiu matrix", INFO_MATRIX, "modelo-a")
+        )
+        self.assertNotEqual(
+            chave, gerar_chave("Quem dirigiu Matrix?", None, "modelo-a")
+        )
+        self.assertNotEqual(
+            chave, gerar_chave("Quem dirigiu Matrix?", INFO_MATRIX, "modelo-b")
+        )
+
+    def test_chave_muda_com_a_instrucao_de_sistema(self):
+        """Verifica se uma mudança no prompt de sistema não reaproveita respostas antigas."""
+        chave = gerar_chave(
+            "Quem dirigiu Matrix?", INFO_MATRIX, "modelo-a", instrucao_sistema="v1"
+        )
+        self.assertEqual(
+            chave,
+            gerar_chave(
+                "Quem dirigiu Matrix?", INFO_MATRIX, "modelo-a", instrucao_sistema="v1"
+            ),
+        )
+        self.assertNotEqual(
+            chave,
+            gerar_chave(
+                "Quem dirigiu Matrix?", INFO_MATRIX, "modelo-a", instrucao_sistema="v2"
+            ),
+        )
+        with patch("src.llm.cache_respostas.VERSAO_PROMPTS", VERSAO_PROMPTS + 1):
+            self.assertNotEqual(
+                chave,
+                gerar_chave(
+                    "Quem dirigiu Matrix?",
+                    INFO_MATRIX,
+                    "modelo-a",
+                    instrucao_sistema="v1",
+                ),
+            )
+
+    def test_lru_remove_o_menos_usado(self):
+        """Verifica se, ao passar da capacidade, sai o item usado há mais tempo."""
+        cache = CacheRespostas(capacidade=2, relogio=self.relogio)
+        cache.guardar("a", "resposta a")
+        cache.guardar("b", "resposta b")
+        cache.obter("a")  # 'a' passa a ser o mais recente.
+        cache.guardar("c", "resposta c")
+
+        self.assertEqual(cache.obter("a"), "resposta a")
+        self.assertIsNone(cache.obter("b"))
+        self.assertEqual(cache.estatisticas()["remocoes"], 1)
+
+    def test_ttl_expira_respostas(self):
+        """Verifica se respostas vencidas deixam de ser servidas."""
+        cache = CacheRespostas(ttl_segundos=60, relogio=self.relogio)
+        cache.guardar("a", "resposta a")
+        self.relogio.agora += 61
+
+        self.assertIsNone(cache.obter("a"))
+        estatisticas = cache.estatisticas()
+        self.assertEqual(estatisticas["expiracoes"], 1)
+        self.assertEqual(estatisticas["faltas"], 1)
+
+    def test_nivel_em_disco_sobrevive_a_novo_cache(self):
+        """Verifica se o nível SQLite serve respostas a uma nova instância do cache."""
+        caminho = os.path.join(self.diretorio.name, "cache.db")
+        cache = CacheRespostas(caminho_disco=caminho, relogio=self.relogio)
+        cache.guardar("a", "resposta a")
+        cache.fechar()
+
+        novo_cache = CacheRespostas(caminho_disco=caminho, relogio=self.relogio)
+        self.assertEqual(novo_cache.obter("a"), "resposta a")
+        self.assertEqual(novo_cache.obter("a"), "resposta a")
+        estatisticas = novo_cache.estatisticas()
+        self.assertEqual(estatisticas["acertos_disco"], 1)
+        self.assertEqual(estatisticas["acertos_memoria"], 1)
+        novo_cache.fechar()
+
+    def test_disco_apaga_respostas_vencidas(self):
+        """Verifica se as linhas vencidas saem do SQLite ao abrir e em uma falta."""
+        caminho = os.path.join(self.diretorio.name, "cache.db")
+        cache = CacheRespostas(
+            ttl_segundos=60, caminho_disco=caminho, relogio=self.relogio
+        )
+        cache.guardar("a", "resposta a")
+        self.relogio.agora += 30
+        cache.guardar("b", "resposta b")
+        self.relogio.agora += 31  # 'a' venceu; 'b' ainda vale.
+
+        novo_cache = CacheRespostas(caminho_disco=caminho, relogio=self.relogio)
+        self.assertEqual(self._chaves_no_disco(caminho), ["b"])
+
+        self.relogio.agora += 30  # Agora 'b' também venceu.
+        self.assertIsNone(novo_cache.obter("b"))
+        self.assertEqual(self._chaves_no_disco(caminho), [])
+        cache.fechar()
+        novo_cache.fechar()
+
+    def _chaves_no_disco(self, caminho):
+        """Chaves gravadas no arquivo SQLite do cache (lidas por outra conexão)."""
+        conn = sqlite3.connect(caminho)
+        try:
+            return [
+                linha[0]
+                for linha in conn.execute("SELECT chave FROM respostas ORDER BY chave")
+            ]
+        finally:
+            conn.close()
+
+    def test_pre_aquecer_de_arquivo(self):
+        """Verifica se o cache é pré-carregado a partir de um arquivo JSONL."""
+        caminho = os.path.join(self.diretorio.name, "respostas.jsonl")
+        with open(caminho, "w", encoding="utf-8") as f:
+            registro = {
+                "pergunta": "Quem dirigiu Matrix?",
+                "info_filme": list(INFO_MATRIX),
+                "resposta": "As irmãs Wachowski.",
+            }
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+        cache = CacheRespostas(relogio=self.relogio)
+        self.assertEqual(cache.pre_aquecer(caminho, "modelo-a"), 1)
+        chave = gerar_chave("quem dirigiu matrix?", INFO_MATRIX, "modelo-a")
+        self.assertEqual(cache.obter(chave), "As irmãs Wachowski.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.database import catalogo_memoria
+from src.database.catalogo_memoria import (
+    CatalogoMemoria,
+    atualizar_catalogo,
+    construir_catalogo,
+    obter_catalogo,
+    recarregar_catalogo,
+)
+from src.database.db_utils import consultar_filme_no_bd
+from src.database.repositorio_filmes import RepositorioFilmes
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+
+
+# --- Classe de Testes para o instantâneo do catálogo em memória mapeada ---
+class TestCatalogoMemoria(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_bd = os.path.join(self.diretorio.name, "filmes.db")
+        self.caminho_arquivo = os.path.join(self.diretorio.name, "catalogo.bin")
+        with patch("builtins.print"):
+            criar_tabela_filmes(self.caminho_bd)
+            popular_filmes_exemplo(self.caminho_bd)
+        construir_catalogo(self.caminho_bd, self.caminho_arquivo)
+        self.catalogo = CatalogoMemoria.carregar(self.caminho_arquivo)
+        self.repositorio = RepositorioFilmes(self.caminho_bd, tamanho_pool=1)
+
+    def tearDown(self):
+        self.repositorio.fechar()
+        recarregar_catalogo()
+        self.diretorio.cleanup()
+
+    def inserir_filme(self, titulo, ano):
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.execute(
+            "INSERT INTO filmes (titulo, ano, titulo_normalizado) VALUES (?, ?, ?)",
+            (titulo, ano, titulo.lower()),
+        )
+        conn.commit()
+        conn.close()
+
+    def test_mesmos_resultados_do_repositorio(self):
+        """O instantâneo substitui o banco nas buscas por título (exatas e parciais)."""
+        filmes = self.repositorio.listar_filmes()
+        self.assertEqual(self.catalogo.listar_filmes(), filmes)
+        for titulo in self.repositorio.listar_titulos():
+            consultas = (titulo, titulo.upper(), titulo[:2], titulo[:6], titulo[3:10])
+            for consulta in consultas:
+                with self.subTest(consulta=consulta):
+                    self.assertEqual(
+                        self.catalogo.buscar_por_titulo(consulta),
+                        self.repositorio.buscar_por_titulo(consulta),
+                    )
+
+    def test_busca_sem_acentos_e_inexistente(self):
+        self.assertEqual(
+            self.catalogo.buscar_por_titulo("o poderoso chefao")[0], "O Poderoso Chefão"
+        )
+        self.assertIsNone(self.catalogo.buscar_por_titulo("Filme Que Não Existe"))
+        self.assertIsNone(self.catalogo.buscar_por_titulo("?!"))
+
+    def test_arrays_apontam_para_o_arquivo(self):
+        """Abrir o instantâneo não copia os dados: os arrays leem o mapa do arquivo."""
+        for array in (self.catalogo.ids, self.catalogo.anos):
+            self.assertFalse(array.flags.owndata)
+            self.assertFalse(array.flags.writeable)
+        self.assertEqual(len(self.catalogo), 77)
+
+    def test_atualizar_so_quando_o_banco_muda(self):
+        self.assertIsNone(atualizar_catalogo(self.caminho_bd, self.caminho_arquivo))
+        self.inserir_filme("Filme Novo", 2024)
+        self.assertEqual(atualizar_catalogo(self.caminho_bd, self.caminho_arquivo), 78)
+
+    def test_troca_atomica_do_instantaneo(self):
+        """Workers passam a ver o instantâneo novo; quem tem o antigo continua lendo."""
+        ambiente = {"CHATBOT_CATALOGO_MEMORIA": self.caminho_arquivo}
+        with patch.dict(os.environ, ambiente), patch.object(
+            catalogo_memoria, "INTERVALO_VERIFICACAO", 0
+        ):
+            antigo = obter_catalogo()
+            self.assertIs(obter_catalogo(), antigo)
+            self.assertIsNone(consultar_filme_no_bd("Filme Novo"))
+
+            self.inserir_filme("Filme Novo", 2024)
+            construir_catalogo(self.caminho_bd, self.caminho_arquivo)
+            novo = obter_catalogo()
+            self.assertIsNot(novo, antigo)
+            self.assertEqual(
+                consultar_filme_no_bd("filme novo")[:3], ("Filme Novo", None, 2024)
+            )
+            self.assertEqual(len(antigo), 77)
+            self.assertEqual(antigo.buscar_por_titulo("Matrix")[0], "Matrix")
+
+
+if __name__ == "__main__":
+    unittest.main()
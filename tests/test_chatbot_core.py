@@ -1,189 +1,451 @@
-import sqlite3
-import unittest
-from unittest.mock import patch
-
-# Importa as funções que você vai testar dos módulos.
-# O caminho aqui será relativo à raiz do projeto quando rodar o pytest
-from src.database.db_utils import consultar_filme_no_bd
-from src.llm.llm_utils import chamar_llm_para_resumo
-
-
-# --- Configuração do Banco de Dados para Testes ---
-# Isso cria um banco de dados temporário em memória para os testes de DB.
-# Garante que os testes de DB sejam isolados e não dependam do 'filmes.db' real.
-def setup_test_db():
-    conn = sqlite3.connect(
-        ":memory:"
-    )  # Banco de dados em memória, volátil para cada teste
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        CREATE TABLE filmes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            titulo TEXT NOT NULL UNIQUE,
-            diretor TEXT NOT NULL,
-            ano INTEGER,
-            genero TEXT,
-            protagonista TEXT
-        );
-    """
-    )
-    # Dados de exemplo para o banco de dados de teste (com 5 elementos por filme)
-    filmes_exemplo_test = [
-        (
-            "Matrix",
-            "Lana Wachowski, Lilly Wachowski",
-            1999,
-            "Ficção Científica",
-            "Keanu Reeves",
-        ),
-        ("O Poderoso Chefão", "Francis Ford Coppola", 1972, "Drama", "Marlon Brando"),
-        (
-            "A Origem",
-            "Christopher Nolan",
-            2010,
-            "Ficção Científica",
-            "Leonardo DiCaprio",
-        ),
-        (
-            "Interstellar",
-            "Christopher Nolan",
-            2014,
-            "Ficção Científica",
-            "Matthew McConaughey",
-        ),
-        ("Pulp Fiction", "Quentin Tarantino", 1994, "Crime", "John Travolta"),
-        (
-            "Senhor dos Anéis: A Sociedade do Anel",
-            "Peter Jackson",
-            2001,
-            "Fantasia",
-            "Elijah Wood",
-        ),
-        (
-            "O Cavaleiro das Trevas",
-            "Christopher Nolan",
-            2008,
-            "Ação/Crime",
-            "Christian Bale",
-        ),
-        ("1984", "Michael Radford", 1984, "Ficção Científica", "John Hurt"),
-        (
-            "A Viagem de Chihiro",
-            "Hayao Miyazaki",
-            2001,
-            "Animação/Fantasia",
-            "Rumi Hiiragi",
-        ),
-    ]
-    cursor.executemany(
-        "INSERT INTO filmes (titulo, diretor, ano, genero, protagonista) VALUES (?, ?, ?, ?, ?)",
-        filmes_exemplo_test,
-    )  # Ajustado para 5 placeholders
-    conn.commit()
-    return conn
-
-
-# --- Classe de Testes para consultar_filme_no_bd ---
-class TestConsultarFilmeNoBD(unittest.TestCase):
-    def setUp(self):
-        """Configura um banco de dados em memória para cada teste."""
-        self.conn = setup_test_db()
-        self.patcher = patch("sqlite3.connect", return_value=self.conn)
-        self.mock_connect = self.patcher.start()
-
-    def tearDown(self):
-        """Fecha a conexão com o banco de dados em memória após cada teste."""
-        self.conn.close()
-        self.patcher.stop()
-
-    def test_consultar_filme_existente(self):
-        """Verifica se a consulta retorna informações de um filme existente."""
-        resultado = consultar_filme_no_bd("Matrix")
-        self.assertIsNotNone(resultado)
-        self.assertEqual(resultado[0], "Matrix")
-        self.assertEqual(resultado[1], "Lana Wachowski, Lilly Wachowski")
-
-    def test_consultar_filme_inexistente(self):
-        """Verifica se a consulta retorna None para um filme inexistente."""
-        resultado = consultar_filme_no_bd("Titanic")
-        self.assertIsNone(resultado)
-
-    def test_consultar_filme_por_parte_do_nome(self):
-        """Verifica se a consulta funciona com parte do nome do filme."""
-        resultado = consultar_filme_no_bd("Chefão")
-        self.assertIsNotNone(resultado)
-        self.assertEqual(resultado[0], "O Poderoso Chefão")
-
-
-# --- Classe de Testes para chamar_llm_para_resumo (Conceitualização com Mocks) ---
-class TestChamarLLM(unittest.TestCase):
-    @patch("google.generativeai.GenerativeModel")  # Mocka a classe GenerativeModel
-    @patch(
-        "os.getenv", return_value="FAKE_API_KEY"
-    )  # Mocka os.getenv para simular que a chave existe
-    def test_chamar_llm_com_contexto_db(self, mock_getenv, MockGenerativeModel):
-        """
-        Verifica se a LLM é chamada com o prompt correto quando há contexto do DB.
-        """
-        # Configura o mock da LLM para retornar uma resposta pré-definida.
-        mock_model_instance = MockGenerativeModel.return_value
-        mock_model_instance.generate_content.return_value.text = (
-            "Mocked: Sua jornada épica sobre Matrix foi dirigida por X."
-        )
-
-        info_filme_db = (
-            "Matrix",
-            "Lana Wachowski, Lilly Wachowski",
-            1999,
-            "Ficção Científica",
-            "Keanu Reeves",
-        )
-        pergunta = "Quem dirigiu Matrix?"
-
-        resposta = chamar_llm_para_resumo(pergunta, info_filme=info_filme_db)
-
-        # Verifica se a LLM foi chamada
-        MockGenerativeModel.assert_called_once_with("gemini-pro")
-        mock_model_instance.generate_content.assert_called_once()
-
-        # Verifica se a resposta contém partes do mock.
-        self.assertIn("Mocked:", resposta)
-        self.assertIn("Matrix", resposta)
-        self.assertIn("X", resposta)
-
-    @patch("google.generativeai.GenerativeModel")
-    @patch("os.getenv", return_value="FAKE_API_KEY")
-    def test_chamar_llm_sem_contexto_db(self, mock_getenv, MockGenerativeModel):
-        """
-        Verifica se a LLM é chamada com o prompt correto quando não há contexto do DB.
-        """
-        mock_model_instance = MockGenerativeModel.return_value
-        mock_model_instance.generate_content.return_value.text = (
-            "Mocked: Não encontrei nos registros antigos."
-        )
-
-        pergunta = "Me resuma um filme que não existe."
-        resposta = chamar_llm_para_resumo(pergunta, info_filme=None)
-
-        MockGenerativeModel.assert_called_once_with("gemini-pro")
-        mock_model_instance.generate_content.assert_called_once()
-        self.assertIn("Mocked:", resposta)
-
-    @patch(
-        "os.getenv", return_value=None
-    )  # Mocka os.getenv para simular que a chave NÃO existe
-    def test_chamar_llm_sem_api_key(self, mock_getenv):
-        """
-        Verifica se a função retorna mensagem de erro quando a API Key não está configurada.
-        """
-        pergunta = "Qualquer pergunta."
-        resposta = chamar_llm_para_resumo(pergunta)
-
-        self.assertIn(
-            "ERRO: A chave da API do Google Gemini não foi configurada", resposta
-        )
-
-
-if __name__ == "__main__":
-    unittest.main()
+import asyncio
+import sqlite3
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import google.generativeai as genai
+
+# Importa as funções que você vai testar dos módulos.
+# O caminho aqui será relativo à raiz do projeto quando rodar o pytest
+from src.database.db_utils import consultar_filme_no_bd
+from src.database.repositorio_filmes import fechar_repositorio
+from src.llm.cliente_llm import (
+    MODELO_PADRAO,
+    RESPOSTA_SEM_TEXTO,
+    SEM_FERRAMENTAS,
+    ClienteLLM,
+    obter_cliente_llm,
+    redefinir_cliente_llm,
+)
+from src.llm.llm_utils import chamar_llm_para_resumo, chamar_llm_para_resumo_stream
+from src.llm.metricas_stream import MetricasStream
+from src.llm.prompts import INSTRUCAO_SISTEMA_RESUMO
+from src.main_chatbot import main
+
+
+# --- Configuração do Banco de Dados para Testes ---
+# Isso cria um banco de dados temporário em memória para os testes de DB.
+# Garante que os testes de DB sejam isolados e não dependam do 'filmes.db' real.
+def setup_test_db():
+    conn = sqlite3.connect(
+        ":memory:"
+    )  # Banco de dados em memória, volátil para cada teste
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE filmes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            titulo TEXT NOT NULL UNIQUE,
+            diretor TEXT NOT NULL,
+            ano INTEGER,
+            genero TEXT,
+            protagonista TEXT
+        );
+    """
+    )
+    # Dados de exemplo para o banco de dados de teste (com 5 elementos por filme)
+    filmes_exemplo_test = [
+        (
+            "Matrix",
+            "Lana Wachowski, Lilly Wachowski",
+            1999,
+            "Ficção Científica",
+            "Keanu Reeves",
+        ),
+        ("O Poderoso Chefão", "Francis Ford Coppola", 1972, "Drama", "Marlon Brando"),
+        (
+            "A Origem",
+            "Christopher Nolan",
+            2010,
+            "Ficção Científica",
+            "Leonardo DiCaprio",
+        ),
+        (
+            "Interstellar",
+            "Christopher Nolan",
+            2014,
+            "Ficção Científica",
+            "Matthew McConaughey",
+        ),
+        ("Pulp Fiction", "Quentin Tarantino", 1994, "Crime", "John Travolta"),
+        (
+            "Senhor dos Anéis: A Sociedade do Anel",
+            "Peter Jackson",
+            2001,
+            "Fantasia",
+            "Elijah Wood",
+        ),
+        (
+            "O Cavaleiro das Trevas",
+            "Christopher Nolan",
+            2008,
+            "Ação/Crime",
+            "Christian Bale",
+        ),
+        ("1984", "Michael Radford", 1984, "Ficção Científica", "John Hurt"),
+        (
+            "A Viagem de Chihiro",
+            "Hayao Miyazaki",
+            2001,
+            "Animação/Fantasia",
+            "Rumi Hiiragi",
+        ),
+    ]
+    cursor.executemany(
+        "INSERT INTO filmes (titulo, diretor, ano, genero, protagonista) VALUES (?, ?, ?, ?, ?)",
+        filmes_exemplo_test,
+    )  # Ajustado para 5 placeholders
+    conn.commit()
+    return conn
+
+
+# --- Classe de Testes para consultar_filme_no_bd ---
+class TestConsultarFilmeNoBD(unittest.TestCase):
+    def setUp(self):
+        """Configura um banco de dados em memória para cada teste."""
+        self.conn = setup_test_db()
+        self.patcher = patch("sqlite3.connect", return_value=self.conn)
+        self.mock_connect = self.patcher.start()
+        fechar_repositorio()  # Garante que o pool não reaproveite a conexão de outro teste.
+
+    def tearDown(self):
+        """Fecha a conexão com o banco de dados em memória após cada teste."""
+        fechar_repositorio()
+        self.conn.close()
+        self.patcher.stop()
+
+    def test_consultar_filme_existente(self):
+        """Verifica se a consulta retorna informações de um filme existente."""
+        resultado = consultar_filme_no_bd("Matrix")
+        self.assertIsNotNone(resultado)
+        self.assertEqual(resultado[0], "Matrix")
+        self.assertEqual(resultado[1], "Lana Wachowski, Lilly Wachowski")
+
+    def test_consultar_filme_inexistente(self):
+        """Verifica se a consulta retorna None para um filme inexistente."""
+        resultado = consultar_filme_no_bd("Titanic")
+        self.assertIsNone(resultado)
+
+    def test_consultar_filme_por_parte_do_nome(self):
+        """Verifica se a consulta funciona com parte do nome do filme."""
+        resultado = consultar_filme_no_bd("Chefão")
+        self.assertIsNotNone(resultado)
+        self.assertEqual(resultado[0], "O Poderoso Chefão")
+
+
+def _pedido_de_ferramenta(nome, **argumentos):
+    """Parte da resposta do modelo que pede a execução de uma ferramenta."""
+    return genai.protos.Part(
+        function_call=genai.protos.FunctionCall(name=nome, args=argumentos)
+    )
+
+
+def _resposta_em_stream(parte):
+    """Imita a resposta assíncrona em streaming da API (um único pedaço)."""
+    resposta = MagicMock()
+    resposta.__aiter__.return_value = [MagicMock(parts=[parte])]
+    resposta.candidates[0].content = genai.protos.Content(role="model", parts=[parte])
+    return resposta
+
+
+def _consumir_com_ferramentas(funcoes):
+    """Lista os pedaços de uma resposta com ferramentas do cliente compartilhado."""
+
+    async def consumir():
+        pedacos = obter_cliente_llm().gerar_stream_com_ferramentas_async(
+            "Quem dirigiu Matrix?", [], funcoes
+        )
+        return [pedaco async for pedaco in pedacos]
+
+    return asyncio.run(consumir())
+
+
+# --- Classe de Testes para chamar_llm_para_resumo (Conceitualização com Mocks) ---
+class TestChamarLLM(unittest.TestCase):
+    def setUp(self):
+        """Força cada teste a criar seu próprio cliente LLM (com os mocks do teste)."""
+        redefinir_cliente_llm()
+
+    def tearDown(self):
+        redefinir_cliente_llm()
+
+    @patch("google.generativeai.GenerativeModel")  # Mocka a classe GenerativeModel
+    @patch(
+        "os.getenv", return_value="FAKE_API_KEY"
+    )  # Mocka os.getenv para simular que a chave existe
+    def test_chamar_llm_com_contexto_db(self, mock_getenv, MockGenerativeModel):
+        """
+        Verifica se a LLM é chamada com o prompt correto quando há contexto do DB.
+        """
+        # Configura o mock da LLM para retornar uma resposta pré-definida.
+        mock_model_instance = MockGenerativeModel.return_value
+        mock_model_instance.generate_content.return_value.text = (
+            "Mocked: Sua jornada épica sobre Matrix foi dirigida por X."
+        )
+
+        info_filme_db = (
+            "Matrix",
+            "Lana Wachowski, Lilly Wachowski",
+            1999,
+            "Ficção Científica",
+            "Keanu Reeves",
+        )
+        pergunta = "Quem dirigiu Matrix?"
+
+        resposta = chamar_llm_para_resumo(pergunta, info_filme=info_filme_db)
+
+        # Verifica se a LLM foi chamada
+        MockGenerativeModel.assert_called_once_with(
+            MODELO_PADRAO, system_instruction=INSTRUCAO_SISTEMA_RESUMO
+        )
+        mock_model_instance.generate_content.assert_called_once()
+
+        # Só a parte variável (fatos do BD e pergunta) vai no conteúdo da requisição;
+        # a persona e os exemplos vão na instrução de sistema do modelo.
+        prompt_enviado = mock_model_instance.generate_content.call_args[0][0]
+        self.assertIn("Diretor: Lana Wachowski, Lilly Wachowski", prompt_enviado)
+        self.assertIn(pergunta, prompt_enviado)
+        self.assertNotIn("Exemplos de Interação", prompt_enviado)
+
+        # Verifica se a resposta contém partes do mock.
+        self.assertIn("Mocked:", resposta)
+        self.assertIn("Matrix", resposta)
+        self.assertIn("X", resposta)
+
+    @patch("google.generativeai.GenerativeModel")
+    @patch("os.getenv", return_value="FAKE_API_KEY")
+    def test_chamar_llm_sem_contexto_db(self, mock_getenv, MockGenerativeModel):
+        """
+        Verifica se a LLM é chamada com o prompt correto quando não há contexto do DB.
+        """
+        mock_model_instance = MockGenerativeModel.return_value
+        mock_model_instance.generate_content.return_value.text = (
+            "Mocked: Não encontrei nos registros antigos."
+        )
+
+        pergunta = "Me resuma um filme que não existe."
+        resposta = chamar_llm_para_resumo(pergunta, info_filme=None)
+
+        MockGenerativeModel.assert_called_once_with(
+            MODELO_PADRAO, system_instruction=INSTRUCAO_SISTEMA_RESUMO
+        )
+        mock_model_instance.generate_content.assert_called_once()
+        self.assertIn("Mocked:", resposta)
+
+    @patch("google.generativeai.configure")
+    @patch("google.generativeai.GenerativeModel")
+    @patch("os.getenv", return_value="FAKE_API_KEY")
+    def test_modelo_reutilizado_entre_chamadas(
+        self, mock_getenv, MockGenerativeModel, mock_configure
+    ):
+        """
+        Verifica se o cliente configura a API e cria o modelo uma única vez.
+        """
+        mock_model_instance = MockGenerativeModel.return_value
+        mock_model_instance.generate_content.return_value.text = "Mocked: resposta."
+
+        chamar_llm_para_resumo("Primeira pergunta sobre cinema.")
+        chamar_llm_para_resumo("Segunda pergunta sobre cinema.")
+
+        mock_configure.assert_called_once_with(api_key="FAKE_API_KEY")
+        MockGenerativeModel.assert_called_once_with(
+            MODELO_PADRAO, system_instruction=INSTRUCAO_SISTEMA_RESUMO
+        )
+        self.assertEqual(mock_model_instance.generate_content.call_count, 2)
+
+    @patch("google.generativeai.GenerativeModel")
+    def test_cache_de_contexto_para_instrucao_de_sistema(self, MockGenerativeModel):
+        """
+        Verifica se a instrução de sistema vai para o cache de contexto do provedor
+        e se o cliente volta à instrução comum quando o cache é recusado.
+        """
+        with patch.object(genai, "caching", create=True) as mock_caching:
+            cliente = ClienteLLM(api_key="FAKE_API_KEY", cache_contexto=True)
+            modelo = cliente.obter_modelo(INSTRUCAO_SISTEMA_RESUMO)
+            self.assertIs(modelo, MockGenerativeModel.from_cached_content.return_value)
+            _, kwargs = mock_caching.CachedContent.create.call_args
+            self.assertEqual(kwargs["system_instruction"], INSTRUCAO_SISTEMA_RESUMO)
+
+            mock_caching.CachedContent.create.side_effect = ValueError("curto demais")
+            cliente = ClienteLLM(api_key="FAKE_API_KEY", cache_contexto=True)
+            with self.assertLogs("src.llm.cliente_llm", level="WARNING"):
+                cliente.obter_modelo(INSTRUCAO_SISTEMA_RESUMO)
+            MockGenerativeModel.assert_called_with(
+                MODELO_PADRAO, system_instruction=INSTRUCAO_SISTEMA_RESUMO
+            )
+
+    @patch("google.generativeai.GenerativeModel")
+    @patch("os.getenv", return_value="FAKE_API_KEY")
+    def test_uso_de_tokens_registrado(self, mock_getenv, MockGenerativeModel):
+        """
+        Verifica se o uso de tokens informado pela API é acumulado pelo cliente.
+        """
+        resposta_api = MockGenerativeModel.return_value.generate_content.return_value
+        resposta_api.text = "Mocked: resposta."
+        resposta_api.usage_metadata.prompt_token_count = 120
+        resposta_api.usage_metadata.cached_content_token_count = 0
+        resposta_api.usage_metadata.candidates_token_count = 40
+
+        with self.assertLogs("src.llm.cliente_llm", level="INFO") as logs:
+            chamar_llm_para_resumo("Pergunta sobre tokens e cinema.")
+
+        estatisticas = obter_cliente_llm().estatisticas_tokens
+        self.assertEqual(estatisticas["chamadas"], 1)
+        self.assertEqual(estatisticas["entrada"], 120)
+        self.assertEqual(estatisticas["saida"], 40)
+        self.assertIn("120 tokens de entrada", logs.output[0])
+
+    @patch("google.generativeai.GenerativeModel")
+    @patch("os.getenv", return_value="FAKE_API_KEY")
+    def test_chamar_llm_em_stream(self, mock_getenv, MockGenerativeModel):
+        """
+        Verifica se a versão em streaming entrega os pedaços na ordem em que chegam.
+        """
+        pedacos = []
+        for texto in ("Ah, ", "Matrix... ", "uma epopeia."):
+            pedaco = MagicMock()
+            pedaco.text = texto
+            pedacos.append(pedaco)
+        mock_model_instance = MockGenerativeModel.return_value
+        mock_model_instance.generate_content.return_value = iter(pedacos)
+
+        resposta = list(chamar_llm_para_resumo_stream("Me fale de Matrix em stream."))
+
+        self.assertEqual(resposta, ["Chatbot: Ah, ", "Matrix... ", "uma epopeia."])
+        _, kwargs = mock_model_instance.generate_content.call_args
+        self.assertTrue(kwargs["stream"])
+
+    @patch("google.generativeai.GenerativeModel")
+    @patch("os.getenv", return_value="FAKE_API_KEY")
+    def test_ferramenta_chamada_e_resultado_devolvido(
+        self, mock_getenv, MockGenerativeModel
+    ):
+        """
+        Verifica se o pedido de ferramenta do modelo é executado e o resultado volta
+        na mesma conversa, que então continua a resposta.
+        """
+        mock_model_instance = MockGenerativeModel.return_value
+        mock_model_instance.generate_content_async = AsyncMock(
+            side_effect=[
+                _resposta_em_stream(
+                    _pedido_de_ferramenta("lookup_movie", title="Matrix")
+                ),
+                _resposta_em_stream(genai.protos.Part(text="Ah, Matrix!")),
+            ]
+        )
+        lookup_movie = MagicMock(return_value={"encontrado": True, "ano": 1999})
+
+        pedacos = _consumir_com_ferramentas({"lookup_movie": lookup_movie})
+        self.assertEqual(pedacos, ["Ah, Matrix!"])
+        lookup_movie.assert_called_once_with(title="Matrix")
+        historico = mock_model_instance.generate_content_async.call_args[0][0]
+        self.assertEqual(len(historico), 3)  # Pergunta, pedido e resultado.
+        self.assertEqual(historico[2].parts[0].function_response.name, "lookup_movie")
+
+    @patch("google.generativeai.GenerativeModel")
+    @patch("os.getenv", return_value="FAKE_API_KEY")
+    def test_pedido_de_ferramenta_invalido_volta_como_erro(
+        self, mock_getenv, MockGenerativeModel
+    ):
+        """Ferramenta inexistente ou com argumentos errados não derruba o turno."""
+        mock_model_instance = MockGenerativeModel.return_value
+        mock_model_instance.generate_content_async = AsyncMock(
+            side_effect=[
+                _resposta_em_stream(_pedido_de_ferramenta("buscar_ator", ator="Keanu")),
+                _resposta_em_stream(_pedido_de_ferramenta("lookup_movie", titulo="X")),
+                _resposta_em_stream(genai.protos.Part(text="Não encontrei.")),
+            ]
+        )
+        titulos = []
+
+        def lookup_movie(title):
+            titulos.append(title)
+
+        pedacos = _consumir_com_ferramentas({"lookup_movie": lookup_movie})
+        self.assertEqual(pedacos, ["Não encontrei."])
+        self.assertEqual(titulos, [])
+        historico = mock_model_instance.generate_content_async.call_args[0][0]
+        for indice in (2, 4):  # Os dois resultados devolvidos ao modelo.
+            resposta = historico[indice].parts[0].function_response.response
+            self.assertIn("erro", resposta)
+
+    @patch("google.generativeai.GenerativeModel")
+    @patch("os.getenv", return_value="FAKE_API_KEY")
+    def test_ultima_rodada_sem_ferramentas(self, mock_getenv, MockGenerativeModel):
+        """A última rodada proíbe ferramentas; sem texto, vem a resposta de reserva."""
+        mock_model_instance = MockGenerativeModel.return_value
+        mock_model_instance.generate_content_async = AsyncMock(
+            side_effect=lambda *args, **kwargs: _resposta_em_stream(
+                _pedido_de_ferramenta("lookup_movie", title="Matrix")
+            )
+        )
+        lookup_movie = MagicMock(return_value={"encontrado": False})
+
+        pedacos = _consumir_com_ferramentas({"lookup_movie": lookup_movie})
+        self.assertEqual(pedacos, [RESPOSTA_SEM_TEXTO])
+        chamadas = mock_model_instance.generate_content_async.call_args_list
+        self.assertEqual(len(chamadas), 3)
+        self.assertNotIn("tool_config", chamadas[0].kwargs)
+        self.assertEqual(chamadas[-1].kwargs["tool_config"], SEM_FERRAMENTAS)
+
+    def test_metricas_stream_separa_primeiro_pedaco_do_total(self):
+        """
+        Verifica se o tempo até o primeiro pedaço é medido separado do tempo total.
+        """
+        instantes = iter([0.0, 0.5, 2.0])  # início, 1º pedaço, fim.
+        metricas = MetricasStream(relogio=lambda: next(instantes))
+
+        self.assertEqual(list(metricas.acompanhar(["a", "b"])), ["a", "b"])
+        self.assertEqual(metricas.tempo_primeiro_pedaco, 0.5)
+        self.assertEqual(metricas.tempo_total, 2.0)
+        self.assertEqual(metricas.pedacos, 2)
+
+    @patch(
+        "os.getenv", return_value=None
+    )  # Mocka os.getenv para simular que a chave NÃO existe
+    def test_chamar_llm_sem_api_key(self, mock_getenv):
+        """
+        Verifica se a função retorna mensagem de erro quando a API Key não está configurada.
+        """
+        pergunta = "Qualquer pergunta."
+        resposta = chamar_llm_para_resumo(pergunta)
+
+        self.assertIn(
+            "ERRO: A chave da API do Google Gemini não foi configurada", resposta
+        )
+
+
+# --- Classe de Testes para a inicialização do chatbot (main) ---
+class TestMainChatbot(unittest.TestCase):
+    @patch("src.main_chatbot.obter_repositorio")
+    @patch("src.main_chatbot.verificar_esquema_na_inicializacao", return_value=False)
+    def test_main_sai_se_o_banco_nao_esta_pronto(self, mock_verificar, mock_repo):
+        """Sem banco utilizável, o chatbot nem abre o repositório nem chama a LLM."""
+        main()
+        mock_verificar.assert_called_once_with()
+        mock_repo.assert_not_called()
+
+    @patch("src.main_chatbot.fechar_repositorio")
+    @patch("src.main_chatbot.conversar", new_callable=MagicMock)
+    @patch("src.main_chatbot.chamar_llm_para_resumo_stream", return_value=iter(()))
+    @patch("src.main_chatbot.obter_repositorio")
+    @patch("src.main_chatbot.verificar_esquema_na_inicializacao", return_value=True)
+    def test_main_verifica_esquema_antes_de_abrir_o_banco(
+        self, mock_verificar, mock_repo, mock_llm, mock_conversar, mock_fechar
+    ):
+        """O esquema é conferido (e migrado) antes do repositório ser aberto."""
+        ordem = MagicMock()
+        ordem.attach_mock(mock_verificar, "verificar")
+        ordem.attach_mock(mock_repo, "obter_repositorio")
+        mock_conversar.return_value = asyncio.sleep(0)
+        main()
+        self.assertEqual(
+            [nome for nome, _, _ in ordem.mock_calls],
+            ["verificar", "obter_repositorio"],
+        )
+        mock_conversar.assert_called_once_with(mock_repo.return_value)
+        mock_fechar.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
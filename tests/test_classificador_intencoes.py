@@ -0,0 +1,50 @@
+import unittest
+
+from src.agent.agent_core import identificar_intencao, identificar_intencoes
+from src.agent.classificador_intencoes import ClassificadorIntencoes
+
+
+# --- Classe de Testes para o classificador de intenções por regras ---
+class TestClassificadorIntencoes(unittest.TestCase):
+    def test_intencoes_basicas(self):
+        """Cada tipo de pergunta cai na intenção esperada."""
+        self.assertEqual(identificar_intencao("Quem dirigiu Matrix?"), "factual")
+        self.assertEqual(identificar_intencao("Me resuma Matrix"), "resumo_geral")
+        self.assertEqual(identificar_intencao("Tchau, obrigado!"), "sair")
+        self.assertEqual(identificar_intencao("Olá, tudo bem?"), "desconhecida")
+
+    def test_palavras_inteiras(self):
+        """Palavras-chave não casam dentro de outras palavras ('ano' em 'americano')."""
+        self.assertEqual(identificar_intencao("Um filme americano"), "desconhecida")
+        self.assertEqual(identificar_intencao("Vou saindo"), "desconhecida")
+
+    def test_acentos_e_maiusculas_ignorados(self):
+        """'gênero', 'GENERO' e 'até, logo' casam as mesmas regras."""
+        self.assertEqual(identificar_intencao("GENERO de Duna"), "factual")
+        self.assertEqual(identificar_intencao("gênero de Duna"), "factual")
+        self.assertEqual(identificar_intencao("ate, logo"), "sair")
+
+    def test_pesos_decidem_entre_intencoes(self):
+        """'qual a moral' (resumo) vence o 'qual' factual contido nela."""
+        self.assertEqual(identificar_intencao("Qual a moral de Up?"), "resumo_geral")
+        regras = {"a": {"x": 1}, "b": {"y": 1, "z": 1}}
+        self.assertEqual(ClassificadorIntencoes(regras).classificar("x y z"), "b")
+        # Sem pesos, vence a primeira intenção da tabela.
+        classificador = ClassificadorIntencoes(regras, ponderado=False)
+        self.assertEqual(classificador.classificar("x y z"), "a")
+
+    def test_palavra_chave_em_duas_intencoes(self):
+        """A mesma palavra-chave (após normalizar) não pode ter dois donos."""
+        with self.assertRaises(ValueError):
+            ClassificadorIntencoes({"a": {"gênero": 1}, "b": {"genero": 1}})
+
+    def test_classificacao_em_lote(self):
+        """O lote devolve uma intenção por pergunta, na ordem de entrada."""
+        perguntas = ["Quem dirigiu Matrix?", "adeus", "Oi"]
+        self.assertEqual(
+            identificar_intencoes(perguntas), ["factual", "sair", "desconhecida"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from models_prototype import corpus_codificado
+from models_prototype.corpus_codificado import (
+    ID_DESCONHECIDO,
+    ID_PAD,
+    CorpusCodificado,
+)
+
+LINHAS = [
+    ["o", "filme", "é", "bom"],
+    [],
+    ["o", "filme", "é", "longo"],
+    ["bom", "dia"],
+    ["o", "fim"],
+]
+
+
+# --- Classe de Testes para o corpus codificado (uint32 + memória mapeada) ---
+class TestCorpusCodificado(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_base = os.path.join(self.diretorio.name, "corpus")
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_vocabulario_por_frequencia_com_unk(self):
+        """Palavras por frequência (empates em ordem alfabética); raras são '<unk>'."""
+        corpus = CorpusCodificado.construir(iter(LINHAS), self.caminho_base)
+        self.assertEqual(
+            corpus.vocabulario, ["<pad>", "<unk>", "o", "bom", "filme", "é"]
+        )
+        self.assertEqual(corpus.contagens, [0, 3, 3, 2, 2, 2])
+        self.assertEqual(corpus.indices["<pad>"], ID_PAD)
+        self.assertEqual(corpus.codificar(["o", "xyz"]), [2, ID_DESCONHECIDO])
+
+    def test_linhas_e_deslocamentos(self):
+        """Cada linha (inclusive as vazias) volta com os mesmos tokens, em ordem."""
+        corpus = CorpusCodificado.construir(LINHAS, self.caminho_base, min_contagem=1)
+        self.assertEqual(len(corpus), len(LINHAS))
+        self.assertEqual(len(corpus.tokens), sum(len(linha) for linha in LINHAS))
+        self.assertEqual(
+            [corpus.decodificar(corpus.linha(i)) for i in range(len(corpus))], LINHAS
+        )
+
+    def test_arquivos_lidos_por_memoria_mapeada(self):
+        """'carregar' abre memmaps uint32/uint64; os temporários são apagados."""
+        CorpusCodificado.construir(LINHAS, self.caminho_base)
+        corpus = CorpusCodificado.carregar(self.caminho_base)
+        self.assertIsInstance(corpus.tokens, np.memmap)
+        self.assertEqual(corpus.tokens.dtype, np.uint32)
+        self.assertEqual(corpus.inicios.dtype, np.uint64)
+        self.assertEqual(
+            sorted(os.listdir(self.diretorio.name)),
+            ["corpus.linhas.npy", "corpus.tokens.npy", "corpus.vocab.json"],
+        )
+
+    def test_limite_do_vocabulario(self):
+        """'max_vocabulario' (com '<pad>' e '<unk>') mantém só as mais frequentes."""
+        corpus = CorpusCodificado.construir(
+            LINHAS, self.caminho_base, min_contagem=1, max_vocabulario=4
+        )
+        self.assertEqual(corpus.vocabulario, ["<pad>", "<unk>", "o", "bom"])
+        self.assertEqual(corpus.decodificar(corpus.linha(3)), ["bom", "<unk>"])
+
+    def test_escrita_em_varios_lotes(self):
+        """Buffers e blocos menores que o corpus dão o mesmo resultado."""
+        linhas = [[f"p{(i * j) % 17}" for j in range(i % 5)] for i in range(200)]
+        esperado = CorpusCodificado.construir(linhas, self.caminho_base)
+        with mock.patch.multiple(
+            corpus_codificado, ITENS_POR_ESCRITA=3, ITENS_POR_BLOCO=7
+        ):
+            obtido = CorpusCodificado.construir(
+                linhas, os.path.join(self.diretorio.name, "lotes")
+            )
+        self.assertEqual(obtido.vocabulario, esperado.vocabulario)
+        np.testing.assert_array_equal(obtido.tokens, esperado.tokens)
+        np.testing.assert_array_equal(obtido.inicios, esperado.inicios)
+
+    def test_corpus_vazio(self):
+        corpus = CorpusCodificado.construir([], self.caminho_base)
+        self.assertEqual(len(corpus), 0)
+        self.assertEqual(corpus.vocabulario, ["<pad>", "<unk>"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import os
+import random
+import tempfile
+import unittest
+
+import nltk
+from nltk.tokenize.destructive import NLTKWordTokenizer
+
+from models_prototype.data_preprocessing import (
+    _PONTO_INTERNO,
+    _PRECISA_TREEBANK,
+    TextProcessor,
+    dividir_em_blocos,
+    tokenizar_regex,
+)
+
+LINHAS = [
+    "Olá, tudo bem?",
+    "",
+    "Não sei... talvez amanhã.",
+    '   Ele disse: "Corra!"   ',
+    "São 10 horas e 30 minutos.",
+    "Ação, coração e pão.",
+]
+
+
+# Linhas de validação no estilo das legendas, com os casos difíceis do Treebank.
+CORPUS_VALIDACAO = [
+    "Olá, tudo bem?",
+    "Não sei...talvez amanhã.",
+    'Ele disse: "Corra!" e saiu.',
+    "- Vamos embora! - Espere...",
+    "O guarda-chuva custa R$ 10,50 (ou 3,5 euros).",
+    "Ela mora em São Paulo/SP, certo?",
+    "Isso -- sem dúvida -- é o fim.",
+    "«Adeus», disse ele; “até logo”.",
+    "Eles foram ao cinema às 20:30, né?",
+    "[RISOS] Você é doido? Sou!",
+    "Isso é 100% verdade & ponto final*",
+    "Espera aí…",
+    "Fim.",
+    "",
+    "d'água, don't, I'm, they're e gonna",
+    "Cannot stop: a,,b",
+    "Ele chegou. Ela saiu.",
+    "Obrigado, Sr. Silva.",
+]
+
+# Alfabeto para gerar frases aleatórias com todo tipo de pontuação.
+CARACTERES_ALEATORIOS = list('abcãçéÁ .,:;!?-"`«»“”‘’()[]{}<>*&$#@%/_0123456789\t')
+CARACTERES_ALEATORIOS += ["--", "...", "\u2013", "\u2026", "²", "e\u0301", "\n"]
+
+
+def _referencia_treebank(frase):
+    """O que 'preprocess' (NLTK) dá para uma única frase, sem depender do 'punkt'."""
+    tokens = NLTKWordTokenizer().tokenize(frase)
+    return [token.lower() for token in tokens if token.isalpha()]
+
+
+def _punkt_disponivel(lang="portuguese"):
+    try:
+        nltk.data.find(f"tokenizers/punkt_tab/{lang}/")
+        return True
+    except LookupError:
+        return False
+
+
+class ProcessadorPorEspacos(TextProcessor):
+    """TextProcessor com uma tokenização simples, que não depende do 'punkt'."""
+
+    def __init__(self):
+        self.lang = "portuguese"
+        self.tokenizer = "nltk"
+
+    def preprocess(self, text):
+        return [palavra.lower() for palavra in text.split() if palavra.isalpha()]
+
+
+# --- Classe de Testes para o pré-processamento paralelo do dataset ---
+class TestPreprocessamentoParalelo(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.processador = ProcessadorPorEspacos()
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def escrever(self, conteudo, nome="pt.txt"):
+        caminho = os.path.join(self.diretorio.name, nome)
+        with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+            arquivo.write(conteudo)
+        return caminho
+
+    def test_blocos_cobrem_o_arquivo_e_terminam_em_fim_de_linha(self):
+        """Os blocos são contíguos e nenhuma linha fica dividida entre dois."""
+        for final in ("\n", ""):
+            caminho = self.escrever("\n".join(LINHAS * 20) + final)
+            with open(caminho, "rb") as arquivo:
+                dados = arquivo.read()
+            for tamanho_bloco in (1, 7, 64, 10_000):
+                with self.subTest(final=final, tamanho_bloco=tamanho_bloco):
+                    blocos = list(dividir_em_blocos(caminho, tamanho_bloco))
+                    self.assertEqual(blocos[0][0], 0)
+                    self.assertEqual(blocos[-1][1], len(dados))
+                    for (_, fim), (inicio, _) in zip(blocos, blocos[1:]):
+                        self.assertEqual(fim, inicio)
+                        self.assertEqual(dados[fim - 1 : fim], b"\n")
+        self.assertEqual(list(dividir_em_blocos(self.escrever("", "vazio.txt"))), [])
+
+    def test_paralelo_igual_ao_serial_e_na_ordem(self):
+        """Com vários processos, os tokens saem iguais e na ordem da leitura serial."""
+        linhas = [f"{linha} {i}" for i, linha in enumerate(LINHAS * 50)]
+        caminho = self.escrever("\r\n".join(linhas))
+        serial = self.processador.load_and_preprocess_dataset(caminho)
+        paralelo = self.processador.load_and_preprocess_dataset(
+            caminho, num_workers=2, chunk_bytes=64
+        )
+        self.assertEqual(paralelo, serial)
+        por_linha = list(
+            self.processador.iter_preprocessed_lines(
+                caminho, num_workers=2, chunk_bytes=64
+            )
+        )
+        self.assertEqual(len(por_linha), len(LINHAS) * 50)
+        self.assertEqual(por_linha[2], ["não", "talvez"])
+
+    def test_limite_de_linhas(self):
+        """'max_lines' vale igual nos dois modos, contando as linhas vazias."""
+        caminho = self.escrever("\n".join(LINHAS * 30) + "\n")
+        for max_lines in (1, 3, 7, 1_000):
+            with self.subTest(max_lines=max_lines):
+                self.assertEqual(
+                    self.processador.load_and_preprocess_dataset(
+                        caminho, max_lines=max_lines, num_workers=2, chunk_bytes=32
+                    ),
+                    self.processador.load_and_preprocess_dataset(
+                        caminho, max_lines=max_lines
+                    ),
+                )
+
+
+# --- Classe de Testes para o tokenizador rápido ('tokenizer="regex"') ---
+class TestTokenizadorRegex(unittest.TestCase):
+    def test_mesmos_tokens_do_treebank_em_frases_aleatorias(self):
+        """A regex separa como o Treebank do NLTK, para qualquer pontuação."""
+        aleatorio = random.Random(7)
+        frases = [
+            "".join(
+                aleatorio.choices(CARACTERES_ALEATORIOS, k=aleatorio.randint(0, 30))
+            )
+            for _ in range(20_000)
+        ]
+        # Ficam de fora os casos entregues ao NLTK ('punkt' ou Treebank completo).
+        frases = [
+            frase
+            for frase in frases
+            if not (_PRECISA_TREEBANK.search(frase) or _PONTO_INTERNO.search(frase))
+        ]
+        divergentes = [
+            frase
+            for frase in frases
+            if tokenizar_regex(frase) != _referencia_treebank(frase)
+        ]
+        self.assertEqual(divergentes, [])
+
+    def test_tokenizador_desconhecido(self):
+        with self.assertRaises(ValueError):
+            TextProcessor(tokenizer="spacy")
+
+    @unittest.skipUnless(_punkt_disponivel(), "recursos 'punkt' do NLTK não instalados")
+    def test_corpus_de_validacao_igual_ao_nltk(self):
+        """Com o 'punkt' instalado, os dois tokenizadores concordam no corpus."""
+        nltk_completo = TextProcessor(tokenizer="nltk")
+        rapido = TextProcessor(tokenizer="regex")
+        esperado = [nltk_completo.preprocess(linha) for linha in CORPUS_VALIDACAO]
+        self.assertEqual([rapido.preprocess(l) for l in CORPUS_VALIDACAO], esperado)
+        self.assertEqual(rapido.preprocess_batch(CORPUS_VALIDACAO), esperado)
+
+
+if __name__ == "__main__":
+    unittest.main()
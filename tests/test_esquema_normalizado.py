@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.database.esquema_normalizado import (
+    migrar_para_esquema_normalizado,
+    separar_generos,
+    separar_pessoas,
+)
+
+# Banco no formato antigo: só a tabela 'filmes', com gêneros e pessoas em texto.
+SQL_FILMES_ANTIGO = """
+    CREATE TABLE filmes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        titulo TEXT NOT NULL,
+        genero TEXT,
+        ano INTEGER,
+        diretor TEXT,
+        protagonista TEXT
+    )
+"""
+
+SQL_CONTAGENS = (
+    "SELECT (SELECT COUNT(*) FROM generos), (SELECT COUNT(*) FROM pessoas), "
+    "(SELECT COUNT(*) FROM filme_genero), (SELECT COUNT(*) FROM filme_pessoa)"
+)
+
+FILMES_ANTIGOS = [
+    ("Matrix", "Ficção Científica/Ação", 1999, "Lana e Lilly Wachowski", "Keanu"),
+    ("O Grande Lebowski", "Comédia", 1998, "Joel e Ethan Coen", "Jeff Bridges"),
+    ("Fargo", "Crime/Drama", 1996, "Joel e Ethan Coen", "Frances McDormand"),
+]
+
+
+# --- Classe de Testes para a separação dos campos compostos ---
+class TestSepararCampos(unittest.TestCase):
+    def test_separar_generos(self):
+        self.assertEqual(
+            separar_generos("Ficção Científica/Ação"), ["Ficção Científica", "Ação"]
+        )
+        self.assertEqual(separar_generos("Drama / Drama"), ["Drama"])
+        self.assertEqual(separar_generos(None), [])
+
+    def test_separar_pessoas(self):
+        casos = {
+            "Lana e Lilly Wachowski": ["Lana Wachowski", "Lilly Wachowski"],
+            "Dan Kwan e Daniel Scheinert": ["Dan Kwan", "Daniel Scheinert"],
+            "Christopher Nolan": ["Christopher Nolan"],
+            "": [],
+        }
+        for campo, esperado in casos.items():
+            with self.subTest(campo=campo):
+                self.assertEqual(separar_pessoas(campo), esperado)
+
+
+# --- Classe de Testes para a migração de um banco antigo ---
+class TestMigracaoEsquemaNormalizado(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_bd = os.path.join(self.diretorio.name, "filmes.db")
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.execute(SQL_FILMES_ANTIGO)
+        conn.executemany(
+            "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista) "
+            "VALUES (?, ?, ?, ?, ?)",
+            FILMES_ANTIGOS,
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def consultar(self, sql, parametros=()):
+        conn = sqlite3.connect(self.caminho_bd)
+        try:
+            return conn.execute(sql, parametros).fetchall()
+        finally:
+            conn.close()
+
+    def test_migracao_separa_generos_e_pessoas(self):
+        self.assertEqual(migrar_para_esquema_normalizado(self.caminho_bd), 3)
+        filmes_dos_coen = self.consultar(
+            "SELECT f.titulo FROM pessoas AS p "
+            "JOIN filme_pessoa AS fp ON fp.pessoa_id = p.id "
+            "JOIN filmes AS f ON f.id = fp.filme_id "
+            "WHERE p.nome_normalizado = ? AND fp.papel = 'diretor' ORDER BY f.ano",
+            ("ethan coen",),
+        )
+        self.assertEqual(filmes_dos_coen, [("Fargo",), ("O Grande Lebowski",)])
+        generos = [linha[0] for linha in self.consultar("SELECT nome FROM generos")]
+        self.assertEqual(
+            sorted(generos), ["Ação", "Comédia", "Crime", "Drama", "Ficção Científica"]
+        )
+
+    def test_migracao_idempotente(self):
+        """Rodar a migração de novo não duplica gêneros, pessoas nem junções."""
+        migrar_para_esquema_normalizado(self.caminho_bd)
+        contagens = self.consultar(SQL_CONTAGENS)
+        migrar_para_esquema_normalizado(self.caminho_bd)
+        self.assertEqual(self.consultar(SQL_CONTAGENS), contagens)
+        # 5 gêneros; 7 pessoas; 5 pares filme-gênero; 6 diretores + 3 protagonistas.
+        self.assertEqual(contagens, [(5, 7, 5, 9)])
+
+    def test_remover_filme_remove_juncoes(self):
+        migrar_para_esquema_normalizado(self.caminho_bd)
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.execute("DELETE FROM filmes WHERE titulo = 'Matrix'")
+        conn.commit()
+        conn.close()
+        self.assertEqual(
+            self.consultar("SELECT COUNT(*) FROM filme_genero WHERE filme_id = 1"),
+            [(0,)],
+        )
+        self.assertEqual(
+            self.consultar("SELECT COUNT(*) FROM filme_pessoa WHERE filme_id = 1"),
+            [(0,)],
+        )
@@ -0,0 +1,71 @@
+import unittest
+
+from src.llm.prompts import formatar_filmes_compacto, montar_prompt_resumo
+from src.nlp.filtros_consulta import ExtratorFiltros
+
+NOLAN = "Christopher Nolan"
+FILMES = [
+    ("O Cavaleiro das Trevas", NOLAN, 2008, "Ação/Crime", "Christian Bale"),
+    ("A Origem", NOLAN, 2010, "Ficção Científica/Ação", "Leonardo DiCaprio"),
+    ("Interestelar", NOLAN, 2014, "Ficção Científica", "Matthew McConaughey"),
+    ("Um Sonho de Liberdade", "Frank Darabont", 1994, "Drama", "Tim Robbins"),
+    ("Pulp Fiction", "Quentin Tarantino", 1994, "Crime/Drama", "John Travolta"),
+    ("Coração Valente", "Mel Gibson", 1995, "Drama Histórico", "Mel Gibson"),
+    ("Máquina Mortífera", "Richard Donner", 1987, "Ação", "Mel Gibson"),
+]
+
+
+# --- Classe de Testes para o ExtratorFiltros (perguntas sobre vários filmes) ---
+class TestExtratorFiltros(unittest.TestCase):
+    def setUp(self):
+        self.extrator = ExtratorFiltros(FILMES)
+
+    def test_diretor_pelo_nome_ou_sobrenome(self):
+        for pergunta in ("filmes do Christopher Nolan", "quais filmes do nolan?"):
+            with self.subTest(pergunta=pergunta):
+                self.assertEqual(
+                    self.extrator.extrair(pergunta), {"diretor": "Christopher Nolan"}
+                )
+
+    def test_genero_no_plural_e_ano(self):
+        self.assertEqual(
+            self.extrator.extrair("dramas de 1994"), {"genero": "Drama", "ano": 1994}
+        )
+        self.assertEqual(
+            self.extrator.extrair("ficção científica dos anos 2010"),
+            {"genero": "Ficção Científica", "ano": (2010, 2019)},
+        )
+
+    def test_papel_de_quem_dirige_e_atua(self):
+        """Mel Gibson dirige e atua: 'com' antes do nome indica o protagonista."""
+        self.assertEqual(
+            self.extrator.extrair("filmes do Mel Gibson"), {"diretor": "Mel Gibson"}
+        )
+        self.assertEqual(
+            self.extrator.extrair("filmes com o Mel Gibson"),
+            {"protagonista": "Mel Gibson"},
+        )
+
+    def test_ano_sozinho_precisa_de_pedido_de_lista(self):
+        """'Me resuma 1984' fala de um título, não dos filmes de 1984."""
+        self.assertEqual(self.extrator.extrair("Me resuma 1984"), {})
+        self.assertEqual(self.extrator.extrair("filmes de 1984"), {"ano": 1984})
+        self.assertEqual(self.extrator.extrair("Olá, tudo bem?"), {})
+
+
+# --- Classe de Testes para o contexto compacto de vários filmes no prompt ---
+class TestContextoVariosFilmes(unittest.TestCase):
+    def test_campos_comuns_vao_no_cabecalho(self):
+        contexto = formatar_filmes_compacto(FILMES[:3])
+        linhas = contexto.split("\n")
+        self.assertIn("(3), todos com Diretor: Christopher Nolan", linhas[0])
+        self.assertEqual(linhas[1], "Título | Ano | Gênero | Protagonista")
+        self.assertEqual(
+            linhas[2], "O Cavaleiro das Trevas | 2008 | Ação/Crime | Christian Bale"
+        )
+        self.assertEqual(len(linhas), 5)
+
+    def test_prompt_com_varios_filmes(self):
+        prompt = montar_prompt_resumo("filmes do Nolan", filmes=FILMES[:2])
+        self.assertIn("A Origem | 2010", prompt)
+        self.assertTrue(prompt.endswith("Sua resposta (no estilo de filme):"))
@@ -0,0 +1,62 @@
+import unittest
+
+from src.nlp.gazetteer import AutomatoTitulos, gerar_apelidos
+
+TITULOS_TESTE = [
+    "Matrix",
+    "O Poderoso Chefão",
+    "Tropa de Elite",
+    "Tropa de Elite 2: O Inimigo Agora é Outro",
+    "Forrest Gump: O Contador de Histórias",
+    "O Pai",
+    "A Origem",
+]
+
+
+# --- Classe de Testes para o AutomatoTitulos (extração local de títulos) ---
+class TestAutomatoTitulos(unittest.TestCase):
+    def setUp(self):
+        self.automato = AutomatoTitulos(
+            TITULOS_TESTE, apelidos=[("Inception", "A Origem")]
+        )
+
+    def test_gerar_apelidos(self):
+        """Verifica se artigos iniciais e subtítulos geram formas alternativas."""
+        self.assertEqual(
+            gerar_apelidos("O Poderoso Chefão"),
+            {"o poderoso chefao", "poderoso chefao"},
+        )
+        self.assertIn("forrest gump", gerar_apelidos(TITULOS_TESTE[4]))
+
+    def test_encontra_titulo_sem_acentos_e_minusculo(self):
+        """Verifica se o título é encontrado independentemente de acentos e caixa."""
+        self.assertEqual(
+            self.automato.melhor_titulo("me resuma o poderoso chefao"),
+            "O Poderoso Chefão",
+        )
+        self.assertEqual(self.automato.melhor_titulo("Quem dirigiu Matrix?"), "Matrix")
+        self.assertEqual(
+            self.automato.melhor_titulo("quem fez forrest gump?"), TITULOS_TESTE[4]
+        )
+
+    def test_prefere_mencao_mais_longa(self):
+        """Verifica se 'Tropa de Elite 2' vence a menção sobreposta 'Tropa de Elite'."""
+        self.assertEqual(
+            self.automato.melhor_titulo("fale de tropa de elite 2"), TITULOS_TESTE[3]
+        )
+
+    def test_apelidos_extras(self):
+        """Verifica se apelidos (ex: título em inglês) apontam para o título do banco."""
+        self.assertEqual(
+            self.automato.melhor_titulo("Fale sobre Inception"), "A Origem"
+        )
+
+    def test_mencao_ambigua_nao_e_confiante(self):
+        """Verifica se palavras comuns só contam como título quando destacadas."""
+        self.assertIsNone(self.automato.melhor_titulo("quem é o pai do Luke?"))
+        self.assertEqual(self.automato.melhor_titulo("Qual o ano de 'O Pai'?"), "O Pai")
+        self.assertIsNone(self.automato.melhor_titulo("Olá chatbot, como vai?"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.database.importador_filmes import detectar_formato, importar_filmes
+from src.database.repositorio_filmes import RepositorioFilmes
+
+CSV_FILMES = (
+    "titulo,genero,ano,diretor,protagonista\n"
+    "Matrix,Ficção Científica/Ação,1999,Lana e Lilly Wachowski,Keanu Reeves\n"
+    'Fargo,"Crime/Drama",1996,Joel e Ethan Coen,Frances McDormand\n'
+    ",Drama,2000,Sem Título,Ninguém\n"
+    "O Grande Lebowski,Comédia,1998,Joel e Ethan Coen,Jeff Bridges\n"
+)
+
+TSV_IMDB = (
+    "tconst\ttitleType\tprimaryTitle\tstartYear\tgenres\n"
+    "tt0133093\tmovie\tThe Matrix\t1999\tAction,Sci-Fi\n"
+    "tt0000001\tshort\tCarmencita\t1894\tDocumentary,Short\n"
+    'tt0118715\tmovie\tThe Big "Dude" Lebowski\t\\N\tComedy\n'
+)
+
+
+# --- Classe de Testes para a importação em lote do catálogo ---
+class TestImportadorFilmes(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_bd = os.path.join(self.diretorio.name, "filmes.db")
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def escrever(self, nome, conteudo, compactar=False):
+        caminho = os.path.join(self.diretorio.name, nome)
+        abrir = gzip.open if compactar else open
+        with abrir(caminho, "wt", encoding="utf-8", newline="") as arquivo:
+            arquivo.write(conteudo)
+        return caminho
+
+    def consultar(self, sql, parametros=()):
+        conn = sqlite3.connect(self.caminho_bd)
+        try:
+            return conn.execute(sql, parametros).fetchall()
+        finally:
+            conn.close()
+
+    def test_detectar_formato(self):
+        self.assertEqual(detectar_formato("catalogo.csv"), "csv")
+        self.assertEqual(detectar_formato("title.basics.TSV.gz"), "tsv")
+        self.assertEqual(detectar_formato("filmes.jsonl.gz"), "jsonl")
+        with self.assertRaises(ValueError):
+            detectar_formato("filmes.xml")
+
+    def test_importar_csv_em_lotes(self):
+        caminho = self.escrever("filmes.csv", CSV_FILMES)
+        lotes = []
+        resultado = importar_filmes(
+            caminho,
+            self.caminho_bd,
+            tamanho_lote=2,
+            ao_concluir_lote=lambda linhas, segundos: lotes.append(linhas),
+        )
+        # A linha sem título é descartada; 3 linhas em lotes de 2.
+        self.assertEqual(resultado["linhas"], 3)
+        self.assertEqual(resultado["filmes"], 3)
+        self.assertEqual(lotes, [2, 3])
+        # O modo WAL volta depois da carga.
+        self.assertEqual(self.consultar("PRAGMA journal_mode"), [("wal",)])
+
+    def test_indices_fts_e_juncoes_apos_importacao(self):
+        importar_filmes(self.escrever("filmes.csv", CSV_FILMES), self.caminho_bd)
+        indices = {
+            linha[0]
+            for linha in self.consultar(
+                "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')"
+            )
+        }
+        for nome in ("idx_filmes_diretor_ano", "idx_filmes_chave_natural"):
+            self.assertIn(nome, indices)
+        self.assertIn("filmes_fts_ai", indices)
+        self.assertEqual(
+            self.consultar(
+                "SELECT rowid FROM filmes_fts WHERE filmes_fts MATCH ?", ("lebowski",)
+            ),
+            [(3,)],
+        )
+
+        repositorio = RepositorioFilmes(self.caminho_bd, tamanho_pool=1)
+        try:
+            filmes = repositorio.buscar_filmes(diretor="Ethan Coen")
+        finally:
+            repositorio.fechar()
+        self.assertEqual([f[0] for f in filmes], ["Fargo", "O Grande Lebowski"])
+
+    def test_upsert_pela_chave_natural(self):
+        importar_filmes(self.escrever("filmes.csv", CSV_FILMES), self.caminho_bd)
+        registros = [
+            {"titulo": "MATRIX", "ano": 1999, "protagonista": "Carrie-Anne Moss"},
+            {"titulo": "Matrix", "ano": 2021, "diretor": "Lana Wachowski"},
+        ]
+        caminho = self.escrever(
+            "novos.jsonl.gz",
+            "".join(json.dumps(r) + "\n" for r in registros),
+            compactar=True,
+        )
+        resultado = importar_filmes(caminho, self.caminho_bd)
+        self.assertEqual(resultado["filmes"], 4)
+        # O mesmo filme é atualizado; campos ausentes no arquivo são mantidos.
+        self.assertEqual(
+            self.consultar(
+                "SELECT titulo, genero, diretor, protagonista FROM filmes "
+                "WHERE ano = 1999"
+            ),
+            [
+                (
+                    "MATRIX",
+                    "Ficção Científica/Ação",
+                    "Lana e Lilly Wachowski",
+                    "Carrie-Anne Moss",
+                )
+            ],
+        )
+
+        importar_filmes(
+            self.escrever("filmes.csv", CSV_FILMES), self.caminho_bd, conflito="ignorar"
+        )
+        self.assertEqual(
+            self.consultar("SELECT titulo FROM filmes WHERE ano = 1999"), [("MATRIX",)]
+        )
+
+    def test_falha_no_meio_da_carga_reconstroi_os_indices(self):
+        """Os lotes já gravados ficam no banco, com índices, gatilhos e FTS de volta."""
+        caminho = self.escrever(
+            "filmes.jsonl", '{"titulo": "Matrix", "ano": 1999}\n{"titulo": \n'
+        )
+        with self.assertRaises(json.JSONDecodeError):
+            importar_filmes(caminho, self.caminho_bd, tamanho_lote=1)
+
+        objetos = {
+            linha[0] for linha in self.consultar("SELECT name FROM sqlite_master")
+        }
+        for nome in (
+            "idx_filmes_diretor_ano",
+            "idx_filmes_protagonista_ano",
+            "idx_filmes_ano",
+            "filmes_fts_ai",
+            "filmes_fts_ad",
+            "filmes_fts_au",
+        ):
+            self.assertIn(nome, objetos)
+        self.assertEqual(self.consultar("SELECT titulo FROM filmes"), [("Matrix",)])
+        self.assertEqual(
+            self.consultar(
+                "SELECT rowid FROM filmes_fts WHERE filmes_fts MATCH ?", ("matrix",)
+            ),
+            [(1,)],
+        )
+        # Escritas seguintes voltam a atualizar o FTS pelos gatilhos.
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.execute(
+            "INSERT INTO filmes (titulo, titulo_normalizado) VALUES ('Novo', 'novo')"
+        )
+        conn.commit()
+        conn.close()
+        self.assertEqual(
+            self.consultar(
+                "SELECT rowid FROM filmes_fts WHERE filmes_fts MATCH ?", ("novo",)
+            ),
+            [(2,)],
+        )
+
+    def test_perfil_imdb(self):
+        caminho = self.escrever("title.basics.tsv.gz", TSV_IMDB, compactar=True)
+        resultado = importar_filmes(caminho, self.caminho_bd, perfil="imdb")
+        self.assertEqual(resultado["linhas"], 2)  # O curta-metragem fica de fora.
+        self.assertEqual(
+            self.consultar("SELECT titulo, genero, ano FROM filmes ORDER BY id"),
+            [
+                ("The Matrix", "Action/Sci-Fi", 1999),
+                ('The Big "Dude" Lebowski', "Comedy", None),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
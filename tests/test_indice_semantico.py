@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+from src.nlp.indice_semantico import DIMENSAO_PADRAO, IndiceSemantico, vetorizar
+from src.nlp.nlp_utils import LIMIAR_BUSCA_SEMANTICA
+
+
+# --- Classe de Testes para o índice semântico (vetores em memória mapeada) ---
+class TestIndiceSemantico(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.diretorio = tempfile.TemporaryDirectory()
+        caminho_bd = os.path.join(cls.diretorio.name, "filmes.db")
+        with patch("builtins.print"):
+            criar_tabela_filmes(caminho_bd)
+            popular_filmes_exemplo(caminho_bd)
+        conn = sqlite3.connect(caminho_bd)
+        cls.linhas = conn.execute(
+            "SELECT titulo, diretor, ano, genero, protagonista FROM filmes"
+        ).fetchall()
+        conn.close()
+        cls.caminho_base = os.path.join(cls.diretorio.name, "indice")
+        cls.indice = IndiceSemantico.construir(cls.linhas, cls.caminho_base, n_listas=8)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.indice  # Libera o memmap antes de apagar o diretório.
+        cls.diretorio.cleanup()
+
+    def test_vetores_normalizados_e_estaveis(self):
+        """O mesmo texto gera sempre o mesmo vetor, de norma 1."""
+        vetor = vetorizar("Christopher Nolan")
+        self.assertAlmostEqual(float(np.linalg.norm(vetor)), 1.0, places=5)
+        np.testing.assert_array_equal(vetor, vetorizar("christopher nolan"))
+        self.assertFalse(vetorizar("o filme").any())  # Só palavras ignoradas.
+
+    def test_matriz_em_memoria_mapeada(self):
+        """O índice carregado lê a matriz do disco por memória mapeada."""
+        indice = IndiceSemantico.carregar(self.caminho_base)
+        self.assertIsInstance(indice.vetores, np.memmap)
+        self.assertEqual(indice.vetores.shape, (len(self.linhas), DIMENSAO_PADRAO))
+
+    def test_busca_por_metadados(self):
+        """Perguntas sem título encontram filmes pelo diretor ou pelo protagonista."""
+        resultados = self.indice.buscar("filme com o Tom Hanks", k=3)
+        self.assertEqual(len(resultados), 3)
+        for _, linha in resultados:
+            self.assertEqual(linha[4], "Tom Hanks")
+        _, linha = self.indice.buscar("aquele filme do Nolan sobre sonhos", k=1)[0]
+        self.assertEqual(linha[1], "Christopher Nolan")
+        _, linha = self.indice.buscar("um filme do spilberg", k=1)[0]  # Com erro.
+        self.assertEqual(linha[1], "Steven Spielberg")
+        # Conversa sem filme fica abaixo do limiar usado pelo chatbot.
+        similaridade, _ = self.indice.buscar("Olá, tudo bem?", k=1)[0]
+        self.assertLess(similaridade, LIMIAR_BUSCA_SEMANTICA)
+
+    def test_ivf_com_todas_as_listas_igual_a_busca_exata(self):
+        """Percorrendo todas as listas, o IVF devolve o mesmo top-k da busca exata."""
+        consulta = "drama de 1994"
+        exata = [linha for _, linha in self.indice.buscar(consulta, k=5)]
+        ivf = self.indice.buscar(consulta, k=5, n_sondas=len(self.indice.centroides))
+        self.assertEqual([linha for _, linha in ivf], exata)
+
+    def test_busca_em_lote(self):
+        """A busca em lote dá o mesmo resultado de uma consulta por vez."""
+        consultas = ["filme com o Tom Hanks", "drama de 1994", "o"]
+        lote = self.indice.buscar_lote(consultas, k=3)
+        self.assertEqual(lote[2], [])
+        for consulta, resultado in zip(consultas[:2], lote):
+            esperado = self.indice.buscar(consulta, k=3)
+            self.assertEqual([l for _, l in resultado], [l for _, l in esperado])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from src.database import migracoes
+from src.database.migracoes import (
+    aplicar_migracoes,
+    esquema_atualizado,
+    verificar_esquema_na_inicializacao,
+    versao_atual,
+)
+from src.database.repositorio_filmes import RepositorioFilmes
+
+# Banco do formato original: só a tabela 'filmes', sem versão nem índices.
+SQL_FILMES_ANTIGO = """
+    CREATE TABLE filmes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        titulo TEXT NOT NULL,
+        genero TEXT,
+        ano INTEGER,
+        diretor TEXT,
+        protagonista TEXT
+    )
+"""
+
+FILMES_ANTIGOS = [
+    ("A Origem", "Ficção Científica/Ação", 2010, "Christopher Nolan", "Leonardo"),
+    ("Fargo", "Crime/Drama", 1996, "Joel e Ethan Coen", "Frances McDormand"),
+]
+
+
+# --- Classe de Testes para as migrações versionadas do esquema ---
+class TestMigracoes(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_bd = os.path.join(self.diretorio.name, "filmes.db")
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def consultar(self, sql, parametros=()):
+        conn = sqlite3.connect(self.caminho_bd)
+        try:
+            return conn.execute(sql, parametros).fetchall()
+        finally:
+            conn.close()
+
+    def criar_banco_antigo(self):
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.execute(SQL_FILMES_ANTIGO)
+        conn.executemany(
+            "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista) "
+            "VALUES (?, ?, ?, ?, ?)",
+            FILMES_ANTIGOS,
+        )
+        conn.commit()
+        conn.close()
+
+    def test_banco_novo_recebe_todas_as_migracoes(self):
+        self.assertFalse(esquema_atualizado(self.caminho_bd))
+        versoes = list(range(1, versao_atual() + 1))
+        self.assertEqual(aplicar_migracoes(self.caminho_bd), versoes)
+        self.assertTrue(esquema_atualizado(self.caminho_bd))
+        self.assertEqual(self.consultar("PRAGMA user_version"), [(versao_atual(),)])
+        self.assertEqual(
+            [linha[0] for linha in self.consultar("SELECT versao FROM schema_version")],
+            versoes,
+        )
+        # Atualizado: nada a fazer.
+        self.assertEqual(aplicar_migracoes(self.caminho_bd), [])
+
+    def test_atualiza_banco_antigo_no_lugar(self):
+        self.criar_banco_antigo()
+        self.assertFalse(esquema_atualizado(self.caminho_bd))
+        self.assertTrue(verificar_esquema_na_inicializacao(self.caminho_bd))
+        self.assertTrue(esquema_atualizado(self.caminho_bd))
+
+        # Os filmes continuam lá, agora com título normalizado, FTS e junções.
+        self.assertEqual(
+            self.consultar("SELECT titulo_normalizado FROM filmes ORDER BY id"),
+            [("a origem",), ("fargo",)],
+        )
+        repositorio = RepositorioFilmes(self.caminho_bd, tamanho_pool=1)
+        try:
+            self.assertEqual(repositorio.buscar_por_titulo("origem")[0], "A Origem")
+            filmes = repositorio.buscar_filmes(diretor="Ethan Coen")
+        finally:
+            repositorio.fechar()
+        self.assertEqual([filme[0] for filme in filmes], ["Fargo"])
+        indices = {
+            linha[0] for linha in self.consultar("SELECT name FROM sqlite_master")
+        }
+        self.assertIn("idx_filmes_diretor_ano", indices)
+
+    def test_migracao_com_erro_volta_a_versao_anterior(self):
+        self.criar_banco_antigo()
+
+        def migracao_com_erro(conn):
+            conn.execute("CREATE TABLE temporaria (id INTEGER)")
+            raise sqlite3.OperationalError("falha simulada")
+
+        lista = migracoes.MIGRACOES[:2] + [(3, "com erro", migracao_com_erro)]
+        with mock.patch.object(migracoes, "MIGRACOES", lista):
+            with self.assertRaises(sqlite3.OperationalError):
+                aplicar_migracoes(self.caminho_bd)
+
+        # As migrações 1 e 2 ficaram; a 3 foi desfeita por inteiro.
+        self.assertEqual(self.consultar("PRAGMA user_version"), [(2,)])
+        self.assertEqual(
+            self.consultar("SELECT name FROM sqlite_master WHERE name = 'temporaria'"),
+            [],
+        )
+        self.assertEqual(aplicar_migracoes(self.caminho_bd), [3, 4, 5, 6])
+
+    def test_chave_natural_remove_filmes_repetidos(self):
+        """O mesmo título no mesmo ano fica só com o filme de menor id."""
+        self.criar_banco_antigo()
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.executemany(
+            "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                ("A ORIGEM", "Ação", 2010, "Nolan", "Leonardo"),
+                ("A Origem", "Drama", None, "Outro", "Outra"),  # Sem ano: não repete.
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        aplicar_migracoes(self.caminho_bd)
+        self.assertEqual(
+            self.consultar("SELECT id, titulo, ano FROM filmes ORDER BY id"),
+            [(1, "A Origem", 2010), (2, "Fargo", 1996), (4, "A Origem", None)],
+        )
+        self.assertEqual(
+            self.consultar(
+                "SELECT rowid FROM filmes_fts WHERE filmes_fts MATCH ? ORDER BY rowid",
+                ("origem",),
+            ),
+            [(1,), (4,)],
+        )
+        for tabela in ("filme_genero", "filme_pessoa", "titulo_alias"):
+            self.assertEqual(
+                self.consultar(f"SELECT 1 FROM {tabela} WHERE filme_id = 3"), []
+            )
+        self.assertEqual(
+            self.consultar(
+                "SELECT filme_id FROM titulo_alias WHERE alias = ?", ("Inception",)
+            ),
+            [(1,)],
+        )
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.consultar(
+                "INSERT INTO filmes (titulo, ano, titulo_normalizado) "
+                "VALUES ('Fargo', 1996, 'fargo')"
+            )
+
+    def test_inicializacao_nao_cria_banco_inexistente(self):
+        self.assertFalse(verificar_esquema_na_inicializacao(self.caminho_bd))
+        self.assertFalse(os.path.exists(self.caminho_bd))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+import warnings
+from unittest.mock import patch
+
+import torch
+
+from models_prototype.modelo_intencoes import (
+    ClassificadorIntencoesNeural,
+    codificar,
+    construir_vocabulario,
+    gerar_dataset_treino,
+    treinar_modelo_intencoes,
+)
+from models_prototype.nlp_model_arch import empacotar
+from src.agent.agent_core import (
+    identificar_intencao,
+    obter_classificador_intencoes,
+    redefinir_classificador_intencoes,
+)
+from src.agent.classificador_intencoes import ClassificadorIntencoes
+
+PERGUNTAS = ["Quem dirigiu Matrix?", "Me resuma Titanic", "tchau", "bom dia", "Duna"]
+
+
+# --- Classe de Testes para o classificador de intenções treinado (PyTorch) ---
+class TestModeloIntencoes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        warnings.filterwarnings("ignore", category=DeprecationWarning)
+        warnings.filterwarnings("ignore", category=FutureWarning)
+        with patch("builtins.print"):  # Silencia o progresso do treino.
+            cls.classificador = treinar_modelo_intencoes(
+                *gerar_dataset_treino(), epocas=10
+            )
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        redefinir_classificador_intencoes()
+        self.diretorio.cleanup()
+
+    def test_vocabulario_com_tokens_especiais(self):
+        """'<pad>' e '<unk>' ocupam os índices 0 e 1; palavras novas viram '<unk>'."""
+        vocabulario = construir_vocabulario(["Quem dirigiu"])
+        self.assertEqual(vocabulario["<pad>"], 0)
+        self.assertEqual(
+            codificar("quem inventou", vocabulario), [vocabulario["quem"], 1]
+        )
+        self.assertEqual(codificar("?!", vocabulario), [1])
+
+    def test_classifica_frases_de_treino(self):
+        """O modelo treinado acerta frases simples de cada intenção."""
+        self.assertEqual(
+            self.classificador.classificar_lote(PERGUNTAS),
+            ["factual", "resumo_geral", "sair", "desconhecida", "desconhecida"],
+        )
+
+    def test_lote_igual_a_uma_frase_por_vez(self):
+        """Frases de tamanhos diferentes no mesmo lote: o resultado não muda."""
+        self.assertEqual(
+            self.classificador.classificar_lote(PERGUNTAS, tamanho_lote=2),
+            [self.classificador.classificar(p) for p in PERGUNTAS],
+        )
+
+    def test_entrada_empacotada_sem_diluir_a_media(self):
+        """Empacotada ou completada com '<pad>', cada frase dá a mesma saída que sozinha."""
+        modelo = self.classificador.modelo
+        sequencias = [codificar(p, self.classificador.vocabulario) for p in PERGUNTAS]
+        with torch.inference_mode():
+            sozinhas = torch.cat([modelo(torch.tensor([s])) for s in sequencias])
+            empacotadas = modelo(*empacotar(sequencias))
+            maior = max(len(s) for s in sequencias)
+            preenchidas = modelo(
+                torch.tensor([s + [0] * (maior - len(s)) for s in sequencias])
+            )
+        torch.testing.assert_close(empacotadas, sozinhas)
+        torch.testing.assert_close(preenchidas, sozinhas)
+
+    def test_salvar_e_carregar_com_vocabulario(self):
+        """Pesos e vocabulário voltam juntos; a versão int8 também classifica."""
+        caminho = os.path.join(self.diretorio.name, "modelo.pt")
+        self.classificador.salvar(caminho)
+        carregado = ClassificadorIntencoesNeural.carregar(caminho)
+        self.assertEqual(carregado.vocabulario, self.classificador.vocabulario)
+        esperado = self.classificador.classificar_lote(PERGUNTAS)
+        self.assertEqual(carregado.classificar_lote(PERGUNTAS), esperado)
+        quantizado = ClassificadorIntencoesNeural.carregar(caminho, quantizar=True)
+        self.assertEqual(len(quantizado.classificar_lote(PERGUNTAS)), len(PERGUNTAS))
+
+    def test_exportar_torchscript(self):
+        """O arquivo TorchScript traz o vocabulário e dá as mesmas respostas."""
+        caminho = os.path.join(self.diretorio.name, "modelo.ts")
+        self.classificador.exportar_torchscript(caminho)
+        script = ClassificadorIntencoesNeural.carregar_torchscript(caminho)
+        self.assertEqual(
+            script.classificar_lote(PERGUNTAS),
+            self.classificador.classificar_lote(PERGUNTAS),
+        )
+
+    def test_agent_core_usa_modelo_configurado(self):
+        """Com CHATBOT_MODELO_INTENCOES, 'identificar_intencao' usa o modelo treinado."""
+        caminho = os.path.join(self.diretorio.name, "modelo.pt")
+        self.classificador.salvar(caminho)
+        redefinir_classificador_intencoes()
+        with patch.dict(os.environ, {"CHATBOT_MODELO_INTENCOES": caminho}):
+            self.assertIsInstance(
+                obter_classificador_intencoes(), ClassificadorIntencoesNeural
+            )
+            self.assertEqual(identificar_intencao("Quem dirigiu Matrix?"), "factual")
+
+    def test_agent_core_volta_as_palavras_chave(self):
+        """Um modelo inexistente não derruba o chatbot: volta às palavras-chave."""
+        redefinir_classificador_intencoes()
+        caminho = os.path.join(self.diretorio.name, "nao_existe.pt")
+        with patch.dict(os.environ, {"CHATBOT_MODELO_INTENCOES": caminho}):
+            with patch("builtins.print"):
+                classificador = obter_classificador_intencoes()
+        self.assertIsInstance(classificador, ClassificadorIntencoes)
+
+
+if __name__ == "__main__":
+    unittest.main()
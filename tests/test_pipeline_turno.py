@@ -0,0 +1,242 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from benchmarks.llm_falso import RESPOSTA_PADRAO, ClienteLLMFalso
+from src.agent.pipeline_turno import SessaoChat, processar_turno_async
+from src.database.catalogo_memoria import construir_catalogo, recarregar_catalogo
+from src.database.repositorio_filmes import (
+    RepositorioFilmes,
+    definir_repositorio,
+    fechar_repositorio,
+)
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+from src.llm.cache_respostas import CacheRespostas
+from src.llm.cliente_llm import redefinir_cliente_llm
+from src.llm.llm_utils import redefinir_cache_respostas
+from src.nlp.indice_semantico import IndiceSemantico
+from src.nlp.nlp_utils import (
+    buscar_titulo_aproximado,
+    extrair_filtros_consulta,
+    recarregar_automato_titulos,
+    recarregar_indice_semantico,
+)
+
+LATENCIA = 0.05
+
+
+# --- Classe de Testes para o agendador de etapas do turno (LLM falsa) ---
+class TestProcessarTurno(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_bd = os.path.join(self.diretorio.name, "filmes.db")
+        criar_tabela_filmes(self.caminho_bd)
+        popular_filmes_exemplo(self.caminho_bd)
+        self.repositorio = RepositorioFilmes(self.caminho_bd)
+        definir_repositorio(self.repositorio)
+        recarregar_automato_titulos()
+        self.cliente = ClienteLLMFalso(
+            latencia=LATENCIA,
+            titulos_extraidos={
+                "Me fale sobre Nosferatu": "Nosferatu",
+                "me fale de up": "Up",
+                "me fale de interstelar": "Interstelar",
+            },
+        )
+        redefinir_cliente_llm(self.cliente)
+        redefinir_cache_respostas(CacheRespostas(capacidade=0))
+
+    def tearDown(self):
+        fechar_repositorio()
+        recarregar_automato_titulos()
+        redefinir_cliente_llm()
+        redefinir_cache_respostas()
+        self.diretorio.cleanup()
+
+    def processar(self, pergunta, especular=True, modo="duas_chamadas", **kwargs):
+        """Processa um turno em uma sessão nova e retorna (resultado, sessão)."""
+        sessao = SessaoChat()
+
+        async def rodar():
+            resultado = await processar_turno_async(
+                pergunta, sessao, especular=especular, modo=modo, **kwargs
+            )
+            await asyncio.sleep(0)  # Deixa as tarefas canceladas terminarem.
+            return resultado
+
+        return asyncio.run(rodar()), sessao
+
+    def test_titulo_confiante_dispensa_extracao_pela_llm(self):
+        """Uma menção confiante do catálogo vai direto ao banco: só a resposta usa a LLM."""
+        resultado, sessao = self.processar("Quem dirigiu Matrix?")
+        self.assertEqual(resultado["titulo"], "Matrix")
+        self.assertEqual(sessao.ultimo_filme[0], "Matrix")
+        self.assertEqual(self.cliente.chamadas, 1)
+        self.assertNotIn("titulo_llm", resultado["etapas"])
+        self.assertIn("bd", resultado["etapas"])
+
+    def test_resposta_especulativa_aproveitada(self):
+        """Sem filme no banco, a resposta adiantada é usada e o turno custa ~1 chamada."""
+        resultado, _ = self.processar("Me fale sobre Nosferatu")
+        self.assertEqual(resultado["titulo"], "Nosferatu")
+        self.assertEqual(resultado["resposta"], f"Chatbot: {RESPOSTA_PADRAO}")
+        self.assertEqual(self.cliente.chamadas, 2)  # Extração e resposta juntas.
+        # As duas chamadas estiveram em andamento ao mesmo tempo.
+        self.assertEqual(self.cliente.max_simultaneas, 2)
+
+    def test_resposta_especulativa_descartada_quando_filme_encontrado(self):
+        """Se a LLM confirma um filme do catálogo, a resposta é refeita com o contexto."""
+        resultado, sessao = self.processar("me fale de up")
+        self.assertEqual(resultado["titulo"], "Up")
+        self.assertEqual(sessao.ultimo_filme[0], "Up - Altas Aventuras")
+        self.assertIn("bd_candidato", resultado["etapas"])  # Consulta adiantada.
+        self.assertNotIn("bd", resultado["etapas"])
+        self.assertIn("resposta_especulativa", resultado["etapas"])
+        self.assertIn("resposta", resultado["etapas"])
+
+    def test_sem_especulacao_etapas_em_sequencia(self):
+        """Com a especulação desligada, a resposta só começa depois da extração."""
+        resultado, _ = self.processar("Olá, tudo bem?", especular=False)
+        self.assertEqual(resultado["titulo"], "")
+        self.assertEqual(self.cliente.chamadas, 2)
+        self.assertNotIn("resposta_especulativa", resultado["etapas"])
+        self.assertEqual(self.cliente.max_simultaneas, 1)
+        self.assertGreaterEqual(resultado["tempo_total"], 2 * LATENCIA)
+
+    def test_especulacao_desligada_por_padrao(self):
+        """Sem CHATBOT_RESPOSTA_ESPECULATIVA, um turno com filmes não gasta a 3ª chamada."""
+        with patch.dict(os.environ):
+            os.environ.pop("CHATBOT_RESPOSTA_ESPECULATIVA", None)
+            resultado, _ = self.processar("quais os filmes do Nolan?", especular=None)
+        self.assertEqual(self.cliente.chamadas, 2)  # Extração e resposta.
+        self.assertNotIn("resposta_especulativa", resultado["etapas"])
+
+    def test_titulo_da_llm_com_erro_corrigido_pela_busca_aproximada(self):
+        """Um título fora do banco ('Interstelar') é trocado pelo mais parecido."""
+        resultado, sessao = self.processar("me fale de interstelar")
+        self.assertEqual(resultado["titulo"], "Interstelar")
+        self.assertEqual(sessao.ultimo_filme[0], "Interestelar")
+        self.assertIn("bd", resultado["etapas"])
+
+    def test_modo_ferramenta_corrige_titulo_com_erro(self):
+        """A ferramenta 'lookup_movie' também aceita títulos com erro de digitação."""
+        _, sessao = self.processar("me fale de interstelar", modo="ferramenta")
+        self.assertEqual(sessao.ultimo_filme[0], "Interestelar")
+
+    def test_titulo_em_ingles_resolvido_localmente_pelo_apelido(self):
+        """'Inception' é um título alternativo de 'A Origem': dispensa a extração."""
+        resultado, sessao = self.processar("Quem dirigiu Inception?")
+        self.assertEqual(resultado["titulo"], "A Origem")
+        self.assertEqual(sessao.ultimo_filme[1], "Christopher Nolan")
+        self.assertEqual(self.cliente.chamadas, 1)
+
+    def test_busca_semantica_quando_nenhum_titulo_e_encontrado(self):
+        """Sem título nem nomes exatos, o índice semântico reconhece o filme."""
+        caminho_base = os.path.join(self.diretorio.name, "indice")
+        IndiceSemantico.construir(self.repositorio.listar_filmes(), caminho_base)
+        recarregar_indice_semantico()
+        ambiente = {
+            "CHATBOT_INDICE_SEMANTICO": caminho_base,
+            "CHATBOT_INDICE_SEMANTICO_LIMIAR": "0.25",
+        }
+        try:
+            with patch.dict(os.environ, ambiente):
+                # Nomes com erros de digitação: os filtros estruturados não os reconhecem.
+                resultado, sessao = self.processar(
+                    "aquele filme do scorcese com o dicapriu"
+                )
+        finally:
+            recarregar_indice_semantico()
+        self.assertEqual(sessao.ultimo_filme[1], "Martin Scorsese")
+        self.assertEqual(resultado["titulo"], sessao.ultimo_filme[0])
+        self.assertIn("busca_semantica", resultado["etapas"])
+
+    def test_pergunta_sobre_varios_filmes_consulta_por_filtros(self):
+        """'filmes do Nolan' consulta o banco pelo diretor e descarta a especulativa."""
+        resultado, sessao = self.processar("quais os filmes do Nolan?")
+        self.assertIn("bd_filtros", resultado["etapas"])
+        self.assertIn("resposta", resultado["etapas"])
+        self.assertEqual(self.cliente.chamadas, 3)  # Extração, especulativa e resposta.
+        self.assertIsNone(sessao.ultimo_filme)  # Vários filmes: nenhum é "o" filme.
+
+    def test_filtros_com_um_unico_filme_viram_o_filme_do_turno(self):
+        """Se os filtros encontram um só filme, ele é tratado como o filme da pergunta."""
+        resultado, sessao = self.processar("o filme do Scorsese com De Niro")
+        self.assertEqual(resultado["titulo"], "Os Bons Companheiros")
+        self.assertEqual(sessao.ultimo_filme[1], "Martin Scorsese")
+
+    def test_titulos_buscados_no_catalogo_em_memoria(self):
+        """Com CHATBOT_CATALOGO_MEMORIA, o título sai do instantâneo, não do SQLite."""
+        caminho_catalogo = os.path.join(self.diretorio.name, "catalogo.bin")
+        construir_catalogo(self.caminho_bd, caminho_catalogo)
+        self.addCleanup(recarregar_catalogo)
+        ambiente = {"CHATBOT_CATALOGO_MEMORIA": caminho_catalogo}
+        with patch.dict(os.environ, ambiente), patch.object(
+            self.repositorio, "buscar_por_titulo", side_effect=AssertionError
+        ):
+            resultado, sessao = self.processar("Quem dirigiu Matrix?")
+            self.assertEqual(sessao.ultimo_filme[0], "Matrix")
+            self.assertIn("bd", resultado["etapas"])
+
+            # Os filtros continuam no repositório, que o instantâneo não substitui.
+            resultado, _ = self.processar("quais os filmes do Nolan?")
+            self.assertIn("bd_filtros", resultado["etapas"])
+
+    def test_catalogo_local_do_repositorio_do_turno(self):
+        """Autômato, filtros e busca aproximada usam o repositório passado ao turno."""
+        caminho_bd = os.path.join(self.diretorio.name, "outro.db")
+        criar_tabela_filmes(caminho_bd)
+        conn = sqlite3.connect(caminho_bd)
+        conn.execute(
+            "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista, "
+            "titulo_normalizado) VALUES ('Trabalhar Cansa', 'Drama', 2011, "
+            "'Juliana Rojas', 'Helena Albergaria', 'trabalhar cansa')"
+        )
+        conn.commit()
+        conn.close()
+        outro = RepositorioFilmes(caminho_bd)
+        self.addCleanup(outro.fechar)
+
+        resultado, sessao = self.processar(
+            "Quem dirigiu Trabalhar Cansa?", repositorio=outro
+        )
+        self.assertEqual(sessao.ultimo_filme[0], "Trabalhar Cansa")
+        self.assertNotIn("titulo_llm", resultado["etapas"])  # Menção confiante.
+        self.assertEqual(
+            buscar_titulo_aproximado("trabalhar cansaa", backend=outro),
+            "Trabalhar Cansa",
+        )
+        self.assertIsNone(buscar_titulo_aproximado("trabalhar cansaa"))
+        self.assertIn(
+            "diretor", extrair_filtros_consulta("filmes da Juliana Rojas", outro)
+        )
+
+    def test_modo_ferramenta_conversa_sem_filme_custa_uma_chamada(self):
+        """No modo 'ferramenta', uma saudação não passa pela extração de título."""
+        resultado, _ = self.processar("Olá, tudo bem?", modo="ferramenta")
+        self.assertEqual(resultado["resposta"], f"Chatbot: {RESPOSTA_PADRAO}")
+        self.assertEqual(resultado["titulo"], "")
+        self.assertEqual(self.cliente.chamadas, 1)
+        self.assertIn("resposta_com_ferramenta", resultado["etapas"])
+        self.assertNotIn("titulo_llm", resultado["etapas"])
+
+    def test_modo_ferramenta_consulta_banco_pela_ferramenta(self):
+        """A LLM chama 'lookup_movie' e o filme encontrado fica no histórico da sessão."""
+        resultado, sessao = self.processar("me fale de up", modo="ferramenta")
+        self.assertEqual(resultado["titulo"], "Up")
+        self.assertEqual(sessao.ultimo_filme[0], "Up - Altas Aventuras")
+        self.assertEqual(self.cliente.chamadas, 2)  # Pedido da ferramenta + resposta.
+
+    def test_modo_ferramenta_titulo_confiante_resolvido_localmente(self):
+        """Menções confiantes continuam indo direto ao banco, sem ferramenta."""
+        resultado, _ = self.processar("Quem dirigiu Matrix?", modo="ferramenta")
+        self.assertEqual(resultado["titulo"], "Matrix")
+        self.assertEqual(self.cliente.chamadas, 1)
+        self.assertNotIn("resposta_com_ferramenta", resultado["etapas"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from src.database.repositorio_filmes import (
+    LIMITE_MAXIMO_RESULTADOS,
+    RepositorioFilmes,
+    montar_consulta_filmes,
+)
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+
+
+# --- Classe de Testes para o RepositorioFilmes (banco em arquivo temporário) ---
+class TestRepositorioFilmes(unittest.TestCase):
+    def setUp(self):
+        """Cria um 'filmes.db' temporário com os dados de exemplo do setup_db."""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_bd = os.path.join(self.diretorio.name, "filmes.db")
+        criar_tabela_filmes(self.caminho_bd)
+        popular_filmes_exemplo(self.caminho_bd)
+        self.repositorio = RepositorioFilmes(self.caminho_bd, tamanho_pool=2)
+
+    def tearDown(self):
+        self.repositorio.fechar()
+        self.diretorio.cleanup()
+
+    def test_buscar_por_titulo(self):
+        """Verifica se a busca retorna a tupla no formato esperado pelo chatbot."""
+        resultado = self.repositorio.buscar_por_titulo("Matrix")
+        self.assertEqual(
+            resultado,
+            (
+                "Matrix",
+                "Lana e Lilly Wachowski",
+                1999,
+                "Ficção Científica/Ação",
+                "Keanu Reeves",
+            ),
+        )
+        self.assertIsNone(self.repositorio.buscar_por_titulo("Filme Inexistente"))
+
+    def test_busca_ignora_acentos_e_maiusculas(self):
+        """Verifica se o índice FTS5 encontra títulos sem acentos e em minúsculas."""
+        self.assertEqual(
+            self.repositorio.buscar_por_titulo("poderoso chefao")[0],
+            "O Poderoso Chefão",
+        )
+        self.assertEqual(self.repositorio.buscar_por_titulo("wall-e")[0], "WALL·E")
+        self.assertEqual(
+            self.repositorio.buscar_por_titulo("UP")[0], "Up - Altas Aventuras"
+        )
+
+    def test_busca_prefere_titulo_exato(self):
+        """Verifica se o título idêntico vence títulos que apenas o contêm."""
+        self.assertEqual(
+            self.repositorio.buscar_por_titulo("Tropa de Elite")[0], "Tropa de Elite"
+        )
+        self.assertEqual(
+            self.repositorio.buscar_por_titulo("tropa de elite 2")[0],
+            "Tropa de Elite 2: O Inimigo Agora é Outro",
+        )
+
+    def test_indice_sincronizado_por_gatilhos(self):
+        """Verifica se inserções e remoções em 'filmes' refletem no índice FTS5."""
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.execute(
+            "INSERT INTO filmes (titulo, genero, ano, diretor, protagonista, titulo_normalizado) "
+            "VALUES ('Cidade dos Sonhos', 'Suspense', 2001, 'David Lynch', 'Naomi Watts', 'cidade dos sonhos')"
+        )
+        conn.execute("DELETE FROM filmes WHERE titulo = 'Barbie'")
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(
+            self.repositorio.buscar_por_titulo("dos sonhos")[0], "Cidade dos Sonhos"
+        )
+        self.assertIsNone(self.repositorio.buscar_por_titulo("Barbie"))
+
+    def test_conexoes_somente_leitura_em_wal(self):
+        """Verifica se as conexões do pool são 'mode=ro' e o banco está em WAL."""
+        with self.repositorio.conexao() as conn:
+            modo = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            self.assertEqual(modo, "wal")
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM filmes")
+
+    def test_pool_reutiliza_conexoes_entre_threads(self):
+        """Verifica se várias threads consultam em paralelo sem exceder o pool."""
+        resultados = []
+
+        def consultar():
+            for _ in range(50):
+                resultados.append(self.repositorio.buscar_por_titulo("Origem"))
+
+        threads = [threading.Thread(target=consultar) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(resultados), 300)
+        self.assertTrue(all(r[0] == "A Origem" for r in resultados))
+        self.assertLessEqual(len(self.repositorio._todas_conexoes), 2)
+
+
+# --- Classe de Testes para as consultas estruturadas (filtros e planos de consulta) ---
+class TestBuscarFilmes(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_bd = os.path.join(self.diretorio.name, "filmes.db")
+        criar_tabela_filmes(self.caminho_bd)
+        popular_filmes_exemplo(self.caminho_bd)
+        self.repositorio = RepositorioFilmes(self.caminho_bd, tamanho_pool=1)
+
+    def tearDown(self):
+        self.repositorio.fechar()
+        self.diretorio.cleanup()
+
+    def plano(self, normalizado=True, **filtros):
+        """Retorna o EXPLAIN QUERY PLAN da consulta, em uma única string."""
+        sql, parametros = montar_consulta_filmes(normalizado=normalizado, **filtros)
+        with self.repositorio.conexao() as conn:
+            linhas = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+        return " | ".join(linha[-1] for linha in linhas)
+
+    def test_filmes_do_diretor_em_ordem_de_ano(self):
+        """O diretor é comparado sem diferenciar maiúsculas; o resultado vem por ano."""
+        filmes = self.repositorio.buscar_filmes(diretor="christopher nolan")
+        self.assertEqual(len(filmes), 5)
+        self.assertEqual(filmes[0][0], "O Cavaleiro das Trevas")
+        anos = [filme[2] for filme in filmes]
+        self.assertEqual(anos, sorted(anos))
+
+    def test_genero_casa_com_qualquer_parte_do_campo(self):
+        """'Drama' encontra 'Drama/Comédia' e 'Crime/Drama' (dramas de 1994)."""
+        filmes = self.repositorio.buscar_filmes(genero="Drama", ano=1994)
+        titulos = [filme[0] for filme in filmes]
+        self.assertIn("Um Sonho de Liberdade", titulos)
+        self.assertIn("Pulp Fiction: Tempo de Violência", titulos)
+        self.assertEqual(self.repositorio.buscar_filmes(genero="100%"), [])
+
+    def test_generos_e_pessoas_pelas_tabelas_normalizadas(self):
+        """Sem acentos, gênero inteiro (não substring) e pessoas de campos compostos."""
+        filmes = self.repositorio.buscar_filmes(genero="ficcao cientifica", ano=2014)
+        self.assertEqual(
+            [filme[0] for filme in filmes], ["Interestelar", "Guardiões da Galáxia"]
+        )
+        dramas = [filme[0] for filme in self.repositorio.buscar_filmes(genero="Drama")]
+        self.assertNotIn("A Lista de Schindler", dramas)  # 'Drama Histórico'.
+        self.assertEqual(
+            self.repositorio.buscar_filmes(diretor="Lilly Wachowski")[0][0], "Matrix"
+        )
+        self.assertEqual(
+            self.repositorio.buscar_filmes(diretor="Joel e Ethan Coen")[0][0],
+            "O Grande Lebowski",
+        )
+
+    def test_banco_sem_esquema_normalizado_usa_as_colunas_de_texto(self):
+        """Bancos ainda não migrados continuam respondendo (gênero por substring)."""
+        conn = sqlite3.connect(self.caminho_bd)
+        conn.execute("DROP TABLE filme_genero")
+        conn.execute("DROP TABLE filme_pessoa")
+        conn.commit()
+        conn.close()
+        repositorio = RepositorioFilmes(self.caminho_bd, tamanho_pool=1)
+        try:
+            dramas = [filme[0] for filme in repositorio.buscar_filmes(genero="Drama")]
+            self.assertIn("A Lista de Schindler", dramas)
+            self.assertEqual(
+                len(repositorio.buscar_filmes(diretor="christopher nolan")), 5
+            )
+        finally:
+            repositorio.fechar()
+
+    def test_intervalo_de_anos_e_protagonista(self):
+        filmes = self.repositorio.buscar_filmes(
+            protagonista="Leonardo DiCaprio", ano=(2010, 2013)
+        )
+        self.assertEqual(
+            [filme[0] for filme in filmes],
+            ["A Origem", "Ilha do Medo", "O Lobo de Wall Street"],
+        )
+
+    def test_filtro_de_pessoa_so_com_separadores(self):
+        """Um diretor que é só separadores não vira filtro nem levanta erro."""
+        self.assertEqual(self.repositorio.buscar_filmes(diretor=" e , "), [])
+        filmes = self.repositorio.buscar_filmes(protagonista="&", ano=1994)
+        self.assertEqual(filmes, self.repositorio.buscar_filmes(ano=1994))
+        with self.assertRaises(ValueError):
+            self.repositorio.buscar_filmes()
+
+    def test_paginacao_e_limite_maximo(self):
+        """As páginas não se repetem e nenhum pedido passa de LIMITE_MAXIMO_RESULTADOS."""
+        todos = self.repositorio.buscar_filmes(ano=(1900, 2100), limite=1000)
+        self.assertEqual(len(todos), LIMITE_MAXIMO_RESULTADOS)
+        pagina_1 = self.repositorio.buscar_filmes(diretor="Quentin Tarantino", limite=3)
+        pagina_2 = self.repositorio.buscar_filmes(
+            diretor="Quentin Tarantino", limite=3, deslocamento=3
+        )
+        self.assertEqual(len(pagina_1), 3)
+        self.assertEqual(len(pagina_2), 2)
+        self.assertFalse(set(pagina_1) & set(pagina_2))
+
+    def test_sem_filtros_gera_erro(self):
+        with self.assertRaises(ValueError):
+            self.repositorio.buscar_filmes(limite=5)
+
+    def test_planos_usam_as_tabelas_de_juncao(self):
+        """Pessoas e gêneros: chave única do nome e chave primária da junção."""
+        plano = self.plano(diretor="Christopher Nolan")
+        self.assertIn("sqlite_autoindex_pessoas_1 (nome_normalizado=?)", plano)
+        self.assertIn("p0 USING PRIMARY KEY (pessoa_id=? AND papel=?)", plano)
+        self.assertIn("filmes USING INTEGER PRIMARY KEY", plano)
+        plano = self.plano(genero="Drama", protagonista="Tom Hanks")
+        self.assertIn("sqlite_autoindex_generos_1 (nome_normalizado=?)", plano)
+        self.assertNotIn("SCAN", plano)
+        plano = self.plano(genero="Drama", ano=1994)
+        self.assertIn("idx_filmes_ano", plano)
+        self.assertNotIn("SCAN", plano)
+
+    def test_planos_legados_usam_os_indices(self):
+        """Sem as junções, cada filtro indexado usa seu índice, sem ordenação extra."""
+        casos = {
+            "idx_filmes_diretor_ano": {"diretor": "Christopher Nolan"},
+            "idx_filmes_protagonista_ano": {"protagonista": "Tom Hanks"},
+            "idx_filmes_ano": {"ano": 1994},
+        }
+        for indice, filtros in casos.items():
+            with self.subTest(filtros=filtros):
+                plano = self.plano(normalizado=False, **filtros)
+                self.assertIn(f"USING INDEX {indice}", plano)
+                self.assertNotIn("TEMP B-TREE", plano)
+        self.assertIn("USING INDEX idx_filmes_ano", self.plano(ano=(1990, 1999)))
+        plano = self.plano(
+            normalizado=False, diretor="Steven Spielberg", ano=1993, genero="Drama"
+        )
+        self.assertIn("idx_filmes_diretor_ano (diretor=? AND ano=?)", plano)
+
+
+if __name__ == "__main__":
+    unittest.main()
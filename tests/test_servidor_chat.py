@@ -0,0 +1,366 @@
+import asyncio
+import base64
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from benchmarks.llm_falso import RESPOSTA_PADRAO, ClienteLLMFalso
+from src.agent.pipeline_turno import MAX_TURNOS_HISTORICO, SessaoChat
+from src.database.repositorio_filmes import (
+    RepositorioFilmes,
+    definir_repositorio,
+    fechar_repositorio,
+)
+from src.database.setup_db import criar_tabela_filmes, popular_filmes_exemplo
+from src.llm.cache_respostas import CacheRespostas
+from src.llm.cliente_llm import redefinir_cliente_llm
+from src.llm.llm_utils import redefinir_cache_respostas
+from src.nlp.nlp_utils import recarregar_automato_titulos
+from src.servidor.protocolo import (
+    OPCODE_TEXTO,
+    TAMANHO_MAXIMO_CORPO,
+    ler_quadro_websocket,
+)
+from src.servidor.servidor_chat import ServidorChat
+
+
+async def _post_chat(porta, dados):
+    """Faz um POST /chat em uma conexão nova e retorna (status, JSON da resposta)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    corpo = json.dumps(dados).encode("utf-8")
+    writer.write(
+        (
+            "POST /chat HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+            f"Content-Length: {len(corpo)}\r\n\r\n"
+        ).encode("latin-1")
+        + corpo
+    )
+    await writer.drain()
+    resposta = await reader.read()
+    writer.close()
+    cabecalhos, _, corpo_resposta = resposta.partition(b"\r\n\r\n")
+    status = int(cabecalhos.split()[1])
+    return status, json.loads(corpo_resposta)
+
+
+async def _enviar_bruto(porta, requisicao):
+    """Envia bytes quaisquer em uma conexão nova e retorna o status HTTP da resposta."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    writer.write(requisicao)
+    await writer.drain()
+    resposta = await reader.read()
+    writer.close()
+    return int(resposta.split()[1])
+
+
+async def _abrir_websocket(porta):
+    """Faz o aperto de mão WebSocket em /ws e retorna (reader, writer)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    chave = base64.b64encode(os.urandom(16)).decode("latin-1")
+    writer.write(
+        (
+            "GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {chave}\r\n\r\n"
+        ).encode("latin-1")
+    )
+    linha_status = await reader.readline()
+    if b"101" not in linha_status:
+        raise AssertionError(f"Aperto de mão recusado: {linha_status!r}")
+    while await reader.readline() != b"\r\n":
+        pass
+    return reader, writer
+
+
+async def _enviar_quadro_texto(writer, texto):
+    """Envia uma mensagem de texto curta (quadros do cliente levam máscara; aqui, nula)."""
+    payload = texto.encode("utf-8")
+    writer.write(bytes([0x81, 0x80 | len(payload)]) + b"\0" * 4 + payload)
+    await writer.drain()
+
+
+# --- Classe de Testes para o ServidorChat (LLM falsa, banco temporário) ---
+class TestServidorChat(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        caminho_bd = os.path.join(self.diretorio.name, "filmes.db")
+        criar_tabela_filmes(caminho_bd)
+        popular_filmes_exemplo(caminho_bd)
+        definir_repositorio(RepositorioFilmes(caminho_bd))
+        recarregar_automato_titulos()
+        redefinir_cliente_llm(ClienteLLMFalso(latencia=0.01))
+        redefinir_cache_respostas(CacheRespostas(capacidade=0))
+
+    def tearDown(self):
+        fechar_repositorio()
+        recarregar_automato_titulos()
+        redefinir_cliente_llm()
+        redefinir_cache_respostas()
+        self.diretorio.cleanup()
+
+    def executar(self, corrotina_de_teste):
+        """Sobe o servidor numa porta livre e executa o teste contra ele."""
+
+        async def rodar():
+            servidor = ServidorChat("127.0.0.1", 0, max_turnos_simultaneos=4)
+            await servidor.iniciar()
+            try:
+                return await corrotina_de_teste(servidor)
+            finally:
+                await servidor.encerrar()
+
+        return asyncio.run(rodar())
+
+    def test_post_chat_mantem_sessao(self):
+        """Verifica a resposta do POST /chat e o reuso da sessão entre turnos."""
+
+        async def teste(servidor):
+            status, dados = await _post_chat(
+                servidor.porta, {"pergunta": "Quem dirigiu Matrix?"}
+            )
+            self.assertEqual(status, 200)
+            self.assertEqual(dados["titulo"], "Matrix")
+            self.assertEqual(dados["resposta"], f"Chatbot: {RESPOSTA_PADRAO}")
+            self.assertFalse(dados["encerrar"])
+
+            _, segundo = await _post_chat(
+                servidor.porta,
+                {"pergunta": "E o Gladiador?", "sessao": dados["sessao"]},
+            )
+            self.assertEqual(segundo["sessao"], dados["sessao"])
+            self.assertEqual(len(servidor.sessoes[dados["sessao"]].historico), 2)
+
+            status, _ = await _post_chat(servidor.porta, {"pergunta": "  "})
+            self.assertEqual(status, 400)
+
+        self.executar(teste)
+
+    def test_content_length_invalido(self):
+        """Content-Length que não é inteiro, negativo ou grande demais dá 400."""
+
+        async def teste(servidor):
+            for valor in ("abc", "-5", "+3", "1e3", str(TAMANHO_MAXIMO_CORPO + 1)):
+                with self.subTest(valor=valor):
+                    status = await _enviar_bruto(
+                        servidor.porta,
+                        (
+                            "POST /chat HTTP/1.1\r\nHost: localhost\r\n"
+                            f"Content-Length: {valor}\r\n\r\n{{}}"
+                        ).encode("latin-1"),
+                    )
+                    self.assertEqual(status, 400)
+
+        self.executar(teste)
+
+    def test_corpo_json_que_nao_e_objeto(self):
+        """Um JSON válido que não é objeto, ou campos que não são texto, dão 400."""
+
+        async def teste(servidor):
+            for dados in (
+                [1],
+                "x",
+                3,
+                None,
+                {"pergunta": ["Matrix"]},
+                {"pergunta": "Matrix", "sessao": [1]},
+            ):
+                with self.subTest(dados=dados):
+                    status, resposta = await _post_chat(servidor.porta, dados)
+                    self.assertEqual(status, 400)
+                    self.assertIn("erro", resposta)
+
+        self.executar(teste)
+
+    def test_historico_da_sessao_limitado(self):
+        """O histórico guarda só os últimos MAX_TURNOS_HISTORICO turnos."""
+        sessao = SessaoChat()
+        for i in range(MAX_TURNOS_HISTORICO + 5):
+            sessao.registrar_turno(f"pergunta {i}", f"resposta {i}")
+        self.assertEqual(len(sessao.historico), MAX_TURNOS_HISTORICO)
+        self.assertEqual(sessao.historico[-1], (f"pergunta {i}", f"resposta {i}"))
+
+    def test_post_chat_em_stream(self):
+        """Verifica a resposta em pedaços (chunked/NDJSON) e o tempo até o 1º pedaço."""
+
+        async def teste(servidor):
+            reader, writer = await asyncio.open_connection("127.0.0.1", servidor.porta)
+            corpo = json.dumps({"pergunta": "Quem dirigiu Matrix?", "stream": True})
+            writer.write(
+                (
+                    "POST /chat HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                    f"Content-Length: {len(corpo)}\r\n\r\n{corpo}"
+                ).encode("utf-8")
+            )
+            resposta = await reader.read()
+            writer.close()
+
+            cabecalhos, _, corpo_resposta = resposta.partition(b"\r\n\r\n")
+            self.assertIn(b"Transfer-Encoding: chunked", cabecalhos)
+            linhas = [
+                json.loads(linha)
+                for linha in corpo_resposta.split(b"\r\n")
+                if linha.startswith(b"{")
+            ]
+            pedacos = [linha["pedaco"] for linha in linhas[:-1]]
+            final = linhas[-1]
+            self.assertEqual("".join(pedacos), final["resposta"])
+            self.assertEqual(final["titulo"], "Matrix")
+            self.assertLess(final["tempo_primeiro_pedaco"], final["tempo_total"])
+
+        self.executar(teste)
+
+    def test_turnos_concorrentes(self):
+        """Verifica se várias sessões são atendidas em paralelo (não em série)."""
+
+        async def teste(servidor):
+            redefinir_cliente_llm(ClienteLLMFalso(latencia=0.2))
+            inicio = asyncio.get_running_loop().time()
+            resultados = await asyncio.gather(
+                *(_post_chat(servidor.porta, {"pergunta": "Olá!"}) for _ in range(4))
+            )
+            duracao = asyncio.get_running_loop().time() - inicio
+            self.assertEqual([status for status, _ in resultados], [200] * 4)
+            self.assertEqual(len({dados["sessao"] for _, dados in resultados}), 4)
+            # Em série seriam 4 x 0.2s; em paralelo, pouco mais de 0.2s.
+            self.assertLess(duracao, 0.6)
+
+        self.executar(teste)
+
+    def test_websocket_e_despedida(self):
+        """Verifica o aperto de mão WebSocket, uma pergunta e o encerramento com 'tchau'."""
+
+        async def teste(servidor):
+            reader, writer = await _abrir_websocket(servidor.porta)
+            for pergunta in ("Quem dirigiu Matrix?", "tchau"):
+                await _enviar_quadro_texto(writer, pergunta)
+                # A resposta chega em pedaços e termina com o JSON completo.
+                pedacos = []
+                while True:
+                    opcode, resposta = await ler_quadro_websocket(reader)
+                    self.assertEqual(opcode, OPCODE_TEXTO)
+                    dados = json.loads(resposta)
+                    if "pedaco" not in dados:
+                        break
+                    pedacos.append(dados["pedaco"])
+                self.assertGreater(len(pedacos), 1)
+                self.assertEqual("".join(pedacos), dados["resposta"])
+
+            self.assertTrue(dados["encerrar"])
+            self.assertEqual(dados["intencao"], "sair")
+            self.assertEqual(servidor.sessoes, {})
+            writer.close()
+
+        self.executar(teste)
+
+    def test_turno_com_erro_responde_500_e_mantem_a_conexao(self):
+        """Uma exceção no turno vira 500 (ou um último pedaço com 'erro')."""
+
+        async def turno_com_erro(pergunta, sessao, ao_receber_pedaco=None):
+            if ao_receber_pedaco is not None and pergunta == "com pedaço":
+                await ao_receber_pedaco("Olá")
+            raise ValueError("Modo de pipeline inválido.")
+
+        async def teste(servidor):
+            reader, writer = await asyncio.open_connection("127.0.0.1", servidor.porta)
+            requisicoes = b""
+            for pergunta, stream, fechar in (
+                ("oi", False, False),
+                ("oi", True, False),
+                ("com pedaço", True, True),
+            ):
+                corpo = json.dumps({"pergunta": pergunta, "stream": stream}).encode()
+                conexao = "close" if fechar else "keep-alive"
+                requisicoes += (
+                    f"POST /chat HTTP/1.1\r\nHost: localhost\r\nConnection: {conexao}"
+                    f"\r\nContent-Length: {len(corpo)}\r\n\r\n"
+                ).encode("latin-1") + corpo
+            writer.write(requisicoes)
+            resposta = await reader.read()
+            writer.close()
+
+            # As três respostas saem pela mesma conexão.
+            self.assertEqual(resposta.count(b"HTTP/1.1 500"), 2)
+            self.assertEqual(resposta.count(b"HTTP/1.1 200"), 1)
+            ultima = resposta.rsplit(b"HTTP/1.1 200", 1)[1]
+            linhas = [
+                json.loads(linha)
+                for linha in ultima.split(b"\r\n")
+                if linha.startswith(b"{")
+            ]
+            self.assertEqual(linhas[0], {"pedaco": "Olá"})
+            self.assertIn("erro", linhas[-1])
+
+        with patch(
+            "src.servidor.servidor_chat.processar_turno_async", turno_com_erro
+        ), self.assertLogs("src.servidor.servidor_chat", "ERROR"):
+            self.executar(teste)
+
+    def test_sessao_com_pedidos_em_fila_nao_ocupa_vagas(self):
+        """Pedidos na fila de uma sessão esperam a trava dela, não uma vaga global."""
+
+        async def teste(servidor):
+            evento = asyncio.Event()
+
+            async def turno_lento(pergunta, sessao, ao_receber_pedaco=None):
+                await evento.wait()
+                return {"encerrar": False}
+
+            with patch("src.servidor.servidor_chat.processar_turno_async", turno_lento):
+                sessao = servidor.obter_sessao()
+                fila = [
+                    asyncio.create_task(servidor.executar_turno(sessao, "oi"))
+                    for _ in range(servidor.max_turnos_simultaneos + 1)
+                ]
+                await asyncio.sleep(0.01)
+                self.assertEqual(servidor.turnos_em_andamento, 1)
+
+                outra = asyncio.create_task(
+                    servidor.executar_turno(servidor.obter_sessao(), "oi")
+                )
+                await asyncio.sleep(0.01)
+                self.assertEqual(servidor.turnos_em_andamento, 2)
+                evento.set()
+                await asyncio.gather(*fila, outra)
+
+        self.executar(teste)
+
+    def test_websocket_turno_com_erro_responde_mensagem_de_erro(self):
+        """No WebSocket, o turno que falha vira {"erro": ...} e a conversa segue."""
+        perguntas = []
+
+        async def turno_com_erro(pergunta, sessao, ao_receber_pedaco=None):
+            perguntas.append(pergunta)
+            raise RuntimeError("Falha na ferramenta.")
+
+        async def teste(servidor):
+            reader, writer = await _abrir_websocket(servidor.porta)
+            for pergunta in ("oi", "de novo"):
+                await _enviar_quadro_texto(writer, pergunta)
+                opcode, resposta = await ler_quadro_websocket(reader)
+                self.assertEqual(opcode, OPCODE_TEXTO)
+                self.assertIn("erro", json.loads(resposta))
+            writer.close()
+            self.assertEqual(perguntas, ["oi", "de novo"])
+
+        with patch(
+            "src.servidor.servidor_chat.processar_turno_async", turno_com_erro
+        ), self.assertLogs("src.servidor.servidor_chat", "ERROR"):
+            self.executar(teste)
+
+    def test_websocket_sem_chave_responde_400(self):
+        """Um pedido de upgrade sem Sec-WebSocket-Key recebe 400, não um silêncio."""
+
+        async def teste(servidor):
+            status = await _enviar_bruto(
+                servidor.porta,
+                b"GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                b"Connection: Upgrade\r\n\r\n",
+            )
+            self.assertEqual(status, 400)
+
+        self.executar(teste)
+
+
+if __name__ == "__main__":
+    unittest.main()
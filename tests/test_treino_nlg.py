@@ -0,0 +1,152 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import torch
+
+from models_prototype.corpus_codificado import CorpusCodificado
+from models_prototype.treino_nlg import (
+    AmostradorPorTamanho,
+    DatasetLinhasCorpus,
+    montar_lote,
+    treinar_modelo_nlg,
+)
+
+
+def _gerar_linhas(num_linhas, semente=3):
+    """Linhas de 0 a 12 palavras tiradas de um vocabulário pequeno."""
+    aleatorio = random.Random(semente)
+    palavras = ["o", "filme", "é", "bom", "longo", "dia", "fim", "ator", "cena"]
+    return [
+        aleatorio.choices(palavras, k=aleatorio.randint(0, 12))
+        for _ in range(num_linhas)
+    ]
+
+
+# --- Classe de Testes para o treino em lotes do SimpleNLGModel ---
+class TestTreinoNLG(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_base = os.path.join(self.diretorio.name, "corpus")
+        self.linhas = _gerar_linhas(300)
+        CorpusCodificado.construir(self.linhas, self.caminho_base, min_contagem=1)
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def treinar(self, **kwargs):
+        parametros = {
+            "embedding_dim": 8,
+            "hidden_dim": 16,
+            "tamanho_lote": 16,
+            "num_workers": 0,
+            "passos_por_relatorio": 1_000,
+        }
+        parametros.update(kwargs)
+        with redirect_stdout(io.StringIO()):
+            return treinar_modelo_nlg(self.caminho_base, **parametros)
+
+    def test_exemplos_sem_preenchimento(self):
+        """Cada posição vira (até 'contexto' palavras anteriores, próxima palavra)."""
+        linhas = [torch.tensor([5, 6, 7, 8, 9]), torch.tensor([3, 4])]
+        lote = montar_lote(linhas, contexto=3)
+        self.assertEqual(lote["tokens"], 7)
+        fins = lote["offsets"].tolist()[1:] + [len(lote["indices"])]
+        contextos = [
+            tuple(lote["indices"][inicio:fim].tolist())
+            for inicio, fim in zip(lote["offsets"].tolist(), fins)
+        ]
+        self.assertEqual(
+            list(zip(contextos, lote["alvos"].tolist())),
+            [((5,), 6), ((5, 6), 7), ((5, 6, 7), 8), ((6, 7, 8), 9), ((3,), 4)],
+        )
+
+    def test_amostrador_cobre_as_linhas_uma_vez_por_epoca(self):
+        """Toda linha com 2+ palavras aparece uma vez; a ordem muda com a época."""
+        comprimentos = [len(linha) for linha in self.linhas]
+        amostrador = AmostradorPorTamanho(comprimentos, 16, lotes_por_piscina=4)
+        lotes = list(amostrador)
+        self.assertEqual(len(lotes), amostrador.total_lotes())
+        vistas = sorted(i for lote in lotes for i in lote)
+        self.assertEqual(vistas, [i for i, n in enumerate(comprimentos) if n >= 2])
+
+        # Com piscinas ordenadas, os comprimentos dentro de um lote ficam próximos.
+        def dispersao(lotes):
+            return sum(
+                max(comprimentos[i] for i in lote) - min(comprimentos[i] for i in lote)
+                for lote in lotes
+            )
+
+        sem_ordenar = AmostradorPorTamanho(comprimentos, 16, lotes_por_piscina=1)
+        self.assertLess(dispersao(lotes), dispersao(sem_ordenar) / 2)
+
+        self.assertEqual(list(amostrador), lotes)
+        amostrador.definir_epoca(0, inicio=3)
+        self.assertEqual(list(amostrador), lotes[3:])
+        self.assertEqual(len(amostrador), len(lotes) - 3)
+        amostrador.definir_epoca(1)
+        self.assertNotEqual(list(amostrador), lotes)
+        with self.assertRaises(ValueError):
+            AmostradorPorTamanho(comprimentos, 0)
+
+    def test_dataset_reabre_o_corpus_no_worker(self):
+        """O dataset copiado para um worker não leva o memmap junto."""
+        dataset = DatasetLinhasCorpus(self.caminho_base)
+        estado = dataset.__getstate__()
+        self.assertIsNone(estado["_corpus"])
+        copia = DatasetLinhasCorpus.__new__(DatasetLinhasCorpus)
+        copia.__dict__.update(estado)
+        self.assertEqual(copia[0].tolist(), dataset[0].tolist())
+        self.assertEqual(copia[0].dtype, torch.long)
+
+    def test_perda_cai_e_workers_dao_o_mesmo_resultado(self):
+        """O treino aprende, e usar workers não muda os lotes nem os pesos."""
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            treinar_modelo_nlg(
+                self.caminho_base,
+                embedding_dim=8,
+                hidden_dim=16,
+                tamanho_lote=16,
+                epocas=6,
+                num_workers=0,
+                passos_por_relatorio=17,
+                taxa_aprendizado=0.01,
+            )
+        perdas = [
+            float(linha.split("perda ")[1].split(",")[0])
+            for linha in saida.getvalue().splitlines()
+            if "perda " in linha
+        ]
+        self.assertLess(perdas[-1], perdas[0])
+        self.assertIn("tokens/s", saida.getvalue())
+        self.assertIn("amostras/s", saida.getvalue())
+
+        serial = self.treinar(max_passos=5)
+        paralelo = self.treinar(max_passos=5, num_workers=2, prefetch=2)
+        for nome, valor in serial.state_dict().items():
+            self.assertTrue(torch.equal(valor, paralelo.state_dict()[nome]), nome)
+
+    def test_checkpoint_e_retomada(self):
+        """Parar no meio e retomar dá os mesmos pesos de um treino direto."""
+        checkpoint = os.path.join(self.diretorio.name, "modelo.pt")
+        # 16 lotes por época e acumulação de 2: o passo 7 cai no meio da 1ª época.
+        direto = self.treinar(epocas=2, acumulacao=2)
+        self.treinar(epocas=2, acumulacao=2, checkpoint=checkpoint, max_passos=7)
+        retomado = self.treinar(
+            epocas=2, acumulacao=2, checkpoint=checkpoint, retomar=True
+        )
+        for nome, valor in direto.state_dict().items():
+            self.assertTrue(torch.equal(valor, retomado.state_dict()[nome]), nome)
+        dados = torch.load(checkpoint, weights_only=True)
+        self.assertEqual((dados["epoca"], dados["lote"]), (2, 0))
+
+        with self.assertRaises(ValueError):
+            self.treinar(epocas=2, acumulacao=3, checkpoint=checkpoint, retomar=True)
+
+
+if __name__ == "__main__":
+    unittest.main()